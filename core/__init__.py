@@ -6,5 +6,6 @@ Module principal de transcription audio basé sur Whisper (OpenAI)
 from .transcription import WhisperTranscriber
 from .models import ModelManager
 from .affinity import CPUAffinityManager
+from .worker_pool import WorkerPool
 
-__all__ = ['WhisperTranscriber', 'ModelManager', 'CPUAffinityManager']
+__all__ = ['WhisperTranscriber', 'ModelManager', 'CPUAffinityManager', 'WorkerPool']
@@ -0,0 +1,226 @@
+"""
+Station TV - Memory Admission
+Contrôle d'admission mémoire au lancement des workers: RSS privée (USS)
+mesurée après chargement du modèle, limite mémoire du cgroup et RAM
+disponible; un worker (ou un morceau du mode découpé) qui ne tient pas est
+retardé puis refusé plutôt que de faire swapper la machine.
+"""
+
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import psutil
+
+from qos.monitor import SystemMonitor
+from utils.cgroup import cgroup_dir, read_sysfs
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GB = 1024 ** 3
+# Limite cgroup v1 "illimitée" (PAGE_COUNTER_MAX arrondi à la page)
+_CGROUP_V1_UNLIMITED = 2 ** 60
+
+
+class MemoryAdmission:
+    """
+    Admission des workers sur la mémoire réellement disponible.
+    
+    Coût d'un worker: plus grande USS observée (pages privées, les poids mappés
+    partagés ne comptent qu'une fois) × marge, ou estimation statique du modèle
+    tant qu'aucun worker n'a chargé son modèle.
+    Mémoire disponible: minimum de la RAM disponible (psutil) et de la marge
+    sous la limite du cgroup, moins la réserve.
+    """
+    
+    def __init__(
+        self,
+        static_estimate_gb: float,
+        max_usage_percent: float = 90.0,
+        reserve_gb: float = 0.0,
+        margin: float = 1.2,
+        poll_s: float = 5.0,
+        max_wait_s: float = 1800.0,
+        sys_root: str = "/sys"
+    ):
+        """
+        Initialise le contrôle d'admission.
+        
+        Args:
+            static_estimate_gb: Coût d'un worker avant toute mesure (ModelManager.estimate_ram_usage)
+            max_usage_percent: Utilisation maximale de la RAM (et de la limite du cgroup)
+            reserve_gb: RAM gardée libre en plus
+            margin: Marge sur l'USS mesurée (activations pendant la transcription)
+            poll_s: Intervalle entre deux vérifications pendant une attente
+            max_wait_s: Attente maximale avant refus (0 = tant que des workers tournent)
+            sys_root: Racine de sysfs
+        """
+        self.static_estimate_gb = static_estimate_gb
+        self.max_usage_percent = max_usage_percent
+        self.reserve_gb = reserve_gb
+        self.margin = margin
+        self.poll_s = poll_s
+        self.max_wait_s = max_wait_s
+        self.sys_root = sys_root
+        # Plus grande USS observée d'un worker au modèle chargé (Go)
+        self.measured_gb = 0.0
+        self.delayed = 0
+        self.refused = 0
+    
+    @classmethod
+    def from_config(cls, config: dict, static_estimate_gb: float) -> Optional["MemoryAdmission"]:
+        """
+        Construit le contrôle d'admission depuis hardware.memory_admission.
+        
+        Args:
+            config: Configuration
+            static_estimate_gb: Coût d'un worker avant toute mesure
+        
+        Returns:
+            MemoryAdmission, ou None si l'admission est désactivée
+        """
+        hardware = config.get('hardware', {})
+        admission_config = hardware.get('memory_admission', {})
+        if not admission_config.get('enabled', False):
+            return None
+        return cls(
+            static_estimate_gb,
+            max_usage_percent=hardware.get('ram_max_usage_percent', 90),
+            reserve_gb=admission_config.get('reserve_gb', 0.0),
+            margin=admission_config.get('margin', 1.2),
+            poll_s=admission_config.get('poll_s', 5.0),
+            max_wait_s=admission_config.get('max_wait_s', 1800.0)
+        )
+    
+    @staticmethod
+    def cgroup_memory(sys_root: str = "/sys", proc_root: str = "/proc") -> Tuple[Optional[int], Optional[int]]:
+        """
+        Limite et utilisation mémoire du cgroup du processus (v2 puis v1).
+        
+        Args:
+            sys_root: Racine de sysfs
+            proc_root: Racine de procfs (cgroup du processus: self/cgroup)
+        
+        Returns:
+            Tuple (limite en octets ou None sans limite, utilisation en octets ou None)
+        """
+        # cgroup v2: "max" = illimité
+        cgroup = cgroup_dir(sys_root, proc_root=proc_root)
+        limit = read_sysfs(cgroup / "memory.max")
+        if limit is not None:
+            usage = read_sysfs(cgroup / "memory.current")
+            return (
+                None if limit == "max" else int(limit),
+                int(usage) if usage else None
+            )
+        
+        cgroup = cgroup_dir(sys_root, "memory", proc_root)
+        limit = read_sysfs(cgroup / "memory.limit_in_bytes")
+        usage = read_sysfs(cgroup / "memory.usage_in_bytes")
+        if limit is None or int(limit) >= _CGROUP_V1_UNLIMITED:
+            return None, int(usage) if usage else None
+        return int(limit), int(usage) if usage else None
+    
+    def available_gb(self) -> float:
+        """
+        Mémoire admissible pour de nouveaux workers.
+        
+        Returns:
+            Go disponibles sous max_usage_percent (RAM et cgroup), réserve déduite
+        """
+        memory = psutil.virtual_memory()
+        share = self.max_usage_percent / 100.0
+        available = memory.available - memory.total * (1.0 - share)
+        
+        limit, usage = self.cgroup_memory(self.sys_root)
+        if limit is not None and usage is not None:
+            available = min(available, limit * share - usage)
+        return available / GB - self.reserve_gb
+    
+    def worker_estimate_gb(self) -> float:
+        """Coût mémoire d'un worker supplémentaire (Go)."""
+        if self.measured_gb > 0:
+            return self.measured_gb * self.margin
+        return self.static_estimate_gb
+    
+    def record(self, uss_gb: float):
+        """
+        Enregistre l'USS d'un worker dont le modèle est chargé.
+        
+        Args:
+            uss_gb: Mémoire privée du worker (Go)
+        """
+        if uss_gb > self.measured_gb:
+            self.measured_gb = uss_gb
+            logger.info(
+                f"Admission mémoire: {uss_gb:.2f} Go privés mesurés par worker "
+                f"(coût retenu {self.worker_estimate_gb():.2f} Go)"
+            )
+    
+    def observe(self, pids: Iterable[int]):
+        """
+        Mesure l'USS des workers en cours (pic pendant la transcription).
+        
+        Args:
+            pids: PID des workers au modèle déjà chargé
+        """
+        for pid in pids:
+            try:
+                self.record(SystemMonitor.get_process_memory(pid)["uss_gb"])
+            except psutil.Error:
+                # Worker terminé entre-temps
+                continue
+    
+    def capacity(self) -> int:
+        """Nombre de workers supplémentaires qui tiennent dans la mémoire disponible."""
+        estimate = self.worker_estimate_gb()
+        if estimate <= 0:
+            return 0
+        return max(0, int(self.available_gb() // estimate))
+    
+    def can_admit(self) -> bool:
+        """Indique si un worker supplémentaire tient dans la mémoire disponible."""
+        return self.available_gb() >= self.worker_estimate_gb()
+    
+    def admit(self, running: Callable[[], List[int]], name: str = "worker") -> bool:
+        """
+        Attend qu'un worker supplémentaire tienne en mémoire.
+        
+        Tant que des workers tournent, leur USS est remesurée et la mémoire peut
+        se libérer à la fin de l'un d'eux; sans worker en cours, l'attente ne
+        porte que sur la mémoire des autres processus de la machine.
+        
+        Args:
+            running: Fonction renvoyant les PID des workers en cours (modèle chargé)
+            name: Nom du worker pour les logs
+        
+        Returns:
+            True si le worker est admis, False s'il est refusé
+        """
+        start_time = time.time()
+        logged = False
+        while True:
+            pids = running()
+            self.observe(pids)
+            if self.can_admit():
+                if logged:
+                    logger.info(f"Admission mémoire: {name} admis après {time.time() - start_time:.0f}s d'attente")
+                return True
+            
+            waited = time.time() - start_time
+            if waited >= self.max_wait_s and (self.max_wait_s > 0 or not pids):
+                self.refused += 1
+                logger.error(
+                    f"Admission mémoire: {name} refusé, {self.available_gb():.1f} Go disponibles "
+                    f"< {self.worker_estimate_gb():.1f} Go requis"
+                )
+                return False
+            
+            if not logged:
+                self.delayed += 1
+                logged = True
+                logger.warning(
+                    f"Admission mémoire: {name} retardé, {self.available_gb():.1f} Go disponibles "
+                    f"< {self.worker_estimate_gb():.1f} Go requis ({len(pids)} workers en cours)"
+                )
+            time.sleep(self.poll_s)
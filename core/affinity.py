@@ -6,21 +6,46 @@ Adapté du code WhisperTranscriptor.py existant
 
 import os
 import psutil
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from core.scheduling import lpt
+from utils.cgroup import cgroup_dir, read_sysfs
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Politiques de placement (hardware.affinity_policy, en plus de "manual")
+AFFINITY_POLICIES = ("physical", "siblings", "node", "contiguous")
+
+
+def _parse_cpu_list(text: str) -> Set[int]:
+    """Lit une liste de CPU au format du noyau ("0-3,8,10-11")."""
+    cpus = set()
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
 
 class Audio:
     """
     Représente un fichier audio à traiter.
     Réutilisé depuis WhisperTranscriptor.py
+    
+    classe et deadline (heure limite, 0 = sans échéance) sont fixées par
+    core.priority quand les priorités sont actives.
     """
     
-    def __init__(self, path: str, duree: float):
+    def __init__(self, path: str, duree: float, classe: str = "", deadline: float = 0.0):
         self.path = path
         self.duree = duree
+        self.classe = classe
+        self.deadline = deadline
     
     def __repr__(self):
         return f"Audio('{self.path}', {self.duree:.2f}s)"
@@ -67,11 +92,220 @@ class CPUAffinityManager:
             logger.error(f"Erreur lors de la lecture de l'affinité CPU: {str(e)}")
             return []
     
+    @staticmethod
+    def allowed_cpus(sys_root: str = "/sys", proc_root: str = "/proc") -> List[int]:
+        """
+        CPU logiques utilisables: affinité du processus restreinte au cpuset de son cgroup.
+        
+        Args:
+            sys_root: Racine de sysfs
+            proc_root: Racine de procfs (cgroup du processus: self/cgroup)
+        
+        Returns:
+            Liste triée des IDs de CPU logiques
+        """
+        if hasattr(os, "sched_getaffinity"):
+            cpus = set(os.sched_getaffinity(0))
+        else:
+            cpus = set(CPUAffinityManager.get_cpu_affinity() or range(psutil.cpu_count() or 1))
+        
+        # cgroup v2 puis v1
+        for controller, cpuset in (("", "cpuset.cpus.effective"), ("cpuset", "cpuset.effective_cpus")):
+            text = read_sysfs(cgroup_dir(sys_root, controller, proc_root) / cpuset)
+            if text:
+                cpus &= _parse_cpu_list(text)
+                break
+        return sorted(cpus)
+    
+    @staticmethod
+    def cpu_quota(sys_root: str = "/sys", proc_root: str = "/proc") -> Optional[float]:
+        """
+        Quota CPU du cgroup du processus (CFS), en nombre de CPU.
+        
+        Args:
+            sys_root: Racine de sysfs
+            proc_root: Racine de procfs (cgroup du processus: self/cgroup)
+        
+        Returns:
+            Nombre de CPU autorisés (ex: 2.5), ou None sans quota
+        """
+        # cgroup v2: "quota période" ou "max période"
+        text = read_sysfs(cgroup_dir(sys_root, proc_root=proc_root) / "cpu.max")
+        if text:
+            quota, _, period = text.partition(" ")
+            if quota != "max" and period:
+                return int(quota) / int(period)
+            return None
+        
+        # cgroup v1: quota -1 = illimité
+        cgroup = cgroup_dir(sys_root, "cpu", proc_root)
+        quota = read_sysfs(cgroup / "cpu.cfs_quota_us")
+        period = read_sysfs(cgroup / "cpu.cfs_period_us")
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+        return None
+    
+    @staticmethod
+    def read_topology(sys_root: str = "/sys") -> List[Dict]:
+        """
+        Topologie des CPU utilisables, lue dans /sys/devices/system/cpu.
+        Sans sysfs (Windows, macOS), chaque CPU logique est son propre cœur sur le nœud 0.
+        
+        Args:
+            sys_root: Racine de sysfs
+        
+        Returns:
+            Liste de dictionnaires (cpu, core: (package, core_id), node)
+        """
+        topology = []
+        for cpu in CPUAffinityManager.allowed_cpus(sys_root):
+            cpu_dir = Path(sys_root, "devices/system/cpu", f"cpu{cpu}")
+            package = read_sysfs(cpu_dir / "topology" / "physical_package_id")
+            core_id = read_sysfs(cpu_dir / "topology" / "core_id")
+            nodes = sorted(int(p.name[4:]) for p in cpu_dir.glob("node[0-9]*"))
+            topology.append({
+                "cpu": cpu,
+                "core": (int(package), int(core_id)) if package and core_id else (0, cpu),
+                "node": nodes[0] if nodes else 0
+            })
+        return topology
+    
+    @staticmethod
+    def plan_core_sets(
+        workers: int,
+        policy: str = "physical",
+        threads_per_worker: int = 0,
+        topology: Optional[List[Dict]] = None,
+        quota: Optional[float] = None
+    ) -> Optional[List[List[int]]]:
+        """
+        Construit les jeux de cœurs des workers d'après la topologie.
+        
+        - physical: threads_per_worker cœurs physiques par worker, un seul CPU logique
+          par cœur (les frères SMT restent libres: pas de contention sur les unités de calcul)
+        - siblings: cœurs physiques complets par worker (tous leurs CPU logiques)
+        - node: CPU logiques d'un même nœud NUMA par worker, frères SMT regroupés
+        - contiguous: tranches consécutives des CPU utilisables (ancien comportement)
+        
+        Args:
+            workers: Nombre de workers
+            policy: Politique de placement (AFFINITY_POLICIES)
+            threads_per_worker: CPU logiques par worker (0 = partage égal des CPU utilisables)
+            topology: Topologie (défaut: read_topology())
+            quota: Quota CPU du cgroup (défaut: cpu_quota())
+        
+        Returns:
+            Jeux de cœurs par worker, ou None si le plan surcharge les CPU disponibles
+        """
+        if policy not in AFFINITY_POLICIES:
+            logger.error(f"Politique de placement inconnue: {policy}")
+            return None
+        if topology is None:
+            topology = CPUAffinityManager.read_topology()
+            quota = CPUAffinityManager.cpu_quota() if quota is None else quota
+        if workers <= 0 or not topology:
+            return []
+        
+        # Cœurs physiques (CPU logiques triés), rangés par nœud puis premier CPU
+        cores = {}
+        for entry in sorted(topology, key=lambda e: e["cpu"]):
+            cores.setdefault((entry["node"], entry["core"]), []).append(entry["cpu"])
+        cores = sorted(cores.items(), key=lambda item: (item[0][0], item[1][0]))
+        
+        # CPU logiques exécutables en même temps: limités par le quota du cgroup
+        limit = len(topology) if quota is None else min(len(topology), int(quota))
+        
+        if policy == "siblings":
+            # Unité = cœur complet: threads_per_worker arrondi au cœur supérieur
+            smt = max(len(cpus) for _, cpus in cores)
+            if threads_per_worker:
+                per_worker = -(-threads_per_worker // smt)
+            else:
+                per_worker = min(len(cores), limit // smt) // workers
+            units = [cpus for _, cpus in cores]
+        elif policy == "physical":
+            per_worker = threads_per_worker or min(len(cores), limit) // workers
+            units = [[cpus[0]] for _, cpus in cores]
+        else:
+            per_worker = threads_per_worker or limit // workers
+            units = [[cpu] for _, cpus in cores for cpu in cpus]
+        
+        needed = workers * per_worker
+        if per_worker <= 0 or needed > len(units):
+            logger.error(
+                f"Plan {policy} refusé: {workers} workers × {max(per_worker, 1)} "
+                f"{'cœurs' if policy in ('physical', 'siblings') else 'CPU'} "
+                f"pour {len(units)} disponibles"
+            )
+            return None
+        
+        if policy == "node":
+            # Chaque worker dans le nœud qui a le plus de CPU libres, sans jamais le déborder
+            free = {}
+            for (node, _), cpus in cores:
+                free.setdefault(node, []).extend(cpus)
+            core_sets = []
+            for _ in range(workers):
+                node = max(free, key=lambda n: len(free[n]))
+                if len(free[node]) < per_worker:
+                    logger.error(f"Plan node refusé: aucun nœud NUMA n'a {per_worker} CPU libres")
+                    return None
+                core_sets.append(free[node][:per_worker])
+                free[node] = free[node][per_worker:]
+        else:
+            core_sets = [
+                [cpu for unit in units[i * per_worker:(i + 1) * per_worker] for cpu in unit]
+                for i in range(workers)
+            ]
+        
+        if not CPUAffinityManager.check_core_sets(core_sets, topology, quota):
+            return None
+        logger.info(f"Plan d'affinité {policy}: {workers} workers × {len(core_sets[0])} CPU logiques")
+        return core_sets
+    
+    @staticmethod
+    def check_core_sets(
+        core_sets: List[List[int]],
+        topology: Optional[List[Dict]] = None,
+        quota: Optional[float] = None
+    ) -> bool:
+        """
+        Vérifie qu'un plan ne surcharge pas la machine: CPU hors du cpuset,
+        CPU partagé entre workers ou total de threads au-delà du quota cgroup.
+        
+        Args:
+            core_sets: Jeux de cœurs par worker
+            topology: Topologie (défaut: read_topology())
+            quota: Quota CPU du cgroup (défaut: cpu_quota())
+        
+        Returns:
+            True si le plan est acceptable
+        """
+        if topology is None:
+            topology = CPUAffinityManager.read_topology()
+            quota = CPUAffinityManager.cpu_quota() if quota is None else quota
+        allowed = {entry["cpu"] for entry in topology}
+        used = [cpu for core_set in core_sets for cpu in core_set]
+        
+        outside = sorted(set(used) - allowed)
+        if outside:
+            logger.error(f"Plan refusé: CPU {outside} hors du cpuset autorisé")
+            return False
+        shared = sorted({cpu for cpu in used if used.count(cpu) > 1})
+        if shared:
+            logger.error(f"Plan refusé: CPU {shared} attribués à plusieurs workers")
+            return False
+        if quota is not None and len(used) > quota:
+            logger.error(f"Plan refusé: {len(used)} threads pour un quota cgroup de {quota:g} CPU")
+            return False
+        return True
+    
     @staticmethod
     def glouton_n_listes(objets: List[Audio], n: int, max_per_list: int = 0) -> List[List[Audio]]:
         """
         Algorithme glouton pour répartir n objets dans n listes de manière équilibrée.
-        Place chaque objet dans la liste avec la plus petite somme actuelle.
+        Place chaque objet dans la liste avec la plus petite somme actuelle
+        (LPT sur la durée audio, tas des listes: voir core.scheduling).
         
         Réutilisé depuis WhisperTranscriptor.py
         
@@ -87,33 +321,10 @@ class CPUAffinityManager:
             logger.warning(f"Répartition impossible: {len(objets)} objets, {n} listes")
             return [[] for _ in range(n)]
         
-        # Trier par durée décroissante
-        objets_tries = sorted(objets, key=lambda x: x.duree, reverse=True)
-        
-        # Initialiser n listes vides avec leurs sommes
-        listes = [[] for _ in range(n)]
-        sommes = [0] * n
-        
-        # Répartir chaque objet dans la liste avec la plus petite somme
-        for objet in objets_tries:
-            # Trouver l'index de la liste avec la somme minimale
-            # en respectant la limite max_per_list si définie
-            if max_per_list > 0:
-                # Filtrer les listes qui n'ont pas atteint la limite
-                indices_disponibles = [i for i in range(n) if len(listes[i]) < max_per_list]
-                if not indices_disponibles:
-                    logger.warning(
-                        f"Toutes les listes ont atteint la limite de {max_per_list} fichiers. "
-                        f"{len(objets_tries) - sum(len(l) for l in listes)} fichiers non assignés."
-                    )
-                    break
-                index_min = min(indices_disponibles, key=lambda i: sommes[i])
-            else:
-                index_min = sommes.index(min(sommes))
-            
-            # Ajouter l'objet à cette liste
-            listes[index_min].append(objet)
-            sommes[index_min] += objet.duree
+        # Chaque objet, par durée décroissante, va à la liste de plus petite somme
+        # (listes pleines retirées du tas si max_per_list est défini)
+        listes = lpt(objets, n, lambda x: x.duree, max_per_list)
+        sommes = [sum(objet.duree for objet in liste) for liste in listes]
         
         # Log des statistiques de répartition
         for i, (liste, somme) in enumerate(zip(listes, sommes)):
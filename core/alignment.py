@@ -0,0 +1,361 @@
+"""
+Station TV - Word Alignment
+Alignement par mot différé: le décodage produit d'abord les segments (SRT/TXT
+disponibles immédiatement) et dépose un travail d'alignement; l'alignement
+(attention croisée + DTW de whisper.timing) est exécuté plus tard, dans un
+pool de processus séparé, pour tous les fichiers ou seulement ceux demandés
+par le traitement MNER en aval.
+"""
+
+import json
+import os
+import time
+import numpy as np
+import torch
+import whisper
+from multiprocessing import Process, Queue
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.affinity import CPUAffinityManager
+from utils.logger import get_logger
+from utils.processes import gather_results, stop_processes
+
+logger = get_logger(__name__)
+
+
+class WordAligner:
+    """
+    Alignement par mot de segments Whisper déjà décodés.
+    
+    Les segments consécutifs sont regroupés en fenêtres d'au plus 30 s du
+    fichier d'origine; chaque fenêtre est alignée d'une seule passe du
+    décodeur sur ses tokens de texte. Le regroupement repose sur les
+    horodatages des segments: il reste valable après la VAD, le découpage
+    ou la cascade, qui recalent ces horodatages sur le fichier.
+    """
+    
+    def __init__(self, model_manager, language: str = "fr"):
+        """
+        Initialise l'aligneur.
+        
+        Args:
+            model_manager: Gestionnaire de modèles (core.models.ModelManager)
+            language: Langue de transcription
+        """
+        self.model_manager = model_manager
+        self.language = language
+    
+    @staticmethod
+    def group_segments(segments: List[Dict], window_s: float = 30.0) -> List[List[Dict]]:
+        """
+        Regroupe les segments alignables en fenêtres d'au plus window_s secondes.
+        
+        Args:
+            segments: Segments (start, end, tokens), dans l'ordre chronologique
+            window_s: Durée maximale d'une fenêtre (secondes)
+        
+        Returns:
+            Liste de groupes de segments
+        """
+        groups = []
+        for segment in segments:
+            if not segment.get("tokens") or segment["end"] <= segment["start"]:
+                continue
+            if groups and segment["end"] - groups[-1][0]["start"] <= window_s:
+                groups[-1].append(segment)
+            else:
+                groups.append([segment])
+        return groups
+    
+    def align(
+        self,
+        model: whisper.Whisper,
+        segments: List[Dict],
+        audio: np.ndarray,
+        language: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Ajoute les horodatages par mot à des segments.
+        
+        Args:
+            model: Modèle Whisper PyTorch
+            segments: Segments du résultat (start, end, text, tokens)
+            audio: Signal PCM 16 kHz du fichier d'origine
+            language: Langue détectée au décodage (défaut: langue configurée)
+        
+        Returns:
+            Segments avec une clé 'words' (horodatages du fichier d'origine)
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language=language or self.language,
+            task="transcribe"
+        )
+        aligned = {}
+        last_speech = 0.0
+        
+        for group in self.group_segments(segments, whisper.audio.CHUNK_LENGTH):
+            begin = group[0]["start"]
+            samples = audio[int(begin * sample_rate):int(group[-1]["end"] * sample_rate)]
+            mel = whisper.log_mel_spectrogram(samples, model.dims.n_mels, padding=whisper.audio.N_SAMPLES)
+            num_frames = min(whisper.audio.N_FRAMES, mel.shape[-1] - whisper.audio.N_FRAMES)
+            mel = whisper.audio.pad_or_trim(mel[:, :num_frames], whisper.audio.N_FRAMES).to(model.device)
+            
+            # Horodatages relatifs à la fenêtre (seek 0), recalés ensuite sur le fichier
+            window = [
+                dict(segment, seek=0, start=segment["start"] - begin, end=segment["end"] - begin)
+                for segment in group
+            ]
+            with torch.inference_mode():
+                whisper.timing.add_word_timestamps(
+                    segments=window,
+                    model=model,
+                    tokenizer=tokenizer,
+                    mel=mel,
+                    num_frames=num_frames,
+                    last_speech_timestamp=max(0.0, last_speech - begin)
+                )
+            
+            for original, segment in zip(group, window):
+                words = [
+                    dict(word, start=word["start"] + begin, end=word["end"] + begin)
+                    for word in segment.get("words", [])
+                ]
+                aligned[id(original)] = words
+                if words:
+                    last_speech = words[-1]["end"]
+        
+        return [dict(segment, words=aligned.get(id(segment), [])) for segment in segments]
+    
+    @staticmethod
+    def job_path(alignment_dir: str, audio_file: str) -> Path:
+        """
+        Retourne le chemin du travail d'alignement d'un fichier audio.
+        
+        Args:
+            alignment_dir: Répertoire des travaux en attente
+            audio_file: Chemin du fichier audio
+        
+        Returns:
+            Chemin du fichier JSON du travail ({chaîne}_{nom}.json)
+        """
+        audio_file = Path(audio_file)
+        return Path(alignment_dir) / f"{audio_file.parent.name}_{audio_file.stem}.json"
+    
+    @classmethod
+    def write_job(
+        cls,
+        alignment_dir: str,
+        audio_file: str,
+        result: Dict,
+        model_name: str,
+        words_file: str
+    ) -> bool:
+        """
+        Dépose un travail d'alignement (segments et tokens du décodage).
+        
+        Args:
+            alignment_dir: Répertoire des travaux en attente
+            audio_file: Chemin du fichier audio
+            result: Résultat de la transcription (segments avec tokens)
+            model_name: Modèle utilisé pour le décodage
+            words_file: Fichier de sortie des horodatages par mot
+        
+        Returns:
+            True si succès, False sinon
+        """
+        segments = [
+            {key: segment[key] for key in ("id", "start", "end", "text", "tokens") if key in segment}
+            for segment in result.get("segments", [])
+        ]
+        if not any(segment.get("tokens") for segment in segments):
+            logger.warning(f"Alignement différé impossible pour {audio_file}: segments sans tokens")
+            return True
+        
+        try:
+            path = cls.job_path(alignment_dir, audio_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            job = {
+                "audio_file": str(audio_file),
+                "model": model_name,
+                "language": result.get("language"),
+                "words_file": str(words_file),
+                "segments": segments
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False)
+            logger.info(f"Travail d'alignement déposé: {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture du travail d'alignement: {str(e)}")
+            return False
+    
+    @staticmethod
+    def write_words(segments: List[Dict], output_file: str) -> bool:
+        """
+        Écrit les horodatages par mot (JSON: segments et leurs mots).
+        
+        Args:
+            segments: Segments avec une clé 'words'
+            output_file: Chemin du fichier de sortie
+        
+        Returns:
+            True si succès, False sinon
+        """
+        try:
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            content = [
+                {
+                    "id": segment.get("id", index),
+                    "start": segment["start"],
+                    "end": segment["end"],
+                    "text": segment["text"].strip(),
+                    "words": [
+                        {
+                            "word": word["word"],
+                            "start": word["start"],
+                            "end": word["end"],
+                            "probability": word.get("probability")
+                        }
+                        for word in segment.get("words", [])
+                    ]
+                }
+                for index, segment in enumerate(segments)
+            ]
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(content, f, ensure_ascii=False, indent=1)
+            logger.info(f"Fichier d'horodatage par mot créé: {output_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de la création du fichier d'horodatage par mot: {str(e)}")
+            return False
+    
+    def process_job(self, job_file: str, load_audio, num_threads: int) -> bool:
+        """
+        Exécute un travail d'alignement et le retire de la file en cas de succès.
+        
+        Args:
+            job_file: Chemin du travail (JSON)
+            load_audio: Fonction chemin -> signal PCM 16 kHz
+            num_threads: Threads d'inférence
+        
+        Returns:
+            True si succès, False sinon
+        """
+        try:
+            with open(job_file, "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except Exception as e:
+            logger.error(f"Travail d'alignement illisible {job_file}: {str(e)}")
+            return False
+        
+        torch.set_num_threads(num_threads)
+        model = self.model_manager.load_model(job["model"])
+        if model is None:
+            logger.error(f"Impossible de charger le modèle {job['model']}")
+            return False
+        
+        try:
+            start_time = time.time()
+            segments = self.align(model, job["segments"], load_audio(job["audio_file"]), job.get("language"))
+            if not self.write_words(segments, job["words_file"]):
+                return False
+            os.remove(job_file)
+            logger.info(f"Alignement de {job['audio_file']} terminé en {time.time() - start_time:.2f}s")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'alignement de {job['audio_file']}: {str(e)}")
+            return False
+        finally:
+            self.model_manager.release_model(model)
+    
+    @classmethod
+    def pending_jobs(cls, alignment_dir: str, audio_files: Optional[List[str]] = None) -> List[Path]:
+        """
+        Liste les travaux en attente, éventuellement restreints à des fichiers demandés.
+        
+        Args:
+            alignment_dir: Répertoire des travaux en attente
+            audio_files: Fichiers audio demandés (None: tous les travaux)
+        
+        Returns:
+            Chemins des travaux, triés
+        """
+        if audio_files is None:
+            return sorted(Path(alignment_dir).glob("*.json"))
+        jobs = [cls.job_path(alignment_dir, audio_file) for audio_file in audio_files]
+        missing = [str(job) for job in jobs if not job.exists()]
+        if missing:
+            logger.warning(f"{len(missing)} fichiers demandés sans travail d'alignement en attente")
+        return [job for job in jobs if job.exists()]
+
+
+def _align_on_cores(config: dict, cpu_cores: List[int], job_queue: Queue, result_queue: Queue):
+    """
+    Processus d'alignement épinglé sur un jeu de cœurs.
+    Traite les travaux de la file jusqu'à recevoir None.
+    
+    Args:
+        config: Configuration
+        cpu_cores: Cœurs CPU de ce processus
+        job_queue: File de chemins de travaux
+        result_queue: File de (travail, succès, temps de traitement)
+    """
+    # Import local: core.transcription importe ce module
+    from core.transcription import WhisperTranscriber
+    
+    CPUAffinityManager.set_cpu_affinity(cpu_cores)
+    transcriber = WhisperTranscriber(config)
+    aligner = WordAligner(transcriber.model_manager, transcriber.language)
+    num_threads = config.get('num_threads', len(cpu_cores))
+    
+    while True:
+        job_file = job_queue.get()
+        if job_file is None:
+            break
+        start_time = time.time()
+        success = aligner.process_job(job_file, transcriber.load_audio, num_threads)
+        result_queue.put((job_file, success, time.time() - start_time))
+
+
+def run_alignment_pool(config: dict, job_files: List[Path], core_sets: List[List[int]]) -> Dict[str, bool]:
+    """
+    Exécute des travaux d'alignement dans un pool de processus (un par jeu de cœurs).
+    
+    Args:
+        config: Configuration
+        job_files: Travaux à exécuter
+        core_sets: Jeux de cœurs CPU (un processus par jeu)
+    
+    Returns:
+        Dictionnaire travail -> succès (échec pour les travaux sans réponse si un processus est mort)
+    """
+    nb_workers = min(len(core_sets), len(job_files))
+    if nb_workers == 0:
+        return {}
+    logger.info(f"Alignement par mot de {len(job_files)} fichiers sur {nb_workers} processus")
+    
+    job_queue = Queue()
+    result_queue = Queue()
+    for job_file in job_files:
+        job_queue.put(str(job_file))
+    for _ in range(nb_workers):
+        job_queue.put(None)
+    
+    processes = []
+    for cores in core_sets[:nb_workers]:
+        p = Process(target=_align_on_cores, args=(config, cores, job_queue, result_queue))
+        p.start()
+        processes.append(p)
+    
+    # Attente bornée: un processus tué (OOM) ne bloque pas le lancement
+    results = {str(job_file): False for job_file in job_files}
+    for job_file, success, elapsed in gather_results(result_queue, len(job_files), processes) or []:
+        results[job_file] = success
+    stop_processes(processes)
+    
+    logger.info(f"Alignement terminé: {sum(results.values())}/{len(results)} fichiers")
+    return results
@@ -0,0 +1,369 @@
+"""
+Station TV - Autotune
+Balayage processus × threads sur un échantillon représentatif, ajustement
+d'une courbe de débit (loi d'Amdahl par processus, contention partagée entre
+processus) et profil machine lu par RunBatchWhisper (max_parallel_processes,
+num_threads, politique d'affinité).
+"""
+
+import math
+import platform
+import time
+from datetime import datetime
+from multiprocessing import Event, Process, Queue
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from utils.logger import get_logger
+from utils.processes import gather_results, stop_processes
+
+logger = get_logger(__name__)
+
+# Fréquence du PCM décodé par Whisper
+SAMPLE_RATE = 16000
+
+
+def candidate_layouts(
+    cpus: int,
+    max_workers: int = 0,
+    thread_counts: Optional[Sequence[int]] = None
+) -> List[Tuple[int, int]]:
+    """
+    Dispositions (processus, threads) à mesurer: puissances de 2 et disposition
+    saturant les CPU, sans dépasser le nombre de CPU.
+    
+    Args:
+        cpus: CPU logiques utilisables
+        max_workers: Nombre max de processus (mémoire; 0 = illimité)
+        thread_counts: Threads par processus à essayer (défaut: 1, 2, 4, ...)
+    
+    Returns:
+        Liste de (processus, threads) triée
+    """
+    thread_counts = thread_counts or [2 ** i for i in range(int(math.log2(max(cpus, 1))) + 1)]
+    layouts = set()
+    for threads in thread_counts:
+        if threads > cpus:
+            continue
+        limit = cpus // threads
+        if max_workers > 0:
+            limit = min(limit, max_workers)
+        workers = {2 ** i for i in range(int(math.log2(limit)) + 1)} | {limit}
+        layouts.update((w, threads) for w in workers)
+    return sorted(layouts)
+
+
+def throughput_model(workers, threads, a: float, p: float, beta: float):
+    """
+    Débit total (× temps réel) de workers processus à threads threads:
+    a × workers × accélération d'Amdahl(threads) / (1 + beta × (CPU occupés - 1)).
+    
+    Args:
+        workers: Nombre de processus (scalaire ou tableau)
+        threads: Threads par processus (scalaire ou tableau)
+        a: Débit d'un processus mono-thread sans contention
+        p: Part parallélisable du calcul d'un processus
+        beta: Contention par CPU occupé supplémentaire (bande passante mémoire, caches)
+    
+    Returns:
+        Débit total prédit
+    """
+    workers = np.asarray(workers, dtype=float)
+    threads = np.asarray(threads, dtype=float)
+    speedup = 1.0 / ((1.0 - p) + p / threads)
+    return a * workers * speedup / (1.0 + beta * (workers * threads - 1.0))
+
+
+def fit_throughput(measurements: Sequence[Dict]) -> Optional[Dict]:
+    """
+    Ajuste throughput_model aux mesures (moindres carrés sur le logarithme,
+    recherche sur grille de p et beta, a en forme close).
+    
+    Args:
+        measurements: Mesures (workers, threads, throughput)
+    
+    Returns:
+        Dictionnaire (a, p, beta, rmse_log), ou None avec moins de 3 mesures
+    """
+    points = [m for m in measurements if m["throughput"] > 0]
+    if len(points) < 3:
+        logger.warning(f"Ajustement impossible: {len(points)} mesures valides (3 minimum)")
+        return None
+    
+    workers = np.array([m["workers"] for m in points], dtype=float)
+    threads = np.array([m["threads"] for m in points], dtype=float)
+    observed = np.log([m["throughput"] for m in points])
+    
+    ps = np.linspace(0.0, 1.0, 101)[:, None, None]
+    betas = np.concatenate([[0.0], np.geomspace(1e-4, 1.0, 80)])[None, :, None]
+    # log T - log a pour chaque (p, beta, mesure)
+    shape = (
+        np.log(workers) - np.log((1.0 - ps) + ps / threads)
+        - np.log(1.0 + betas * (workers * threads - 1.0))
+    )
+    log_a = (observed - shape).mean(axis=2, keepdims=True)
+    errors = ((observed - shape - log_a) ** 2).mean(axis=2)
+    i, j = np.unravel_index(np.argmin(errors), errors.shape)
+    return {
+        "a": float(np.exp(log_a[i, j, 0])),
+        "p": float(ps[i, 0, 0]),
+        "beta": float(betas[0, j, 0]),
+        "rmse_log": float(np.sqrt(errors[i, j]))
+    }
+
+
+def recommend(fit: Dict, cpus: int, max_workers: int = 0) -> Dict:
+    """
+    Disposition de débit prédit maximal parmi toutes celles qui tiennent dans les CPU.
+    
+    Args:
+        fit: Paramètres ajustés (fit_throughput)
+        cpus: CPU logiques utilisables
+        max_workers: Nombre max de processus (0 = illimité)
+    
+    Returns:
+        Dictionnaire (workers, threads, throughput)
+    """
+    best = None
+    for threads in range(1, cpus + 1):
+        limit = cpus // threads
+        if max_workers > 0:
+            limit = min(limit, max_workers)
+        for workers in range(1, limit + 1):
+            throughput = float(throughput_model(workers, threads, fit["a"], fit["p"], fit["beta"]))
+            # À débit égal (1%), la disposition à moins de processus (moins de RAM)
+            if best is None or throughput > best["throughput"] * 1.01 or (
+                throughput >= best["throughput"] * 0.99 and workers < best["workers"]
+            ):
+                best = {"workers": workers, "threads": threads, "throughput": throughput}
+    return best
+
+
+def _autotune_worker(
+    config: dict,
+    cpu_cores: List[int],
+    samples: List[Tuple[str, int]],
+    ready: Queue,
+    start: Event,
+    result_queue: Queue
+):
+    """
+    Processus de mesure: charge le modèle et l'audio, attend le départ commun,
+    puis transcrit l'échantillon.
+    
+    Args:
+        config: Configuration (modèle et num_threads de la disposition)
+        cpu_cores: Cœurs CPU du processus
+        samples: (fichier, nombre d'échantillons PCM à garder)
+        ready: File de signalement "prêt" (False si le modèle ou l'audio n'a pas pu être chargé)
+        start: Départ commun des processus
+        result_queue: File de (succès, secondes d'audio transcrites)
+    """
+    # Import local: le modèle n'est chargé que dans les processus de mesure
+    from core.transcription import WhisperTranscriber
+    
+    try:
+        transcriber = WhisperTranscriber(config)
+        if transcriber.backend.load(transcriber.model_name, config['num_threads']) is None:
+            raise RuntimeError(f"modèle {transcriber.model_name} non chargé")
+        audios = [transcriber.load_audio(path)[:length] for path, length in samples]
+    except Exception as e:
+        logger.error(f"Processus de mesure {cpu_cores}: {str(e)}")
+        ready.put(False)
+        return
+    ready.put(True)
+    start.wait()
+    
+    success = True
+    for (path, _), audio in zip(samples, audios):
+        result = transcriber.transcribe_on_specific_cores(path, cpu_cores, audio=audio)
+        success = success and result is not None
+    result_queue.put((success, sum(len(audio) for audio in audios) / SAMPLE_RATE))
+    transcriber.backend.unload_all()
+
+
+def measure_layout(
+    config: dict,
+    samples: List[Tuple[str, int]],
+    core_sets: List[List[int]],
+    threads: int,
+    timeout_s: float = 0.0
+) -> Optional[Dict]:
+    """
+    Mesure le débit total de len(core_sets) processus transcrivant chacun
+    l'échantillon en même temps (modèles chargés avant le chronomètre).
+    
+    Args:
+        config: Configuration
+        samples: (fichier, nombre d'échantillons PCM à garder)
+        core_sets: Jeux de cœurs (un processus par jeu)
+        threads: Threads d'inférence par processus
+        timeout_s: Durée maximale de la mesure, chargement compris (0 = sans limite)
+    
+    Returns:
+        Dictionnaire (workers, threads, wall_s, audio_s, throughput), ou None en cas d'échec
+    """
+    whisper_config = config.get('whisper', {})
+    # Modèle gardé en cache: on mesure l'inférence, pas le chargement
+    trial_config = dict(
+        config,
+        num_threads=threads,
+        whisper=dict(whisper_config, model_cache_gb=max(whisper_config.get('model_cache_gb', 0), 1))
+    )
+    ready, result_queue, start = Queue(), Queue(), Event()
+    processes = [
+        Process(target=_autotune_worker, args=(trial_config, cores, samples, ready, start, result_queue))
+        for cores in core_sets
+    ]
+    deadline = time.time() + timeout_s if timeout_s > 0 else 0.0
+    for p in processes:
+        p.start()
+    
+    results = None
+    readies = gather_results(ready, len(processes), processes, deadline)
+    if readies is not None and all(readies):
+        start_time = time.time()
+        start.set()
+        results = gather_results(result_queue, len(processes), processes, deadline)
+        wall_s = time.time() - start_time
+    
+    if results is None:
+        # Processus restants (en attente du départ ou encore en mesure) arrêtés
+        stop_processes(processes)
+        logger.error(f"Mesure échouée: {len(core_sets)} processus × {threads} threads")
+        return None
+    for p in processes:
+        p.join()
+    
+    if not all(success for success, _ in results) or wall_s <= 0:
+        logger.error(f"Mesure échouée: {len(core_sets)} processus × {threads} threads")
+        return None
+    audio_s = sum(audio_s for _, audio_s in results)
+    return {
+        "workers": len(core_sets),
+        "threads": threads,
+        "wall_s": wall_s,
+        "audio_s": audio_s,
+        "throughput": audio_s / wall_s
+    }
+
+
+def layout_policy(workers: int, threads: int, topology: List[Dict]) -> str:
+    """
+    Politique d'affinité d'une disposition: cœurs physiques distincts si elle
+    tient sans frères SMT, sinon CPU regroupés par nœud NUMA.
+    
+    Args:
+        workers: Nombre de processus
+        threads: Threads par processus
+        topology: Topologie (CPUAffinityManager.read_topology)
+    
+    Returns:
+        "physical" ou "node"
+    """
+    physical_cores = len({(entry["node"], entry["core"]) for entry in topology})
+    return "physical" if workers * threads <= physical_cores else "node"
+
+
+def write_profile(path: str, profile: Dict) -> bool:
+    """
+    Écrit le profil machine (YAML).
+    
+    Args:
+        path: Fichier du profil
+        profile: Profil (voir build_profile)
+    
+    Returns:
+        True si succès, False sinon
+    """
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(profile, f, allow_unicode=True, sort_keys=False)
+        logger.info(f"Profil machine écrit dans {path}")
+        return True
+    except Exception as e:
+        logger.error(f"Erreur lors de l'écriture du profil machine: {str(e)}")
+        return False
+
+
+def build_profile(
+    model: str,
+    measurements: List[Dict],
+    fit: Optional[Dict],
+    topology: List[Dict],
+    max_workers: int = 0
+) -> Optional[Dict]:
+    """
+    Construit le profil machine: disposition recommandée par la courbe ajustée
+    (ou meilleure mesure si l'ajustement est impossible).
+    
+    Args:
+        model: Modèle Whisper mesuré
+        measurements: Mesures du balayage
+        fit: Paramètres ajustés (ou None)
+        topology: Topologie des CPU utilisables
+        max_workers: Nombre max de processus (0 = illimité)
+    
+    Returns:
+        Profil, ou None sans mesure
+    """
+    if not measurements:
+        return None
+    measured_best = max(measurements, key=lambda m: m["throughput"])
+    best = recommend(fit, len(topology), max_workers) if fit else measured_best
+    return {
+        "machine": platform.node(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "model": model,
+        "cpus": len(topology),
+        "max_parallel_processes": best["workers"],
+        "num_threads": best["threads"],
+        "affinity_policy": layout_policy(best["workers"], best["threads"], topology),
+        "predicted_throughput": round(float(best["throughput"]), 3),
+        "measured_best": {k: measured_best[k] for k in ("workers", "threads", "throughput")},
+        "fit": fit,
+        "measurements": measurements
+    }
+
+
+def apply_profile(config: dict, path: str) -> dict:
+    """
+    Applique un profil machine à la configuration, s'il a été mesuré pour le modèle configuré.
+    
+    Args:
+        config: Configuration
+        path: Fichier du profil
+    
+    Returns:
+        Configuration mise à jour (inchangée si le profil est absent ou d'un autre modèle)
+    """
+    if not Path(path).exists():
+        return config
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture du profil machine {path}: {str(e)}")
+        return config
+    
+    model = config.get('whisper', {}).get('model')
+    if profile.get('model') != model:
+        logger.warning(f"Profil machine {path} mesuré pour {profile.get('model')}, pas pour {model}: ignoré")
+        return config
+    
+    logger.info(
+        f"Profil machine {path}: {profile['max_parallel_processes']} processus × "
+        f"{profile['num_threads']} threads ({profile['affinity_policy']}), "
+        f"{profile.get('predicted_throughput', 0):.2f}× temps réel prédit"
+    )
+    hardware = dict(
+        config.get('hardware', {}),
+        max_parallel_processes=profile['max_parallel_processes'],
+        affinity_policy=profile['affinity_policy'],
+        threads_per_process=profile['num_threads']
+    )
+    return dict(config, hardware=hardware, num_threads=profile['num_threads'])
@@ -0,0 +1,430 @@
+"""
+Station TV - Transcription Backends
+Moteurs d'inférence interchangeables derrière WhisperTranscriber:
+Whisper PyTorch de référence, CTranslate2 int8 (faster-whisper) et ONNX Runtime.
+Tous rendent le format de résultat de model.transcribe (text, segments, words, language).
+"""
+
+import importlib
+import numpy as np
+import torch
+import whisper
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    from faster_whisper import WhisperModel as CT2WhisperModel
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    from transformers import AutoProcessor, pipeline
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+from core.decoding import resolve_profile
+from core.models import ModelManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@contextmanager
+def precomputed_mel(mel: torch.Tensor):
+    """
+    Fait utiliser à model.transcribe un log-mel déjà calculé (cache de features)
+    au lieu de recalculer le spectrogramme depuis le signal.
+    
+    model.transcribe n'accepte que du PCM: la fonction log_mel_spectrogram
+    du module whisper.transcribe est remplacée le temps de l'appel.
+    
+    Args:
+        mel: Log-mel complet (padding de 30 s inclus)
+    """
+    # whisper.transcribe désigne la fonction: passer par le module
+    transcribe_module = importlib.import_module("whisper.transcribe")
+    original = transcribe_module.log_mel_spectrogram
+    transcribe_module.log_mel_spectrogram = lambda *args, **kwargs: mel
+    try:
+        yield
+    finally:
+        transcribe_module.log_mel_spectrogram = original
+
+
+class TranscriptionBackend(ABC):
+    """
+    Interface commune des moteurs d'inférence.
+    """
+    
+    name = "base"
+    
+    # Le moteur accepte-t-il un log-mel précalculé (features Whisper de référence)
+    supports_mel = False
+    
+    def __init__(self, model_manager: ModelManager, config: dict):
+        """
+        Initialise le moteur.
+        
+        Args:
+            model_manager: Gestionnaire de modèles (cache, suffixes, device)
+            config: Configuration
+        """
+        self.model_manager = model_manager
+        self.config = config
+        self.models_dir = Path(config.get('whisper', {}).get('backend_models_dir', 'models'))
+        # Profil de décodage (whisper.decoding_profile): faisceau, replis, conditionnement
+        self.profile, self.decode_options = resolve_profile(config)
+    
+    @abstractmethod
+    def load(self, model_name: str, num_threads: int):
+        """
+        Charge un modèle pour ce moteur.
+        
+        Args:
+            model_name: Nom du modèle Whisper (tiny, base, small, ...)
+            num_threads: Threads d'inférence
+        
+        Returns:
+            Modèle chargé ou None en cas d'erreur
+        """
+    
+    @abstractmethod
+    def transcribe(
+        self,
+        model,
+        audio: Union[str, np.ndarray],
+        language: str,
+        word_timestamps: bool,
+        mel: Optional[torch.Tensor] = None
+    ) -> Dict:
+        """
+        Transcrit un fichier ou un signal PCM 16 kHz.
+        
+        Args:
+            model: Modèle obtenu via load
+            audio: Chemin du fichier ou signal PCM 16 kHz
+            language: Langue de transcription
+            word_timestamps: Horodatage au niveau des mots
+            mel: Log-mel précalculé (utilisé si le moteur le supporte)
+        
+        Returns:
+            Résultat au format de model.transcribe
+        """
+    
+    @abstractmethod
+    def release(self, model):
+        """Rend un modèle après usage (conservé si le cache de modèles est actif)."""
+    
+    def unload_all(self):
+        """Décharge tous les modèles du moteur."""
+        self.model_manager.unload_all()
+
+
+class PyTorchBackend(TranscriptionBackend):
+    """
+    Whisper de référence (openai-whisper, PyTorch FP32).
+    """
+    
+    name = "pytorch"
+    supports_mel = True
+    
+    def load(self, model_name: str, num_threads: int):
+        torch.set_num_threads(num_threads)
+        model = self.model_manager.load_model(model_name)
+        if model is not None:
+            # Mode évaluation : désactive dropout et batchnorm tracking
+            model.eval()
+        return model
+    
+    def transcribe(self, model, audio, language, word_timestamps, mel=None):
+        # inference_mode() est plus agressif que no_grad() :
+        # désactive les version counters et le view tracking
+        with torch.inference_mode():
+            if mel is not None:
+                with precomputed_mel(mel):
+                    return model.transcribe(
+                        audio, language=language, word_timestamps=word_timestamps, **self.decode_options
+                    )
+            return model.transcribe(audio, language=language, word_timestamps=word_timestamps, **self.decode_options)
+    
+    def release(self, model):
+        self.model_manager.release_model(model)
+
+
+class _CachedBackend(TranscriptionBackend):
+    """
+    Moteur dont les modèles sont gérés hors de ModelManager:
+    conservés par (modèle, threads) si le cache de modèles est actif.
+    """
+    
+    def __init__(self, model_manager: ModelManager, config: dict):
+        super().__init__(model_manager, config)
+        self._models: Dict[tuple, object] = {}
+    
+    def load(self, model_name: str, num_threads: int):
+        key = (model_name, num_threads)
+        if key in self._models:
+            self.model_manager.cache_stats["hits"] += 1
+            logger.info(f"Modèle {model_name} ({self.name}) réutilisé depuis le cache")
+            return self._models[key]
+        
+        try:
+            logger.info(f"Chargement du modèle {model_name} ({self.name}, {num_threads} threads)...")
+            model = self._load(model_name, num_threads)
+            self.model_manager.cache_stats["loads"] += 1
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement du modèle {model_name} ({self.name}): {str(e)}")
+            return None
+        
+        if self.model_manager.cache_enabled:
+            self._models[key] = model
+        return model
+    
+    @abstractmethod
+    def _load(self, model_name: str, num_threads: int):
+        """Construit le modèle du moteur (exceptions gérées par load)."""
+    
+    def release(self, model):
+        if not any(m is model for m in self._models.values()):
+            del model
+    
+    def unload_all(self):
+        self._models.clear()
+        super().unload_all()
+
+
+class CTranslate2Backend(_CachedBackend):
+    """
+    CTranslate2 via faster-whisper, poids quantifiés int8 sur CPU.
+    """
+    
+    name = "ctranslate2"
+    
+    def _load(self, model_name: str, num_threads: int):
+        return CT2WhisperModel(
+            model_name,
+            device="cpu",
+            compute_type=self.config.get('whisper', {}).get('compute_type', 'int8'),
+            cpu_threads=num_threads,
+            num_workers=1,
+            download_root=str(self.models_dir / "ctranslate2")
+        )
+    
+    def transcribe(self, model, audio, language, word_timestamps, mel=None):
+        # Profil de décodage traduit dans les paramètres de faster-whisper
+        options = self.decode_options
+        segments_iter, info = model.transcribe(
+            audio,
+            language=language,
+            beam_size=options["beam_size"] or 1,
+            best_of=options["best_of"] or 1,
+            patience=options["patience"] or 1.0,
+            temperature=list(options["temperature"]),
+            condition_on_previous_text=options["condition_on_previous_text"],
+            word_timestamps=word_timestamps
+        )
+        
+        segments = []
+        for seg in segments_iter:
+            segment = {
+                "id": len(segments),
+                "seek": seg.seek,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "tokens": list(seg.tokens),
+                "temperature": seg.temperature,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob
+            }
+            if seg.words:
+                segment["words"] = [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in seg.words
+                ]
+            segments.append(segment)
+        
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language
+        }
+
+
+class ONNXBackend(_CachedBackend):
+    """
+    ONNX Runtime via optimum (export ONNX réalisé une seule fois, conservé sur disque).
+    """
+    
+    name = "onnx"
+    
+    # Coupure des segments reconstruits à partir des mots
+    MAX_SEGMENT_S = 30.0
+    MAX_GAP_S = 1.0
+    
+    def __init__(self, model_manager: ModelManager, config: dict):
+        super().__init__(model_manager, config)
+        # Pipeline transformers: décodage glouton sans repli, segments sans
+        # avg_logprob / no_speech_prob ni tokens
+        whisper_config = config.get('whisper', {})
+        ignored = []
+        if self.profile != "greedy-fast":
+            ignored.append(f"profil de décodage {self.profile} (décodage glouton de transformers)")
+        if whisper_config.get('cascade', False):
+            ignored.append("cascade (segments sans confiance, jamais escaladés)")
+        if whisper_config.get('word_alignment', 'inline') == 'deferred':
+            ignored.append("alignement différé (segments sans tokens)")
+        if ignored:
+            logger.warning(f"Moteur onnx, sans effet: {'; '.join(ignored)}")
+    
+    def _load(self, model_name: str, num_threads: int):
+        model_id = f"openai/whisper-{model_name}"
+        export_dir = self.models_dir / "onnx" / model_name
+        
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = num_threads
+        session_options.inter_op_num_threads = 1
+        
+        if export_dir.exists():
+            model = ORTModelForSpeechSeq2Seq.from_pretrained(export_dir, session_options=session_options)
+            processor = AutoProcessor.from_pretrained(export_dir)
+        else:
+            logger.info(f"Export ONNX de {model_id} vers {export_dir}...")
+            model = ORTModelForSpeechSeq2Seq.from_pretrained(model_id, export=True, session_options=session_options)
+            processor = AutoProcessor.from_pretrained(model_id)
+            model.save_pretrained(export_dir)
+            processor.save_pretrained(export_dir)
+        
+        return pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            chunk_length_s=30,
+            device=-1
+        )
+    
+    @classmethod
+    def group_words(cls, words: List[Dict], duration: float) -> List[Dict]:
+        """
+        Regroupe des mots horodatés en segments (fin de phrase, silence
+        de plus de MAX_GAP_S ou segment de plus de MAX_SEGMENT_S).
+        
+        Args:
+            words: Mots (word, start, end; end peut valoir None pour le dernier)
+            duration: Durée de l'audio (fin par défaut)
+        
+        Returns:
+            Segments au format de model.transcribe (avec words)
+        """
+        segments = []
+        current: List[Dict] = []
+        
+        def close():
+            if current:
+                segments.append({
+                    "id": len(segments),
+                    "start": current[0]["start"],
+                    "end": current[-1]["end"],
+                    "text": "".join(w["word"] for w in current),
+                    "words": list(current)
+                })
+                current.clear()
+        
+        for word in words:
+            word = dict(word, end=word["end"] if word["end"] is not None else duration)
+            if current and (
+                word["start"] - current[-1]["end"] > cls.MAX_GAP_S
+                or word["end"] - current[0]["start"] > cls.MAX_SEGMENT_S
+            ):
+                close()
+            current.append(word)
+            if word["word"].rstrip().endswith((".", "?", "!")):
+                close()
+        close()
+        
+        return segments
+    
+    def transcribe(self, model, audio, language, word_timestamps, mel=None):
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        duration = len(audio) / whisper.audio.SAMPLE_RATE
+        
+        output = model(
+            {"raw": audio, "sampling_rate": whisper.audio.SAMPLE_RATE},
+            return_timestamps="word" if word_timestamps else True,
+            generate_kwargs={"language": language, "task": "transcribe"}
+        )
+        chunks = [
+            {
+                "word": chunk["text"],
+                "start": chunk["timestamp"][0] or 0.0,
+                "end": chunk["timestamp"][1],
+                "probability": None
+            }
+            for chunk in output.get("chunks", [])
+        ]
+        
+        if word_timestamps:
+            segments = self.group_words(chunks, duration)
+        else:
+            segments = [
+                {
+                    "id": i,
+                    "start": chunk["start"],
+                    "end": chunk["end"] if chunk["end"] is not None else duration,
+                    "text": chunk["word"]
+                }
+                for i, chunk in enumerate(chunks)
+            ]
+        
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language
+        }
+
+
+# Moteurs disponibles: nom -> (classe, dépendance installée)
+BACKENDS = {
+    "pytorch": (PyTorchBackend, True),
+    "ctranslate2": (CTranslate2Backend, CTRANSLATE2_AVAILABLE),
+    "onnx": (ONNXBackend, ONNX_AVAILABLE),
+}
+
+
+def create_backend(config: dict, model_manager: ModelManager, name: Optional[str] = None) -> TranscriptionBackend:
+    """
+    Instancie le moteur demandé (whisper.backend), avec repli sur PyTorch
+    si le nom est inconnu ou si sa dépendance n'est pas installée.
+    
+    Args:
+        config: Configuration
+        model_manager: Gestionnaire de modèles
+        name: Nom du moteur (optionnel, utilise whisper.backend)
+    
+    Returns:
+        Moteur d'inférence
+    """
+    name = name or config.get('whisper', {}).get('backend', 'pytorch')
+    
+    if name not in BACKENDS:
+        logger.error(f"Moteur inconnu: {name}. Moteurs disponibles: {list(BACKENDS.keys())}")
+        name = "pytorch"
+    
+    backend_class, available = BACKENDS[name]
+    if not available:
+        logger.warning(
+            f"Moteur {name} indisponible (dépendance non installée: "
+            f"{'faster-whisper' if name == 'ctranslate2' else 'optimum[onnxruntime]'}), repli sur pytorch"
+        )
+        backend_class = PyTorchBackend
+    
+    return backend_class(model_manager, config)
@@ -0,0 +1,220 @@
+"""
+Station TV - Batched Engine
+Inférence Whisper par lots: les fenêtres mel de 30 s de plusieurs fichiers
+courts sont empilées dans une seule passe de l'encodeur, puis décodées
+en parallèle (lockstep) par whisper.decode.
+"""
+
+import time
+import torch
+import whisper
+from typing import Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Durée d'une position de timestamp Whisper (secondes)
+TIME_PRECISION = 0.02
+
+
+class BatchedEngine:
+    """
+    Moteur de transcription par lots pour les clips courts.
+    
+    Chaque fichier est découpé en fenêtres fixes de 30 s (pas de seek dynamique
+    comme model.transcribe), décodées en glouton à température 0 sans repli.
+    Les résultats sont rendus par fichier au format de model.transcribe
+    (text, segments, language).
+    """
+    
+    def __init__(self, model: whisper.Whisper, language: str = "fr", batch_size: int = 8):
+        """
+        Initialise le moteur.
+        
+        Args:
+            model: Modèle Whisper chargé
+            language: Langue de transcription
+            batch_size: Nombre de fenêtres de 30 s par passe d'encodeur
+        """
+        self.model = model
+        self.language = language
+        self.batch_size = max(1, batch_size)
+        self.tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language=language,
+            task="transcribe"
+        )
+        self.stats = {"files": 0, "windows": 0, "batches": 0, "audio_s": 0.0, "wall_time_s": 0.0}
+        
+        logger.info(f"BatchedEngine initialisé (batch_size={self.batch_size}, langue={language})")
+    
+    def _windows(self, audio, mel: Optional[torch.Tensor] = None) -> Tuple[List[Tuple[int, torch.Tensor]], float]:
+        """
+        Découpe un signal en fenêtres mel de 30 s.
+        
+        Args:
+            audio: Signal PCM 16 kHz (ignoré si mel est fourni)
+            mel: Log-mel précalculé avec un padding de 30 s (optionnel, cache de features)
+        
+        Returns:
+            Tuple (liste de (seek en trames, mel de la fenêtre), durée en secondes)
+        """
+        n_frames = whisper.audio.N_FRAMES
+        if mel is None:
+            mel = whisper.log_mel_spectrogram(audio, self.model.dims.n_mels, padding=whisper.audio.N_SAMPLES)
+        content_frames = mel.shape[-1] - n_frames
+        duration = content_frames * whisper.audio.HOP_LENGTH / whisper.audio.SAMPLE_RATE
+        
+        windows = [
+            (seek, whisper.pad_or_trim(mel[:, seek:seek + n_frames], n_frames))
+            for seek in range(0, max(content_frames, 1), n_frames)
+        ]
+        return windows, duration
+    
+    @staticmethod
+    def tokens_to_segments(
+        tokens: List[int],
+        timestamp_begin: int,
+        offset: float,
+        window_end: float
+    ) -> List[Tuple[float, float, List[int]]]:
+        """
+        Découpe les tokens d'une fenêtre en segments selon les tokens de timestamp.
+        
+        Args:
+            tokens: Tokens décodés (sans séquence SOT ni EOT)
+            timestamp_begin: Identifiant du premier token de timestamp
+            offset: Début de la fenêtre (secondes)
+            window_end: Fin de la fenêtre dans le fichier (secondes)
+        
+        Returns:
+            Liste de (début, fin, tokens texte) en temps global
+        """
+        segments = []
+        start = None
+        text_tokens: List[int] = []
+        
+        for token in tokens:
+            if token >= timestamp_begin:
+                t = offset + (token - timestamp_begin) * TIME_PRECISION
+                if start is None:
+                    start = t
+                elif text_tokens:
+                    segments.append((start, min(t, window_end), text_tokens))
+                    text_tokens = []
+                    start = None
+                else:
+                    start = t
+            else:
+                text_tokens.append(token)
+        
+        # Texte sans timestamp de fin (ou sans timestamp du tout): jusqu'à la fin de la fenêtre
+        if text_tokens:
+            segments.append((offset if start is None else start, window_end, text_tokens))
+        
+        return segments
+    
+    def transcribe(
+        self,
+        audios: Dict[str, object],
+        mels: Optional[Dict[str, torch.Tensor]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Transcrit plusieurs fichiers en mutualisant les passes de l'encodeur.
+        
+        Args:
+            audios: Dictionnaire identifiant -> chemin ou signal PCM 16 kHz
+            mels: Log-mel précalculés par identifiant (optionnel, évite le décodage et la STFT)
+        
+        Returns:
+            Dictionnaire identifiant -> résultat (text, segments, language)
+        """
+        start_time = time.time()
+        
+        # File de fenêtres: (identifiant, seek, mel)
+        pending = []
+        durations = {}
+        for key, audio in audios.items():
+            mel = (mels or {}).get(key)
+            if mel is None and isinstance(audio, str):
+                audio = whisper.load_audio(audio)
+            windows, durations[key] = self._windows(audio, mel)
+            pending.extend((key, seek, mel) for seek, mel in windows)
+        
+        options = whisper.DecodingOptions(
+            task="transcribe",
+            language=self.language,
+            temperature=0.0,
+            without_timestamps=False,
+            fp16=False
+        )
+        
+        decoded: Dict[str, List] = {key: [] for key in audios}
+        for i in range(0, len(pending), self.batch_size):
+            batch = pending[i:i + self.batch_size]
+            mel_batch = torch.stack([mel for _, _, mel in batch]).to(self.model.device)
+            with torch.inference_mode():
+                results = whisper.decode(self.model, mel_batch, options)
+            for (key, seek, _), result in zip(batch, results):
+                decoded[key].append((seek, result))
+            self.stats["batches"] += 1
+        
+        outputs = {key: self._build_result(decoded[key], durations[key]) for key in audios}
+        
+        self.stats["files"] += len(audios)
+        self.stats["windows"] += len(pending)
+        self.stats["audio_s"] += sum(durations.values())
+        self.stats["wall_time_s"] += time.time() - start_time
+        logger.info(
+            f"Lot de {len(audios)} fichiers ({len(pending)} fenêtres) transcrit en "
+            f"{time.time() - start_time:.2f}s"
+        )
+        return outputs
+    
+    def _build_result(self, windows: List[Tuple[int, object]], duration: float) -> Dict:
+        """Assemble les fenêtres décodées d'un fichier au format de model.transcribe."""
+        segments = []
+        seconds_per_frame = whisper.audio.HOP_LENGTH / whisper.audio.SAMPLE_RATE
+        
+        for seek, result in sorted(windows, key=lambda w: w[0]):
+            # Même filtre de non-parole que model.transcribe (valeurs par défaut)
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                continue
+            offset = seek * seconds_per_frame
+            window_end = min(offset + whisper.audio.CHUNK_LENGTH, duration)
+            for start, end, text_tokens in self.tokens_to_segments(
+                result.tokens, self.tokenizer.timestamp_begin, offset, window_end
+            ):
+                text = self.tokenizer.decode(text_tokens)
+                if not text.strip():
+                    continue
+                segments.append({
+                    "id": len(segments),
+                    "seek": seek,
+                    "start": start,
+                    "end": end,
+                    "text": text,
+                    "tokens": text_tokens,
+                    "temperature": result.temperature,
+                    "avg_logprob": result.avg_logprob,
+                    "compression_ratio": result.compression_ratio,
+                    "no_speech_prob": result.no_speech_prob
+                })
+        
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": self.language
+        }
+    
+    def get_throughput(self) -> Optional[float]:
+        """
+        Retourne le débit cumulé du moteur.
+        
+        Returns:
+            Secondes d'audio par seconde de calcul, ou None si rien n'a été traité
+        """
+        if self.stats["wall_time_s"] <= 0:
+            return None
+        return self.stats["audio_s"] / self.stats["wall_time_s"]
@@ -0,0 +1,149 @@
+"""
+Station TV - Model Cascade
+Cascade de modèles: transcription rapide avec un petit modèle, puis
+retranscription des seuls segments peu confiants par un modèle plus grand.
+"""
+
+import math
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from preprocessing.vad import VoiceActivityDetector
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelCascade:
+    """
+    Escalade des segments peu confiants vers un modèle plus grand.
+    
+    La confiance d'un segment est exp(avg_logprob) (probabilité moyenne par
+    jeton) pondérée par 1 - no_speech_prob. Les segments sous le seuil, voisins
+    à moins de max_gap_s près, forment des zones retranscrites d'une seule
+    passe par le grand modèle puis recalées sur la chronologie du fichier.
+    """
+    
+    def __init__(
+        self,
+        backend,
+        model_name: str = "medium",
+        confidence_threshold: float = 0.6,
+        max_gap_s: float = 1.0
+    ):
+        """
+        Initialise la cascade.
+        
+        Args:
+            backend: Moteur d'inférence (core.backends.TranscriptionBackend)
+            model_name: Modèle de retranscription (medium, large...)
+            confidence_threshold: Confiance minimale d'un segment (0.0-1.0)
+            max_gap_s: Écart maximal entre deux segments fusionnés dans une même zone (secondes)
+        """
+        self.backend = backend
+        self.model_name = model_name
+        self.confidence_threshold = confidence_threshold
+        self.max_gap_s = max_gap_s
+        
+        logger.info(f"ModelCascade initialisée: escalade vers {model_name} sous une confiance de {confidence_threshold}")
+    
+    @staticmethod
+    def segment_confidence(segment: Dict) -> float:
+        """
+        Calcule la confiance d'un segment Whisper.
+        
+        Args:
+            segment: Segment (avg_logprob, no_speech_prob)
+        
+        Returns:
+            Confiance entre 0.0 et 1.0 (1.0 si le segment ne porte pas de score)
+        """
+        if "avg_logprob" not in segment:
+            return 1.0
+        return math.exp(min(0.0, segment["avg_logprob"])) * (1.0 - segment.get("no_speech_prob", 0.0))
+    
+    def low_confidence_spans(self, segments: List[Dict]) -> List[Tuple[float, float]]:
+        """
+        Regroupe les segments peu confiants en zones à retranscrire.
+        
+        Args:
+            segments: Segments du petit modèle, dans l'ordre chronologique
+        
+        Returns:
+            Liste de (début, fin) en secondes
+        """
+        spans = []
+        for segment in segments:
+            if self.segment_confidence(segment) >= self.confidence_threshold:
+                continue
+            if spans and segment["start"] - spans[-1][1] <= self.max_gap_s:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], segment["end"]))
+            else:
+                spans.append((segment["start"], segment["end"]))
+        return spans
+    
+    def escalate(
+        self,
+        result: Dict,
+        audio: np.ndarray,
+        sample_rate: int,
+        language: str,
+        num_threads: int,
+        word_timestamps: bool
+    ) -> Optional[Dict]:
+        """
+        Retranscrit les zones peu confiantes avec le grand modèle.
+        
+        Args:
+            result: Résultat du petit modèle (horodatages du signal audio)
+            audio: Signal PCM du fichier
+            sample_rate: Fréquence d'échantillonnage (Hz)
+            language: Langue de transcription
+            num_threads: Threads d'inférence
+            word_timestamps: Horodatages par mot
+        
+        Returns:
+            Résultat fusionné avec une clé 'cascade' de statistiques,
+            ou None si le grand modèle n'a pas pu être chargé
+        """
+        segments = result.get("segments", [])
+        spans = self.low_confidence_spans(segments)
+        stats = {
+            "audio_s": len(audio) / sample_rate,
+            "escalated_s": sum(end - begin for begin, end in spans),
+            "segments_escalated": 0,
+            "escalation_time_s": 0.0
+        }
+        if not spans:
+            return dict(result, cascade=stats)
+        
+        model = self.backend.load(self.model_name, num_threads)
+        if model is None:
+            logger.error(f"Impossible de charger le modèle de cascade {self.model_name}")
+            return None
+        
+        try:
+            start_time = time.time()
+            concat, mapping = VoiceActivityDetector.extract(audio, sample_rate, spans)
+            escalated = self.backend.transcribe(model, concat, language, word_timestamps)
+            escalated = VoiceActivityDetector.remap_result(escalated, mapping)
+            stats["escalation_time_s"] = time.time() - start_time
+        finally:
+            self.backend.release(model)
+        
+        # Segments du petit modèle hors zones escaladées + segments du grand modèle
+        kept = [
+            segment for segment in segments
+            if not any(begin <= segment["start"] < end for begin, end in spans)
+        ]
+        stats["segments_escalated"] = len(segments) - len(kept)
+        merged = sorted(kept + escalated.get("segments", []), key=lambda segment: segment["start"])
+        merged = [dict(segment, id=index) for index, segment in enumerate(merged)]
+        
+        return dict(
+            result,
+            text=" ".join(segment["text"].strip() for segment in merged),
+            segments=merged,
+            cascade=stats
+        )
@@ -0,0 +1,173 @@
+"""
+Station TV - Decoding Profiles
+Profils de décodage nommés (faisceau, replis en température, patience,
+conditionnement sur le texte précédent) et mesure du coût des replis:
+chaque fenêtre redécodée à une température plus élevée est comptée et chronométrée.
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Profils prédéfinis (surchargeables par whisper.decoding_profiles)
+DECODING_PROFILES = {
+    # Réglages par défaut de model.transcribe (comportement d'origine): glouton,
+    # replis complets 0 à 1.0, conditionnement sur le texte précédent
+    "whisper-default": {
+        "beam_size": None,
+        "best_of": None,
+        "patience": None,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True
+    },
+    # Glouton sans repli ni conditionnement: une seule passe par fenêtre
+    "greedy-fast": {
+        "beam_size": None,
+        "best_of": None,
+        "patience": None,
+        "temperature": (0.0,),
+        "condition_on_previous_text": False
+    },
+    # Glouton, replis espacés, sans conditionnement (limite les boucles)
+    "balanced": {
+        "beam_size": None,
+        "best_of": 3,
+        "patience": None,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False
+    },
+    # Réglages de la ligne de commande whisper: faisceau de 5, replis complets
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "patience": 1.0,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True
+    }
+}
+
+# Profil par défaut: transcriptions identiques à celles d'avant les profils
+DEFAULT_PROFILE = "whisper-default"
+
+
+def resolve_profile(config: dict) -> Tuple[str, Dict]:
+    """
+    Retourne le profil de décodage configuré (whisper.decoding_profile).
+    
+    Args:
+        config: Configuration
+    
+    Returns:
+        Tuple (nom du profil, options de décodage)
+    """
+    whisper_config = config.get('whisper', {})
+    profiles = {name: dict(options) for name, options in DECODING_PROFILES.items()}
+    for name, options in (whisper_config.get('decoding_profiles') or {}).items():
+        profiles.setdefault(name, dict(DECODING_PROFILES[DEFAULT_PROFILE])).update(options)
+    
+    name = whisper_config.get('decoding_profile', DEFAULT_PROFILE)
+    if name not in profiles:
+        logger.warning(f"Profil de décodage inconnu: {name}, utilisation de {DEFAULT_PROFILE}")
+        name = DEFAULT_PROFILE
+    options = profiles[name]
+    options["temperature"] = tuple(options["temperature"])
+    return name, options
+
+
+def queue_config(config: dict, queue: str) -> dict:
+    """
+    Applique le profil de décodage d'une file (batch.queue_profiles) à la configuration.
+    
+    Args:
+        config: Configuration
+        queue: Nom de la file (dossier CoeurN ou numéro de processus)
+    
+    Returns:
+        Configuration du processus de la file (copie si le profil change)
+    """
+    profile = config.get('batch', {}).get('queue_profiles', {}).get(str(queue))
+    if profile is None:
+        return config
+    logger.info(f"File {queue}: profil de décodage {profile}")
+    return dict(config, whisper=dict(config.get('whisper', {}), decoding_profile=profile))
+
+
+class FallbackMeter:
+    """
+    Mesure des passes de décodage whisper (whisper.decoding.DecodingTask.run):
+    la première passe d'une fenêtre se fait à la température 0, toute passe
+    à une température supérieure est un repli.
+    """
+    
+    def __init__(self, profile: str = DEFAULT_PROFILE):
+        """
+        Initialise la mesure.
+        
+        Args:
+            profile: Nom du profil de décodage (reporté dans les statistiques)
+        """
+        self.profile = profile
+    
+    @contextmanager
+    def active(self):
+        """
+        Chronomètre chaque passe de décodage exécutée pendant le bloc.
+        
+        Yields:
+            Liste de (température, fenêtres décodées, durée en secondes)
+        """
+        decoding = importlib.import_module("whisper.decoding")
+        original = decoding.DecodingTask.run
+        calls: List[Tuple[float, int, float]] = []
+        
+        def run(task, mel):
+            start_time = time.time()
+            try:
+                return original(task, mel)
+            finally:
+                windows = mel.shape[0] if mel.ndim == 3 else 1
+                calls.append((task.options.temperature, windows, time.time() - start_time))
+        
+        decoding.DecodingTask.run = run
+        try:
+            yield calls
+        finally:
+            decoding.DecodingTask.run = original
+    
+    def summarize(self, calls: List[Tuple[float, int, float]], segments: Optional[List[Dict]] = None) -> Dict:
+        """
+        Statistiques de replis d'un fichier.
+        
+        Sans passe mesurée (moteurs ctranslate2/onnx), les replis sont comptés
+        d'après la température des segments, sans leur coût.
+        
+        Args:
+            calls: Passes mesurées par active()
+            segments: Segments du résultat (température par segment)
+        
+        Returns:
+            Dictionnaire (profile, windows, fallbacks, decode_time_s, fallback_time_s)
+        """
+        if not calls and segments:
+            windows = {
+                segment.get("seek", index): segment.get("temperature", 0.0)
+                for index, segment in enumerate(segments)
+            }
+            return {
+                "profile": self.profile,
+                "windows": len(windows),
+                "fallbacks": sum(1 for temperature in windows.values() if temperature > 0),
+                "decode_time_s": 0.0,
+                "fallback_time_s": 0.0
+            }
+        return {
+            "profile": self.profile,
+            "windows": sum(windows for temperature, windows, _ in calls if temperature == 0),
+            "fallbacks": sum(windows for temperature, windows, _ in calls if temperature > 0),
+            "decode_time_s": sum(elapsed for _, _, elapsed in calls),
+            "fallback_time_s": sum(elapsed for temperature, _, elapsed in calls if temperature > 0)
+        }
@@ -0,0 +1,219 @@
+"""
+Station TV - Loop Guard
+Garde anti-boucle pendant le décodage Whisper: une fenêtre qui répète le même
+n-gramme ou dont le taux de compression s'envole est close immédiatement
+(token de fin forcé), acceptée par le repli en température, et le décodage
+passe à la fenêtre suivante.
+"""
+
+import dataclasses
+import importlib
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# logprob_threshold par défaut de model.transcribe: une fenêtre close par la garde
+# n'est pas redécodée, mais reste peu confiante (cascade) et peut être écartée comme silence
+_LOGPROB_THRESHOLD = -1.0
+
+
+class RepetitionGuard:
+    """
+    Détection des boucles de répétition (hallucinations sur les silences et bruits).
+    
+    Deux critères, sur les seuls tokens de texte de la fenêtre en cours
+    (les tokens de timestamp changent à chaque répétition):
+    - un motif de 1 à max_period tokens répété au moins min_repeats fois
+      d'affilée en fin de séquence, sur au moins min_loop_tokens tokens;
+    - un taux de compression gzip du texte décodé au-delà de
+      compression_ratio (vérifié tous les check_every tokens).
+    """
+    
+    def __init__(
+        self,
+        max_period: int = 32,
+        min_repeats: int = 3,
+        min_loop_tokens: int = 16,
+        compression_ratio: float = 2.4,
+        min_compression_tokens: int = 48,
+        check_every: int = 8
+    ):
+        """
+        Initialise la garde.
+        
+        Args:
+            max_period: Longueur maximale du motif répété (tokens)
+            min_repeats: Nombre minimal de répétitions consécutives
+            min_loop_tokens: Longueur minimale de la boucle (tokens)
+            compression_ratio: Taux de compression au-delà duquel la fenêtre est close
+            min_compression_tokens: Nombre de tokens avant le premier contrôle de compression
+            check_every: Intervalle (tokens) entre deux contrôles de compression
+        """
+        self.max_period = max_period
+        self.min_repeats = min_repeats
+        self.min_loop_tokens = min_loop_tokens
+        self.compression_ratio = compression_ratio
+        self.min_compression_tokens = min_compression_tokens
+        self.check_every = check_every
+        self.events: List[Dict] = []
+        self.windows = 0
+        # (fenêtre, index dans le lot) déjà signalées: un événement par fenêtre, pas par passe
+        self.triggered = set()
+        
+        logger.info(
+            f"RepetitionGuard initialisée: motif ≤ {max_period} tokens répété ≥ {min_repeats} fois, "
+            f"compression > {compression_ratio}"
+        )
+    
+    def find_loop(self, tokens: List[int]) -> Optional[Tuple[int, int]]:
+        """
+        Cherche une répétition consécutive en fin de séquence.
+        
+        Args:
+            tokens: Tokens de texte de la fenêtre
+        
+        Returns:
+            Tuple (longueur du motif, nombre de répétitions) ou None
+        """
+        for period in range(1, min(self.max_period, len(tokens) // self.min_repeats) + 1):
+            repeats = max(self.min_repeats, -(-self.min_loop_tokens // period))
+            span = period * repeats
+            if span > len(tokens):
+                continue
+            tail = tokens[-span:]
+            if tail == tokens[-period:] * repeats:
+                return period, repeats
+        return None
+    
+    @staticmethod
+    def text_compression_ratio(text: str) -> float:
+        """Taux de compression gzip d'un texte (même mesure que whisper)."""
+        data = text.encode("utf-8")
+        return len(data) / len(zlib.compress(data)) if data else 0.0
+    
+    def check(self, tokens: List[int], decode) -> Optional[Dict]:
+        """
+        Applique les deux critères à une séquence en cours de décodage.
+        
+        Args:
+            tokens: Tokens de texte de la fenêtre
+            decode: Fonction tokens -> texte (tokenizer)
+        
+        Returns:
+            Événement (reason, tokens, détail, extrait) ou None
+        """
+        loop = self.find_loop(tokens)
+        if loop is not None:
+            period, repeats = loop
+            return {
+                "reason": "repetition",
+                "tokens": len(tokens),
+                "period": period,
+                "repeats": repeats,
+                "excerpt": decode(tokens[-period:]).strip()[:80]
+            }
+        
+        if len(tokens) >= self.min_compression_tokens and len(tokens) % self.check_every == 0:
+            text = decode(tokens)
+            ratio = self.text_compression_ratio(text)
+            if ratio > self.compression_ratio:
+                return {
+                    "reason": "compression",
+                    "tokens": len(tokens),
+                    "compression_ratio": ratio,
+                    "excerpt": text.strip()[-80:]
+                }
+        return None
+    
+    @contextmanager
+    def active(self):
+        """
+        Installe la garde dans chaque tâche de décodage whisper créée pendant
+        le bloc (model.transcribe, whisper.decode, moteurs par lots et spéculatif).
+        Les résultats des fenêtres closes ont un taux de compression nul et un
+        avg_logprob relevé à _LOGPROB_THRESHOLD: le repli en température les accepte.
+        
+        Yields:
+            Liste des événements du bloc
+        """
+        decoding = importlib.import_module("whisper.decoding")
+        original_init = decoding.DecodingTask.__init__
+        original_run = decoding.DecodingTask.run
+        guard = self
+        self.events = []
+        self.triggered = set()
+        
+        def __init__(task, model, options):
+            original_init(task, model, options)
+            # Un repli (température > 0) redécode la fenêtre de la passe précédente
+            if not options.temperature:
+                guard.windows += 1
+            task.logit_filters.append(
+                _LoopFilter(guard, task.tokenizer, task.sample_begin, guard.windows, task.n_group)
+            )
+        
+        def run(task, mel):
+            results = original_run(task, mel)
+            for loop_filter in task.logit_filters:
+                if isinstance(loop_filter, _LoopFilter):
+                    for audio in loop_filter.guarded:
+                        results[audio] = dataclasses.replace(
+                            results[audio],
+                            compression_ratio=0.0,
+                            avg_logprob=max(results[audio].avg_logprob, _LOGPROB_THRESHOLD)
+                        )
+            return results
+        
+        decoding.DecodingTask.__init__ = __init__
+        decoding.DecodingTask.run = run
+        try:
+            yield self.events
+        finally:
+            decoding.DecodingTask.__init__ = original_init
+            decoding.DecodingTask.run = original_run
+
+
+class _LoopFilter:
+    """
+    Filtre de logits whisper (interface LogitFilter.apply): force le token
+    de fin sur les lignes dont la séquence boucle.
+    """
+    
+    def __init__(self, guard: RepetitionGuard, tokenizer, sample_begin: int, window: int, n_group: int = 1):
+        self.guard = guard
+        self.tokenizer = tokenizer
+        self.sample_begin = sample_begin
+        self.window = window
+        # Candidats par fenêtre du lot (faisceau / best_of): ligne = fenêtre × n_group + candidat
+        self.n_group = n_group
+        # Fenêtres du lot (index) interrompues pendant cette passe
+        self.guarded = set()
+    
+    def apply(self, logits, tokens):
+        timestamp_begin = self.tokenizer.timestamp_begin
+        for row in range(tokens.shape[0]):
+            # Séquence déjà terminée (lots: les lignes closes reçoivent des EOT)
+            if int(tokens[row, -1]) == self.tokenizer.eot:
+                continue
+            text_tokens = [t for t in tokens[row, self.sample_begin:].tolist() if t < timestamp_begin]
+            if not text_tokens:
+                continue
+            event = self.guard.check(text_tokens, self.tokenizer.decode)
+            if event is None:
+                continue
+            
+            logits[row, :] = float("-inf")
+            logits[row, self.tokenizer.eot] = 0.0
+            audio = row // self.n_group
+            self.guarded.add(audio)
+            if (self.window, audio) not in self.guard.triggered:
+                self.guard.triggered.add((self.window, audio))
+                event["window"] = self.window
+                self.guard.events.append(event)
+                logger.warning(
+                    f"Boucle détectée ({event['reason']}, {event['tokens']} tokens) "
+                    f"fenêtre {self.window}: décodage interrompu - «{event['excerpt']}»"
+                )
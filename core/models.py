@@ -3,8 +3,13 @@ Station TV - Model Manager
 Gestion des modèles Whisper (chargement, cache, validation)
 """
 
+import gc
+import os
+import time
 import whisper
 import torch
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional, Dict
 from utils.logger import get_logger
 
@@ -16,37 +21,101 @@ class ModelManager:
     Gestionnaire centralisé des modèles Whisper.
     """
     
-    # Spécifications des modèles (RAM estimée en Go)
+    # Spécifications des modèles (RAM estimée en Go, FP32 et quantifié int8)
+    # int8: seules les couches linéaires sont quantifiées (embeddings et convolutions restent FP32)
     MODEL_SPECS = {
-        "tiny": {"ram_gb": 1, "suffix": "wt"},
-        "base": {"ram_gb": 1, "suffix": "wb"},
-        "small": {"ram_gb": 2, "suffix": "ws"},
-        "medium": {"ram_gb": 5, "suffix": "wm"},
-        "large": {"ram_gb": 10, "suffix": "wl"},
-        "large-v2": {"ram_gb": 10, "suffix": "wl2"},
-        "large-v3": {"ram_gb": 10, "suffix": "wl3"},
+        "tiny": {"ram_gb": 1, "ram_gb_int8": 0.5, "suffix": "wt"},
+        "base": {"ram_gb": 1, "ram_gb_int8": 0.5, "suffix": "wb"},
+        "small": {"ram_gb": 2, "ram_gb_int8": 1, "suffix": "ws"},
+        "medium": {"ram_gb": 5, "ram_gb_int8": 2, "suffix": "wm"},
+        "large": {"ram_gb": 10, "ram_gb_int8": 4, "suffix": "wl"},
+        "large-v2": {"ram_gb": 10, "ram_gb_int8": 4, "suffix": "wl2"},
+        "large-v3": {"ram_gb": 10, "ram_gb_int8": 4, "suffix": "wl3"},
     }
     
-    def __init__(self, device: str = "cpu"):
+    def __init__(
+        self,
+        device: str = "cpu",
+        cache_budget_gb: float = 0.0,
+        weights_dir: Optional[str] = None,
+        quantize: bool = False,
+        quantized_dir: str = "models/int8"
+    ):
         """
         Initialise le gestionnaire de modèles.
         
         Args:
             device: Device à utiliser ('cpu' ou 'cuda')
+            cache_budget_gb: Budget RAM du cache de modèles en Go
+                             (0 = pas de cache, chaque fichier recharge le modèle)
+            weights_dir: Répertoire du magasin de poids mappés en mémoire
+                         (None = chargement classique via whisper.load_model)
+            quantize: Quantification dynamique int8 des couches linéaires (CPU uniquement)
+            quantized_dir: Répertoire des modèles quantifiés mis en cache
         """
         self.device = device
-        self.device = device
-        # self._loaded_models removed to prevent caching
+        self.cache_budget_gb = cache_budget_gb
+        self.weights_dir = weights_dir
+        self.quantize = quantize and device == "cpu"
+        self.quantized_dir = quantized_dir
+        
+        # Cache LRU par processus: model_name -> modèle (ordre = du moins au plus récent)
+        self._loaded_models: "OrderedDict[str, whisper.Whisper]" = OrderedDict()
+        self._load_times: Dict[str, float] = {}
+        self.cache_stats = {
+            "loads": 0,
+            "hits": 0,
+            "evictions": 0,
+            "load_time_s": 0.0,
+            "saved_time_s": 0.0,
+        }
         
-        logger.info(f"ModelManager initialisé avec device={device}")
+        logger.info(
+            f"ModelManager initialisé avec device={device}, "
+            f"cache={cache_budget_gb} Go, poids partagés={weights_dir or 'non'}, "
+            f"quantification={'int8' if self.quantize else 'non'}"
+        )
+    
+    @property
+    def cache_enabled(self) -> bool:
+        """Indique si le cache de modèles est actif."""
+        return self.cache_budget_gb > 0
+    
+    def get_model_ram_gb(self, model_name: str) -> float:
+        """
+        Retourne la RAM estimée d'un modèle, selon la précision de chargement.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            RAM estimée en Go (d'après MODEL_SPECS)
+        """
+        specs = self.MODEL_SPECS.get(model_name, {})
+        if self.quantize:
+            return specs.get("ram_gb_int8", specs.get("ram_gb", 0))
+        return specs.get("ram_gb", 0)
+    
+    def get_cached_ram_gb(self) -> float:
+        """
+        Retourne la RAM estimée occupée par les modèles en cache.
+        
+        Returns:
+            RAM estimée en Go (d'après MODEL_SPECS)
+        """
+        return sum(self.get_model_ram_gb(name) for name in self._loaded_models)
     
     def load_model(self, model_name: str, force_reload: bool = False) -> Optional[whisper.Whisper]:
         """
         Charge un modèle Whisper en mémoire.
         
+        Si le cache est actif, un modèle déjà chargé dans ce processus est
+        réutilisé, et les modèles les moins récemment utilisés sont évincés
+        lorsque le budget RAM est dépassé.
+        
         Args:
             model_name: Nom du modèle (tiny, base, small, medium, large)
-            force_reload: Ignoré (plus de cache)
+            force_reload: Recharger le modèle même s'il est en cache
         
         Returns:
             Modèle Whisper chargé ou None en cas d'erreur
@@ -56,17 +125,323 @@ class ModelManager:
             logger.error(f"Modèle inconnu: {model_name}. Modèles disponibles: {list(self.MODEL_SPECS.keys())}")
             return None
         
+        if self.cache_enabled and not force_reload and model_name in self._loaded_models:
+            self._loaded_models.move_to_end(model_name)
+            self.cache_stats["hits"] += 1
+            self.cache_stats["saved_time_s"] += self._load_times.get(model_name, 0.0)
+            logger.info(f"Modèle {model_name} réutilisé depuis le cache")
+            return self._loaded_models[model_name]
+        
         try:
             logger.info(f"Chargement du modèle {model_name} sur {self.device}...")
-            model = whisper.load_model(model_name, device=self.device)
+            start_time = time.time()
+            if self.quantize:
+                model = self._load_quantized(model_name)
+            elif self.weights_dir and self.device == "cpu":
+                model = self._load_from_weight_store(model_name)
+            else:
+                model = whisper.load_model(model_name, device=self.device)
+            load_time = time.time() - start_time
             
-            logger.info(f"Modèle {model_name} chargé avec succès")
-            return model
+            self.cache_stats["loads"] += 1
+            self.cache_stats["load_time_s"] += load_time
+            self._load_times[model_name] = load_time
+            
+            logger.info(f"Modèle {model_name} chargé avec succès en {load_time:.2f}s")
             
+            if self.cache_enabled:
+                self._loaded_models.pop(model_name, None)
+                self._loaded_models[model_name] = model
+                self._evict_over_budget()
+            
+            return model
+        
         except Exception as e:
             logger.error(f"Erreur lors du chargement du modèle {model_name}: {str(e)}")
             return None
     
+    def get_weight_store_path(self, model_name: str) -> Optional[Path]:
+        """
+        Retourne le chemin du magasin de poids d'un modèle.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Chemin du fichier ou None si le magasin est désactivé
+        """
+        if not self.weights_dir:
+            return None
+        return Path(self.weights_dir) / f"{model_name}.pt"
+    
+    def prepare_weight_store(self, model_name: str) -> Optional[str]:
+        """
+        Convertit une seule fois le checkpoint Whisper en magasin de poids
+        mappable en mémoire (tenseurs FP32 contigus, format zip de torch.save).
+        
+        À appeler dans le processus parent avant de lancer les workers,
+        pour éviter que plusieurs processus convertissent en même temps.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Chemin du magasin de poids ou None en cas d'erreur
+        """
+        store_path = self.get_weight_store_path(model_name)
+        if store_path is None or model_name not in self.MODEL_SPECS:
+            return None
+        if store_path.exists():
+            return str(store_path)
+        
+        try:
+            logger.info(f"Conversion du checkpoint {model_name} vers {store_path}...")
+            start_time = time.time()
+            
+            download_root = os.path.join(
+                os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                "whisper"
+            )
+            checkpoint_file = self._whisper_internal("_download")(
+                self._whisper_internal("_MODELS")[model_name], download_root, False
+            )
+            checkpoint = torch.load(checkpoint_file, map_location="cpu")
+            
+            # FP32 sur CPU: les poids sont utilisés tels quels, sans copie privée
+            state_dict = {
+                key: (tensor.float() if tensor.is_floating_point() else tensor).contiguous()
+                for key, tensor in checkpoint["model_state_dict"].items()
+            }
+            
+            # Écriture atomique (fichier temporaire puis renommage)
+            store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = store_path.with_name(f"{store_path.name}.{os.getpid()}.tmp")
+            torch.save({"dims": checkpoint["dims"], "model_state_dict": state_dict}, tmp_path)
+            os.replace(tmp_path, store_path)
+            
+            logger.info(f"Magasin de poids {model_name} créé en {time.time() - start_time:.2f}s")
+            return str(store_path)
+        
+        except Exception as e:
+            logger.error(f"Erreur lors de la conversion du checkpoint {model_name}: {str(e)}")
+            return None
+    
+    def _load_from_weight_store(self, model_name: str) -> whisper.Whisper:
+        """
+        Charge un modèle depuis le magasin de poids en mappant le fichier en mémoire.
+        
+        Les tenseurs restent adossés au fichier (mmap copy-on-write jamais écrit
+        en inférence): tous les workers partagent les mêmes pages physiques.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Modèle Whisper chargé
+        """
+        store_path = self.prepare_weight_store(model_name)
+        if store_path is None:
+            raise RuntimeError(f"Magasin de poids indisponible pour {model_name}")
+        
+        checkpoint = torch.load(store_path, map_location="cpu", mmap=True, weights_only=True)
+        dims = whisper.model.ModelDimensions(**checkpoint["dims"])
+        
+        # Construction sur le device "meta": aucune allocation avant l'assignation des poids
+        with torch.device("meta"):
+            model = whisper.model.Whisper(dims)
+        model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+        
+        # Buffer non persistant (absent du state_dict): masque causal du décodeur
+        model.decoder.register_buffer(
+            "mask",
+            torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-float("inf")).triu_(1),
+            persistent=False
+        )
+        model.set_alignment_heads(self._whisper_internal("_ALIGNMENT_HEADS")[model_name])
+        
+        return model
+    
+    @staticmethod
+    def _whisper_internal(name: str):
+        """
+        Retourne un attribut privé d'openai-whisper utilisé par le magasin de
+        poids (téléchargement, URL des checkpoints, têtes d'alignement).
+        
+        Args:
+            name: Nom de l'attribut (_download, _MODELS, _ALIGNMENT_HEADS)
+        
+        Returns:
+            Attribut de whisper
+        
+        Raises:
+            RuntimeError: Si la version installée ne l'expose plus
+        """
+        if not hasattr(whisper, name):
+            raise RuntimeError(
+                f"openai-whisper {getattr(whisper, '__version__', '?')} n'expose plus whisper.{name}: "
+                f"version non prise en charge par le magasin de poids (voir requirements.txt), "
+                f"désactiver whisper.shared_weights"
+            )
+        return getattr(whisper, name)
+    
+    @staticmethod
+    def quantize_model(model: whisper.Whisper) -> whisper.Whisper:
+        """
+        Applique la quantification dynamique int8 aux couches linéaires
+        (poids int8, activations quantifiées à la volée).
+        
+        Args:
+            model: Modèle Whisper FP32 sur CPU
+        
+        Returns:
+            Modèle quantifié
+        """
+        # La conversion ne remplace que les types exacts de sa table (nn.Linear):
+        # les sous-classes (whisper.model.Linear) sont d'abord ramenées à nn.Linear
+        for parent in list(model.modules()):
+            for name, child in list(parent.named_children()):
+                if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                    linear = torch.nn.Linear(
+                        child.in_features, child.out_features, bias=child.bias is not None, device="meta"
+                    )
+                    linear.weight = child.weight
+                    linear.bias = child.bias
+                    setattr(parent, name, linear)
+        
+        quantized = torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+        if not ModelManager.is_quantized(quantized):
+            raise RuntimeError("Aucune couche linéaire quantifiée")
+        return quantized
+    
+    @staticmethod
+    def is_quantized(model: whisper.Whisper) -> bool:
+        """
+        Indique si un modèle contient des couches linéaires int8 dynamiques.
+        
+        Args:
+            model: Modèle Whisper
+        
+        Returns:
+            True si au moins une couche est quantifiée
+        """
+        return any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in model.modules())
+    
+    def get_quantized_path(self, model_name: str) -> Path:
+        """
+        Retourne le chemin du modèle quantifié mis en cache.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Chemin du fichier
+        """
+        return Path(self.quantized_dir) / f"{model_name}_int8.pt"
+    
+    def prepare_quantized_model(self, model_name: str) -> Optional[str]:
+        """
+        Quantifie une seule fois un modèle et enregistre le résultat sur disque.
+        
+        À appeler dans le processus parent avant de lancer les workers,
+        pour éviter que plusieurs processus quantifient en même temps.
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Chemin du modèle quantifié ou None en cas d'erreur
+        """
+        if model_name not in self.MODEL_SPECS:
+            return None
+        quantized_path = self.get_quantized_path(model_name)
+        if quantized_path.exists():
+            return str(quantized_path)
+        
+        try:
+            logger.info(f"Quantification int8 du modèle {model_name} vers {quantized_path}...")
+            start_time = time.time()
+            
+            if self.weights_dir:
+                model = self._load_from_weight_store(model_name)
+            else:
+                model = whisper.load_model(model_name, device="cpu")
+            model = self.quantize_model(model)
+            
+            # Écriture atomique (fichier temporaire puis renommage)
+            quantized_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = quantized_path.with_name(f"{quantized_path.name}.{os.getpid()}.tmp")
+            torch.save(model, tmp_path)
+            os.replace(tmp_path, quantized_path)
+            
+            logger.info(f"Modèle {model_name} quantifié en {time.time() - start_time:.2f}s")
+            return str(quantized_path)
+        
+        except Exception as e:
+            logger.error(f"Erreur lors de la quantification du modèle {model_name}: {str(e)}")
+            return None
+    
+    def _load_quantized(self, model_name: str) -> whisper.Whisper:
+        """
+        Charge le modèle quantifié depuis le disque (quantification au premier appel).
+        
+        Args:
+            model_name: Nom du modèle
+        
+        Returns:
+            Modèle Whisper quantifié
+        """
+        quantized_path = self.prepare_quantized_model(model_name)
+        if quantized_path is None:
+            raise RuntimeError(f"Modèle quantifié indisponible pour {model_name}")
+        # Module complet sérialisé (les couches quantifiées ne se reconstruisent pas depuis un state_dict FP32)
+        model = torch.load(quantized_path, map_location="cpu", weights_only=False)
+        if not self.is_quantized(model):
+            # Artefact d'une version qui enregistrait le modèle FP32 sans le quantifier
+            logger.warning(f"Modèle {quantized_path} non quantifié: nouvelle quantification")
+            Path(quantized_path).unlink()
+            quantized_path = self.prepare_quantized_model(model_name)
+            if quantized_path is None:
+                raise RuntimeError(f"Modèle quantifié indisponible pour {model_name}")
+            model = torch.load(quantized_path, map_location="cpu", weights_only=False)
+        return model
+    
+    def _evict_over_budget(self):
+        """Évince les modèles les moins récemment utilisés tant que le budget est dépassé."""
+        # Le modèle le plus récent est toujours conservé, même s'il dépasse seul le budget
+        while len(self._loaded_models) > 1 and self.get_cached_ram_gb() > self.cache_budget_gb:
+            name, model = self._loaded_models.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+            logger.info(
+                f"Modèle {name} évincé du cache (budget {self.cache_budget_gb} Go dépassé)"
+            )
+            self.unload_model(model)
+    
+    def release_model(self, model: Optional[whisper.Whisper]) -> bool:
+        """
+        Rend un modèle après usage.
+        Le modèle est conservé s'il est en cache, sinon il est déchargé.
+        
+        Args:
+            model: Instance du modèle obtenue via load_model
+        
+        Returns:
+            True si le modèle a été déchargé, False s'il reste en cache
+        """
+        if model is not None and any(m is model for m in self._loaded_models.values()):
+            return False
+        return self.unload_model(model)
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Retourne les compteurs du cache de modèles.
+        
+        Returns:
+            Dictionnaire (loads, hits, evictions, load_time_s, saved_time_s, cached_models)
+        """
+        stats = dict(self.cache_stats)
+        stats["cached_models"] = list(self._loaded_models.keys())
+        return stats
+    
     def unload_model(self, model: Optional[whisper.Whisper]) -> bool:
         """
         Décharge un modèle de la mémoire.
@@ -79,7 +454,6 @@ class ModelManager:
         """
         if model:
             del model
-            import gc
             gc.collect()
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
@@ -87,10 +461,10 @@ class ModelManager:
             logger.info(f"Modèle déchargé et garbage collector appelé")
             return True
         return False
-
+    
     def unload_all(self):
-        """Décharge tous les modèles de la mémoire (Obsolète avec la nouvelle gestion)."""
-        import gc
+        """Vide le cache et décharge tous les modèles de la mémoire."""
+        self._loaded_models.clear()
         gc.collect()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -119,13 +493,13 @@ class ModelManager:
         Returns:
             RAM estimée en Go
         """
-        base_ram = self.MODEL_SPECS.get(model_name, {}).get("ram_gb", 0)
+        base_ram = self.get_model_ram_gb(model_name)
         # Ajouter une marge de sécurité de 50%
         estimated_ram = base_ram * num_processes * 1.5
         
         logger.info(
-            f"RAM estimée pour {num_processes} processus {model_name}: "
-            f"{estimated_ram:.1f} Go"
+            f"RAM estimée pour {num_processes} processus {model_name}"
+            f"{' (int8)' if self.quantize else ''}: {estimated_ram:.1f} Go"
         )
         
         return estimated_ram
@@ -165,7 +539,8 @@ class ModelManager:
                 f"{max_allowed_ram:.1f} Go disponibles"
             )
             logger.warning(
-                f"Réduire le nombre de processus ou choisir un modèle plus petit"
+                f"Réduire le nombre de processus, choisir un modèle plus petit"
+                f"{'' if self.quantize else ' ou activer whisper.quantization: int8'}"
             )
         
         return is_valid
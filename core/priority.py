@@ -0,0 +1,297 @@
+"""
+Station TV - Priority
+File de travail à priorités et échéances: classes de priorité (diffusions
+fraîches, rattrapage d'archives), échéance par fichier (heure de diffusion +
+délai de la classe), ordre par échéance la plus proche dans chaque classe et
+préemption aux frontières de fichiers.
+"""
+
+import csv
+import heapq
+import itertools
+import math
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from core.affinity import Audio
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Classes par défaut: priorité (0 = plus urgente) et délai après diffusion (0 = sans échéance)
+DEFAULT_CLASSES = {
+    "fresh": {"priority": 0, "deadline_s": 3600},
+    "backlog": {"priority": 1, "deadline_s": 0},
+}
+
+
+class PriorityClassifier:
+    """
+    Classe de priorité et échéance de chaque fichier.
+    
+    Classe: celle de la chaîne (dossier parent) dans channel_classes, sinon
+    fresh_class si le fichier a été diffusé depuis moins de fresh_max_age_s,
+    sinon default_class. Heure de diffusion: date de modification du fichier
+    (fin d'enregistrement), ou heure de lecture si le fichier est introuvable.
+    """
+    
+    def __init__(
+        self,
+        classes: Optional[Dict[str, Dict]] = None,
+        channel_classes: Optional[Dict[str, str]] = None,
+        fresh_class: str = "fresh",
+        fresh_max_age_s: float = 0.0,
+        default_class: str = "backlog",
+        reserved_slots: int = 0,
+        reserved_max_backlog_s: float = 0.0
+    ):
+        """
+        Initialise le classement.
+        
+        Args:
+            classes: Classes (priority, deadline_s), défaut DEFAULT_CLASSES
+            channel_classes: Classe imposée par chaîne
+            fresh_class: Classe des diffusions récentes
+            fresh_max_age_s: Âge maximal d'une diffusion récente (0 = pas de détection)
+            default_class: Classe des autres fichiers
+            reserved_slots: Slots du pool réservés aux fichiers urgents (et aux fichiers courts)
+            reserved_max_backlog_s: Durée max d'un fichier sans échéance sur un slot réservé
+        """
+        self.classes = classes or DEFAULT_CLASSES
+        self.channel_classes = channel_classes or {}
+        self.fresh_class = fresh_class
+        self.fresh_max_age_s = fresh_max_age_s
+        self.default_class = default_class
+        self.reserved_slots = reserved_slots
+        self.reserved_max_backlog_s = reserved_max_backlog_s
+    
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["PriorityClassifier"]:
+        """
+        Construit le classement depuis batch.priority.
+        
+        Args:
+            config: Configuration
+        
+        Returns:
+            PriorityClassifier, ou None si les priorités sont désactivées
+        """
+        priority_config = config.get('batch', {}).get('priority', {})
+        if not priority_config.get('enabled', False):
+            return None
+        return cls(
+            classes=priority_config.get('classes') or None,
+            channel_classes=priority_config.get('channel_classes', {}),
+            fresh_class=priority_config.get('fresh_class', 'fresh'),
+            fresh_max_age_s=priority_config.get('fresh_max_age_s', 0.0),
+            default_class=priority_config.get('default_class', 'backlog'),
+            reserved_slots=priority_config.get('reserved_slots', 0),
+            reserved_max_backlog_s=priority_config.get('reserved_max_backlog_s', 0.0)
+        )
+    
+    def classify(
+        self,
+        audio: Audio,
+        now: Optional[float] = None,
+        aired_at: Optional[float] = None,
+        classe: str = ""
+    ) -> Audio:
+        """
+        Fixe la classe et l'échéance d'un fichier.
+        
+        Args:
+            audio: Fichier à classer (modifié en place)
+            now: Heure courante (défaut: time.time())
+            aired_at: Heure de diffusion (défaut: date de modification du fichier)
+            classe: Classe imposée (boîte de réception), sinon règles du classement
+        
+        Returns:
+            Le fichier classé
+        """
+        now = time.time() if now is None else now
+        if aired_at is None:
+            try:
+                aired_at = os.path.getmtime(audio.path)
+            except OSError:
+                aired_at = now
+        
+        channel = Path(audio.path).parent.name
+        if not classe:
+            if channel in self.channel_classes:
+                classe = self.channel_classes[channel]
+            elif self.fresh_max_age_s > 0 and now - aired_at <= self.fresh_max_age_s:
+                classe = self.fresh_class
+            else:
+                classe = self.default_class
+        if classe not in self.classes:
+            logger.warning(f"Classe de priorité inconnue {classe} pour {audio.path}: {self.default_class}")
+            classe = self.default_class
+        
+        deadline_s = self.classes.get(classe, {}).get('deadline_s', 0)
+        audio.classe = classe
+        audio.deadline = aired_at + deadline_s if deadline_s > 0 else 0.0
+        return audio
+    
+    def key(self, audio: Audio) -> tuple:
+        """
+        Rang d'un fichier: priorité de sa classe, échéance la plus proche,
+        puis le plus long d'abord (LPT) à échéance égale ou absente.
+        """
+        priority = self.classes.get(audio.classe, {}).get('priority', math.inf)
+        return (priority, audio.deadline or math.inf, -audio.duree)
+    
+    def sort(self, items: Sequence[Audio]) -> List[Audio]:
+        """Fichiers du plus urgent au moins urgent."""
+        return sorted(items, key=self.key)
+    
+    def accepts(self, slot: int, audio: Audio) -> bool:
+        """
+        Indique si un slot peut prendre un fichier: les slots réservés ne
+        prennent que les fichiers à échéance et les fichiers courts, ce qui borne
+        l'attente d'un fichier urgent à la fin d'un fichier court.
+        """
+        return slot >= self.reserved_slots or self.reserved_eligible(audio)
+    
+    def reserved_eligible(self, audio: Audio) -> bool:
+        """Indique si un fichier peut aller sur un slot réservé (échéance ou fichier court)."""
+        return audio.deadline > 0 or audio.duree <= self.reserved_max_backlog_s
+
+
+class JobQueue:
+    """
+    File à priorités au comportement de deque pour WorkerPool: popleft() rend
+    le fichier le plus urgent, pop() le moins urgent (vol de travail) et
+    appendleft() remet un fichier à son rang.
+    
+    Trois tas partagent les mêmes entrées (suppression paresseuse): le plus
+    urgent d'abord, le moins urgent d'abord et les seuls fichiers admis sur
+    un slot réservé, soit O(log n) par retrait.
+    """
+    
+    def __init__(self, classifier: PriorityClassifier, items: Sequence[Audio] = ()):
+        """
+        Initialise la file.
+        
+        Args:
+            classifier: Classement (rang des fichiers)
+            items: Fichiers déjà classés
+        """
+        self.classifier = classifier
+        self._counter = itertools.count()
+        # Fichiers encore en file, par numéro d'entrée (les tas gardent les entrées retirées)
+        self._entries: Dict[int, Audio] = {}
+        self._heap = []
+        self._tail = []
+        self._reserved = []
+        for audio in items:
+            self._add(audio)
+        heapq.heapify(self._heap)
+        heapq.heapify(self._tail)
+        heapq.heapify(self._reserved)
+    
+    def _add(self, audio: Audio, push: Callable = list.append):
+        """Enregistre un fichier dans les trois tas (ajout simple avant heapify)."""
+        key, count = self.classifier.key(audio), next(self._counter)
+        self._entries[count] = audio
+        push(self._heap, (key, count))
+        push(self._tail, (tuple(-k for k in key), -count))
+        if self.classifier.reserved_eligible(audio):
+            push(self._reserved, (key, count))
+    
+    def _pop_from(self, heap: list, sign: int = 1) -> Optional[Audio]:
+        """Retire la première entrée encore en file d'un tas."""
+        while heap:
+            count = sign * heapq.heappop(heap)[1]
+            if count in self._entries:
+                return self._entries.pop(count)
+        return None
+    
+    def append(self, audio: Audio):
+        """Ajoute un fichier à son rang."""
+        self._add(audio, heapq.heappush)
+    
+    # Un fichier rendu (recyclage d'un worker) reprend simplement son rang
+    appendleft = append
+    
+    def popleft(self) -> Audio:
+        """Retire le fichier le plus urgent."""
+        if not self._entries:
+            raise IndexError("pop from an empty JobQueue")
+        return self._pop_from(self._heap)
+    
+    def pop(self) -> Audio:
+        """Retire le fichier le moins urgent."""
+        if not self._entries:
+            raise IndexError("pop from an empty JobQueue")
+        return self._pop_from(self._tail, sign=-1)
+    
+    def pop_reserved(self) -> Optional[Audio]:
+        """
+        Retire le fichier le plus urgent admis sur un slot réservé.
+        
+        Returns:
+            Fichier, ou None si aucun ne convient
+        """
+        return self._pop_from(self._reserved)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[Audio]:
+        return iter(self._entries.values())
+
+
+class JobInbox:
+    """
+    Boîte de réception des diffusions fraîches: fichier CSV (chemin, durée,
+    classe optionnelle) complété pendant le lancement et relu par le pool.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialise la boîte de réception.
+        
+        Args:
+            path: Fichier CSV (même en-tête que paths.csv_filename)
+        """
+        self.path = Path(path)
+        self.seen = set()
+        self._mtime = None
+    
+    def poll(self) -> List[tuple]:
+        """
+        Lit les entrées ajoutées depuis la dernière lecture.
+        
+        Returns:
+            Liste de (Audio, classe imposée ou "")
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return []
+        if mtime == self._mtime:
+            return []
+        self._mtime = mtime
+        
+        entries = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # En-tête
+                for row in reader:
+                    if len(row) < 2 or row[0] in self.seen:
+                        continue
+                    try:
+                        audio = Audio(row[0], float(row[1]))
+                    except ValueError:
+                        logger.warning(f"Boîte de réception: ligne ignorée {row}")
+                        continue
+                    self.seen.add(row[0])
+                    entries.append((audio, row[2].strip() if len(row) > 2 else ""))
+        except OSError as e:
+            logger.error(f"Erreur lors de la lecture de la boîte de réception {self.path}: {str(e)}")
+        if entries:
+            logger.info(f"Boîte de réception: {len(entries)} nouveaux fichiers")
+        return entries
@@ -0,0 +1,441 @@
+"""
+Station TV - Scheduling
+Répartition des fichiers entre processus sur le temps de traitement prédit
+(durée × facteur de coût du modèle): LPT par tas, MULTIFIT et différenciation
+de Karmarkar-Karp, avec le makespan et le déséquilibre prédits avant lancement.
+Modèles mélangés: nombre de workers par modèle sous contraintes de cœurs et de
+RAM, chaque worker gardant un seul modèle chargé.
+"""
+
+import heapq
+import itertools
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Secondes de calcul par seconde d'audio et par processus (inverse du "× temps réel"),
+# valeurs CPU indicatives surchargées par batch.cost_factors
+DEFAULT_COST_FACTORS = {
+    "tiny": 0.1,
+    "base": 0.2,
+    "small": 0.5,
+    "medium": 1.5,
+    "large": 3.0,
+    "large-v2": 3.0,
+    "large-v3": 3.0,
+}
+
+ALGORITHMS = ("lpt", "multifit", "kk", "best")
+
+
+def duration_cost(model_name: str, cost_factors: Optional[Dict[str, float]] = None) -> Callable:
+    """
+    Construit la fonction de coût d'un fichier: durée × facteur de coût du modèle.
+    
+    Args:
+        model_name: Modèle Whisper utilisé
+        cost_factors: Facteurs de coût par modèle (surcharge DEFAULT_COST_FACTORS)
+    
+    Returns:
+        Fonction Audio -> temps de traitement prédit (secondes)
+    """
+    factors = dict(DEFAULT_COST_FACTORS, **(cost_factors or {}))
+    factor = factors.get(model_name, 1.0)
+    return lambda audio: audio.duree * factor
+
+
+def lpt(items: Sequence, n: int, cost: Callable, max_per_list: int = 0) -> List[List]:
+    """
+    Longest Processing Time: chaque fichier, du plus coûteux au moins coûteux,
+    va à la liste la moins chargée (tas de n listes, O(N log N + N log n)).
+    
+    Args:
+        items: Fichiers à répartir
+        n: Nombre de listes
+        cost: Fonction fichier -> coût
+        max_per_list: Nombre max de fichiers par liste (0 = illimité)
+    
+    Returns:
+        n listes de fichiers
+    """
+    listes = [[] for _ in range(n)]
+    # (charge, index): à charge égale, la liste de plus petit index (comme glouton_n_listes)
+    heap = [(0.0, i) for i in range(n)]
+    ordered = sorted(items, key=cost, reverse=True)
+    
+    for position, item in enumerate(ordered):
+        if not heap:
+            logger.warning(
+                f"Toutes les listes ont atteint la limite de {max_per_list} fichiers. "
+                f"{len(ordered) - position} fichiers non assignés."
+            )
+            break
+        load, index = heapq.heappop(heap)
+        listes[index].append(item)
+        # Liste pleine: retirée du tas
+        if max_per_list <= 0 or len(listes[index]) < max_per_list:
+            heapq.heappush(heap, (load + cost(item), index))
+    return listes
+
+
+class _FirstFitTree:
+    """
+    Arbre de segments sur la capacité restante des listes: trouve en O(log n)
+    la première liste pouvant recevoir un coût (first-fit).
+    """
+    
+    def __init__(self, n: int, capacity: float):
+        self.size = 1
+        while self.size < n:
+            self.size *= 2
+        self.tree = [float("-inf")] * (2 * self.size)
+        for i in range(n):
+            self.tree[self.size + i] = capacity
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+    
+    def first_fit(self, value: float) -> int:
+        """Index de la première liste de capacité restante ≥ value, ou -1."""
+        if self.tree[1] < value:
+            return -1
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.tree[2 * node] >= value else 2 * node + 1
+        return node - self.size
+    
+    def update(self, index: int, remaining: float):
+        """Fixe la capacité restante d'une liste."""
+        node = self.size + index
+        self.tree[node] = remaining
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+
+def _first_fit_decreasing(
+    ordered: Sequence,
+    costs: Sequence[float],
+    n: int,
+    capacity: float,
+    max_per_list: int
+) -> Optional[List[List]]:
+    """Range des fichiers triés par coût décroissant dans n listes de capacité donnée (None si impossible)."""
+    tree = _FirstFitTree(n, capacity)
+    listes = [[] for _ in range(n)]
+    remaining = [capacity] * n
+    for item, item_cost in zip(ordered, costs):
+        index = tree.first_fit(item_cost)
+        if index < 0:
+            return None
+        listes[index].append(item)
+        remaining[index] -= item_cost
+        full = max_per_list > 0 and len(listes[index]) >= max_per_list
+        tree.update(index, float("-inf") if full else remaining[index])
+    return listes
+
+
+def multifit(
+    items: Sequence,
+    n: int,
+    cost: Callable,
+    max_per_list: int = 0,
+    iterations: int = 10
+) -> List[List]:
+    """
+    MULTIFIT: recherche dichotomique de la plus petite capacité pour laquelle
+    first-fit decreasing range tous les fichiers dans n listes
+    (borne 13/11 de l'optimum, contre 4/3 pour LPT).
+    
+    Args:
+        items: Fichiers à répartir
+        n: Nombre de listes
+        cost: Fonction fichier -> coût
+        max_per_list: Nombre max de fichiers par liste (0 = illimité)
+        iterations: Nombre d'itérations de la dichotomie
+    
+    Returns:
+        n listes de fichiers (LPT si aucune capacité testée ne suffit)
+    """
+    ordered = sorted(items, key=cost, reverse=True)
+    costs = [cost(item) for item in ordered]
+    if not ordered:
+        return [[] for _ in range(n)]
+    
+    total = sum(costs)
+    low = max(total / n, costs[0])
+    high = max(2 * total / n, costs[0])
+    best = None
+    for _ in range(iterations):
+        capacity = (low + high) / 2
+        listes = _first_fit_decreasing(ordered, costs, n, capacity, max_per_list)
+        if listes is None:
+            low = capacity
+        else:
+            best, high = listes, capacity
+    
+    if best is None:
+        best = _first_fit_decreasing(ordered, costs, n, high, max_per_list)
+    return best if best is not None else lpt(items, n, cost, max_per_list)
+
+
+def _join(first, second):
+    """Concatène deux arbres d'indices en O(1) (aplatis une seule fois à la fin)."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return (first, second)
+
+
+def _flatten(node) -> List[int]:
+    """Aplatit un arbre de concaténations (tuples imbriqués) en indices de fichiers."""
+    flat, stack = [], [node]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        if isinstance(node, tuple):
+            stack.extend(node)
+        else:
+            flat.append(node)
+    return flat
+
+
+def karmarkar_karp(items: Sequence, n: int, cost: Callable) -> List[List]:
+    """
+    Différenciation de Karmarkar-Karp à n listes: les deux partitions partielles
+    les plus déséquilibrées sont fusionnées en associant les sous-ensembles lourds
+    de l'une aux légers de l'autre, jusqu'à n'en garder qu'une.
+    
+    Args:
+        items: Fichiers à répartir
+        n: Nombre de listes
+        cost: Fonction fichier -> coût
+    
+    Returns:
+        n listes de fichiers
+    """
+    if not items:
+        return [[] for _ in range(n)]
+    
+    # Partition partielle: sous-ensembles non vides (somme, arbre d'indices) triés par
+    # somme décroissante, complétés implicitement par des sous-ensembles vides jusqu'à n
+    counter = itertools.count()
+    heap = []
+    for index, item in enumerate(items):
+        heapq.heappush(heap, (-cost(item), next(counter), [(cost(item), index)]))
+    
+    empty = (0.0, None)
+    while len(heap) > 1:
+        _, _, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        first = first + [empty] * (n - len(first))
+        second = second + [empty] * (n - len(second))
+        merged = [
+            (heavy[0] + light[0], _join(heavy[1], light[1]))
+            for heavy, light in zip(first, reversed(second))
+        ]
+        merged = sorted((subset for subset in merged if subset[1] is not None), key=lambda s: s[0], reverse=True)
+        # Clé du tas: écart entre le sous-ensemble le plus lourd et le plus léger
+        lightest = merged[-1][0] if len(merged) == n else 0.0
+        heapq.heappush(heap, (-(merged[0][0] - lightest), next(counter), merged))
+    
+    _, _, partition = heap[0]
+    # Dans chaque liste, les fichiers les plus coûteux d'abord (comme LPT)
+    listes = [
+        sorted((items[index] for index in _flatten(node)), key=cost, reverse=True)
+        for _, node in partition
+    ]
+    return listes + [[] for _ in range(n - len(listes))]
+
+
+def predict(listes: List[List], cost: Callable) -> Dict:
+    """
+    Prédit le makespan et le déséquilibre d'une répartition.
+    
+    Args:
+        listes: Listes de fichiers par processus
+        cost: Fonction fichier -> coût
+    
+    Returns:
+        Dictionnaire (loads_s, makespan_s, mean_load_s, lower_bound_s, imbalance)
+    """
+    loads = [sum(cost(item) for item in liste) for liste in listes]
+    mean = sum(loads) / len(loads) if loads else 0.0
+    largest = max((cost(item) for liste in listes for item in liste), default=0.0)
+    makespan = max(loads, default=0.0)
+    return {
+        "loads_s": loads,
+        "makespan_s": makespan,
+        "mean_load_s": mean,
+        # Aucune répartition ne fait mieux que max(charge moyenne, plus gros fichier)
+        "lower_bound_s": max(mean, largest),
+        # Makespan / charge moyenne - 1 (0 = équilibre parfait)
+        "imbalance": makespan / mean - 1.0 if mean > 0 else 0.0
+    }
+
+
+def schedule(
+    items: Sequence,
+    n: int,
+    cost: Callable,
+    algorithm: str = "lpt",
+    max_per_list: int = 0
+) -> Tuple[List[List], Dict]:
+    """
+    Répartit des fichiers entre n processus et prédit le makespan.
+    
+    Args:
+        items: Fichiers à répartir
+        n: Nombre de processus
+        cost: Fonction fichier -> temps de traitement prédit (secondes)
+        algorithm: "lpt", "multifit", "kk" ou "best" (meilleur makespan des trois)
+        max_per_list: Nombre max de fichiers par processus (0 = illimité)
+    
+    Returns:
+        Tuple (n listes de fichiers, prédiction avec la clé 'algorithm')
+    """
+    if algorithm not in ALGORITHMS:
+        logger.warning(f"Algorithme de répartition inconnu: {algorithm}, utilisation de lpt")
+        algorithm = "lpt"
+    if algorithm == "kk" and max_per_list > 0:
+        logger.warning("Karmarkar-Karp ne borne pas le nombre de fichiers par liste: utilisation de multifit")
+        algorithm = "multifit"
+    
+    candidates = {"lpt": lambda: lpt(items, n, cost, max_per_list)}
+    if algorithm in ("multifit", "best"):
+        candidates["multifit"] = lambda: multifit(items, n, cost, max_per_list)
+    if algorithm == "kk" or (algorithm == "best" and max_per_list <= 0):
+        candidates["kk"] = lambda: karmarkar_karp(items, n, cost)
+    if algorithm != "best":
+        candidates = {algorithm: candidates[algorithm]}
+    
+    best = None
+    for name, run in candidates.items():
+        listes = run()
+        prediction = dict(predict(listes, cost), algorithm=name)
+        if best is None or prediction["makespan_s"] < best[1]["makespan_s"]:
+            best = (listes, prediction)
+    return best
+
+
+def group_by_model(items: Sequence, channel_models: Dict[str, str], default_model: str) -> Dict[str, List]:
+    """
+    Regroupe les fichiers par modèle: celui de leur chaîne (dossier parent)
+    dans batch.channel_models, sinon le modèle par défaut.
+    
+    Args:
+        items: Fichiers (objets avec un attribut path)
+        channel_models: Modèle par chaîne (ex: {"TF1": "medium"})
+        default_model: Modèle des chaînes non listées
+    
+    Returns:
+        Dictionnaire modèle -> fichiers
+    """
+    groups = {}
+    for item in items:
+        model = channel_models.get(Path(item.path).parent.name, default_model)
+        groups.setdefault(model, []).append(item)
+    return groups
+
+
+def pack_models(
+    loads: Dict[str, float],
+    jobs: Dict[str, int],
+    ram_gb: Dict[str, float],
+    cores: Dict[str, int],
+    total_cores: int,
+    ram_budget_gb: float
+) -> Optional[Dict[str, int]]:
+    """
+    Nombre de workers par modèle sous contraintes de cœurs et de RAM: un worker
+    par modèle, puis chaque worker supplémentaire va au modèle de plus grande
+    charge par worker parmi ceux qui tiennent encore dans les cœurs et la RAM.
+    
+    Args:
+        loads: Temps de traitement prédit total par modèle (secondes)
+        jobs: Nombre de fichiers par modèle (borne le nombre de workers)
+        ram_gb: RAM d'un worker par modèle (Go)
+        cores: Cœurs d'un worker par modèle
+        total_cores: Cœurs disponibles
+        ram_budget_gb: RAM disponible (Go)
+    
+    Returns:
+        Dictionnaire modèle -> nombre de workers, ou None si un worker par modèle ne tient pas
+    """
+    models = [model for model in loads if jobs.get(model, 0) > 0]
+    workers = {model: 1 for model in models}
+    used_cores = sum(cores[model] for model in models)
+    used_ram = sum(ram_gb[model] for model in models)
+    if used_cores > total_cores or used_ram > ram_budget_gb:
+        logger.error(
+            f"Modèles {models} impossibles à placer: {used_cores}/{total_cores} cœurs, "
+            f"{used_ram:.1f}/{ram_budget_gb:.1f} Go pour un worker par modèle"
+        )
+        return None
+    
+    while True:
+        candidates = [
+            model for model in models
+            if workers[model] < jobs[model]
+            and used_cores + cores[model] <= total_cores
+            and used_ram + ram_gb[model] <= ram_budget_gb
+        ]
+        if not candidates:
+            return workers
+        # Goulot: modèle de plus grande charge par worker
+        model = max(candidates, key=lambda m: loads[m] / workers[m])
+        workers[model] += 1
+        used_cores += cores[model]
+        used_ram += ram_gb[model]
+
+
+def schedule_mixed(
+    groups: Dict[str, List],
+    workers: Dict[str, int],
+    costs: Dict[str, Callable],
+    algorithm: str = "lpt",
+    max_per_list: int = 0
+) -> Tuple[List[List], List[str], Dict]:
+    """
+    Répartit les fichiers de chaque modèle entre les workers de ce modèle.
+    
+    Args:
+        groups: Fichiers par modèle (group_by_model)
+        workers: Nombre de workers par modèle (pack_models)
+        costs: Fonction fichier -> temps prédit, par modèle
+        algorithm: Algorithme de répartition (voir schedule)
+        max_per_list: Nombre max de fichiers par worker (0 = illimité)
+    
+    Returns:
+        Tuple (listes de fichiers, modèle de chaque liste, prédiction sur l'ensemble)
+    """
+    listes, modeles = [], []
+    for model, count in workers.items():
+        model_listes, _ = schedule(groups[model], count, costs[model], algorithm, max_per_list)
+        listes.extend(model_listes)
+        modeles.extend([model] * count)
+    
+    owner = {id(item): model for model, items in groups.items() for item in items}
+    prediction = predict(listes, lambda item: costs[owner[id(item)]](item))
+    return listes, modeles, prediction
+
+
+def model_config(config: dict, model: str) -> dict:
+    """
+    Configuration d'un worker dédié à un modèle.
+    
+    Args:
+        config: Configuration
+        model: Modèle du worker
+    
+    Returns:
+        Configuration du worker (copie si le modèle change)
+    """
+    whisper_config = config.get('whisper', {})
+    if whisper_config.get('model') == model:
+        return config
+    return dict(config, whisper=dict(whisper_config, model=model))
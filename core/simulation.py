@@ -0,0 +1,249 @@
+"""
+Station TV - Simulation
+Simulation à événements discrets des politiques d'ordonnancement du batch
+(dossiers Coeur, glouton, répartitions sur le temps prédit, pool à file
+partagée, vol de travail) sans exécuter Whisper: makespan, cœurs-heures
+inactifs et longueur de la traîne prédits pour chaque nombre de processus.
+"""
+
+import heapq
+import math
+import random
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.affinity import Audio, CPUAffinityManager
+from core.scheduling import schedule
+from core.worker_pool import WorkerPool
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Politiques statiques (listes fixes par processus) puis dynamiques (pool)
+STATIC_POLICIES = ("coeur", "glouton", "lpt", "multifit", "kk", "best")
+DYNAMIC_POLICIES = ("pool", "stealing")
+POLICIES = STATIC_POLICIES + DYNAMIC_POLICIES
+
+
+def coeur_lists(items: Sequence[Audio], n: int, max_per_list: int = 0) -> Optional[List[List[Audio]]]:
+    """
+    Répartition par dossiers Coeur (comme RunBatchWhisper): un processus par
+    dossier CoeurN, en tri naturel, limitée aux n premiers dossiers.
+    
+    Args:
+        items: Fichiers à répartir
+        n: Nombre de processus
+        max_per_list: Nombre max de fichiers par processus (0 = illimité)
+    
+    Returns:
+        Listes de fichiers, ou None si le manifeste n'est pas rangé en dossiers Coeur
+    """
+    dossiers = {}
+    for audio in items:
+        dossiers.setdefault(Path(audio.path).parent.name, []).append(audio)
+    if len(dossiers) <= 1 or not any("coeur" in d.lower() for d in dossiers):
+        return None
+    
+    def natural_sort_key(s):
+        return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', s)]
+    
+    noms = sorted(dossiers, key=natural_sort_key)[:n]
+    return [dossiers[nom][:max_per_list] if max_per_list > 0 else dossiers[nom] for nom in noms]
+
+
+def thread_scaling(
+    cost: Callable,
+    threads: int,
+    reference_threads: int,
+    parallel_fraction: float
+) -> Callable:
+    """
+    Ajuste un coût mesuré avec reference_threads à un autre nombre de threads (loi d'Amdahl).
+    
+    Args:
+        cost: Fonction fichier -> temps de traitement avec reference_threads
+        threads: Threads d'inférence par processus simulé
+        reference_threads: Threads auxquels le coût a été mesuré
+        parallel_fraction: Part parallélisable du calcul (0-1)
+    
+    Returns:
+        Fonction fichier -> temps de traitement avec threads
+    """
+    def amdahl(t):
+        return (1.0 - parallel_fraction) + parallel_fraction / max(t, 1)
+    
+    ratio = amdahl(threads) / amdahl(reference_threads)
+    return lambda audio: cost(audio) * ratio
+
+
+def noisy_cost(items: Sequence[Audio], cost: Callable, sigma: float, seed: int = 0) -> Callable:
+    """
+    Temps "réels" simulés: temps prédit × bruit log-normal, tiré une fois par fichier
+    (le même fichier coûte le même temps quelle que soit la politique).
+    
+    Args:
+        items: Fichiers du manifeste
+        cost: Fonction fichier -> temps de traitement prédit
+        sigma: Écart-type du logarithme du bruit (0 = temps réel = prédit)
+        seed: Graine du tirage
+    
+    Returns:
+        Fonction fichier -> temps de traitement simulé
+    """
+    if sigma <= 0:
+        return cost
+    rng = random.Random(seed)
+    # Bruit de moyenne 1: exp(N(-sigma²/2, sigma))
+    factors = {audio.path: math.exp(rng.gauss(-sigma ** 2 / 2, sigma)) for audio in items}
+    return lambda audio: cost(audio) * factors.get(audio.path, 1.0)
+
+
+def _run_static(listes: List[List[Audio]], actual: Callable) -> List[Dict]:
+    """Exécution de listes fixes: chaque processus enchaîne sa liste."""
+    return [
+        {"busy_s": sum(actual(audio) for audio in liste), "files": len(liste)}
+        for liste in listes
+    ]
+
+
+def _run_pool(listes: List[List[Audio]], actual: Callable, n: int, work_stealing: bool) -> List[Dict]:
+    """
+    Exécution du pool: à chaque fin de fichier, le slot libéré le plus tôt
+    demande un travail à WorkerPool.next_job (même politique que le superviseur).
+    """
+    pool = WorkerPool({}, [[] for _ in range(n)], work_stealing=work_stealing)
+    pool.load_jobs(listes)
+    workers = [{"busy_s": 0.0, "files": 0} for _ in range(n)]
+    
+    # (instant où le slot est libre, slot)
+    events = [(0.0, slot) for slot in range(n)]
+    heapq.heapify(events)
+    while events:
+        now, slot = heapq.heappop(events)
+        audio = pool.next_job(slot)
+        if audio is None:
+            continue
+        duration = actual(audio)
+        workers[slot]["busy_s"] += duration
+        workers[slot]["files"] += 1
+        heapq.heappush(events, (now + duration, slot))
+    return workers
+
+
+def simulate(
+    items: Sequence[Audio],
+    policy: str,
+    workers: int,
+    threads: int,
+    predicted: Callable,
+    actual: Optional[Callable] = None,
+    max_per_list: int = 0,
+    total_cores: int = 0,
+    partitioning: str = "best"
+) -> Optional[Dict]:
+    """
+    Simule le traitement d'un manifeste avec une politique et un nombre de processus.
+    
+    Les politiques statiques répartissent sur le temps prédit, mais chaque
+    processus enchaîne ensuite ses fichiers au temps "réel" (actual); le pool
+    distribue les fichiers au fil des fins de traitement.
+    
+    Args:
+        items: Fichiers du manifeste
+        policy: Politique (POLICIES)
+        workers: Nombre de processus
+        threads: Threads (cœurs) par processus
+        predicted: Fonction fichier -> temps prédit (répartition)
+        actual: Fonction fichier -> temps simulé (défaut: temps prédit)
+        max_per_list: Nombre max de fichiers par processus des politiques statiques (0 = illimité)
+        total_cores: Cœurs de la machine (défaut: workers × threads)
+        partitioning: Algorithme de répartition initiale du vol de travail (batch.partitioning)
+    
+    Returns:
+        Dictionnaire (policy, workers, threads, makespan_s, idle_core_hours, tail_s,
+        busy_s, assigned, unassigned), ou None si la politique ne s'applique pas
+    """
+    if policy not in POLICIES:
+        logger.warning(f"Politique inconnue: {policy}")
+        return None
+    actual = actual or predicted
+    total_cores = total_cores or workers * threads
+    
+    if policy == "coeur":
+        listes = coeur_lists(items, workers, max_per_list)
+        if listes is None:
+            logger.info("Politique coeur ignorée: le manifeste n'est pas rangé en dossiers Coeur")
+            return None
+    elif policy == "glouton":
+        listes = CPUAffinityManager.glouton_n_listes(list(items), workers, max_per_list)
+    elif policy in DYNAMIC_POLICIES:
+        # Répartition initiale du vol de travail: schedule sur le temps prédit (comme RunBatchWhisper)
+        listes = schedule(items, workers, predicted, partitioning)[0] if policy == "stealing" else [list(items)]
+    else:
+        listes, _ = schedule(items, workers, predicted, policy, max_per_list)
+    
+    if policy in DYNAMIC_POLICIES:
+        runs = _run_pool(listes, actual, workers, work_stealing=policy == "stealing")
+    else:
+        runs = _run_static(listes, actual)
+        runs += [{"busy_s": 0.0, "files": 0} for _ in range(workers - len(runs))]
+    
+    busy = [run["busy_s"] for run in runs]
+    makespan = max(busy, default=0.0)
+    assigned = sum(run["files"] for run in runs)
+    return {
+        "policy": policy,
+        "workers": workers,
+        "threads": threads,
+        "makespan_s": makespan,
+        # Cœurs de la machine sans travail: processus finis tôt et cœurs non attribués
+        "idle_core_hours": (total_cores * makespan - threads * sum(busy)) / 3600,
+        # Traîne: du premier processus à court de travail à la fin du dernier
+        "tail_s": makespan - min(busy, default=0.0),
+        "busy_s": busy,
+        "assigned": assigned,
+        "unassigned": len(items) - assigned
+    }
+
+
+def compare_policies(
+    items: Sequence[Audio],
+    policies: Sequence[str],
+    worker_counts: Sequence[int],
+    cost_for_threads: Callable,
+    total_cores: int,
+    noise: float = 0.0,
+    seed: int = 0,
+    max_per_list: int = 0,
+    partitioning: str = "best"
+) -> List[Dict]:
+    """
+    Simule chaque politique pour chaque nombre de processus (cœurs partagés à parts égales).
+    
+    Args:
+        items: Fichiers du manifeste
+        policies: Politiques à comparer
+        worker_counts: Nombres de processus à comparer
+        cost_for_threads: Fonction threads -> (fonction fichier -> temps prédit)
+        total_cores: Cœurs de la machine
+        noise: Écart-type log du temps simulé autour du temps prédit
+        seed: Graine du bruit
+        max_per_list: Nombre max de fichiers par processus des politiques statiques
+        partitioning: Algorithme de répartition initiale du vol de travail
+    
+    Returns:
+        Résultats triés par makespan croissant
+    """
+    results = []
+    for workers in worker_counts:
+        threads = max(1, total_cores // workers)
+        predicted = cost_for_threads(threads)
+        actual = noisy_cost(items, predicted, noise, seed)
+        for policy in policies:
+            result = simulate(
+                items, policy, workers, threads, predicted, actual, max_per_list, total_cores, partitioning
+            )
+            if result is not None:
+                results.append(result)
+    return sorted(results, key=lambda r: (r["unassigned"], r["makespan_s"]))
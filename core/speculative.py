@@ -0,0 +1,310 @@
+"""
+Station TV - Speculative Engine
+Décodage spéculatif Whisper: un petit modèle brouillon (tiny, base) propose
+plusieurs tokens, vérifiés par le grand modèle en une seule passe du décodeur.
+La sortie est identique au décodage glouton du grand modèle.
+"""
+
+import time
+import torch
+import whisper
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.batched import BatchedEngine
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class KVDecoder:
+    """
+    Décodeur Whisper incrémental (cache clés/valeurs) avec retour arrière:
+    les entrées d'auto-attention peuvent être tronquées après un rejet.
+    """
+    
+    def __init__(self, model: whisper.Whisper, audio_features: torch.Tensor):
+        """
+        Initialise le décodeur.
+        
+        Args:
+            model: Modèle Whisper
+            audio_features: Sortie de l'encodeur pour la fenêtre (1, n_audio_ctx, n_state)
+        """
+        self.model = model
+        self.audio_features = audio_features
+        self.cache, self.hooks = model.install_kv_cache_hooks()
+        # Clés/valeurs d'attention croisée: calculées une fois, jamais tronquées
+        self.cross = {
+            module for block in model.decoder.blocks
+            for module in (block.cross_attn.key, block.cross_attn.value)
+        }
+        self.length = 0
+    
+    def feed(self, tokens: List[int]) -> torch.Tensor:
+        """
+        Ajoute des tokens et retourne les logits de chacune de leurs positions.
+        
+        Args:
+            tokens: Tokens à ajouter après les self.length déjà en cache
+        
+        Returns:
+            Logits (len(tokens), n_vocab)
+        """
+        x = torch.tensor([tokens], device=self.audio_features.device)
+        logits = self.model.decoder(x, self.audio_features, kv_cache=self.cache)
+        self.length += len(tokens)
+        return logits[0]
+    
+    def rollback(self, length: int):
+        """
+        Ramène le cache aux length premiers tokens.
+        
+        Args:
+            length: Nombre de tokens conservés
+        """
+        for module, value in self.cache.items():
+            if module not in self.cross and value.shape[1] > length:
+                self.cache[module] = value[:, :length]
+        self.length = min(self.length, length)
+    
+    def close(self):
+        """Retire les hooks du cache et libère les tenseurs."""
+        for hook in self.hooks:
+            hook.remove()
+        self.cache.clear()
+
+
+def speculative_greedy(
+    target,
+    draft,
+    tokens: List[int],
+    select: Callable[[object, List[int]], Tuple[int, float]],
+    eot: int,
+    max_length: int,
+    n_draft: int
+) -> Tuple[List[int], float, Dict]:
+    """
+    Boucle de décodage spéculatif glouton.
+    
+    Le brouillon propose jusqu'à n_draft tokens; la cible calcule en une passe
+    les logits de toutes les positions proposées et garde le plus long préfixe
+    conforme à son propre choix glouton, suivi de sa correction (ou d'un token
+    bonus si tout est accepté). Les tokens émis sont donc ceux du décodage
+    glouton de la cible seule.
+    
+    Args:
+        target: Décodeur cible (feed, rollback, length), avec length == len(tokens) - 1
+        draft: Décodeur brouillon (feed, rollback, length), préfixe quelconque de tokens
+        tokens: Séquence courante (préfixe SOT et premier token choisi par la cible)
+        select: Choix glouton (logits d'une position, séquence précédente) -> (token, log-probabilité)
+        eot: Token de fin de texte
+        max_length: Longueur maximale de la séquence
+        n_draft: Nombre maximal de tokens proposés par passe
+    
+    Returns:
+        Tuple (séquence complète, somme des log-probabilités des tokens ajoutés,
+        statistiques drafted/accepted/target_passes)
+    """
+    tokens = list(tokens)
+    sum_logprob = 0.0
+    stats = {"drafted": 0, "accepted": 0, "target_passes": 0}
+    
+    while tokens[-1] != eot and len(tokens) < max_length:
+        # Propositions du brouillon (il rattrape d'abord les tokens qu'il n'a pas vus)
+        proposals: List[int] = []
+        pending = tokens[draft.length:]
+        budget = min(n_draft, max_length - len(tokens) - 1)
+        while len(proposals) < budget:
+            token, _ = select(draft.feed(pending)[-1], tokens + proposals)
+            proposals.append(token)
+            pending = [token]
+            if token == eot:
+                break
+        
+        # Vérification: une passe de la cible sur le dernier token et les propositions
+        rows = target.feed([tokens[-1]] + proposals)
+        stats["target_passes"] += 1
+        stats["drafted"] += len(proposals)
+        accepted = 0
+        for index in range(len(proposals) + 1):
+            token, logprob = select(rows[index], tokens + proposals[:index])
+            tokens.append(token)
+            sum_logprob += logprob
+            if index == len(proposals) or token != proposals[index]:
+                break
+            accepted += 1
+            if token == eot:
+                break
+        stats["accepted"] += accepted
+        
+        # Caches ramenés au préfixe validé (tous les tokens sauf le dernier)
+        target.rollback(len(tokens) - 1)
+        draft.rollback(min(draft.length, len(tokens) - 1))
+    
+    return tokens, sum_logprob, stats
+
+
+class SpeculativeEngine(BatchedEngine):
+    """
+    Moteur de transcription par décodage spéculatif.
+    
+    Même découpage en fenêtres fixes de 30 s et même assemblage des segments
+    que BatchedEngine (glouton, température 0, sans repli); chaque fenêtre est
+    décodée avec le brouillon et vérifiée par le grand modèle.
+    """
+    
+    def __init__(
+        self,
+        model: whisper.Whisper,
+        draft_model: whisper.Whisper,
+        language: str = "fr",
+        n_draft: int = 5
+    ):
+        """
+        Initialise le moteur.
+        
+        Args:
+            model: Grand modèle (medium, large), dont la sortie est reproduite
+            draft_model: Modèle brouillon (tiny, base) de même vocabulaire
+            language: Langue de transcription
+            n_draft: Nombre maximal de tokens proposés par passe
+        """
+        super().__init__(model, language, batch_size=1)
+        self.draft_model = draft_model
+        self.n_draft = max(1, n_draft)
+        self.task = whisper.decoding.DecodingTask(model, whisper.DecodingOptions(
+            task="transcribe",
+            language=language,
+            temperature=0.0,
+            without_timestamps=False,
+            fp16=False
+        ))
+        self.stats.update({"drafted": 0, "accepted": 0, "target_passes": 0, "tokens": 0})
+    
+    @staticmethod
+    def compatible(model: whisper.Whisper, draft_model: whisper.Whisper) -> bool:
+        """
+        Vérifie qu'un brouillon partage le vocabulaire et les bandes mel du grand modèle
+        (large-v3 n'a pas de petit modèle compatible).
+        
+        Args:
+            model: Grand modèle
+            draft_model: Modèle brouillon
+        
+        Returns:
+            True si le brouillon est utilisable
+        """
+        return (
+            model.dims.n_vocab == draft_model.dims.n_vocab
+            and model.dims.n_mels == draft_model.dims.n_mels
+        )
+    
+    def _select(self, logits: torch.Tensor, tokens: List[int]) -> Tuple[int, float]:
+        """Choix glouton après les mêmes filtres de logits que whisper.decode."""
+        logits = logits.float().unsqueeze(0).clone()
+        prefix = torch.tensor([tokens], device=logits.device)
+        for logit_filter in self.task.logit_filters:
+            logit_filter.apply(logits, prefix)
+        token = int(logits.argmax(dim=-1)[0])
+        return token, float(torch.log_softmax(logits, dim=-1)[0, token])
+    
+    def _decode_window(self, mel: torch.Tensor) -> whisper.DecodingResult:
+        """
+        Décode une fenêtre de 30 s par décodage spéculatif.
+        
+        Args:
+            mel: Log-mel de la fenêtre (n_mels, N_FRAMES)
+        
+        Returns:
+            Résultat au format de whisper.decode
+        """
+        mel = mel.unsqueeze(0).to(self.model.device)
+        target = KVDecoder(self.model, self.model.embed_audio(mel))
+        draft = KVDecoder(self.draft_model, self.draft_model.embed_audio(mel.to(self.draft_model.device)))
+        eot = self.tokenizer.eot
+        prefix = list(self.task.initial_tokens)
+        max_length = self.task.sample_begin + self.task.sample_len
+        
+        try:
+            # Passe initiale de la cible: probabilité de non-parole et premier token
+            logits = target.feed(prefix)
+            no_speech_prob = float(logits[self.task.sot_index].float().softmax(dim=-1)[self.tokenizer.no_speech])
+            token, sum_logprob = self._select(logits[-1], prefix)
+            tokens, logprob, stats = speculative_greedy(
+                target, draft, prefix + [token], self._select, eot, max_length, self.n_draft
+            )
+            sum_logprob += logprob
+        finally:
+            target.close()
+            draft.close()
+        
+        sampled = tokens[self.task.sample_begin:]
+        if eot in sampled:
+            sampled = sampled[:sampled.index(eot)]
+        text = self.tokenizer.decode(sampled).strip()
+        
+        for key in ("drafted", "accepted", "target_passes"):
+            self.stats[key] += stats[key]
+        self.stats["tokens"] += len(sampled)
+        
+        return whisper.DecodingResult(
+            audio_features=None,
+            language=self.language,
+            tokens=sampled,
+            text=text,
+            avg_logprob=sum_logprob / (len(sampled) + 1),
+            no_speech_prob=no_speech_prob,
+            temperature=0.0,
+            compression_ratio=whisper.utils.compression_ratio(text)
+        )
+    
+    def transcribe(
+        self,
+        audios: Dict[str, object],
+        mels: Optional[Dict[str, torch.Tensor]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Transcrit des fichiers fenêtre par fenêtre avec le décodage spéculatif.
+        
+        Args:
+            audios: Dictionnaire identifiant -> chemin ou signal PCM 16 kHz
+            mels: Log-mel précalculés par identifiant (optionnel)
+        
+        Returns:
+            Dictionnaire identifiant -> résultat (text, segments, language)
+        """
+        start_time = time.time()
+        outputs = {}
+        windows_count = 0
+        
+        for key, audio in audios.items():
+            mel = (mels or {}).get(key)
+            if mel is None and isinstance(audio, str):
+                audio = whisper.load_audio(audio)
+            windows, duration = self._windows(audio, mel)
+            with torch.inference_mode():
+                decoded = [(seek, self._decode_window(window)) for seek, window in windows]
+            outputs[key] = self._build_result(decoded, duration)
+            windows_count += len(windows)
+            self.stats["audio_s"] += duration
+        
+        self.stats["files"] += len(audios)
+        self.stats["windows"] += windows_count
+        self.stats["wall_time_s"] += time.time() - start_time
+        logger.info(
+            f"Décodage spéculatif de {len(audios)} fichiers ({windows_count} fenêtres) en "
+            f"{time.time() - start_time:.2f}s, acceptation {self.get_stats()['acceptance_rate'] * 100:.1f}%"
+        )
+        return outputs
+    
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs du décodage spéculatif.
+        
+        Returns:
+            Dictionnaire (drafted, accepted, acceptance_rate, target_passes, tokens, tokens_per_pass...)
+        """
+        stats = dict(self.stats)
+        stats["acceptance_rate"] = stats["accepted"] / stats["drafted"] if stats["drafted"] else 0.0
+        stats["tokens_per_pass"] = stats["tokens"] / stats["target_passes"] if stats["target_passes"] else 0.0
+        return stats
@@ -0,0 +1,528 @@
+"""
+Station TV - Streaming Transcriber
+Transcription en direct des flux TNT: lecture PCM depuis un pipe ou un
+fichier en croissance, tampon circulaire, fenêtres glissantes avec
+recouvrement et émission incrémentale des segments (SRT / JSON Lines).
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+import numpy as np
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Format PCM attendu en entrée: s16le mono 16 kHz (format natif de Whisper)
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+
+class RingBuffer:
+    """
+    Tampon circulaire de PCM float32 indexé en échantillons absolus
+    (depuis le début du flux).
+    """
+    
+    def __init__(self, capacity_s: float, sample_rate: int = SAMPLE_RATE):
+        """
+        Initialise le tampon.
+        
+        Args:
+            capacity_s: Capacité en secondes
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        """
+        self.capacity = int(capacity_s * sample_rate)
+        self.buffer = np.zeros(self.capacity, dtype=np.float32)
+        self.total = 0  # Nombre d'échantillons écrits depuis le début du flux
+    
+    @property
+    def start(self) -> int:
+        """Index absolu du plus ancien échantillon encore disponible."""
+        return max(0, self.total - self.capacity)
+    
+    def write(self, samples: np.ndarray):
+        """
+        Ajoute des échantillons (les plus anciens sont écrasés).
+        
+        Args:
+            samples: Échantillons float32
+        """
+        n = len(samples)
+        if n == 0:
+            return
+        kept = samples[-self.capacity:]
+        first = (self.total + n - len(kept)) % self.capacity
+        head = min(len(kept), self.capacity - first)
+        self.buffer[first:first + head] = kept[:head]
+        self.buffer[:len(kept) - head] = kept[head:]
+        self.total += n
+    
+    def read(self, start: int, end: int) -> np.ndarray:
+        """
+        Lit les échantillons [start, end[ (indices absolus).
+        
+        Args:
+            start: Premier échantillon (borné au plus ancien disponible)
+            end: Fin exclue (bornée au total écrit)
+        
+        Returns:
+            Copie des échantillons
+        """
+        start = max(start, self.start)
+        end = min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        return np.take(self.buffer, np.arange(start, end) % self.capacity)
+
+
+class SegmentWriter:
+    """
+    Écriture incrémentale des segments finalisés (SRT et/ou JSON Lines).
+    """
+    
+    def __init__(self, output_base: str, formats: List[str]):
+        """
+        Initialise les fichiers de sortie.
+        
+        Args:
+            output_base: Chemin de sortie sans extension
+            formats: Formats à produire ('srt', 'json')
+        """
+        self.srt_path = f"{output_base}.srt" if 'srt' in formats else None
+        self.json_path = f"{output_base}.jsonl" if 'json' in formats else None
+        self.count = 0
+        
+        Path(output_base).parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.srt_path, self.json_path):
+            if path:
+                open(path, 'w', encoding='utf-8').close()
+    
+    def write(self, segment: Dict):
+        """
+        Ajoute un segment aux sorties (écriture immédiate sur disque).
+        
+        Args:
+            segment: Segment avec start, end, text en temps absolu du flux
+        """
+        from core.transcription import WhisperTranscriber
+        
+        self.count += 1
+        if self.srt_path:
+            with open(self.srt_path, 'a', encoding='utf-8') as f:
+                f.write(f"{self.count}\n")
+                f.write(
+                    f"{WhisperTranscriber.format_timestamp_srt(segment['start'])} --> "
+                    f"{WhisperTranscriber.format_timestamp_srt(segment['end'])}\n"
+                )
+                f.write(f"{segment['text'].strip()}\n\n")
+        if self.json_path:
+            with open(self.json_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(segment, ensure_ascii=False) + "\n")
+
+
+class StreamingTranscriber:
+    """
+    Transcription d'un flux en fenêtres glissantes.
+    
+    Une fenêtre de window_s secondes est transcrite dès qu'elle est pleine.
+    Seuls les segments qui se terminent avant la zone de recouvrement
+    (les overlap_s dernières secondes) sont finalisés; la fenêtre suivante
+    repart de la fin du dernier segment finalisé. Si le retard dépasse
+    max_lag_s, l'audio en attente le plus ancien est abandonné pour
+    garder une latence bornée.
+    
+    Avec run(), la source est lue dans un thread dédié: le tampon se remplit
+    au rythme du flux pendant la transcription, et le retard est mesuré sur
+    l'horloge du flux (secondes écoulées depuis le début du flux, ou audio
+    reçu si la source va plus vite) face à l'audio finalisé.
+    """
+    
+    def __init__(
+        self,
+        transcribe_fn: Callable[[np.ndarray], Dict],
+        stream_name: str,
+        writer: Optional[SegmentWriter] = None,
+        window_s: float = 30.0,
+        overlap_s: float = 5.0,
+        max_lag_s: float = 60.0,
+        sample_rate: int = SAMPLE_RATE
+    ):
+        """
+        Initialise le transcripteur de flux.
+        
+        Args:
+            transcribe_fn: Fonction signal -> résultat Whisper (text, segments)
+            stream_name: Nom du flux (chaîne)
+            writer: Sortie des segments finalisés (optionnelle)
+            window_s: Durée d'une fenêtre (secondes, 30 max pour Whisper)
+            overlap_s: Recouvrement entre fenêtres (secondes)
+            max_lag_s: Retard maximal toléré avant abandon d'audio (secondes)
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        """
+        self.transcribe_fn = transcribe_fn
+        self.stream_name = stream_name
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.window = int(window_s * sample_rate)
+        self.overlap = int(min(overlap_s, window_s / 2) * sample_rate)
+        self.max_lag = int(max_lag_s * sample_rate)
+        
+        self.ring = RingBuffer(max(window_s * 2, max_lag_s + window_s), sample_rate)
+        self.window_start = 0  # Premier échantillon non finalisé
+        self._pending = b""   # Octet impair en attente entre deux lectures
+        self._arrivals = deque()  # (total d'échantillons reçus, heure d'arrivée)
+        # Tampon partagé entre le thread de lecture et la transcription
+        self._lock = threading.Condition()
+        self._stream_start: Optional[float] = None  # Réception du premier échantillon
+        self._stream_end: Optional[float] = None    # Fin de la source
+        self._reading = False
+        
+        self.segments_emitted = 0
+        self.dropped_s = 0.0
+        self.lag_samples: List[float] = []
+        self.latencies: List[float] = []
+        
+        logger.info(
+            f"StreamingTranscriber '{stream_name}': fenêtre {window_s}s, "
+            f"recouvrement {overlap_s}s, retard max {max_lag_s}s"
+        )
+    
+    def feed(self, data: bytes) -> List[Dict]:
+        """
+        Ajoute des octets PCM s16le et transcrit les fenêtres prêtes
+        (appel synchrone, sans thread de lecture).
+        
+        Args:
+            data: Octets PCM
+        
+        Returns:
+            Segments finalisés pendant cet appel
+        """
+        self._write(data)
+        
+        emitted = []
+        while self.ring.total - self.window_start >= self.window:
+            self._enforce_max_lag()
+            emitted.extend(self._process_window(final=False))
+        return emitted
+    
+    def flush(self) -> List[Dict]:
+        """
+        Transcrit et finalise l'audio restant (fin de flux).
+        
+        Returns:
+            Segments finalisés
+        """
+        if self._stream_end is None:
+            self._stream_end = time.time()
+        emitted = []
+        while self.ring.total > self.window_start:
+            emitted.extend(self._process_window(final=True))
+        return emitted
+    
+    def _write(self, data: bytes, block: bool = False):
+        """
+        Ajoute des octets PCM s16le au tampon et note leur heure de réception.
+        
+        Args:
+            data: Octets PCM
+            block: Attendre que la transcription libère de la place plutôt
+                   qu'écraser l'audio non finalisé (thread de lecture)
+        """
+        data = self._pending + data
+        usable = len(data) - len(data) % BYTES_PER_SAMPLE
+        self._pending = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        
+        with self._lock:
+            # Une fenêtre complète est en attente: la transcription avancera window_start
+            while (
+                block and self._reading
+                and self.ring.total + len(samples) - self.window_start > self.ring.capacity
+                and self.ring.total - self.window_start >= self.window
+            ):
+                self._lock.wait(0.5)
+            if self._stream_start is None:
+                self._stream_start = time.time()
+            self.ring.write(samples)
+            self._arrivals.append((self.ring.total, time.time()))
+            self._lock.notify_all()
+    
+    def _stream_position(self) -> int:
+        """
+        Position du flux en échantillons: secondes écoulées depuis le premier
+        échantillon (horloge murale), ou audio reçu si la source va plus vite.
+        """
+        if self._stream_start is None:
+            return self.ring.total
+        now = self._stream_end or time.time()
+        return max(self.ring.total, int((now - self._stream_start) * self.sample_rate))
+    
+    def _enforce_max_lag(self):
+        """Mesure le retard et abandonne l'audio le plus ancien s'il dépasse le maximum."""
+        with self._lock:
+            lag = self._stream_position() - self.window_start
+            self.lag_samples.append(lag / self.sample_rate)
+            new_start = self.ring.total - self.window
+            if lag <= self.max_lag or new_start <= self.window_start:
+                return
+            self.dropped_s += (new_start - self.window_start) / self.sample_rate
+            logger.warning(
+                f"[{self.stream_name}] Retard {lag / self.sample_rate:.1f}s > "
+                f"{self.max_lag / self.sample_rate:.0f}s: {(new_start - self.window_start) / self.sample_rate:.1f}s abandonnés"
+            )
+            self.window_start = new_start
+            self._lock.notify_all()
+    
+    def _latency(self, sample_index: int) -> Optional[float]:
+        """
+        Délai entre la diffusion d'un échantillon et sa finalisation: heure de
+        réception, ou heure de diffusion d'après l'horloge du flux si la
+        lecture elle-même a pris du retard.
+        """
+        arrival = next((at for total, at in self._arrivals if total >= sample_index), None)
+        if arrival is None:
+            return None
+        if self._stream_start is not None:
+            arrival = min(arrival, self._stream_start + sample_index / self.sample_rate)
+        return time.time() - arrival
+    
+    def _process_window(self, final: bool) -> List[Dict]:
+        """
+        Transcrit la fenêtre courante et finalise les segments stables.
+        
+        Args:
+            final: Fin de flux (tous les segments sont finalisés)
+        
+        Returns:
+            Segments finalisés
+        """
+        with self._lock:
+            end = min(self.ring.total, self.window_start + self.window)
+            samples = self.ring.read(self.window_start, end)
+            offset = self.window_start / self.sample_rate
+            is_last = final and end >= self.ring.total
+        commit_limit = end if is_last else end - self.overlap
+        
+        # Transcription hors verrou: le thread de lecture continue de remplir le tampon
+        result = self.transcribe_fn(samples) if len(samples) > 0 else {"segments": []}
+        
+        emitted = []
+        committed_end = self.window_start
+        for segment in result.get("segments", []):
+            seg_end = offset + segment["end"]
+            if int(seg_end * self.sample_rate) > commit_limit:
+                break
+            finalized = {
+                "stream": self.stream_name,
+                "start": offset + segment["start"],
+                "end": seg_end,
+                "text": segment["text"]
+            }
+            emitted.append(finalized)
+            committed_end = int(seg_end * self.sample_rate)
+            
+            with self._lock:
+                latency = self._latency(committed_end)
+            if latency is not None:
+                self.latencies.append(latency)
+            if self.writer:
+                self.writer.write(finalized)
+        
+        with self._lock:
+            # Pas de segment stable: avancer d'un pas (fenêtre - recouvrement) pour ne pas boucler
+            if is_last:
+                self.window_start = end
+            elif committed_end > self.window_start:
+                self.window_start = committed_end
+            else:
+                self.window_start = end - self.overlap
+            
+            while self._arrivals and self._arrivals[0][0] < self.window_start:
+                self._arrivals.popleft()
+            self._lock.notify_all()
+        
+        self.segments_emitted += len(emitted)
+        return emitted
+    
+    def get_stats(self) -> Dict:
+        """
+        Retourne les statistiques du flux.
+        
+        Returns:
+            Dictionnaire (audio reçu/finalisé, abandonné, retard et latence)
+        """
+        return {
+            "stream": self.stream_name,
+            "audio_received_s": self.ring.total / self.sample_rate,
+            "audio_committed_s": self.window_start / self.sample_rate,
+            "audio_dropped_s": self.dropped_s,
+            "segments": self.segments_emitted,
+            "lag_s_current": max(0, self._stream_position() - self.window_start) / self.sample_rate,
+            "lag_s_max": max(self.lag_samples, default=0.0),
+            "lag_s_avg": sum(self.lag_samples) / len(self.lag_samples) if self.lag_samples else 0.0,
+            "latency_s_max": max(self.latencies, default=0.0),
+            "latency_s_avg": sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+        }
+    
+    def run(self, source: BinaryIO, read_bytes: int = SAMPLE_RATE * BYTES_PER_SAMPLE, follow: bool = False,
+            idle_timeout_s: float = 10.0) -> Dict:
+        """
+        Consomme une source PCM jusqu'à sa fin. La source est lue dans un
+        thread dédié, les fenêtres sont transcrites dans le thread appelant.
+        
+        Args:
+            source: Flux binaire (stdout d'un pipe ffmpeg, FIFO ou fichier)
+            read_bytes: Taille des lectures (octets, 1 s par défaut)
+            follow: Suivre un fichier en croissance (attendre les nouvelles données)
+            idle_timeout_s: Fin du flux après ce délai sans données (mode follow)
+        
+        Returns:
+            Statistiques du flux
+        """
+        self._reading = True
+        reader = threading.Thread(
+            target=self._read_source, args=(source, read_bytes, follow, idle_timeout_s),
+            name=f"stream-reader-{self.stream_name}", daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                with self._lock:
+                    while self._reading and self.ring.total - self.window_start < self.window:
+                        self._lock.wait()
+                    if self.ring.total - self.window_start < self.window:
+                        break
+                self._enforce_max_lag()
+                self._process_window(final=False)
+        finally:
+            with self._lock:
+                self._reading = False
+                self._lock.notify_all()
+        reader.join()
+        
+        self.flush()
+        stats = self.get_stats()
+        logger.info(
+            f"[{self.stream_name}] Flux terminé: {stats['audio_received_s']:.0f}s reçus, "
+            f"{stats['segments']} segments, retard max {stats['lag_s_max']:.1f}s, "
+            f"latence moyenne {stats['latency_s_avg']:.1f}s, {stats['audio_dropped_s']:.1f}s abandonnés"
+        )
+        return stats
+    
+    def _read_source(self, source: BinaryIO, read_bytes: int, follow: bool, idle_timeout_s: float):
+        """
+        Thread de lecture: remplit le tampon au rythme de la source,
+        indépendamment de la vitesse de transcription.
+        
+        Args:
+            source: Flux binaire
+            read_bytes: Taille des lectures (octets)
+            follow: Suivre un fichier en croissance
+            idle_timeout_s: Fin du flux après ce délai sans données (mode follow)
+        """
+        last_data = time.time()
+        try:
+            while self._reading:
+                data = source.read(read_bytes)
+                if data:
+                    last_data = time.time()
+                    self._write(data, block=True)
+                    continue
+                if not follow or time.time() - last_data > idle_timeout_s:
+                    break
+                time.sleep(0.2)
+        except (OSError, ValueError) as e:
+            logger.error(f"[{self.stream_name}] Erreur de lecture de la source: {str(e)}")
+        finally:
+            with self._lock:
+                self._stream_end = time.time()
+                self._reading = False
+                self._lock.notify_all()
+
+
+def open_ffmpeg_pcm(input_url: str, realtime: bool = False) -> subprocess.Popen:
+    """
+    Lance ffmpeg pour décoder une source (fichier, URL, périphérique) en PCM
+    s16le mono 16 kHz sur sa sortie standard.
+    
+    Args:
+        input_url: Source ffmpeg
+        realtime: Lire à la vitesse réelle (-re), pour simuler un flux en direct
+    
+    Returns:
+        Processus ffmpeg (lire process.stdout)
+    """
+    cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error']
+    if realtime:
+        cmd.append('-re')
+    cmd += ['-i', input_url, '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-']
+    logger.info(f"Source ffmpeg: {input_url}{' (temps réel)' if realtime else ''}")
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE)
+
+
+def create_stream_transcriber(
+    config: dict,
+    stream_name: str,
+    cpu_cores: Optional[List[int]] = None,
+    output_dir: Optional[str] = None
+) -> Optional[StreamingTranscriber]:
+    """
+    Construit un StreamingTranscriber adossé à un modèle Whisper chargé
+    une fois pour toute la durée du flux.
+    
+    Args:
+        config: Configuration (sections whisper et streaming)
+        stream_name: Nom du flux (chaîne)
+        cpu_cores: Cœurs CPU à utiliser (optionnel)
+        output_dir: Répertoire des sorties (optionnel, utilise streaming.output_dir)
+    
+    Returns:
+        StreamingTranscriber ou None si le modèle n'a pas pu être chargé
+    """
+    import torch
+    from core.affinity import CPUAffinityManager
+    from core.models import ModelManager
+    
+    whisper_config = config.get('whisper', {})
+    streaming_config = config.get('streaming', {})
+    model_name = whisper_config.get('model', 'small')
+    language = whisper_config.get('language', 'fr')
+    
+    if cpu_cores:
+        CPUAffinityManager.set_cpu_affinity(cpu_cores)
+        torch.set_num_threads(config.get('num_threads', len(cpu_cores)))
+    
+    manager = ModelManager(device=whisper_config.get('device', 'cpu'))
+    model = manager.load_model(model_name)
+    if model is None:
+        return None
+    model.eval()
+    
+    def transcribe_fn(samples: np.ndarray) -> Dict:
+        with torch.inference_mode():
+            # Pas de conditionnement sur la fenêtre précédente: les fenêtres se recouvrent
+            return model.transcribe(samples, language=language, condition_on_previous_text=False)
+    
+    output_dir = output_dir or streaming_config.get('output_dir', 'test_output/live')
+    timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
+    output_base = os.path.join(
+        output_dir, f"{timestamp}_{stream_name}_live_st_{manager.get_model_suffix(model_name)}"
+    )
+    formats = [fmt for fmt in ('srt', 'json') if streaming_config.get('output_formats', {}).get(fmt, True)]
+    
+    return StreamingTranscriber(
+        transcribe_fn,
+        stream_name,
+        writer=SegmentWriter(output_base, formats),
+        window_s=streaming_config.get('window_s', 30),
+        overlap_s=streaming_config.get('overlap_s', 5),
+        max_lag_s=streaming_config.get('max_lag_s', 60)
+    )
@@ -7,23 +7,83 @@ Adapté et amélioré depuis WhisperTranscriptor.py
 import gc
 import time
 import os
+import queue
+import numpy as np
 import torch
+import whisper
 import warnings
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional
-from multiprocessing import Process
+from typing import Dict, List, Optional, Tuple
+from multiprocessing import Process, Queue
 from datetime import datetime
 
+from core.admission import MemoryAdmission
 from core.models import ModelManager
 from core.affinity import CPUAffinityManager
+from core.alignment import WordAligner
+from core.backends import create_backend
+from core.batched import BatchedEngine
+from core.cascade import ModelCascade
+from core.decoding import FallbackMeter
+from core.loop_guard import RepetitionGuard
+from core.speculative import SpeculativeEngine
+from preprocessing.segmenter import AudioSegmenter
+from preprocessing.pcm_cache import PCMCache
+from preprocessing.mel_cache import MelCache
+from preprocessing.vad import VoiceActivityDetector
+from preprocessing.music_detector import SpeechMusicClassifier, MUSIC
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Champs optionnels des lignes de tracker, dans l'ordre d'écriture: clé -> format
+TRACKER_FIELDS = {
+    "ignoré": ".2f", "musique": ".2f", "économisé": ".2f", "chaîne": "", "boucles": "d",
+    "profil": "", "replis": "d", "temps replis": ".2f", "modèle": "", "threads": "d",
+    "classe": "", "échéance": ".0f", "fin": ".0f",
+}
+
 # Supprimer les avertissements FP16
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead")
 
 
+def _transcribe_chunks_on_cores(
+    config: dict,
+    model_name: str,
+    audio_path: str,
+    cpu_cores: List[int],
+    chunk_queue: Queue,
+    result_queue: Queue
+):
+    """
+    Processus de transcription de morceaux, épinglé sur un jeu de cœurs.
+    Traite les morceaux de la file jusqu'à recevoir None.
+    
+    Args:
+        config: Configuration
+        model_name: Nom du modèle
+        audio_path: Fichier d'origine (pour les logs)
+        cpu_cores: Cœurs CPU de ce processus
+        chunk_queue: File de (index, signal PCM 16 kHz)
+        result_queue: File de (index, résultat, temps de traitement)
+    """
+    transcriber = WhisperTranscriber(config)
+    
+    while True:
+        item = chunk_queue.get()
+        if item is None:
+            break
+        index, samples = item
+        start_time = time.time()
+        result = transcriber.transcribe_on_specific_cores(
+            f"{audio_path}#{index}", cpu_cores, model_name, audio=samples
+        )
+        result_queue.put((index, result, time.time() - start_time))
+    
+    transcriber.backend.unload_all()
+
+
 class WhisperTranscriber:
     """
     Classe principale de transcription audio avec Whisper.
@@ -37,10 +97,51 @@ class WhisperTranscriber:
             config: Dictionnaire de configuration
         """
         self.config = config
-        self.model_manager = ModelManager(device=config.get('whisper', {}).get('device', 'cpu'))
+        self.model_manager = ModelManager(
+            device=config.get('whisper', {}).get('device', 'cpu'),
+            cache_budget_gb=config.get('whisper', {}).get('model_cache_gb', 0.0),
+            weights_dir=(
+                config.get('whisper', {}).get('weights_dir', 'models/mmap')
+                if config.get('whisper', {}).get('shared_weights', False) else None
+            ),
+            quantize=config.get('whisper', {}).get('quantization', 'none') == 'int8',
+            quantized_dir=config.get('whisper', {}).get('quantized_dir', 'models/int8')
+        )
+        self.backend = create_backend(config, self.model_manager)
+        # Modèle chargé d'avance (admission mémoire), repris par la première transcription
+        self._preloaded = None
         self.model_name = config.get('whisper', {}).get('model', 'small')
         self.language = config.get('whisper', {}).get('language', 'fr')
         
+        # Moteur de décodage: "standard" (model.transcribe) ou "speculative" (brouillon draft_model)
+        self.decoding_engine = config.get('whisper', {}).get('decoding_engine', 'standard')
+        self.draft_model = config.get('whisper', {}).get('draft_model', 'tiny')
+        self.speculative_tokens = config.get('whisper', {}).get('speculative_tokens', 5)
+        
+        # Profil de décodage (résolu par le moteur) et mesure du coût des replis en température
+        self.fallback_meter = FallbackMeter(self.backend.profile)
+        
+        # Garde anti-boucle: fenêtres qui répètent un n-gramme closes en cours de décodage
+        loop_guard = config.get('whisper', {}).get('loop_guard', {})
+        self.loop_guard = (
+            RepetitionGuard(
+                min_repeats=loop_guard.get('min_repeats', 3),
+                min_loop_tokens=loop_guard.get('min_loop_tokens', 16),
+                compression_ratio=loop_guard.get('compression_ratio', 2.4)
+            )
+            if loop_guard.get('enabled', False) else None
+        )
+        
+        # Cascade: segments peu confiants retranscrits par un modèle plus grand
+        self.cascade = (
+            ModelCascade(
+                self.backend,
+                config.get('whisper', {}).get('cascade_model', 'medium'),
+                config.get('whisper', {}).get('confidence_threshold', 0.6)
+            )
+            if config.get('whisper', {}).get('cascade', False) else None
+        )
+        
         # Formats de sortie
         output_formats = config.get('whisper', {}).get('output_formats', {})
         self.transcription_txt = output_formats.get('txt', True)
@@ -48,16 +149,122 @@ class WhisperTranscriber:
         self.transcription_csv = output_formats.get('csv', False)
         self.transcription_json = output_formats.get('json', False)
         
+        # Horodatage par mot: pendant le décodage ("inline"), en étape séparée après
+        # l'écriture des segments ("deferred", scripts/RunWordAlignment.py) ou jamais ("off")
+        self.word_alignment = (
+            config.get('whisper', {}).get('word_alignment', 'inline')
+            if config.get('whisper', {}).get('word_timestamps', True) and self.transcription_srt else 'off'
+        )
+        self.alignment_dir = config.get('whisper', {}).get('alignment_dir', 'test_output/alignment')
+        
+        # Inférence par lots des clips courts (1 = désactivé)
+        self.batch_size = config.get('whisper', {}).get('batch_size', 1)
+        
+        # Mode découpé: transcription parallèle des fichiers longs par morceaux
+        preprocessing = config.get('preprocessing', {})
+        self.chunking_enabled = preprocessing.get('chunking', False)
+        self.segmenter = AudioSegmenter(
+            min_duration_s=preprocessing.get('segment_duration_min', 5) * 60,
+            max_duration_s=preprocessing.get('segment_duration_max', 20) * 60
+        )
+        
+        # Cache du PCM décodé (ffmpeg une seule fois par fichier)
+        self.pcm_cache = (
+            PCMCache(
+                preprocessing.get('pcm_cache_dir', 'test_output/cache/pcm'),
+                preprocessing.get('pcm_cache_max_gb', 20)
+            )
+            if preprocessing.get('pcm_cache', False) else None
+        )
+        
+        # Cache des log-mel (partagé entre modèles de même nombre de bandes)
+        self.mel_cache = (
+            MelCache(
+                preprocessing.get('mel_cache_dir', 'test_output/cache/mel'),
+                preprocessing.get('mel_cache_max_gb', 20)
+            )
+            if preprocessing.get('mel_cache', False) else None
+        )
+        
+        # Pré-passe VAD: seules les zones de parole sont transcrites
+        self.vad = (
+            VoiceActivityDetector(threshold_db=preprocessing.get('silence_threshold_db', -40))
+            if preprocessing.get('remove_silence', False) else None
+        )
+        
+        # Discrimination parole/musique: zones de musique ignorées, confiées
+        # à un petit modèle ou transcrites normalement (music_policy)
+        self.music_policy = preprocessing.get('music_policy', 'transcribe')
+        self.music_model = preprocessing.get('music_model', 'tiny')
+        self.music_classifier = (
+            SpeechMusicClassifier(min_music_s=preprocessing.get('music_min_duration_s', 10))
+            if preprocessing.get('music_detection', False) and self.music_policy in ('skip', 'tiny') else None
+        )
+        
         # Réduire les buffers de threads inter-op (doit être appelé une seule fois)
         torch.set_num_interop_threads(1)
         
-        logger.info(f"WhisperTranscriber initialisé avec modèle={self.model_name}, langue={self.language}")
+        logger.info(
+            f"WhisperTranscriber initialisé avec modèle={self.model_name}, langue={self.language}, "
+            f"moteur={self.backend.name}"
+        )
+    
+    def preload_model(self, num_threads: int):
+        """
+        Charge le modèle par défaut avant le premier fichier et le conserve
+        pour la première transcription (pas de second chargement si le cache
+        de modèles est désactivé).
+        
+        Args:
+            num_threads: Threads d'inférence
+        
+        Returns:
+            Modèle chargé ou None en cas d'erreur
+        """
+        model = self.backend.load(self.model_name, num_threads)
+        if model is not None:
+            self._preloaded = (self.model_name, num_threads, model)
+        return model
+    
+    def _load_model(self, model_name: str, num_threads: int):
+        """
+        Charge un modèle avec le moteur configuré, en reprenant le modèle
+        chargé d'avance s'il correspond.
+        
+        Args:
+            model_name: Nom du modèle
+            num_threads: Threads d'inférence
+        
+        Returns:
+            Modèle chargé ou None en cas d'erreur
+        """
+        preloaded, self._preloaded = self._preloaded, None
+        if preloaded is not None and preloaded[:2] == (model_name, num_threads):
+            return preloaded[2]
+        if preloaded is not None:
+            self.backend.release(preloaded[2])
+        return self.backend.load(model_name, num_threads)
+    
+    def load_audio(self, audio_path: str) -> np.ndarray:
+        """
+        Décode un fichier en PCM 16 kHz mono, via le cache PCM s'il est actif.
+        
+        Args:
+            audio_path: Chemin du fichier audio
+        
+        Returns:
+            Signal PCM float32
+        """
+        if self.pcm_cache is not None:
+            return self.pcm_cache.load(audio_path)
+        return whisper.load_audio(audio_path)
     
     def transcribe_on_specific_cores(
         self, 
         audio_path: str, 
         cpu_cores: List[int],
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        audio: Optional[np.ndarray] = None
     ) -> Optional[Dict]:
         """
         Effectue la transcription sur les cœurs CPU spécifiés.
@@ -67,6 +274,7 @@ class WhisperTranscriber:
             audio_path: Chemin du fichier audio
             cpu_cores: Liste des cœurs CPU à utiliser
             model_name: Nom du modèle (optionnel, utilise config par défaut)
+            audio: Signal PCM 16 kHz déjà décodé (optionnel, remplace la lecture du fichier)
         
         Returns:
             Résultat de la transcription ou None en cas d'erreur
@@ -77,51 +285,468 @@ class WhisperTranscriber:
         # Utiliser le modèle spécifié ou celui par défaut
         model_name = model_name or self.model_name
         
-        # Charger le modèle
-        model = self.model_manager.load_model(model_name)
-        if model is None:
-            logger.error(f"Impossible de charger le modèle {model_name}")
-            return None
-        
-        # Configurer PyTorch pour minimiser la mémoire
         # Utiliser num_threads de la config si spécifié (pour benchmarks k=1)
         # Sinon, utiliser le nombre de cores
         num_threads = self.config.get('num_threads', len(cpu_cores))
-        torch.set_num_threads(num_threads)
-        logger.info(f"Threads PyTorch: {torch.get_num_threads()} (cores alloués: {len(cpu_cores)})")
         
-        # Mode évaluation : désactive dropout et batchnorm tracking
-        model.eval()
+        # Charger le modèle avec le moteur configuré (whisper.backend)
+        model = self._load_model(model_name, num_threads)
+        if model is None:
+            logger.error(f"Impossible de charger le modèle {model_name}")
+            return None
+        logger.info(f"Threads d'inférence: {num_threads} (cores alloués: {len(cpu_cores)}, moteur {self.backend.name})")
         
         try:
             # Effectuer la transcription
-            word_timestamps = self.config.get('whisper', {}).get('word_timestamps', True)
+            # En mode différé, le décodage ne fait pas la passe d'attention croisée/DTW
+            word_timestamps = self.word_alignment == "inline"
             
             logger.info(f"Transcription de {audio_path} avec {model_name}...")
             start_time = time.time()
             
-            # inference_mode() est plus agressif que no_grad() :
-            # désactive les version counters et le view tracking,
-            # réduisant significativement les allocations mémoire internes
-            with torch.inference_mode():
-                result = model.transcribe(
-                    audio_path,
-                    language=self.language,
-                    word_timestamps=word_timestamps if self.transcription_srt else False
+            # Garde anti-boucle active dans toutes les tâches de décodage du fichier,
+            # chaque passe (première ou repli) chronométrée
+            guard = self.loop_guard.active() if self.loop_guard is not None else nullcontext([])
+            with guard as loop_events, self.fallback_meter.active() as decode_calls:
+                if self.vad is not None or self.music_classifier is not None:
+                    # Seules les zones retenues (parole, hors musique) passent par l'encodeur
+                    # Log-mel des zones mis en cache pour un fichier entier (pas pour un morceau)
+                    result = self._transcribe_regions(
+                        model, audio if audio is not None else self.load_audio(audio_path),
+                        audio_path, num_threads, word_timestamps, cache_mel=audio is None
+                    )
+                    if result is None:
+                        return None
+                else:
+                    # Fichier entier: log-mel lu depuis le cache et fourni directement à l'encodeur
+                    mel = None
+                    if audio is None and self.mel_cache is not None and self.backend.supports_mel:
+                        mel = self.mel_cache.load(audio_path, model.dims.n_mels, self.load_audio)
+                    elif audio is None and self.pcm_cache is not None:
+                        audio = self.pcm_cache.load(audio_path)
+                    
+                    result = self._decode(
+                        model,
+                        audio if audio is not None else audio_path,
+                        num_threads,
+                        word_timestamps,
+                        mel=mel
+                    )
+                    if result is None:
+                        return None
+                
+                # Cascade: escalade des segments sous le seuil de confiance
+                if self.cascade is not None and model_name != self.cascade.model_name:
+                    if audio is None:
+                        audio = self.load_audio(audio_path)
+                    result = self.cascade.escalate(
+                        result, audio, whisper.audio.SAMPLE_RATE, self.language,
+                        num_threads, word_timestamps
+                    )
+                    if result is None:
+                        return None
+                    cascade = result["cascade"]
+                    share = cascade["escalated_s"] / cascade["audio_s"] if cascade["audio_s"] > 0 else 0.0
+                    logger.info(
+                        f"Cascade {audio_path}: {share * 100:.1f}% de l'audio ({cascade['escalated_s']:.1f}s, "
+                        f"{cascade['segments_escalated']} segments) retranscrit avec {self.cascade.model_name}"
+                    )
+            
+            result["decoding"] = self.fallback_meter.summarize(decode_calls, result.get("segments"))
+            if result["decoding"]["fallbacks"]:
+                logger.info(
+                    f"{audio_path}: {result['decoding']['fallbacks']} replis en température "
+                    f"({result['decoding']['fallback_time_s']:.2f}s, profil {result['decoding']['profile']})"
                 )
+            if loop_events:
+                result["loop_guard"] = {"events": len(loop_events), "details": list(loop_events)}
+                logger.warning(f"{audio_path}: {len(loop_events)} fenêtres interrompues par la garde anti-boucle")
             
             elapsed_time = time.time() - start_time
             logger.info(f"Transcription terminée en {elapsed_time:.2f}s")
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"Erreur lors de la transcription de {audio_path}: {str(e)}")
             return None
         finally:
-            # Libération explicite du modèle (puisqu'il n'est plus mis en cache)
+            # Libération explicite du modèle, sauf s'il est conservé dans le cache
             if model:
-                self.model_manager.unload_model(model)
+                self.backend.release(model)
+    
+    def _decode(
+        self,
+        model,
+        audio,
+        num_threads: int,
+        word_timestamps: bool,
+        mel: Optional[torch.Tensor] = None
+    ) -> Optional[Dict]:
+        """
+        Transcrit un signal avec le moteur de décodage configuré (whisper.decoding_engine).
+        Le décodage spéculatif (moteur pytorch uniquement) reproduit la sortie gloutonne
+        du modèle sur des fenêtres fixes de 30 s, sans horodatage par mot.
+        
+        Args:
+            model: Modèle chargé par le moteur
+            audio: Chemin ou signal PCM 16 kHz
+            num_threads: Threads d'inférence (pour le modèle brouillon)
+            word_timestamps: Horodatages par mot (décodage standard)
+            mel: Log-mel précalculé (optionnel)
+        
+        Returns:
+            Résultat Whisper (avec une clé 'speculative' de statistiques le cas échéant)
+        """
+        if self.decoding_engine == 'speculative' and self.backend.name == 'pytorch':
+            draft = self.backend.load(self.draft_model, num_threads)
+            if draft is None:
+                logger.error(f"Impossible de charger le modèle brouillon {self.draft_model}")
+                return None
+            try:
+                if SpeculativeEngine.compatible(model, draft):
+                    engine = SpeculativeEngine(model, draft, self.language, self.speculative_tokens)
+                    result = engine.transcribe({"audio": audio}, {"audio": mel} if mel is not None else None)["audio"]
+                    result["speculative"] = engine.get_stats()
+                    return result
+                logger.warning(
+                    f"Brouillon {self.draft_model} incompatible (vocabulaire ou bandes mel): décodage standard"
+                )
+            finally:
+                self.backend.release(draft)
+        
+        return self.backend.transcribe(model, audio, self.language, word_timestamps, mel=mel)
+    
+    def _transcribe_regions(
+        self,
+        model,
+        audio: np.ndarray,
+        audio_path: str,
+        num_threads: int,
+        word_timestamps: bool,
+        cache_mel: bool = False
+    ) -> Optional[Dict]:
+        """
+        Transcrit les seules zones utiles d'un signal: zones de parole (VAD)
+        hors musique, la musique étant ignorée ou confiée au modèle music_model
+        selon music_policy. Les horodatages sont recalés sur le fichier d'origine.
+        
+        Args:
+            model: Modèle chargé par le moteur
+            audio: Signal PCM 16 kHz du fichier
+            audio_path: Chemin du fichier audio (pour les logs et la clé du cache de log-mel)
+            num_threads: Threads d'inférence (pour le modèle music_model)
+            word_timestamps: Horodatages par mot
+            cache_mel: Log-mel des zones retenues lu depuis le cache (signal = fichier entier)
+        
+        Returns:
+            Résultat Whisper, avec les clés 'vad' et/ou 'music' de statistiques,
+            ou None si le décodage a échoué
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        audio_s = len(audio) / sample_rate
+        stats = {}
+        
+        # Pré-passe VAD: carte des zones de parole
+        regions = [(0.0, audio_s)]
+        if self.vad is not None:
+            regions = self.vad.speech_map(audio, sample_rate)
+            speech_s = sum(end - begin for begin, end in regions)
+            stats["vad"] = {"audio_s": audio_s, "speech_s": speech_s, "skipped_s": audio_s - speech_s}
+            logger.info(
+                f"VAD {audio_path}: {len(regions)} zones de parole, "
+                f"{audio_s - speech_s:.1f}s ignorées sur {audio_s:.1f}s"
+            )
+        
+        # Zones de musique retirées du passage principal
+        music_regions = []
+        if self.music_classifier is not None:
+            spans = self.music_classifier.classify(audio, sample_rate)
+            regions, music_regions = SpeechMusicClassifier.split_regions(regions, spans, MUSIC)
+        
+        parts = []
+        main_s = sum(end - begin for begin, end in regions)
+        start_time = time.time()
+        if regions:
+            concat, mapping = VoiceActivityDetector.extract(audio, sample_rate, regions)
+            # Log-mel du signal concaténé, indexé par (fichier, zones retenues)
+            mel = None
+            if cache_mel and self.mel_cache is not None and self.backend.supports_mel:
+                mel = self.mel_cache.load(
+                    audio_path, model.dims.n_mels, lambda _: concat, variant=MelCache.regions_key(regions)
+                )
+            result = self._decode(model, concat, num_threads, word_timestamps, mel=mel)
+            if result is None:
+                return None
+            parts.append(VoiceActivityDetector.remap_result(result, mapping))
+        main_time = time.time() - start_time
+        
+        if self.music_classifier is not None:
+            music_s = sum(end - begin for begin, end in music_regions)
+            # Coût du modèle principal par seconde d'audio, mesuré sur ce fichier
+            cost_per_s = main_time / main_s if main_s > 0 else 0.0
+            saved = cost_per_s * music_s
+            if music_regions and self.music_policy == 'tiny':
+                music_model = self.backend.load(self.music_model, num_threads)
+                if music_model is not None:
+                    try:
+                        start_time = time.time()
+                        concat, mapping = VoiceActivityDetector.extract(audio, sample_rate, music_regions)
+                        result = self.backend.transcribe(music_model, concat, self.language, word_timestamps)
+                        parts.append(VoiceActivityDetector.remap_result(result, mapping))
+                        saved -= time.time() - start_time
+                    finally:
+                        self.backend.release(music_model)
+            stats["music"] = {
+                "music_s": music_s,
+                "policy": self.music_policy,
+                "compute_saved_s": max(0.0, saved)
+            }
+            logger.info(
+                f"Musique {audio_path}: {music_s:.1f}s ({self.music_policy}), "
+                f"calcul économisé estimé {stats['music']['compute_saved_s']:.1f}s"
+            )
+        
+        merged = self.merge_chunk_results([(0.0, part) for part in parts])
+        if len(parts) > 1:
+            # Passages principal et musique entrelacés: remise en ordre chronologique
+            merged["segments"].sort(key=lambda segment: segment["start"])
+            for index, segment in enumerate(merged["segments"]):
+                segment["id"] = index
+            merged["text"] = " ".join(segment["text"].strip() for segment in merged["segments"])
+        merged["language"] = merged["language"] or self.language
+        for part in parts:
+            if part.get("speculative"):
+                stats["speculative"] = part["speculative"]
+        merged.update(stats)
+        return merged
+    
+    def transcribe_batch(
+        self,
+        audio_paths: List[str],
+        cpu_cores: List[int],
+        batch_size: Optional[int] = None,
+        model_name: Optional[str] = None
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        Transcrit plusieurs clips courts avec le moteur par lots
+        (une passe d'encodeur pour plusieurs fenêtres de 30 s).
+        
+        Args:
+            audio_paths: Chemins des fichiers audio
+            cpu_cores: Liste des cœurs CPU à utiliser
+            batch_size: Fenêtres par passe (optionnel, utilise whisper.batch_size)
+            model_name: Nom du modèle (optionnel, utilise config par défaut)
+        
+        Returns:
+            Dictionnaire chemin -> résultat, ou None en cas d'erreur
+        """
+        model_name = model_name or self.model_name
+        
+        # Le moteur par lots repose sur whisper.decode: autres moteurs, fichier par fichier
+        if self.backend.name != "pytorch":
+            results = {}
+            for path in audio_paths:
+                results[path] = self.transcribe_on_specific_cores(path, cpu_cores, model_name)
+                if results[path] is None:
+                    return None
+            return results
+        
+        CPUAffinityManager.set_cpu_affinity(cpu_cores)
+        model = self._load_model(model_name, self.config.get('num_threads', len(cpu_cores)))
+        if model is None:
+            logger.error(f"Impossible de charger le modèle {model_name}")
+            return None
+        
+        try:
+            engine = BatchedEngine(model, self.language, batch_size or self.batch_size)
+            with self.loop_guard.active() if self.loop_guard is not None else nullcontext([]):
+                if self.mel_cache is not None:
+                    mels = {
+                        path: self.mel_cache.load(path, model.dims.n_mels, self.load_audio) for path in audio_paths
+                    }
+                    return engine.transcribe({path: path for path in audio_paths}, mels)
+                return engine.transcribe({
+                    path: (self.pcm_cache.load(path) if self.pcm_cache is not None else path)
+                    for path in audio_paths
+                })
+        except Exception as e:
+            logger.error(f"Erreur lors de la transcription par lots: {str(e)}")
+            return None
+        finally:
+            self.backend.release(model)
+    
+    @staticmethod
+    def merge_chunk_results(chunk_results: List[Tuple[float, Dict]]) -> Dict:
+        """
+        Recolle les résultats des morceaux en un seul résultat Whisper,
+        avec des horodatages globaux.
+        
+        Args:
+            chunk_results: Liste de (décalage en secondes, résultat du morceau), dans l'ordre
+        
+        Returns:
+            Résultat fusionné (text, segments, language, et les statistiques
+            'vad' / 'music' / 'cascade' / 'loop_guard' / 'decoding' des morceaux cumulées)
+        """
+        segments = []
+        texts = []
+        language = None
+        stats = {}
+        
+        for offset, result in chunk_results:
+            language = language or result.get("language")
+            for key in ("vad", "music", "cascade", "loop_guard", "decoding"):
+                if result.get(key):
+                    merged_stats = stats.setdefault(key, {})
+                    for name, value in result[key].items():
+                        if isinstance(value, (int, float)):
+                            merged_stats[name] = merged_stats.get(name, 0) + value
+                        elif isinstance(value, list):
+                            merged_stats[name] = merged_stats.get(name, []) + value
+                        else:
+                            merged_stats[name] = value
+            if result.get("text", "").strip():
+                texts.append(result["text"].strip())
+            
+            for segment in result.get("segments", []):
+                segment = dict(segment)
+                segment["id"] = len(segments)
+                segment["start"] = segment["start"] + offset
+                segment["end"] = segment["end"] + offset
+                # seek est exprimé en trames mel (100 par seconde)
+                if "seek" in segment:
+                    segment["seek"] = segment["seek"] + int(round(offset * 100))
+                if segment.get("words"):
+                    segment["words"] = [
+                        dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                        for word in segment["words"]
+                    ]
+                segments.append(segment)
+        
+        merged = {"text": " ".join(texts), "segments": segments, "language": language}
+        merged.update(stats)
+        return merged
+    
+    def transcribe_chunked(
+        self,
+        audio_path: str,
+        core_sets: List[List[int]],
+        model_name: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Transcrit un fichier long en le découpant aux silences, les morceaux
+        étant traités en parallèle par un processus par jeu de cœurs.
+        Utilisé par le lancement statique (jeux de cœurs sans liste de fichiers);
+        le pool n'a de slots libres qu'une fois sa file vide et ne découpe pas.
+        
+        Args:
+            audio_path: Chemin du fichier audio
+            core_sets: Jeux de cœurs CPU disponibles (un processus par jeu)
+            model_name: Nom du modèle (optionnel, utilise config par défaut)
+        
+        Returns:
+            Résultat fusionné (avec une clé 'chunking' de statistiques), résultat non découpé
+            si la mémoire n'admet aucun processus de morceaux, ou None en cas d'erreur
+        """
+        model_name = model_name or self.model_name
+        start_time = time.time()
+        
+        try:
+            audio = self.load_audio(audio_path)
+        except Exception as e:
+            logger.error(f"Erreur lors du décodage de {audio_path}: {str(e)}")
+            return None
+        
+        chunks = self.segmenter.find_chunks(audio, whisper.audio.SAMPLE_RATE)
+        nb_workers = min(len(core_sets), len(chunks))
+        
+        # Admission mémoire: autant de processus de morceaux que la mémoire en admet
+        # (coût mesuré sur ce processus si son modèle est gardé en cache)
+        admission = MemoryAdmission.from_config(
+            self.config, self.model_manager.estimate_ram_usage(model_name, 1)
+        )
+        if admission is not None:
+            if self.model_manager.cache_enabled and self.model_manager.cache_stats["loads"] > 0:
+                admission.observe([os.getpid()])
+            admis = min(nb_workers, admission.capacity())
+            if admis < nb_workers:
+                logger.warning(
+                    f"Admission mémoire: {admis}/{nb_workers} processus de morceaux admis "
+                    f"({admission.available_gb():.1f} Go disponibles, "
+                    f"{admission.worker_estimate_gb():.1f} Go par processus)"
+                )
+            if admis < 1:
+                logger.warning(f"Mode découpé refusé pour {audio_path}: transcription sur les cœurs du processus")
+                return self.transcribe_on_specific_cores(audio_path, core_sets[0], model_name, audio=audio)
+            nb_workers = admis
+        logger.info(f"Transcription découpée de {audio_path}: {len(chunks)} morceaux sur {nb_workers} processus")
+        
+        chunk_queue = Queue()
+        result_queue = Queue()
+        # Les plus longs morceaux d'abord pour finir au plus tôt
+        for index in sorted(range(len(chunks)), key=lambda i: chunks[i][0] - chunks[i][1]):
+            begin, end = chunks[index]
+            samples = audio[int(begin * whisper.audio.SAMPLE_RATE):int(end * whisper.audio.SAMPLE_RATE)]
+            chunk_queue.put((index, samples))
+        for _ in range(nb_workers):
+            chunk_queue.put(None)
+        del audio
+        
+        processes = []
+        for cores in core_sets[:nb_workers]:
+            p = Process(
+                target=_transcribe_chunks_on_cores,
+                args=(self.config, model_name, audio_path, cores, chunk_queue, result_queue)
+            )
+            p.start()
+            processes.append(p)
+        
+        results = {}
+        chunk_times = []
+        while len(results) < len(chunks):
+            try:
+                index, result, elapsed = result_queue.get(timeout=5)
+            except queue.Empty:
+                # Processus de morceaux morts sans répondre (OOM, échec du chargement du modèle)
+                if any(p.is_alive() for p in processes):
+                    continue
+                try:
+                    index, result, elapsed = result_queue.get(timeout=1)
+                except queue.Empty:
+                    logger.error(
+                        f"Processus de morceaux arrêtés: {len(chunks) - len(results)} morceaux "
+                        f"de {audio_path} sans résultat"
+                    )
+                    break
+            results[index] = result
+            chunk_times.append(elapsed)
+        for p in processes:
+            p.join()
+        
+        if any(results.get(i) is None for i in range(len(chunks))):
+            logger.error(f"Échec d'au moins un morceau de {audio_path}")
+            return None
+        
+        merged = self.merge_chunk_results([(chunks[i][0], results[i]) for i in range(len(chunks))])
+        
+        # Gain: somme des temps des morceaux (≈ traitement séquentiel) / temps mur
+        wall_time = time.time() - start_time
+        sequential_time = sum(chunk_times)
+        speedup = sequential_time / wall_time if wall_time > 0 else 0.0
+        merged["chunking"] = {
+            "chunks": len(chunks),
+            "workers": nb_workers,
+            "wall_time_s": wall_time,
+            "sequential_time_s": sequential_time,
+            "speedup": speedup
+        }
+        logger.info(
+            f"Transcription découpée terminée en {wall_time:.2f}s "
+            f"(séquentiel estimé {sequential_time:.2f}s, gain {speedup:.2f}×)"
+        )
+        
+        return merged
     
     @staticmethod
     def format_timestamp_srt(seconds: float) -> str:
@@ -169,7 +794,7 @@ class WhisperTranscriber:
             
             logger.info(f"Fichier SRT créé: {output_file}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Erreur lors de la création du fichier SRT: {str(e)}")
             return False
@@ -195,42 +820,23 @@ class WhisperTranscriber:
             
             logger.info(f"Fichier TXT créé: {output_file}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Erreur lors de la création du fichier TXT: {str(e)}")
             return False
     
-    def process_and_write(
-        self, 
-        audio_file: str, 
-        cpu_cores: List[int],
-        core_index: int,
-        tracker_path: Optional[str] = None,
-        run_number: Optional[int] = None,
-        audio_duration: float = 0.0
-    ) -> bool:
+    def write_outputs(self, audio_file: str, result: Dict, run_number: Optional[int] = None) -> bool:
         """
-        Lance la transcription et écrit les résultats dans les fichiers de sortie.
-        Réutilisé depuis WhisperTranscriptor.py avec améliorations.
+        Écrit les fichiers SRT/TXT d'un résultat selon la convention STVD-MNER.
         
         Args:
             audio_file: Chemin du fichier audio
-            cpu_cores: Liste des cœurs CPU à utiliser
-            core_index: Index du processus (pour tracking)
-            tracker_path: Chemin du fichier tracker (optionnel)
+            result: Résultat de la transcription (text, segments)
             run_number: Numéro du run (optionnel, pour benchmark avec répétitions)
-            audio_duration: Durée audio en secondes (pour le tracker)
         
         Returns:
             True si succès, False sinon
         """
-        start_time = time.time()
-        
-        # Transcription
-        result = self.transcribe_on_specific_cores(audio_file, cpu_cores)
-        if result is None:
-            return False
-        
         # Préparer les noms de fichiers (Format STVD-MNER)
         audio_dir = os.path.dirname(audio_file)
         base_name = os.path.basename(audio_file)
@@ -271,19 +877,126 @@ class WhisperTranscriber:
             output_txt = os.path.join(audio_dir, f"{timestamp}_transcript_{model_suffix}{run_suffix}.txt")
             success &= self.create_txt_file(result, output_txt)
         
+        if self.word_alignment != "off" and result.get("segments"):
+            # Horodatage par mot: _transcript_words_{model_suffix}{run_suffix}.json
+            output_words = os.path.join(audio_dir, f"{timestamp}_transcript_words_{model_suffix}{run_suffix}.json")
+            if any(segment.get("words") for segment in result["segments"]):
+                success &= WordAligner.write_words(result["segments"], output_words)
+            elif self.word_alignment == "deferred":
+                success &= WordAligner.write_job(
+                    self.alignment_dir, audio_file, result, self.model_name, output_words
+                )
+        
+        return success
+    
+    @staticmethod
+    def write_tracker(
+        tracker_path: str,
+        base_name: str,
+        execution_time: float,
+        audio_duration: float,
+        fields: Optional[Dict] = None
+    ):
+        """
+        Ajoute une ligne au fichier tracker.
+        Format: "filename: X.XX secondes (audio: Y.YY)" pour import_from_trackers(),
+        suivi des champs renseignés " (clé: valeur)" de TRACKER_FIELDS: audio ignoré par
+        la VAD, musique et calcul économisé, chaîne, fenêtres interrompues par la garde
+        anti-boucle, profil de décodage et replis, modèle et threads, classe de priorité,
+        échéance et fin du traitement (horodatages Unix)
+        
+        Args:
+            tracker_path: Chemin du fichier tracker
+            base_name: Nom du fichier audio
+            execution_time: Temps de traitement (secondes)
+            audio_duration: Durée audio (secondes)
+            fields: Champs optionnels, clés de TRACKER_FIELDS (valeurs nulles omises);
+                    "fin" vaut par défaut l'heure d'écriture (fin du traitement)
+        """
+        fields = dict(fields or {})
+        fields.setdefault("fin", time.time())
+        try:
+            Path(tracker_path).parent.mkdir(parents=True, exist_ok=True)
+            line = f"{base_name}: {execution_time:.2f} secondes (audio: {audio_duration:.2f})"
+            for key, spec in TRACKER_FIELDS.items():
+                if fields.get(key):
+                    line += f" ({key}: {fields[key]:{spec}})"
+            with open(tracker_path, 'a', encoding='utf-8') as tracker:
+                tracker.write(line + "\n")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture du tracker: {str(e)}")
+    
+    def process_and_write(
+        self, 
+        audio_file: str, 
+        cpu_cores: List[int],
+        core_index: int,
+        tracker_path: Optional[str] = None,
+        run_number: Optional[int] = None,
+        audio_duration: float = 0.0,
+        chunk_core_sets: Optional[List[List[int]]] = None,
+        priority_class: str = "",
+        deadline: float = 0.0
+    ) -> bool:
+        """
+        Lance la transcription et écrit les résultats dans les fichiers de sortie.
+        Réutilisé depuis WhisperTranscriptor.py avec améliorations.
+        
+        Args:
+            audio_file: Chemin du fichier audio
+            cpu_cores: Liste des cœurs CPU à utiliser
+            core_index: Index du processus (pour tracking)
+            tracker_path: Chemin du fichier tracker (optionnel)
+            run_number: Numéro du run (optionnel, pour benchmark avec répétitions)
+            audio_duration: Durée audio en secondes (pour le tracker)
+            chunk_core_sets: Jeux de cœurs pour le mode découpé (optionnel)
+            priority_class: Classe de priorité (pour le tracker)
+            deadline: Échéance du fichier (pour le tracker, 0 = sans échéance)
+        
+        Returns:
+            True si succès, False sinon
+        """
+        start_time = time.time()
+        
+        # Transcription (découpée si le fichier est long et plusieurs jeux de cœurs sont disponibles)
+        use_chunking = (
+            self.chunking_enabled
+            and chunk_core_sets is not None and len(chunk_core_sets) > 1
+            and audio_duration > self.segmenter.max_duration_s
+        )
+        if use_chunking:
+            result = self.transcribe_chunked(audio_file, chunk_core_sets)
+        else:
+            result = self.transcribe_on_specific_cores(audio_file, cpu_cores)
+        if result is None:
+            return False
+        
+        success = self.write_outputs(audio_file, result, run_number)
+        
         # Temps d'exécution
         execution_time = time.time() - start_time
         logger.info(f"Temps total d'exécution: {execution_time:.2f} secondes")
         
         # Écrire dans le tracker si spécifié
-        # Format: "filename: X.XX secondes (audio: Y.YY)" pour import_from_trackers()
         if tracker_path:
-            try:
-                Path(tracker_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(tracker_path, 'a', encoding='utf-8') as tracker:
-                    tracker.write(f"{base_name}: {execution_time:.2f} secondes (audio: {audio_duration:.2f})\n")
-            except Exception as e:
-                logger.error(f"Erreur lors de l'écriture du tracker: {str(e)}")
+            # Les enregistrements sont rangés par chaîne: dossier parent du fichier
+            fields = {
+                "ignoré": result.get("vad", {}).get("skipped_s", 0.0),
+                "chaîne": Path(audio_file).parent.name,
+                "boucles": result.get("loop_guard", {}).get("events", 0),
+                "modèle": self.model_name,
+                "threads": self.config.get('num_threads', len(cpu_cores)),
+                "classe": priority_class,
+                "échéance": deadline
+            }
+            if result.get("music"):
+                fields["musique"] = result["music"]["music_s"]
+                fields["économisé"] = result["music"]["compute_saved_s"]
+            if result.get("decoding"):
+                fields["profil"] = result["decoding"]["profile"]
+                fields["replis"] = result["decoding"]["fallbacks"]
+                fields["temps replis"] = result["decoding"]["fallback_time_s"]
+            self.write_tracker(tracker_path, os.path.basename(audio_file), execution_time, audio_duration, fields)
         
         # Nettoyage mémoire explicite après traitement complet du fichier
         # Whisper ne libère pas automatiquement les tenseurs intermédiaires
@@ -291,3 +1004,55 @@ class WhisperTranscriber:
         gc.collect()
         
         return success
+    
+    def process_batch_and_write(
+        self,
+        audio_files: List[Tuple[str, float]],
+        cpu_cores: List[int],
+        tracker_path: Optional[str] = None,
+        priorities: Optional[Dict[str, Tuple[str, float]]] = None
+    ) -> Dict[str, bool]:
+        """
+        Transcrit un groupe de clips courts par lots et écrit leurs résultats.
+        Le temps du lot est réparti entre les fichiers au prorata de leur durée.
+        
+        Args:
+            audio_files: Liste de (chemin, durée audio en secondes)
+            cpu_cores: Liste des cœurs CPU à utiliser
+            tracker_path: Chemin du fichier tracker (optionnel)
+            priorities: Chemin -> (classe de priorité, échéance) pour le tracker (optionnel)
+        
+        Returns:
+            Dictionnaire chemin -> succès
+        """
+        start_time = time.time()
+        results = self.transcribe_batch([path for path, _ in audio_files], cpu_cores)
+        if results is None:
+            return {path: False for path, _ in audio_files}
+        
+        statuses = {path: self.write_outputs(path, results[path]) for path, _ in audio_files}
+        
+        execution_time = time.time() - start_time
+        total_audio = sum(duration for _, duration in audio_files)
+        logger.info(
+            f"Lot de {len(audio_files)} fichiers traité en {execution_time:.2f}s "
+            f"({total_audio / execution_time if execution_time > 0 else 0:.2f}× temps réel)"
+        )
+        
+        if tracker_path:
+            priorities = priorities or {}
+            for path, duration in audio_files:
+                share = duration / total_audio if total_audio > 0 else 1 / len(audio_files)
+                priority_class, deadline = priorities.get(path, ("", 0.0))
+                self.write_tracker(tracker_path, os.path.basename(path), execution_time * share, duration, {
+                    "chaîne": Path(path).parent.name,
+                    "modèle": self.model_name,
+                    "threads": self.config.get('num_threads', len(cpu_cores)),
+                    "classe": priority_class,
+                    "échéance": deadline
+                })
+        
+        del results
+        gc.collect()
+        
+        return statuses
@@ -0,0 +1,554 @@
+"""
+Station TV - Worker Pool
+Pool de workers persistants épinglés sur leurs cœurs, alimentés par une file
+de travail partagée (avec vol de travail optionnel) et recyclés après N
+fichiers ou au-delà d'un seuil de RSS. Avec l'admission mémoire, les workers
+démarrent un par un, chacun une fois le précédent chargé et si la mémoire le permet.
+Avec des modèles mélangés, chaque slot garde son modèle et ne reçoit que ses fichiers.
+Avec les priorités, les files sont ordonnées par classe puis échéance et les
+diffusions fraîches de la boîte de réception passent devant à la fin du fichier en cours.
+"""
+
+import os
+import time
+import queue
+import psutil
+from collections import deque
+from multiprocessing import Process, Queue
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from core.admission import MemoryAdmission
+from core.affinity import Audio, CPUAffinityManager
+from core.decoding import queue_config
+from core.priority import JobInbox, JobQueue, PriorityClassifier
+from core.scheduling import model_config
+from qos.monitor import SystemMonitor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _pool_worker(
+    slot: int,
+    cpu_cores: List[int],
+    config: dict,
+    job_queue: Queue,
+    result_queue: Queue,
+    tracker_path: str
+):
+    """
+    Boucle d'un worker: demande un travail, le traite, recommence.
+    Le worker s'arrête quand le superviseur lui envoie None.
+    
+    Args:
+        slot: Index du slot (0-based) dans le pool
+        cpu_cores: Cœurs CPU du slot (depuis whisper.cpu_affinity)
+        config: Configuration
+        job_queue: File privée superviseur -> worker
+        result_queue: File commune workers -> superviseur
+        tracker_path: Fichier tracker du slot
+    """
+    # Import local: le modèle n'est chargé que dans les workers
+    from core.transcription import WhisperTranscriber
+    
+    # Profil de décodage du slot (batch.queue_profiles, clé: numéro de slot)
+    transcriber = WhisperTranscriber(queue_config(config, str(slot + 1)))
+    process = psutil.Process(os.getpid())
+    peak_memory = None
+    
+    # Admission mémoire: modèle chargé d'avance (gardé pour le premier fichier), USS signalée au superviseur
+    if config.get('hardware', {}).get('memory_admission', {}).get('enabled', False):
+        CPUAffinityManager.set_cpu_affinity(cpu_cores)
+        transcriber.preload_model(config.get('num_threads', len(cpu_cores)))
+        result_queue.put(("loaded", slot, SystemMonitor.get_process_memory()["uss_gb"]))
+    
+    while True:
+        result_queue.put(("ready", slot, process.memory_info().rss / (1024**3)))
+        audio = job_queue.get()
+        if audio is None:
+            break
+        
+        start_time = time.time()
+        try:
+            success = transcriber.process_and_write(
+                audio.path,
+                cpu_cores,
+                slot + 1,
+                tracker_path,
+                audio_duration=audio.duree,
+                priority_class=audio.classe,
+                deadline=audio.deadline
+            )
+        except Exception as e:
+            logger.error(f"Worker {slot + 1}: erreur sur {audio.path}: {str(e)}")
+            success = False
+        
+        result_queue.put(("done", slot, audio.path, success, time.time() - start_time))
+        
+        memory = SystemMonitor.get_process_memory()
+        if peak_memory is None or memory["rss_gb"] > peak_memory["rss_gb"]:
+            peak_memory = memory
+    
+    # Même ligne mémoire que les workers statiques (importée par MetricsCalculator)
+    if peak_memory is not None:
+        with open(tracker_path, 'a', encoding='utf-8') as f:
+            f.write(
+                f"memoire: rss={peak_memory['rss_gb']:.3f} uss={peak_memory['uss_gb']:.3f} "
+                f"shared={peak_memory['shared_gb']:.3f} (Go)\n"
+            )
+    transcriber.backend.unload_all()
+
+
+class WorkerPool:
+    """
+    Pool de workers persistants avec distribution dynamique des fichiers.
+    
+    Le superviseur conserve les files de travail et répond aux demandes
+    des workers (modèle "pull"): un worker qui termine tôt reçoit
+    immédiatement le fichier suivant au lieu de rester inactif.
+    
+    - Mode file partagée: une seule file triée par durée décroissante (LPT).
+    - Mode vol de travail: une file par slot (répartition initiale conservée);
+      un slot à court de travail vole le plus court fichier du slot le plus chargé.
+    - Modèles mélangés (slot_models): une file partagée par modèle, et le vol
+      de travail se limite aux slots du même modèle.
+    - Priorités (priority): files ordonnées par classe puis échéance; les slots
+      réservés attendent un fichier urgent ou court plutôt que de s'arrêter.
+    """
+    
+    def __init__(
+        self,
+        config: dict,
+        cpu_affinity: List[List[int]],
+        work_stealing: bool = False,
+        max_files_per_worker: int = 0,
+        max_rss_gb: float = 0.0,
+        admission: Optional[MemoryAdmission] = None,
+        slot_models: Optional[List[str]] = None,
+        priority: Optional[PriorityClassifier] = None,
+        inbox: Optional[JobInbox] = None
+    ):
+        """
+        Initialise le pool.
+        
+        Args:
+            config: Configuration
+            cpu_affinity: Cœurs CPU de chaque slot (un worker par slot)
+            work_stealing: Files par slot avec vol de travail (sinon file partagée)
+            max_files_per_worker: Recycler un worker après N fichiers (0 = jamais)
+            max_rss_gb: Recycler un worker dont la RSS dépasse ce seuil (0 = jamais)
+            admission: Contrôle d'admission mémoire des démarrages (None = tous démarrés d'emblée)
+            slot_models: Modèle de chaque slot (None = whisper.model pour tous)
+            priority: Classement des fichiers par priorité et échéance (None = LPT)
+            inbox: Boîte de réception relue pendant le lancement (avec priority)
+        """
+        self.config = config
+        self.cpu_affinity = cpu_affinity
+        self.work_stealing = work_stealing
+        self.max_files_per_worker = max_files_per_worker
+        self.max_rss_gb = max_rss_gb
+        self.admission = admission
+        self.slot_models = slot_models
+        self.priority = priority
+        self.inbox = inbox
+        
+        self.queues: List[Deque[Audio]] = []
+        # Index de la file de chaque slot hors vol de travail (une par modèle)
+        self.slot_queue: List[int] = []
+        self.results: List[Dict] = []
+        self.recycled = 0
+        
+        logger.info(
+            f"WorkerPool initialisé: {len(cpu_affinity)} slots, "
+            f"{'vol de travail' if work_stealing else 'file partagée'}, "
+            f"recyclage après {max_files_per_worker or '∞'} fichiers / {max_rss_gb or '∞'} Go RSS"
+        )
+    
+    def load_jobs(self, listes_audio: List[List[Audio]]):
+        """
+        Prépare les files de travail.
+        
+        Args:
+            listes_audio: Répartition initiale par slot (dossiers Coeur ou glouton).
+                          En mode file partagée, elle est aplatie et triée LPT
+                          (ou par priorité puis échéance).
+        """
+        if self.work_stealing:
+            self.queues = [self._queue(liste, lpt=False) for liste in listes_audio]
+            self.queues += [self._queue([]) for _ in range(len(self.cpu_affinity) - len(self.queues))]
+        elif self.slot_models:
+            modeles = list(dict.fromkeys(self.slot_models))
+            par_modele = {modele: [] for modele in modeles}
+            for modele, liste in zip(self.slot_models, listes_audio):
+                par_modele[modele].extend(liste)
+            self.queues = [self._queue(par_modele[modele]) for modele in modeles]
+            self.slot_queue = [modeles.index(modele) for modele in self.slot_models]
+        else:
+            self.queues = [self._queue([audio for liste in listes_audio for audio in liste])]
+            self.slot_queue = [0] * len(self.cpu_affinity)
+    
+    def _queue(self, items: List[Audio], lpt: bool = True):
+        """File de travail: à priorités si le classement est actif, sinon deque (triée LPT si demandé)."""
+        if self.priority is not None:
+            return JobQueue(self.priority, items)
+        return deque(sorted(items, key=lambda a: a.duree, reverse=True) if lpt else items)
+    
+    def _model_slots(self, model: Optional[str]) -> List[int]:
+        """Slots d'un modèle (tous les slots sans modèles mélangés)."""
+        if not self.slot_models:
+            return list(range(len(self.cpu_affinity)))
+        return [slot for slot, slot_model in enumerate(self.slot_models) if slot_model == model]
+    
+    def _take(self, q, slot: int, from_end: bool = False, strict: bool = True) -> Optional[Audio]:
+        """
+        Retire un fichier d'une file pour un slot: le premier (ou le dernier pour
+        un vol), parmi ceux que le slot accepte si les priorités sont actives
+        (n'importe lequel si strict est faux).
+        """
+        if not q:
+            return None
+        if self.priority is None or not strict:
+            return q.pop() if from_end else q.popleft()
+        if not from_end:
+            return q.pop_reserved() if slot < self.priority.reserved_slots else q.popleft()
+        audio = q.pop()
+        if self.priority.accepts(slot, audio):
+            return audio
+        q.append(audio)
+        return None
+    
+    def enqueue(self, audio: Audio):
+        """
+        Ajoute un fichier arrivé pendant le lancement (boîte de réception) à la
+        file de son modèle (la moins chargée en vol de travail).
+        
+        Args:
+            audio: Fichier classé
+        """
+        slots = list(range(len(self.cpu_affinity)))
+        if self.slot_models:
+            channel_models = self.config.get('batch', {}).get('channel_models', {})
+            model = channel_models.get(Path(audio.path).parent.name, self.config.get('whisper', {}).get('model'))
+            slots = self._model_slots(model)
+            if not slots:
+                logger.warning(f"Aucun slot pour le modèle {model} de {audio.path}: file du slot 1")
+                slots = [0]
+        if self.work_stealing:
+            min((self.queues[slot] for slot in slots), key=lambda q: sum(a.duree for a in q)).append(audio)
+        else:
+            self.queues[self.slot_queue[slots[0]]].append(audio)
+    
+    def remaining_jobs(self) -> int:
+        """Retourne le nombre de fichiers pas encore distribués."""
+        return sum(len(q) for q in self.queues)
+    
+    def slot_remaining_jobs(self, slot: int) -> int:
+        """Retourne le nombre de fichiers que le slot peut encore recevoir (files de son modèle)."""
+        if not self.work_stealing:
+            return len(self.queues[self.slot_queue[slot]])
+        model = self.slot_models[slot] if self.slot_models else None
+        return sum(len(self.queues[other]) for other in self._model_slots(model))
+    
+    def next_job(self, slot: int, strict: bool = True) -> Optional[Audio]:
+        """
+        Choisit le prochain fichier pour un slot.
+        
+        Args:
+            slot: Index du slot demandeur
+            strict: Respecter la réservation des slots (priorités)
+        
+        Returns:
+            Fichier Audio ou None s'il n'y a plus de travail (pour ce slot)
+        """
+        if not self.work_stealing:
+            return self._take(self.queues[self.slot_queue[slot]], slot, strict=strict)
+        
+        own = self.queues[slot] if slot < len(self.queues) else deque()
+        audio = self._take(own, slot, strict=strict)
+        if audio is not None:
+            return audio
+        
+        # Vol: victime = slot avec le plus de durée restante (du même modèle),
+        # on prend par la fin (plus court, ou moins urgent)
+        candidates = [
+            self.queues[other]
+            for other in self._model_slots(self.slot_models[slot] if self.slot_models else None)
+        ]
+        victim = max(candidates, key=lambda q: sum(a.duree for a in q))
+        audio = self._take(victim, slot, from_end=True, strict=strict)
+        if audio is not None:
+            logger.info(f"Slot {slot + 1} vole {Path(audio.path).name} ({audio.duree:.0f}s)")
+        return audio
+    
+    def should_recycle(self, files_done: int, rss_gb: float) -> bool:
+        """
+        Indique si un worker doit être recyclé.
+        
+        Args:
+            files_done: Fichiers traités par l'incarnation courante du worker
+            rss_gb: RSS actuelle du worker (Go)
+        
+        Returns:
+            True si le worker doit être remplacé
+        """
+        if self.max_files_per_worker > 0 and files_done >= self.max_files_per_worker:
+            return True
+        if self.max_rss_gb > 0 and rss_gb > self.max_rss_gb:
+            return True
+        return False
+    
+    def _start_worker(self, slot: int, result_queue: Queue) -> Dict:
+        """Démarre un worker pour un slot et retourne son état."""
+        trackers_dir = Path(self.config.get('paths', {}).get('trackers_dir', 'trackers'))
+        job_queue = Queue()
+        config = model_config(self.config, self.slot_models[slot]) if self.slot_models else self.config
+        process = Process(
+            target=_pool_worker,
+            args=(
+                slot, self.cpu_affinity[slot], config, job_queue, result_queue,
+                str(trackers_dir / f"Tracker{slot + 1}.txt")
+            )
+        )
+        process.start()
+        logger.info(f"Worker {slot + 1} démarré (PID {process.pid}) sur les cœurs {self.cpu_affinity[slot]}")
+        return {
+            "process": process, "queue": job_queue, "files_done": 0, "current": None,
+            # Sans admission mémoire, le chargement du modèle n'est pas attendu
+            "loaded": self.admission is None
+        }
+    
+    def _admit_pending(self, pending: List[int], workers: Dict[int, Dict], result_queue: Queue):
+        """
+        Démarre les slots en attente que la mémoire admet.
+        
+        Avec l'admission mémoire, un seul worker charge son modèle à la fois et
+        le suivant ne démarre que si son coût (USS mesurée) tient dans la mémoire
+        disponible; sinon il reste en attente jusqu'à la fin d'un autre worker.
+        
+        Args:
+            pending: Slots à démarrer (modifiée en place)
+            workers: États des workers en cours (modifié en place)
+            result_queue: File commune workers -> superviseur
+        """
+        if self.remaining_jobs() == 0:
+            pending.clear()
+            return
+        if self.admission is None:
+            while pending:
+                slot = pending.pop(0)
+                workers[slot] = self._start_worker(slot, result_queue)
+            return
+        
+        if not pending or any(not state["loaded"] for state in workers.values()):
+            return
+        self.admission.observe(state["process"].pid for state in workers.values())
+        if self.admission.can_admit():
+            slot = pending.pop(0)
+            workers[slot] = self._start_worker(slot, result_queue)
+    
+    def _dispatch_idle(self, idle: set, workers: Dict[int, Dict]):
+        """
+        Donne un fichier aux slots en attente; ils s'arrêtent quand les files
+        sont vides. Si tous les workers de leur modèle attendent, la réservation
+        est levée pour que les fichiers restants soient traités.
+        
+        Args:
+            idle: Slots en attente (modifié)
+            workers: État des workers actifs
+        """
+        for slot in sorted(idle):
+            state = workers.get(slot)
+            if state is None:
+                idle.discard(slot)
+                continue
+            model = self.slot_models[slot] if self.slot_models else None
+            busy = [other for other in self._model_slots(model) if other in workers and other not in idle]
+            job = self.next_job(slot, strict=bool(busy))
+            if job is None and self.slot_remaining_jobs(slot) > 0:
+                continue
+            idle.discard(slot)
+            state["current"] = job
+            state["queue"].put(job)
+            if job is None:
+                state["process"].join()
+                del workers[slot]
+    
+    def _handle_message(self, message: tuple, workers: Dict[int, Dict], idle: set, result_queue: Queue, total: int):
+        """
+        Traite un message d'un worker: modèle chargé, fichier terminé ou demande de travail.
+        
+        Args:
+            message: (type, slot, ...) envoyé par _pool_worker
+            workers: États des workers actifs (modifié en place)
+            idle: Slots en attente d'un fichier urgent (modifié)
+            result_queue: File commune workers -> superviseur
+            total: Nombre de fichiers à traiter (journal)
+        """
+        kind, slot = message[0], message[1]
+        state = workers.get(slot)
+        if state is None:
+            return
+        
+        if kind == "loaded":
+            state["loaded"] = True
+            if self.admission is not None:
+                self.admission.record(message[2])
+            return
+        
+        if kind == "done":
+            _, _, path, success, processing_time = message
+            self.results.append({
+                "path": path, "success": success,
+                "processing_time": processing_time, "slot": slot
+            })
+            state["files_done"] += 1
+            state["current"] = None
+            logger.info(f"Pool: {len(self.results)}/{total} fichiers terminés")
+            return
+        
+        # kind == "ready"
+        rss_gb = message[2]
+        job = self.next_job(slot)
+        if job is not None and self.should_recycle(state["files_done"], rss_gb):
+            logger.info(
+                f"Recyclage du worker {slot + 1} "
+                f"({state['files_done']} fichiers, RSS {rss_gb:.2f} Go)"
+            )
+            state["queue"].put(None)
+            state["process"].join()
+            self.recycled += 1
+            workers[slot] = self._start_worker(slot, result_queue)
+            # Le fichier est rendu à sa file: le nouveau worker le redemandera
+            self.queues[slot if self.work_stealing else self.slot_queue[slot]].appendleft(job)
+            return
+        
+        if job is None and self.priority is not None and self.slot_remaining_jobs(slot) > 0:
+            # Slot réservé: il attend un fichier urgent (ou la fin de la file)
+            idle.add(slot)
+            return
+        
+        state["current"] = job
+        state["queue"].put(job)
+        if job is None:
+            state["process"].join()
+            del workers[slot]
+    
+    def _reap_dead_workers(
+        self,
+        workers: Dict[int, Dict],
+        idle: set,
+        pending: List[int],
+        result_queue: Queue,
+        total: int
+    ):
+        """
+        Libère les slots des workers morts sans prévenir (crash, OOM killer).
+        
+        Les messages déjà envoyés sont traités d'abord (ils ne doivent pas être
+        attribués au worker de remplacement), puis le fichier en cours est compté
+        en échec et le slot est redémarré par _admit_pending.
+        
+        Args:
+            workers: États des workers actifs (modifié en place)
+            idle: Slots en attente d'un fichier urgent (modifié)
+            pending: Slots à démarrer (modifié)
+            result_queue: File commune workers -> superviseur
+            total: Nombre de fichiers à traiter (journal)
+        """
+        if all(state["process"].is_alive() for state in workers.values()):
+            return
+        while True:
+            try:
+                message = result_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_message(message, workers, idle, result_queue, total)
+        
+        for slot, state in list(workers.items()):
+            if state["process"].is_alive():
+                continue
+            if state["current"] is not None:
+                logger.error(f"Worker {slot + 1} arrêté pendant {state['current'].path}")
+                self.results.append({
+                    "path": state["current"].path, "success": False,
+                    "processing_time": 0.0, "slot": slot
+                })
+            del workers[slot]
+            idle.discard(slot)
+            pending.append(slot)
+    
+    def run(self, listes_audio: List[List[Audio]]) -> List[Dict]:
+        """
+        Exécute tous les fichiers sur le pool et attend la fin.
+        
+        Args:
+            listes_audio: Répartition initiale par slot
+        
+        Returns:
+            Liste des résultats (path, success, processing_time, slot)
+        """
+        self.load_jobs(listes_audio)
+        total = self.remaining_jobs()
+        nb_slots = min(len(self.cpu_affinity), total)
+        if self.slot_models:
+            # Chaque modèle garde ses slots (un slot sans fichier s'arrête aussitôt)
+            nb_slots = min(len(self.cpu_affinity), len(self.slot_models))
+        if total == 0 or nb_slots == 0:
+            logger.warning("Aucun fichier à traiter")
+            return []
+        
+        # Réinitialiser les trackers (les incarnations successives y ajoutent)
+        trackers_dir = Path(self.config.get('paths', {}).get('trackers_dir', 'trackers'))
+        trackers_dir.mkdir(parents=True, exist_ok=True)
+        for slot in range(nb_slots):
+            with open(trackers_dir / f"Tracker{slot + 1}.txt", 'w', encoding='utf-8') as f:
+                f.write(f"=== Worker {slot + 1} - pool ===\n\n")
+        
+        logger.info(f"Pool: {total} fichiers sur {nb_slots} workers")
+        start_time = time.time()
+        result_queue = Queue()
+        workers = {}
+        pending = list(range(nb_slots))
+        # Slots réservés en attente d'un fichier urgent (priorités)
+        idle = set()
+        self.recycled = 0
+        if self.inbox is not None:
+            self.inbox.seen.update(audio.path for q in self.queues for audio in q)
+        
+        while workers or pending:
+            if self.inbox is not None and self.priority is not None:
+                for audio, classe in self.inbox.poll():
+                    self.enqueue(self.priority.classify(audio, classe=classe))
+                    total += 1
+            self._dispatch_idle(idle, workers)
+            if not workers and self.admission is not None and self.remaining_jobs() > 0:
+                # Plus aucun worker: attente bloquante de la mémoire, puis refus
+                if not self.admission.admit(lambda: [], f"worker {pending[0] + 1}"):
+                    logger.error(
+                        f"Mémoire insuffisante: {self.remaining_jobs()} fichiers non traités, "
+                        f"{len(pending)} workers non démarrés"
+                    )
+                    break
+                slot = pending.pop(0)
+                workers[slot] = self._start_worker(slot, result_queue)
+            self._admit_pending(pending, workers, result_queue)
+            if not workers:
+                continue
+            
+            try:
+                self._handle_message(result_queue.get(timeout=5), workers, idle, result_queue, total)
+            except queue.Empty:
+                pass
+            # Workers morts sans prévenir: contrôlés à chaque tour, même si d'autres envoient des messages
+            self._reap_dead_workers(workers, idle, pending, result_queue, total)
+        
+        makespan = time.time() - start_time
+        busy = sum(r["processing_time"] for r in self.results)
+        idle = max(0.0, makespan * nb_slots - busy)
+        logger.info(
+            f"Pool terminé: makespan {makespan:.1f}s, temps inactif cumulé {idle:.1f}s "
+            f"({idle / (makespan * nb_slots) * 100 if makespan > 0 else 0:.1f}%), "
+            f"{self.recycled} recyclages"
+        )
+        return self.results
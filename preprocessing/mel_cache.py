@@ -0,0 +1,99 @@
+"""
+Station TV - Mel Cache
+Cache disque des spectrogrammes log-mel Whisper, indexé par le contenu du
+fichier audio et les paramètres mel: tiny, base, small et medium (80 bandes)
+partagent le même log-mel pour un enregistrement donné.
+"""
+
+import hashlib
+import time
+import numpy as np
+import torch
+import whisper
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from preprocessing.pcm_cache import ArrayCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MelCache(ArrayCache):
+    """
+    Cache des log-mel au format attendu par model.transcribe
+    (log_mel_spectrogram avec un padding de 30 s).
+    """
+    
+    def __init__(self, cache_dir: str = "cache/mel", max_size_gb: float = 20.0):
+        """
+        Initialise le cache.
+        
+        Args:
+            cache_dir: Répertoire des entrées
+            max_size_gb: Taille maximale du cache (Go)
+        """
+        super().__init__(cache_dir, max_size_gb)
+    
+    @staticmethod
+    def mel_params(n_mels: int) -> str:
+        """
+        Décrit les paramètres du log-mel (partie de la clé de cache).
+        
+        Args:
+            n_mels: Nombre de bandes mel (80, ou 128 pour large-v3)
+        
+        Returns:
+            Identifiant des paramètres
+        """
+        return (
+            f"mel{n_mels}_fft{whisper.audio.N_FFT}_hop{whisper.audio.HOP_LENGTH}"
+            f"_sr{whisper.audio.SAMPLE_RATE}_pad{whisper.audio.N_SAMPLES}"
+        )
+    
+    @staticmethod
+    def regions_key(regions: List[Tuple[float, float]]) -> str:
+        """
+        Décrit les zones retenues d'un fichier (partie de la clé de cache).
+        
+        Args:
+            regions: Zones (début, fin) en secondes
+        
+        Returns:
+            Identifiant des zones
+        """
+        boundaries = ",".join(f"{begin:.3f}-{end:.3f}" for begin, end in regions)
+        return "regions" + hashlib.blake2b(boundaries.encode(), digest_size=8).hexdigest()
+    
+    def load(
+        self,
+        audio_path: str,
+        n_mels: int,
+        audio_loader: Optional[Callable[[str], np.ndarray]] = None,
+        variant: str = ""
+    ) -> torch.Tensor:
+        """
+        Retourne le log-mel d'un fichier, calculé une seule fois.
+        
+        Args:
+            audio_path: Chemin du fichier audio
+            n_mels: Nombre de bandes mel du modèle (model.dims.n_mels)
+            audio_loader: Décodeur du fichier en cas d'absence (défaut: whisper.load_audio)
+            variant: Signal dérivé du fichier (ex: regions_key des zones de parole),
+                     rendu par audio_loader
+        
+        Returns:
+            Log-mel (n_mels, trames) adossé au fichier mappé
+        """
+        key = self.content_key(audio_path) + (f"_{variant}" if variant else "")
+        entry = self.get_entry_path(f"{key}_{self.mel_params(n_mels)}")
+        mel = self._open(entry)
+        
+        if mel is None:
+            start_time = time.time()
+            audio = (audio_loader or whisper.load_audio)(audio_path)
+            mel = whisper.log_mel_spectrogram(audio, n_mels, padding=whisper.audio.N_SAMPLES)
+            mel = self._store(entry, mel.cpu().numpy().astype(np.float32, copy=False), time.time() - start_time)
+            logger.info(f"Log-mel de {Path(audio_path).name} mis en cache ({mel.nbytes / 1024**2:.0f} Mo)")
+        
+        return torch.from_numpy(mel)
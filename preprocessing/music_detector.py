@@ -0,0 +1,202 @@
+"""
+Station TV - Speech/Music Discriminator
+Classification légère parole / musique / mixte par descripteurs spectraux
+(vectorisée numpy), pour écarter ou alléger la transcription des clips,
+concerts et jingles.
+"""
+
+import numpy as np
+from typing import List, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SPEECH = "speech"
+MUSIC = "music"
+MIXED = "mixed"
+
+
+class SpeechMusicClassifier:
+    """
+    Discriminateur parole / musique par fenêtres de quelques secondes.
+    
+    Descripteurs par fenêtre (trames de frame_s):
+    - proportion de trames de faible énergie (< 50 % de l'énergie moyenne):
+      élevée pour la parole (pauses entre syllabes), faible pour la musique;
+    - variation du taux de passage par zéro (alternance voisé/non voisé);
+    - planéité spectrale moyenne: faible pour les sons tonals (musique).
+    
+    Les fenêtres silencieuses sont étiquetées parole (laissées à la VAD) et
+    les zones de musique plus courtes que min_music_s deviennent mixtes.
+    """
+    
+    # Fenêtres analysées par bloc (borne la mémoire de la FFT)
+    BLOCK_WINDOWS = 256
+    
+    def __init__(
+        self,
+        window_s: float = 2.0,
+        frame_s: float = 0.025,
+        speech_low_energy: float = 0.35,
+        music_low_energy: float = 0.15,
+        music_zcr_variation: float = 0.6,
+        music_flatness: float = 0.2,
+        min_music_s: float = 10.0,
+        silence_db: float = -50.0
+    ):
+        """
+        Initialise le discriminateur.
+        
+        Args:
+            window_s: Durée d'une fenêtre de décision (secondes)
+            frame_s: Durée d'une trame d'analyse (secondes)
+            speech_low_energy: Proportion de trames faibles au-delà de laquelle la fenêtre est de la parole
+            music_low_energy: Proportion de trames faibles en deçà de laquelle la fenêtre peut être de la musique
+            music_zcr_variation: Coefficient de variation du ZCR maximal pour de la musique
+            music_flatness: Planéité spectrale moyenne maximale pour de la musique
+            min_music_s: Durée minimale d'une zone de musique (secondes)
+            silence_db: Énergie (dBFS) sous laquelle une fenêtre est considérée silencieuse
+        """
+        self.window_s = window_s
+        self.frame_s = frame_s
+        self.speech_low_energy = speech_low_energy
+        self.music_low_energy = music_low_energy
+        self.music_zcr_variation = music_zcr_variation
+        self.music_flatness = music_flatness
+        self.min_music_s = min_music_s
+        self.silence_db = silence_db
+        
+        logger.info(f"SpeechMusicClassifier initialisé: fenêtres de {window_s}s, musique min {min_music_s}s")
+    
+    def _frame_layout(self, sample_rate: int) -> Tuple[int, int]:
+        """Retourne (échantillons par trame, trames par fenêtre)."""
+        return max(2, int(self.frame_s * sample_rate)), max(1, int(round(self.window_s / self.frame_s)))
+    
+    def window_features(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Calcule les descripteurs de chaque fenêtre.
+        
+        Args:
+            audio: Signal mono (float32)
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        
+        Returns:
+            Tableau (fenêtres, 4): énergie (dBFS), proportion de trames faibles,
+            coefficient de variation du ZCR, planéité spectrale moyenne
+        """
+        frame_len, frames_per_window = self._frame_layout(sample_rate)
+        window_len = frame_len * frames_per_window
+        n_windows = len(audio) // window_len
+        
+        # Par blocs de fenêtres: la FFT du fichier entier ne tiendrait pas en mémoire
+        features = [np.zeros((0, 4), dtype=np.float32)]
+        for first in range(0, n_windows, self.BLOCK_WINDOWS):
+            count = min(self.BLOCK_WINDOWS, n_windows - first)
+            block = np.asarray(audio[first * window_len:(first + count) * window_len], dtype=np.float32)
+            features.append(self._block_features(block.reshape(count, frames_per_window, frame_len)))
+        return np.concatenate(features)
+    
+    @staticmethod
+    def _block_features(frames: np.ndarray) -> np.ndarray:
+        """Descripteurs d'un bloc de fenêtres (fenêtres, trames, échantillons)."""
+        frame_len = frames.shape[2]
+        energy = np.einsum('wfs,wfs->wf', frames, frames) / frame_len
+        mean_energy = energy.mean(axis=1)
+        low_energy = np.mean(energy < 0.5 * mean_energy[:, None], axis=1)
+        
+        zcr = np.count_nonzero(np.diff(np.signbit(frames), axis=2), axis=2) / frame_len
+        zcr_variation = zcr.std(axis=1) / (zcr.mean(axis=1) + 1e-6)
+        
+        spectrum = np.abs(np.fft.rfft(frames, axis=2)) + 1e-10
+        flatness = np.exp(np.mean(np.log(spectrum), axis=2)) / np.mean(spectrum, axis=2)
+        
+        return np.stack([
+            10.0 * np.log10(mean_energy + 1e-10),
+            low_energy,
+            zcr_variation,
+            flatness.mean(axis=1)
+        ], axis=1).astype(np.float32)
+    
+    def classify(self, audio: np.ndarray, sample_rate: int) -> List[Tuple[float, float, str]]:
+        """
+        Découpe un signal en zones parole / musique / mixte.
+        
+        Args:
+            audio: Signal mono (float32)
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        
+        Returns:
+            Liste de (début, fin, étiquette) en secondes, contiguë et couvrant tout le signal
+        """
+        duration = len(audio) / sample_rate
+        features = self.window_features(audio, sample_rate)
+        if len(features) == 0:
+            return [(0.0, duration, SPEECH)] if duration > 0 else []
+        
+        frame_len, frames_per_window = self._frame_layout(sample_rate)
+        step = frame_len * frames_per_window / sample_rate
+        energy_db, low_energy, zcr_variation, flatness = features.T
+        labels = np.full(len(features), MIXED, dtype=object)
+        labels[low_energy >= self.speech_low_energy] = SPEECH
+        labels[
+            (low_energy < self.music_low_energy)
+            & ((zcr_variation < self.music_zcr_variation) | (flatness < self.music_flatness))
+        ] = MUSIC
+        labels[energy_db < self.silence_db] = SPEECH
+        
+        # Regroupement des fenêtres consécutives de même étiquette
+        spans = []
+        for index, label in enumerate(labels):
+            begin = index * step
+            if spans and spans[-1][2] == label:
+                spans[-1][1] = begin + step
+            else:
+                spans.append([begin, begin + step, label])
+        
+        # Musique trop courte (transition, habillage sonore): mixte
+        for span in spans:
+            if span[2] == MUSIC and span[1] - span[0] < self.min_music_s:
+                span[2] = MIXED
+        
+        merged = []
+        for begin, end, label in spans:
+            if merged and merged[-1][2] == label:
+                merged[-1] = (merged[-1][0], end, label)
+            else:
+                merged.append((begin, end, label))
+        
+        # La fin du signal (fenêtre incomplète) prolonge la dernière zone
+        merged[-1] = (merged[-1][0], duration, merged[-1][2])
+        return merged
+    
+    @staticmethod
+    def split_regions(
+        regions: List[Tuple[float, float]],
+        spans: List[Tuple[float, float, str]],
+        label: str = MUSIC
+    ) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """
+        Sépare des zones selon qu'elles recouvrent des zones d'une étiquette donnée.
+        
+        Args:
+            regions: Zones à transcrire (secondes), triées et disjointes
+            spans: Zones étiquetées retournées par classify()
+            label: Étiquette à isoler
+        
+        Returns:
+            Tuple (zones hors étiquette, zones dans l'étiquette)
+        """
+        targets = [(begin, end) for begin, end, span_label in spans if span_label == label]
+        kept, removed = [], []
+        for begin, end in regions:
+            cursor = begin
+            for target_begin, target_end in targets:
+                if target_end <= cursor or target_begin >= end:
+                    continue
+                if target_begin > cursor:
+                    kept.append((cursor, target_begin))
+                removed.append((max(cursor, target_begin), min(end, target_end)))
+                cursor = min(end, target_end)
+            if cursor < end:
+                kept.append((cursor, end))
+        return kept, removed
@@ -0,0 +1,218 @@
+"""
+Station TV - PCM Cache
+Cache disque du PCM décodé (16 kHz mono float32), indexé par le contenu
+du fichier source et relu en mémoire mappée: ffmpeg ne tourne qu'une fois
+par fichier et les workers partagent le cache de pages du noyau.
+"""
+
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import whisper
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArrayCache:
+    """
+    Cache LRU de tableaux numpy sur disque, borné en taille.
+    
+    Chaque entrée est un fichier .npy nommé d'après l'empreinte BLAKE2 du
+    fichier audio source, accompagné d'un .json (temps de calcul de l'entrée,
+    pour estimer le temps économisé). La date de modification de l'entrée
+    sert d'horodatage LRU (mise à jour à chaque lecture).
+    """
+    
+    def __init__(self, cache_dir: str, max_size_gb: float = 20.0):
+        """
+        Initialise le cache.
+        
+        Args:
+            cache_dir: Répertoire des entrées
+            max_size_gb: Taille maximale du cache (Go)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_gb * 1024**3)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Empreintes déjà calculées dans ce processus: (chemin, taille, mtime) -> clé
+        self._keys: Dict[Tuple[str, int, int], str] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "compute_time_s": 0.0, "saved_time_s": 0.0}
+        
+        logger.info(f"{type(self).__name__} initialisé: {self.cache_dir} (max {max_size_gb} Go)")
+    
+    def content_key(self, audio_path: str) -> str:
+        """
+        Calcule l'empreinte du contenu d'un fichier audio.
+        
+        Args:
+            audio_path: Chemin du fichier
+        
+        Returns:
+            Empreinte hexadécimale
+        """
+        stat = os.stat(audio_path)
+        memo_key = (os.path.abspath(audio_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._keys:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(audio_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+            self._keys[memo_key] = digest.hexdigest()
+        return self._keys[memo_key]
+    
+    def get_entry_path(self, key: str) -> Path:
+        """Retourne le chemin de l'entrée d'une clé."""
+        return self.cache_dir / f"{key}.npy"
+    
+    def _open(self, entry: Path) -> Optional[np.ndarray]:
+        """
+        Ouvre une entrée existante en mémoire mappée (copy-on-write).
+        
+        Args:
+            entry: Chemin de l'entrée
+        
+        Returns:
+            Tableau mappé ou None si l'entrée est absente ou illisible
+        """
+        if not entry.exists():
+            return None
+        try:
+            array = np.load(entry, mmap_mode='c')
+            os.utime(entry)
+        except (OSError, ValueError):
+            # Entrée supprimée ou tronquée entre-temps: la regénérer
+            return None
+        
+        self.stats["hits"] += 1
+        try:
+            with open(entry.with_suffix(".json"), 'r', encoding='utf-8') as f:
+                self.stats["saved_time_s"] += json.load(f).get("compute_time_s", 0.0)
+        except (OSError, ValueError):
+            pass
+        return array
+    
+    def _store(self, entry: Path, array: np.ndarray, compute_time_s: float) -> np.ndarray:
+        """
+        Écrit une entrée puis la rouvre en mémoire mappée.
+        
+        Args:
+            entry: Chemin de l'entrée
+            array: Tableau à stocker
+            compute_time_s: Temps de calcul du tableau (secondes)
+        
+        Returns:
+            Tableau mappé
+        """
+        self.stats["misses"] += 1
+        self.stats["compute_time_s"] += compute_time_s
+        
+        # Écriture atomique (fichier temporaire puis renommage): sûr entre workers
+        tmp_path = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, array)
+        with open(entry.with_suffix(".json"), 'w', encoding='utf-8') as f:
+            json.dump({"compute_time_s": compute_time_s}, f)
+        os.replace(tmp_path, entry)
+        
+        self._evict_over_budget(keep=entry)
+        return np.load(entry, mmap_mode='c')
+    
+    def get_size_bytes(self) -> int:
+        """Retourne la taille totale des entrées du cache (octets)."""
+        total = 0
+        for path in self.cache_dir.glob("*.npy"):
+            if ".tmp" in path.name:
+                continue
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+    
+    def _evict_over_budget(self, keep: Path):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de la taille maximale.
+        Une entrée encore mappée par un autre processus reste lisible (inode conservé).
+        
+        Args:
+            keep: Entrée à ne jamais supprimer (celle qui vient d'être écrite)
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            if ".tmp" in path.name:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                path.with_suffix(".json").unlink(missing_ok=True)
+                total -= size
+                self.stats["evictions"] += 1
+                logger.info(f"Entrée {path.name} évincée (cache > {self.max_size_bytes / 1024**3:.1f} Go)")
+            except FileNotFoundError:
+                continue
+    
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs du cache.
+        
+        Returns:
+            Dictionnaire (hits, misses, evictions, compute_time_s, saved_time_s, hit_rate, size_gb)
+        """
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size_gb"] = self.get_size_bytes() / 1024**3
+        return stats
+
+
+class PCMCache(ArrayCache):
+    """
+    Cache du PCM 16 kHz mono décodé par ffmpeg.
+    """
+    
+    def __init__(self, cache_dir: str = "cache/pcm", max_size_gb: float = 20.0):
+        """
+        Initialise le cache.
+        
+        Args:
+            cache_dir: Répertoire des entrées
+            max_size_gb: Taille maximale du cache (Go)
+        """
+        super().__init__(cache_dir, max_size_gb)
+    
+    def load(self, audio_path: str) -> np.ndarray:
+        """
+        Retourne le PCM 16 kHz mono d'un fichier, décodé une seule fois.
+        
+        Args:
+            audio_path: Chemin du fichier audio
+        
+        Returns:
+            Signal float32 mappé en mémoire (copy-on-write)
+        """
+        entry = self.get_entry_path(self.content_key(audio_path))
+        audio = self._open(entry)
+        if audio is not None:
+            return audio
+        
+        start_time = time.time()
+        audio = whisper.load_audio(audio_path)
+        audio = self._store(entry, audio.astype(np.float32, copy=False), time.time() - start_time)
+        logger.info(f"PCM de {Path(audio_path).name} mis en cache ({audio.nbytes / 1024**2:.0f} Mo)")
+        return audio
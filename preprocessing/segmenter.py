@@ -0,0 +1,121 @@
+"""
+Station TV - Audio Segmenter
+Découpage des enregistrements longs aux points de faible énergie
+pour une transcription parallèle par morceaux.
+"""
+
+import numpy as np
+from typing import List, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AudioSegmenter:
+    """
+    Découpe un signal PCM mono en morceaux de durée bornée,
+    en coupant dans les passages les plus silencieux.
+    """
+    
+    def __init__(
+        self,
+        min_duration_s: float = 300.0,
+        max_duration_s: float = 1200.0,
+        frame_s: float = 0.05,
+        smoothing_s: float = 0.5
+    ):
+        """
+        Initialise le segmenteur.
+        
+        Args:
+            min_duration_s: Durée minimale d'un morceau (secondes)
+            max_duration_s: Durée maximale d'un morceau (secondes)
+            frame_s: Durée d'une trame d'analyse d'énergie (secondes)
+            smoothing_s: Fenêtre de lissage de l'énergie (secondes)
+        """
+        self.min_duration_s = min_duration_s
+        self.max_duration_s = max(max_duration_s, min_duration_s)
+        self.frame_s = frame_s
+        self.smoothing_s = smoothing_s
+        
+        logger.info(
+            f"AudioSegmenter initialisé: morceaux de {min_duration_s:.0f}s à {self.max_duration_s:.0f}s"
+        )
+    
+    def frame_energy_db(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Calcule l'énergie lissée par trame, en dB.
+        
+        Args:
+            audio: Signal mono (float32)
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        
+        Returns:
+            Énergie par trame (dB)
+        """
+        frame_len = max(1, int(self.frame_s * sample_rate))
+        n_frames = len(audio) // frame_len
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+        energy = np.mean(frames ** 2, axis=1)
+        
+        # Lissage: un silence utile dure au moins quelques centaines de ms
+        width = max(1, int(self.smoothing_s / self.frame_s))
+        if width > 1 and n_frames >= width:
+            energy = np.convolve(energy, np.ones(width) / width, mode='same')
+        
+        return 10.0 * np.log10(energy + 1e-10)
+    
+    def find_chunks(self, audio: np.ndarray, sample_rate: int) -> List[Tuple[float, float]]:
+        """
+        Détermine les bornes des morceaux.
+        
+        Chaque coupe est placée au minimum d'énergie de la fenêtre
+        [début + min, début + max], en laissant au moins min pour la fin.
+        Si le reste ne peut plus faire deux morceaux d'au moins min, les deux
+        derniers morceaux sont équilibrés (coupe au silence près du milieu).
+        
+        Args:
+            audio: Signal mono (float32)
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        
+        Returns:
+            Liste de tuples (début, fin) en secondes
+        """
+        duration = len(audio) / sample_rate
+        if duration <= self.max_duration_s:
+            return [(0.0, duration)]
+        
+        energy_db = self.frame_energy_db(audio, sample_rate)
+        chunks = []
+        start = 0.0
+        
+        while duration - start > self.max_duration_s:
+            lo = start + self.min_duration_s
+            hi = min(start + self.max_duration_s, duration - self.min_duration_s)
+            if hi < lo:
+                # Reste < 2 × min: deux morceaux proches de la moitié, chacun ≤ max
+                half = (duration - start) / 2
+                margin = min(self.max_duration_s - half, half / 2)
+                lo, hi = start + half - margin, start + half + margin
+            lo_frame = int(lo / self.frame_s)
+            hi_frame = max(lo_frame + 1, int(hi / self.frame_s))
+            
+            window = energy_db[lo_frame:hi_frame]
+            if len(window) == 0:
+                cut = lo
+            else:
+                cut = (lo_frame + int(np.argmin(window))) * self.frame_s
+            
+            chunks.append((start, cut))
+            start = cut
+        
+        chunks.append((start, duration))
+        
+        logger.info(
+            f"{len(chunks)} morceaux pour {duration:.0f}s d'audio: "
+            + ", ".join(f"{end - begin:.0f}s" for begin, end in chunks)
+        )
+        return chunks
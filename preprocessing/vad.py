@@ -0,0 +1,184 @@
+"""
+Station TV - Voice Activity Detection
+Pré-passe de détection d'activité vocale par énergie (vectorisée numpy):
+carte des zones de parole, extraction des seules zones utiles pour
+l'encodeur et recalage des horodatages sur le fichier d'origine.
+"""
+
+import bisect
+import numpy as np
+from typing import Dict, List, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class VoiceActivityDetector:
+    """
+    Détecteur d'activité vocale à seuil d'énergie.
+    
+    Les trames au-dessus de threshold_db (dBFS) sont considérées actives;
+    les silences plus courts que min_silence_s sont comblés, les zones
+    actives plus courtes que min_speech_s sont ignorées et chaque zone
+    est élargie de padding_s pour ne pas couper d'attaque de mot.
+    """
+    
+    def __init__(
+        self,
+        threshold_db: float = -40.0,
+        frame_s: float = 0.03,
+        min_speech_s: float = 0.3,
+        min_silence_s: float = 1.0,
+        padding_s: float = 0.2
+    ):
+        """
+        Initialise le détecteur.
+        
+        Args:
+            threshold_db: Seuil d'énergie en dBFS (preprocessing.silence_threshold_db)
+            frame_s: Durée d'une trame d'analyse (secondes)
+            min_speech_s: Durée minimale d'une zone de parole (secondes)
+            min_silence_s: Durée minimale d'un silence supprimé (secondes)
+            padding_s: Marge conservée autour de chaque zone de parole (secondes)
+        """
+        self.threshold_db = threshold_db
+        self.frame_s = frame_s
+        self.min_speech_s = min_speech_s
+        self.min_silence_s = min_silence_s
+        self.padding_s = padding_s
+        
+        logger.info(f"VoiceActivityDetector initialisé: seuil {threshold_db} dBFS, silence min {min_silence_s}s")
+    
+    @staticmethod
+    def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Retourne les débuts et fins (exclues) des plages True d'un masque."""
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    
+    def speech_map(self, audio: np.ndarray, sample_rate: int) -> List[Tuple[float, float]]:
+        """
+        Construit la carte des zones de parole d'un signal.
+        
+        Args:
+            audio: Signal mono (float32, amplitude dans [-1, 1])
+            sample_rate: Fréquence d'échantillonnage (Hz)
+        
+        Returns:
+            Liste de tuples (début, fin) en secondes, triés et disjoints
+        """
+        frame_len = max(1, int(self.frame_s * sample_rate))
+        n_frames = -(-len(audio) // frame_len)
+        if n_frames == 0:
+            return []
+        
+        # Énergie par trame (dernière trame complétée par des zéros)
+        padded = np.zeros(n_frames * frame_len, dtype=np.float32)
+        padded[:len(audio)] = audio
+        energy = np.mean(padded.reshape(n_frames, frame_len) ** 2, axis=1)
+        active = 10.0 * np.log10(energy + 1e-10) > self.threshold_db
+        
+        # Combler les silences courts (entre deux zones actives)
+        starts, ends = self._runs(~active)
+        short = (ends - starts) < self.min_silence_s / self.frame_s
+        inner = (starts > 0) & (ends < n_frames)
+        fill = np.zeros(n_frames + 1, dtype=np.int32)
+        np.add.at(fill, starts[short & inner], 1)
+        np.add.at(fill, ends[short & inner], -1)
+        active |= np.cumsum(fill[:-1]) > 0
+        
+        # Supprimer les zones actives trop courtes (clics, bruits)
+        starts, ends = self._runs(active)
+        keep = (ends - starts) >= self.min_speech_s / self.frame_s
+        
+        duration = len(audio) / sample_rate
+        regions = []
+        for start, end in zip(starts[keep], ends[keep]):
+            begin = max(0.0, start * self.frame_s - self.padding_s)
+            finish = min(duration, end * self.frame_s + self.padding_s)
+            if regions and begin <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], finish)
+            else:
+                regions.append((begin, finish))
+        return regions
+    
+    @staticmethod
+    def extract(
+        audio: np.ndarray,
+        sample_rate: int,
+        regions: List[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+        """
+        Concatène les zones de parole.
+        
+        Args:
+            audio: Signal d'origine
+            sample_rate: Fréquence d'échantillonnage (Hz)
+            regions: Carte des zones de parole (secondes)
+        
+        Returns:
+            Tuple (signal concaténé, correspondances (début concaténé, début d'origine))
+        """
+        pieces = []
+        mapping = []
+        position = 0.0
+        for begin, end in regions:
+            piece = audio[int(begin * sample_rate):int(end * sample_rate)]
+            mapping.append((position, begin))
+            pieces.append(piece)
+            position += len(piece) / sample_rate
+        
+        if not pieces:
+            return np.zeros(0, dtype=np.float32), []
+        return np.concatenate(pieces), mapping
+    
+    @staticmethod
+    def remap_time(t: float, mapping: List[Tuple[float, float]], is_end: bool = False) -> float:
+        """
+        Convertit un horodatage du signal concaténé vers le fichier d'origine.
+        
+        Args:
+            t: Horodatage dans le signal concaténé (secondes)
+            mapping: Correspondances retournées par extract()
+            is_end: Horodatage de fin (une fin à la jointure reste dans la zone précédente)
+        
+        Returns:
+            Horodatage dans le fichier d'origine (secondes)
+        """
+        if not mapping:
+            return t
+        starts = [m[0] for m in mapping]
+        position = bisect.bisect_left(starts, t) if is_end else bisect.bisect_right(starts, t)
+        index = max(0, position - 1)
+        concat_start, original_start = mapping[index]
+        return original_start + (t - concat_start)
+    
+    @classmethod
+    def remap_result(cls, result: Dict, mapping: List[Tuple[float, float]]) -> Dict:
+        """
+        Recale les segments (et les mots) d'un résultat Whisper sur le fichier d'origine.
+        
+        Args:
+            result: Résultat obtenu sur le signal concaténé
+            mapping: Correspondances retournées par extract()
+        
+        Returns:
+            Résultat avec des horodatages d'origine
+        """
+        segments = []
+        for segment in result.get("segments", []):
+            segment = dict(
+                segment,
+                start=cls.remap_time(segment["start"], mapping),
+                end=cls.remap_time(segment["end"], mapping, is_end=True)
+            )
+            if segment.get("words"):
+                segment["words"] = [
+                    dict(
+                        word,
+                        start=cls.remap_time(word["start"], mapping),
+                        end=cls.remap_time(word["end"], mapping, is_end=True)
+                    )
+                    for word in segment["words"]
+                ]
+            segments.append(segment)
+        return dict(result, segments=segments)
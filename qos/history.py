@@ -0,0 +1,411 @@
+"""
+Station TV - Processing History
+Historique persistant des temps de traitement (issus des trackers) et modèle
+de prédiction appris sur cet historique: temps de traitement d'un fichier
+selon sa durée, le modèle, le nombre de threads, la chaîne et la part de parole.
+"""
+
+import csv
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.scheduling import DEFAULT_COST_FACTORS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HISTORY_FIELDS = [
+    "timestamp", "file", "channel", "model", "threads",
+    "audio_s", "speech_ratio", "processing_s", "predicted_s"
+]
+
+
+class ProcessingHistory:
+    """
+    Historique des traitements (CSV, une ligne par fichier transcrit).
+    Chaque ligne garde le temps prédit avant le traitement pour suivre
+    l'erreur du prédicteur dans le temps.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialise l'historique et charge les enregistrements existants.
+        
+        Args:
+            path: Fichier CSV de l'historique
+        """
+        self.path = Path(path)
+        self.records: List[Dict] = []
+        self.load()
+    
+    def load(self):
+        """Charge l'historique depuis le fichier CSV (lignes invalides ignorées)."""
+        self.records = []
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    try:
+                        self.records.append({
+                            "timestamp": float(row["timestamp"]),
+                            "file": row["file"],
+                            "channel": row["channel"],
+                            "model": row["model"],
+                            "threads": int(row["threads"]),
+                            "audio_s": float(row["audio_s"]),
+                            "speech_ratio": float(row["speech_ratio"]),
+                            "processing_s": float(row["processing_s"]),
+                            "predicted_s": float(row["predicted_s"] or 0.0)
+                        })
+                    except (KeyError, TypeError, ValueError):
+                        continue
+            logger.info(f"Historique chargé: {len(self.records)} traitements ({self.path})")
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de l'historique {self.path}: {str(e)}")
+    
+    def append(self, records: List[Dict]):
+        """
+        Ajoute des enregistrements à l'historique (mémoire et fichier).
+        
+        Args:
+            records: Enregistrements (champs HISTORY_FIELDS)
+        """
+        if not records:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            with open(self.path, 'a', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction='ignore')
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(records)
+            self.records.extend(records)
+            logger.info(f"Historique: {len(records)} traitements ajoutés ({len(self.records)} au total)")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture de l'historique {self.path}: {str(e)}")
+    
+    @staticmethod
+    def from_transcriptions(
+        transcriptions: List[Dict],
+        default_model: str = "unknown",
+        default_threads: int = 0
+    ) -> List[Dict]:
+        """
+        Convertit les transcriptions de MetricsCalculator en enregistrements.
+        
+        Args:
+            transcriptions: MetricsCalculator.transcriptions (import des trackers)
+            default_model: Modèle des lignes de tracker qui ne le précisent pas
+            default_threads: Threads des lignes de tracker qui ne les précisent pas
+        
+        Returns:
+            Enregistrements (sans temps prédit) des transcriptions réussies et mesurables
+        """
+        records = []
+        for t in transcriptions:
+            if not t["success"] or t["audio_duration"] <= 0 or t["processing_time"] <= 0:
+                continue
+            model = t.get("model") or "unknown"
+            records.append({
+                # Fin du traitement (et non date de l'import des trackers)
+                "timestamp": t["finished_at"],
+                "file": Path(t["file_path"]).name,
+                "channel": t.get("channel", ""),
+                "model": default_model if model == "unknown" else model,
+                "threads": t.get("threads") or default_threads,
+                "audio_s": t["audio_duration"],
+                # Part de l'audio réellement décodée (hors silences écartés par la VAD)
+                "speech_ratio": max(0.0, 1.0 - t.get("audio_skipped", 0.0) / t["audio_duration"]),
+                "processing_s": t["processing_time"],
+                "predicted_s": 0.0
+            })
+        return records
+    
+    def record(
+        self,
+        transcriptions: List[Dict],
+        predictor: "ProcessingTimePredictor",
+        default_model: str = "unknown"
+    ) -> List[Dict]:
+        """
+        Ajoute les transcriptions d'un lancement avec le temps que le prédicteur
+        (ajusté avant le lancement) leur attribuait.
+        
+        Args:
+            transcriptions: MetricsCalculator.transcriptions (import des trackers)
+            predictor: Prédicteur ajusté sur l'historique antérieur au lancement
+            default_model: Modèle des lignes de tracker qui ne le précisent pas
+        
+        Returns:
+            Enregistrements ajoutés
+        """
+        records = self.from_transcriptions(transcriptions, default_model)
+        for r in records:
+            # Prédiction faite sans connaître la part de parole (comme avant le traitement)
+            r["predicted_s"] = predictor.predict(r["audio_s"], r["model"], r["threads"], r["channel"])
+        self.append(records)
+        return records
+    
+    @staticmethod
+    def error_stats(records: Sequence[Dict], recent: int = 100) -> Dict:
+        """
+        Erreur du prédicteur sur les enregistrements qui ont un temps prédit.
+        
+        Args:
+            records: Enregistrements de l'historique
+            recent: Nombre de derniers enregistrements de la fenêtre récente
+        
+        Returns:
+            Dictionnaire (samples, mape, mape_recent, bias, mape_per_day), vide sans prédiction
+        """
+        scored = sorted(
+            (r for r in records if r["predicted_s"] > 0 and r["processing_s"] > 0),
+            key=lambda r: r["timestamp"]
+        )
+        if not scored:
+            return {}
+        
+        def mape(rows):
+            return sum(abs(r["predicted_s"] - r["processing_s"]) / r["processing_s"] for r in rows) / len(rows)
+        
+        per_day = {}
+        for r in scored:
+            per_day.setdefault(time.strftime("%Y-%m-%d", time.localtime(r["timestamp"])), []).append(r)
+        
+        return {
+            "samples": len(scored),
+            "mape": mape(scored),
+            "mape_recent": mape(scored[-recent:]),
+            # Prédit / réel - 1, médian (> 0: le prédicteur surestime)
+            "bias": float(np.median([r["predicted_s"] / r["processing_s"] - 1.0 for r in scored])),
+            "mape_per_day": {day: mape(rows) for day, rows in per_day.items()}
+        }
+
+
+class ProcessingTimePredictor:
+    """
+    Prédiction du temps de traitement par régression ridge sur le logarithme
+    du coût (secondes de calcul par seconde d'audio).
+    
+    Le coût est modélisé relativement au facteur de coût par défaut du modèle
+    (DEFAULT_COST_FACTORS, batch.cost_factors): sans historique, ou pour un
+    modèle jamais observé, la prédiction retombe sur ce facteur recalé par la
+    vitesse moyenne observée de la machine. Les effets de modèle et de chaîne
+    sont rétrécis vers 0 tant qu'ils reposent sur peu de traitements.
+    """
+    
+    def __init__(
+        self,
+        cost_factors: Optional[Dict[str, float]] = None,
+        ridge: float = 1.0,
+        min_samples: int = 20
+    ):
+        """
+        Initialise le prédicteur (non ajusté).
+        
+        Args:
+            cost_factors: Facteurs de coût par modèle (surcharge DEFAULT_COST_FACTORS)
+            ridge: Pénalité ridge des effets modèle, threads, parole et chaîne
+            min_samples: Nombre minimal de traitements pour ajuster la régression
+        """
+        self.cost_factors = dict(DEFAULT_COST_FACTORS, **(cost_factors or {}))
+        self.ridge = ridge
+        self.min_samples = min_samples
+        self.fitted = False
+        self.samples = 0
+        self.models: List[str] = []
+        self.channels: List[str] = []
+        self.intercept = 0.0
+        self.coefficients = np.zeros(0)
+        self.means = np.zeros(0)
+        self.smearing = 1.0
+        self.speech_ratio = {}
+        self.default_speech_ratio = 1.0
+    
+    @classmethod
+    def from_config(cls, config: dict, history: Optional[ProcessingHistory] = None) -> "ProcessingTimePredictor":
+        """
+        Construit le prédicteur depuis la configuration et l'historique (paths.history_file).
+        
+        Args:
+            config: Configuration
+            history: Historique déjà chargé (optionnel)
+        
+        Returns:
+            Prédicteur ajusté si l'historique est activé et suffisant
+        """
+        batch_config = config.get('batch', {})
+        prediction_config = batch_config.get('prediction', {})
+        predictor = cls(
+            batch_config.get('cost_factors'),
+            prediction_config.get('ridge', 1.0),
+            prediction_config.get('min_samples', 20)
+        )
+        if prediction_config.get('enabled', True):
+            if history is None:
+                history = ProcessingHistory(
+                    config.get('paths', {}).get('history_file', 'test_output/history/processing_history.csv')
+                )
+            predictor.fit(history.records)
+        return predictor
+    
+    def _base_factor(self, model: str) -> float:
+        """Facteur de coût par défaut d'un modèle."""
+        return self.cost_factors.get(model, 1.0)
+    
+    def _features(self, model: str, threads: int, channel: str, speech_ratio: float) -> np.ndarray:
+        """Variables explicatives: modèle (indicatrices), log2(threads), parole, chaîne (indicatrices)."""
+        row = np.zeros(len(self.models) + 2 + len(self.channels))
+        if model in self.models:
+            row[self.models.index(model)] = 1.0
+        row[len(self.models)] = math.log2(max(threads, 1))
+        row[len(self.models) + 1] = speech_ratio
+        if channel in self.channels:
+            row[len(self.models) + 2 + self.channels.index(channel)] = 1.0
+        return row
+    
+    def fit(self, records: Sequence[Dict]) -> "ProcessingTimePredictor":
+        """
+        Ajuste la régression sur l'historique.
+        
+        Args:
+            records: Enregistrements de l'historique
+        
+        Returns:
+            Le prédicteur (ajusté si l'historique compte au moins min_samples traitements)
+        """
+        records = [r for r in records if r["audio_s"] > 0 and r["processing_s"] > 0]
+        
+        # Part de parole attendue par chaîne (inconnue avant la VAD)
+        ratios = {}
+        for r in records:
+            ratios.setdefault(r["channel"], []).append(r["speech_ratio"])
+        self.speech_ratio = {channel: sum(values) / len(values) for channel, values in ratios.items()}
+        if records:
+            self.default_speech_ratio = sum(r["speech_ratio"] for r in records) / len(records)
+        
+        self.samples = len(records)
+        if len(records) < self.min_samples:
+            self.fitted = False
+            logger.info(
+                f"Historique insuffisant ({len(records)}/{self.min_samples} traitements): "
+                f"prédiction par facteurs de coût"
+            )
+            return self
+        
+        self.models = sorted({r["model"] for r in records})
+        self.channels = sorted({r["channel"] for r in records if r["channel"]})
+        features = np.array([
+            self._features(r["model"], r["threads"], r["channel"], r["speech_ratio"]) for r in records
+        ])
+        # Cible: écart (log) du coût observé au facteur par défaut du modèle
+        target = np.array([
+            math.log(r["processing_s"] / r["audio_s"] / self._base_factor(r["model"])) for r in records
+        ])
+        
+        # Ridge sur variables centrées: l'ordonnée à l'origine (vitesse de la machine) n'est pas pénalisée
+        self.means = features.mean(axis=0)
+        centered = features - self.means
+        gram = centered.T @ centered + self.ridge * np.eye(centered.shape[1])
+        self.coefficients = np.linalg.solve(gram, centered.T @ (target - target.mean()))
+        self.intercept = float(target.mean())
+        
+        # Correction de retransformation (Duan): moyenne de exp(résidus)
+        residuals = target - self.intercept - centered @ self.coefficients
+        self.smearing = float(np.mean(np.exp(residuals)))
+        self.fitted = True
+        
+        logger.info(
+            f"Prédicteur ajusté sur {len(records)} traitements "
+            f"({len(self.models)} modèles, {len(self.channels)} chaînes), "
+            f"erreur log résiduelle {float(np.std(residuals)):.3f}"
+        )
+        return self
+    
+    def predict(
+        self,
+        audio_s: float,
+        model: str,
+        threads: int,
+        channel: str = "",
+        speech_ratio: Optional[float] = None
+    ) -> float:
+        """
+        Prédit le temps de traitement d'un fichier.
+        
+        Args:
+            audio_s: Durée audio (secondes)
+            model: Modèle Whisper
+            threads: Threads d'inférence du processus
+            channel: Chaîne d'origine du fichier
+            speech_ratio: Part de parole (défaut: moyenne observée de la chaîne)
+        
+        Returns:
+            Temps de traitement prédit (secondes)
+        """
+        if not self.fitted:
+            return audio_s * self._base_factor(model)
+        if speech_ratio is None:
+            speech_ratio = self.speech_ratio.get(channel, self.default_speech_ratio)
+        features = self._features(model, threads, channel, speech_ratio)
+        log_ratio = self.intercept + float((features - self.means) @ self.coefficients)
+        return audio_s * self._base_factor(model) * math.exp(log_ratio) * self.smearing
+    
+    def cost(self, model: str, threads: int) -> Callable:
+        """
+        Fonction de coût pour core.scheduling (chaîne = dossier parent du fichier).
+        
+        Args:
+            model: Modèle Whisper
+            threads: Threads d'inférence par processus
+        
+        Returns:
+            Fonction Audio -> temps de traitement prédit (secondes)
+        """
+        return lambda audio: self.predict(audio.duree, model, threads, Path(audio.path).parent.name)
+
+
+class EtaEstimator:
+    """
+    Temps restant d'une file de fichiers: temps prédits des fichiers restants,
+    recalés par le rapport réel / prédit observé sur les fichiers déjà traités.
+    """
+    
+    def __init__(self, predicted: Sequence[float]):
+        """
+        Initialise l'estimation.
+        
+        Args:
+            predicted: Temps prédits des fichiers de la file, dans l'ordre de traitement
+        """
+        self.predicted = list(predicted)
+        self.done = 0
+        self.actual_s = 0.0
+        self.predicted_done_s = 0.0
+    
+    def update(self, processing_time: float) -> float:
+        """
+        Enregistre la fin du fichier suivant de la file.
+        
+        Args:
+            processing_time: Temps de traitement réel du fichier (secondes)
+        
+        Returns:
+            Temps restant estimé (secondes)
+        """
+        if self.done < len(self.predicted):
+            self.predicted_done_s += self.predicted[self.done]
+            self.actual_s += processing_time
+            self.done += 1
+        return self.remaining()
+    
+    def remaining(self) -> float:
+        """Temps restant estimé (secondes)."""
+        correction = self.actual_s / self.predicted_done_s if self.predicted_done_s > 0 else 1.0
+        return sum(self.predicted[self.done:]) * correction
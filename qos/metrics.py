@@ -3,6 +3,7 @@ Station TV - Metrics Calculator
 Calcul des métriques QoS (throughput, WER, temps de traitement, etc.)
 """
 
+import re
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -21,6 +22,7 @@ class MetricsCalculator:
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.transcriptions: List[Dict] = []
+        self.worker_memory: List[Dict] = []
         
         logger.info("MetricsCalculator initialisé")
     
@@ -41,7 +43,8 @@ class MetricsCalculator:
         processing_time: float,
         file_path: str,
         model: str,
-        success: bool = True
+        success: bool = True,
+        fields: Optional[Dict] = None
     ):
         """
         Ajoute une transcription aux métriques.
@@ -52,13 +55,29 @@ class MetricsCalculator:
             file_path: Chemin du fichier audio
             model: Nom du modèle utilisé
             success: Succès de la transcription
+            fields: Champs optionnels, clés des lignes de tracker (cf. _parse_tracker_fields):
+                    ignoré, musique, économisé, chaîne, boucles, profil, replis,
+                    temps replis, threads, classe, échéance, fin (défaut: maintenant)
         """
+        fields = fields or {}
         self.transcriptions.append({
             "file_path": file_path,
             "audio_duration": audio_duration,
             "processing_time": processing_time,
             "model": model,
             "success": success,
+            "audio_skipped": fields.get("ignoré", 0.0),
+            "music_s": fields.get("musique", 0.0),
+            "compute_saved_s": fields.get("économisé", 0.0),
+            "channel": str(fields.get("chaîne", "")),
+            "loop_events": int(fields.get("boucles", 0)),
+            "profile": str(fields.get("profil", "")),
+            "fallbacks": int(fields.get("replis", 0)),
+            "fallback_time_s": fields.get("temps replis", 0.0),
+            "threads": int(fields.get("threads", 0)),
+            "priority_class": str(fields.get("classe", "")),
+            "deadline": fields.get("échéance", 0.0),
+            "finished_at": fields.get("fin") or time.time(),
             "timestamp": time.time()
         })
         
@@ -170,6 +189,103 @@ class MetricsCalculator:
         summary["total_audio_duration_hours"] = summary["total_audio_duration_seconds"] / 3600
         summary["total_processing_time_hours"] = summary["total_processing_time_seconds"] / 3600
         
+        # Audio écarté par la pré-passe VAD (silences), par fichier
+        skipped = {
+            t["file_path"]: t["audio_skipped"]
+            for t in self.transcriptions if t["success"] and t.get("audio_skipped", 0.0) > 0
+        }
+        if skipped:
+            summary["total_audio_skipped_seconds"] = sum(skipped.values())
+            summary["audio_skipped_ratio"] = (
+                summary["total_audio_skipped_seconds"] / summary["total_audio_duration_seconds"]
+                if summary["total_audio_duration_seconds"] > 0 else 0.0
+            )
+            summary["audio_skipped_per_file"] = skipped
+        
+        # Musique ignorée ou confiée à un petit modèle: calcul économisé par chaîne
+        music_files = [t for t in self.transcriptions if t["success"] and t.get("music_s", 0.0) > 0]
+        if music_files:
+            per_channel = {}
+            for t in music_files:
+                channel = per_channel.setdefault(
+                    t.get("channel") or "inconnue", {"files": 0, "music_s": 0.0, "compute_saved_s": 0.0}
+                )
+                channel["files"] += 1
+                channel["music_s"] += t["music_s"]
+                channel["compute_saved_s"] += t["compute_saved_s"]
+            summary["total_music_seconds"] = sum(t["music_s"] for t in music_files)
+            summary["total_compute_saved_seconds"] = sum(t["compute_saved_s"] for t in music_files)
+            summary["music_per_channel"] = per_channel
+        
+        # Interventions de la garde anti-boucle (fenêtres interrompues), par fichier
+        loops = {t["file_path"]: t["loop_events"] for t in self.transcriptions if t.get("loop_events", 0) > 0}
+        if loops:
+            summary["total_loop_guard_events"] = sum(loops.values())
+            summary["loop_guard_events_per_file"] = loops
+        
+        # Profils de décodage: coût mesuré par profil et replis en température par fichier
+        profiled = [t for t in self.transcriptions if t["success"] and t.get("profile")]
+        if profiled:
+            per_profile = {}
+            for t in profiled:
+                stats = per_profile.setdefault(t["profile"], {
+                    "files": 0, "audio_s": 0.0, "processing_s": 0.0, "fallbacks": 0, "fallback_time_s": 0.0
+                })
+                stats["files"] += 1
+                stats["audio_s"] += t["audio_duration"]
+                stats["processing_s"] += t["processing_time"]
+                stats["fallbacks"] += t["fallbacks"]
+                stats["fallback_time_s"] += t["fallback_time_s"]
+            for stats in per_profile.values():
+                stats["realtime_factor"] = (
+                    stats["audio_s"] / stats["processing_s"] if stats["processing_s"] > 0 else 0.0
+                )
+            summary["decoding_profiles"] = per_profile
+        
+        fallbacks = {t["file_path"]: t["fallbacks"] for t in self.transcriptions if t.get("fallbacks", 0) > 0}
+        if fallbacks:
+            summary["total_fallbacks"] = sum(fallbacks.values())
+            summary["total_fallback_time_seconds"] = sum(t.get("fallback_time_s", 0.0) for t in self.transcriptions)
+            summary["fallback_time_ratio"] = (
+                summary["total_fallback_time_seconds"] / summary["total_processing_time_seconds"]
+                if summary["total_processing_time_seconds"] > 0 else 0.0
+            )
+            summary["fallbacks_per_file"] = fallbacks
+        
+        # Échéances par classe de priorité: retard positif = échéance manquée
+        classed = [t for t in self.transcriptions if t.get("priority_class")]
+        if classed:
+            per_class = {}
+            misses = []
+            for t in classed:
+                stats = per_class.setdefault(t["priority_class"], {
+                    "files": 0, "deadlines": 0, "missed": 0, "max_lateness_s": 0.0, "margins": []
+                })
+                stats["files"] += 1
+                if t["deadline"] > 0:
+                    lateness = t["finished_at"] - t["deadline"]
+                    stats["deadlines"] += 1
+                    stats["margins"].append(-lateness)
+                    if lateness > 0:
+                        stats["missed"] += 1
+                        stats["max_lateness_s"] = max(stats["max_lateness_s"], lateness)
+                        misses.append({"file_path": t["file_path"], "lateness_s": lateness})
+            for stats in per_class.values():
+                margins = stats.pop("margins")
+                stats["miss_rate"] = stats["missed"] / stats["deadlines"] if stats["deadlines"] else 0.0
+                stats["mean_margin_s"] = sum(margins) / len(margins) if margins else 0.0
+            summary["deadline_stats"] = per_class
+            summary["deadline_misses"] = sorted(misses, key=lambda m: m["lateness_s"], reverse=True)
+        
+        # Mémoire par worker (RSS unique vs partagée), si mesurée
+        if self.worker_memory:
+            nb_workers = len(self.worker_memory)
+            summary["worker_count_measured"] = nb_workers
+            summary["worker_rss_gb_avg"] = sum(m["rss_gb"] for m in self.worker_memory) / nb_workers
+            summary["worker_uss_gb_avg"] = sum(m["uss_gb"] for m in self.worker_memory) / nb_workers
+            summary["worker_uss_gb_max"] = max(m["uss_gb"] for m in self.worker_memory)
+            summary["worker_shared_gb_avg"] = sum(m["shared_gb"] for m in self.worker_memory) / nb_workers
+        
         return summary
     
     def export_to_csv(self, output_file: str) -> bool:
@@ -241,6 +357,25 @@ class MetricsCalculator:
         
         return wer
 
+    @staticmethod
+    def _parse_tracker_fields(text: str) -> Dict:
+        """
+        Extrait les champs "(clé: valeur)" d'une ligne de tracker.
+        
+        Args:
+            text: Fin de ligne, ex. " (audio: 300.00) (chaîne: france2)"
+        
+        Returns:
+            Dictionnaire clé -> valeur (float si numérique, chaîne sinon)
+        """
+        fields = {}
+        for key, value in re.findall(r"\(([^:()]+):([^()]*)\)", text):
+            try:
+                fields[key.strip()] = float(value)
+            except ValueError:
+                fields[key.strip()] = value.strip()
+        return fields
+    
     def import_from_trackers(self, trackers_dir: str):
         """
         Importe les métriques depuis les fichiers trackers générés par les processus.
@@ -267,6 +402,29 @@ class MetricsCalculator:
                         # Format attendu: "filename: duration secondes" OU "filename: duration secondes (audio: duration)"
                         # Exemple v1: "audio.mp3: 243.60 secondes"
                         # Exemple v2: "audio.mp3: 243.60 secondes (audio: 300.00)"
+                        # Exemple v3: "audio.mp3: 243.60 secondes (audio: 300.00) (ignoré: 42.10)"
+                        # Exemple v4: "... (musique: 120.00) (économisé: 35.20) (chaîne: france2)"
+                        # Exemple v5: "... (boucles: 2)"
+                        # Exemple v6: "... (profil: accurate) (replis: 3) (temps replis: 12.40)"
+                        # Exemple v7: "... (chaîne: france2) ... (modèle: small) (threads: 4)"
+                        # Exemple v8: "... (classe: fresh) (échéance: 1760000000) (fin: 1759998200)"
+                        # Exemple v9: "... (fin: 1759998200)" sur toutes les lignes
+                        # Ligne mémoire: "memoire: rss=1.20 uss=0.30 shared=0.90 (Go)"
+                        if line.startswith("memoire:"):
+                            try:
+                                fields = dict(
+                                    item.split("=") for item in line.split(":", 1)[1].split()
+                                    if "=" in item
+                                )
+                                self.worker_memory.append({
+                                    "rss_gb": float(fields["rss"]),
+                                    "uss_gb": float(fields["uss"]),
+                                    "shared_gb": float(fields["shared"])
+                                })
+                            except (KeyError, ValueError):
+                                pass
+                            continue
+                        
                         if "secondes" in line:
                             try:
                                 # On sépare autour de "secondes" qui est notre ancre fiable
@@ -283,22 +441,18 @@ class MetricsCalculator:
                                     # Pas de deux points found? Cas étrange, on skip
                                     continue
                                 
-                                # Extraction de la durée audio depuis part_after
-                                audio_duration = 0.0
-                                if "(audio:" in part_after:
-                                    try:
-                                        # " (audio: 300.00)" -> "300.00)" -> "300.00"
-                                        audio_str = part_after.split("(audio:")[1].strip().rstrip(")")
-                                        audio_duration = float(audio_str)
-                                    except ValueError:
-                                        pass
+                                # Champs optionnels de part_after: " (audio: 300.00) (ignoré: 42.10)" etc.
+                                fields = self._parse_tracker_fields(part_after)
+                                # Lignes antérieures à "(fin: F)": dernière écriture du tracker
+                                fields.setdefault("fin", os.path.getmtime(t_file))
                                 
                                 self.add_transcription(
-                                    audio_duration=audio_duration,
+                                    audio_duration=fields.get("audio", 0.0),
                                     processing_time=processing_time,
                                     file_path=file_path,
-                                    model="unknown",
-                                    success=True
+                                    model=str(fields.get("modèle", "unknown")),
+                                    success=True,
+                                    fields=fields
                                 )
                                 count += 1
                             except ValueError:
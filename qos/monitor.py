@@ -267,6 +267,38 @@ class SystemMonitor:
             "io_write_bytes": io.write_bytes if io else 0
         }
     
+    @staticmethod
+    def get_process_memory(pid: Optional[int] = None) -> dict:
+        """
+        Mesure la mémoire d'un processus en distinguant pages privées et partagées.
+        
+        USS (unique set size) = mémoire libérée si le processus s'arrête.
+        Partagé = RSS - USS (ex: poids mappés communs à tous les workers).
+        
+        Args:
+            pid: PID du processus (None = processus courant)
+        
+        Returns:
+            Dictionnaire avec rss_gb, uss_gb, pss_gb et shared_gb
+        """
+        process = psutil.Process(pid)
+        try:
+            info = process.memory_full_info()
+            rss = info.rss
+            uss = info.uss
+            pss = getattr(info, 'pss', uss)
+        except (psutil.AccessDenied, AttributeError):
+            # USS indisponible: on considère toute la RSS comme privée
+            rss = process.memory_info().rss
+            uss = pss = rss
+        
+        return {
+            "rss_gb": rss / (1024**3),
+            "uss_gb": uss / (1024**3),
+            "pss_gb": pss / (1024**3),
+            "shared_gb": (rss - uss) / (1024**3)
+        }
+    
     def __enter__(self):
         """Support du context manager."""
         self.start()
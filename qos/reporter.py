@@ -211,6 +211,76 @@ class QoSReporter:
                 f.write(f"Throughput (débit): {metrics_summary.get('throughput', 0):.2f}× temps réel\n")
                 f.write(f"Temps moyen par fichier: {metrics_summary.get('average_processing_time_seconds', 0):.2f} secondes\n\n")
                 
+                if 'worker_uss_gb_avg' in metrics_summary:
+                    f.write("MÉMOIRE PAR WORKER\n")
+                    f.write("-" * 80 + "\n")
+                    f.write(f"Workers mesurés: {metrics_summary.get('worker_count_measured', 0)}\n")
+                    f.write(f"RSS moyenne: {metrics_summary.get('worker_rss_gb_avg', 0):.2f} Go\n")
+                    f.write(f"RSS unique moyenne (USS): {metrics_summary.get('worker_uss_gb_avg', 0):.2f} Go "
+                            f"(max {metrics_summary.get('worker_uss_gb_max', 0):.2f} Go)\n")
+                    f.write(f"RSS partagée moyenne: {metrics_summary.get('worker_shared_gb_avg', 0):.2f} Go\n\n")
+                
+                if 'total_audio_skipped_seconds' in metrics_summary:
+                    f.write("SILENCES IGNORÉS (VAD)\n")
+                    f.write("-" * 80 + "\n")
+                    f.write(f"Audio ignoré: {metrics_summary['total_audio_skipped_seconds'] / 3600:.2f} heures "
+                            f"({metrics_summary.get('audio_skipped_ratio', 0)*100:.1f}% de l'audio)\n")
+                    for file_path, skipped in metrics_summary.get('audio_skipped_per_file', {}).items():
+                        f.write(f"  {file_path}: {skipped:.1f} s\n")
+                    f.write("\n")
+                
+                if 'loop_guard_events_per_file' in metrics_summary:
+                    f.write("GARDE ANTI-BOUCLE\n")
+                    f.write("-" * 80 + "\n")
+                    f.write(f"Fenêtres interrompues: {metrics_summary['total_loop_guard_events']}\n")
+                    for file_path, events in metrics_summary['loop_guard_events_per_file'].items():
+                        f.write(f"  {file_path}: {events}\n")
+                    f.write("\n")
+                
+                if 'decoding_profiles' in metrics_summary:
+                    f.write("PROFILS DE DÉCODAGE\n")
+                    f.write("-" * 80 + "\n")
+                    for profile, stats in metrics_summary['decoding_profiles'].items():
+                        f.write(
+                            f"  {profile}: {stats['files']} fichiers, {stats['realtime_factor']:.2f}x temps réel, "
+                            f"{stats['fallbacks']} replis ({stats['fallback_time_s']:.1f}s)\n"
+                        )
+                    if 'fallbacks_per_file' in metrics_summary:
+                        f.write(
+                            f"Replis en température: {metrics_summary['total_fallbacks']} "
+                            f"({metrics_summary['fallback_time_ratio'] * 100:.1f}% du temps de traitement)\n"
+                        )
+                        for file_path, count in metrics_summary['fallbacks_per_file'].items():
+                            f.write(f"  {file_path}: {count}\n")
+                    f.write("\n")
+                
+                if 'music_per_channel' in metrics_summary:
+                    f.write("MUSIQUE (DISCRIMINATION PAROLE/MUSIQUE)\n")
+                    f.write("-" * 80 + "\n")
+                    f.write(f"Musique détectée: {metrics_summary['total_music_seconds'] / 3600:.2f} heures\n")
+                    f.write(f"Calcul économisé (estimation): "
+                            f"{metrics_summary['total_compute_saved_seconds'] / 3600:.2f} heures\n")
+                    for channel, stats in metrics_summary['music_per_channel'].items():
+                        f.write(f"  {channel}: {stats['files']} fichiers, musique {stats['music_s'] / 60:.1f} min, "
+                                f"économisé {stats['compute_saved_s'] / 60:.1f} min\n")
+                    f.write("\n")
+                
+                if 'deadline_stats' in metrics_summary:
+                    f.write("ÉCHÉANCES (PRIORITÉS)\n")
+                    f.write("-" * 80 + "\n")
+                    for classe, stats in metrics_summary['deadline_stats'].items():
+                        f.write(f"  {classe}: {stats['files']} fichiers")
+                        if stats['deadlines']:
+                            f.write(
+                                f", {stats['missed']}/{stats['deadlines']} échéances manquées "
+                                f"({stats['miss_rate'] * 100:.1f}%), marge moyenne {stats['mean_margin_s'] / 60:.1f} min, "
+                                f"retard max {stats['max_lateness_s'] / 60:.1f} min"
+                            )
+                        f.write("\n")
+                    for miss in metrics_summary.get('deadline_misses', []):
+                        f.write(f"  {miss['file_path']}: {miss['lateness_s'] / 60:.1f} min de retard\n")
+                    f.write("\n")
+                
                 f.write("OBJECTIFS QoS\n")
                 f.write("-" * 80 + "\n")
                 throughput = metrics_summary.get('throughput', 0)
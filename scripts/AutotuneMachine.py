@@ -0,0 +1,179 @@
+"""
+Station TV - Autotune Machine
+Balaye les dispositions processus × threads (torch.set_num_threads) sur un
+échantillon représentatif du manifeste pour le modèle choisi, ajuste la courbe
+de débit et écrit le profil machine lu par RunBatchWhisper.
+
+Usage:
+    python scripts/AutotuneMachine.py
+    python scripts/AutotuneMachine.py --model small --threads 1 2 4
+    python scripts/AutotuneMachine.py --samples 2 --sample-seconds 60
+"""
+
+import sys
+import argparse
+import yaml
+import psutil
+from pathlib import Path
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.affinity import CPUAffinityManager
+from core.autotune import (
+    SAMPLE_RATE, build_profile, candidate_layouts, fit_throughput,
+    layout_policy, measure_layout, write_profile
+)
+from core.models import ModelManager
+from utils.file_handler import FileHandler
+from utils.logger import setup_logger
+
+# Logger
+logger = setup_logger("AutotuneMachine", level="INFO")
+
+
+def load_config(config_file: str) -> dict:
+    """Charge la configuration depuis un fichier YAML."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        logger.info(f"Configuration chargée depuis {config_file}")
+        return config
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de la configuration: {str(e)}")
+        sys.exit(1)
+
+
+def choisir_echantillon(csv_path: str, nb_fichiers: int) -> list:
+    """
+    Choisit des fichiers du manifeste répartis sur les quantiles de durée.
+    
+    Args:
+        csv_path: Manifeste fichiers_audio.csv
+        nb_fichiers: Nombre de fichiers
+    
+    Returns:
+        Chemins des fichiers retenus (existants)
+    """
+    donnees = sorted(
+        ((path, duree) for path, duree in FileHandler.lire_csv(csv_path) if Path(path).exists()),
+        key=lambda item: item[1]
+    )
+    if not donnees:
+        return []
+    indices = sorted({
+        round(i * (len(donnees) - 1) / max(nb_fichiers - 1, 1)) for i in range(min(nb_fichiers, len(donnees)))
+    })
+    return [donnees[i][0] for i in indices]
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(
+        description="Autotune processus × threads et profil machine - Station TV"
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default='config/default_config.yaml',
+        help="Fichier de configuration YAML (défaut: config/default_config.yaml)"
+    )
+    parser.add_argument(
+        '--model', '-m',
+        default=None,
+        help="Modèle Whisper mesuré (défaut: whisper.model)"
+    )
+    parser.add_argument(
+        '--threads', '-t',
+        type=int,
+        nargs='+',
+        default=None,
+        help="Threads par processus à balayer (défaut: autotune.thread_counts)"
+    )
+    parser.add_argument(
+        '--samples', '-s',
+        type=int,
+        default=None,
+        help="Nombre de fichiers de l'échantillon (défaut: autotune.sample_files)"
+    )
+    parser.add_argument(
+        '--sample-seconds',
+        type=int,
+        default=None,
+        help="Audio gardé par fichier en secondes (défaut: autotune.sample_seconds)"
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default=None,
+        help="Fichier du profil machine (défaut: hardware.machine_profile)"
+    )
+    
+    args = parser.parse_args()
+    config = load_config(args.config)
+    autotune_config = config.get('autotune', {})
+    if args.model:
+        config.setdefault('whisper', {})['model'] = args.model
+    model = config.get('whisper', {}).get('model', 'small')
+    output = args.output or config.get('hardware', {}).get('machine_profile', 'config/machine_profile.yaml')
+    
+    # Échantillon représentatif: fichiers aux quantiles de durée, tronqués
+    csv_path = config.get('paths', {}).get('csv_filename', 'fichiers_audio.csv')
+    fichiers = choisir_echantillon(csv_path, args.samples or autotune_config.get('sample_files', 4))
+    if not fichiers:
+        logger.error(f"Aucun fichier audio disponible dans {csv_path}")
+        sys.exit(1)
+    sample_seconds = args.sample_seconds or autotune_config.get('sample_seconds', 120)
+    samples = [(path, sample_seconds * SAMPLE_RATE) for path in fichiers]
+    
+    # CPU utilisables (cpuset, quota cgroup) et processus que la RAM peut accueillir
+    topology = CPUAffinityManager.read_topology()
+    quota = CPUAffinityManager.cpu_quota()
+    cpus = len(topology) if quota is None else min(len(topology), int(quota))
+    ram_gb = ModelManager.MODEL_SPECS.get(model, {}).get('ram_gb', 10)
+    ram_total_gb = psutil.virtual_memory().total / (1024**3)
+    max_workers = max(1, int(ram_total_gb * autotune_config.get('ram_margin', 0.9) // ram_gb))
+    layouts = candidate_layouts(cpus, max_workers, args.threads or autotune_config.get('thread_counts'))
+    
+    logger.info("=" * 80)
+    logger.info(f"AUTOTUNE {model}: {cpus} CPU, {max_workers} processus max (RAM), {len(layouts)} dispositions")
+    logger.info(f"Échantillon: {len(fichiers)} fichiers × {sample_seconds}s par processus")
+    logger.info("=" * 80)
+    
+    measurements = []
+    for workers, threads in layouts:
+        core_sets = CPUAffinityManager.plan_core_sets(
+            workers, layout_policy(workers, threads, topology), threads, topology, quota
+        )
+        if core_sets is None:
+            continue
+        mesure = measure_layout(config, samples, core_sets, threads, autotune_config.get('trial_timeout_s', 0))
+        if mesure is None:
+            continue
+        logger.info(
+            f"{workers:>3} processus × {threads:>2} threads: {mesure['throughput']:.2f}× temps réel "
+            f"({mesure['wall_s']:.1f}s)"
+        )
+        measurements.append(mesure)
+    
+    fit = fit_throughput(measurements)
+    if fit:
+        logger.info(
+            f"Courbe ajustée: {fit['a']:.3f}× par processus mono-thread, part parallèle {fit['p']:.2f}, "
+            f"contention {fit['beta']:.4f} par CPU (erreur log {fit['rmse_log']:.3f})"
+        )
+    profile = build_profile(model, measurements, fit, topology[:cpus], max_workers)
+    if profile is None:
+        logger.error("Aucune mesure réussie: profil non écrit")
+        sys.exit(1)
+    
+    logger.info("=" * 80)
+    logger.info(
+        f"Recommandation: {profile['max_parallel_processes']} processus × {profile['num_threads']} threads "
+        f"({profile['affinity_policy']}), {profile['predicted_throughput']:.2f}× temps réel prédit"
+    )
+    logger.info("=" * 80)
+    if not write_profile(output, profile):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ import argparse
 import yaml
 import time
 import csv
+import resource
+from multiprocessing import Process, Queue
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple
@@ -21,14 +23,63 @@ import statistics
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.transcription import WhisperTranscriber
+from core.models import ModelManager
 from core.affinity import CPUAffinityManager
+from qos.metrics import MetricsCalculator
 from utils.logger import setup_logger
 from utils.file_handler import FileHandler
+from utils.processes import gather_results, stop_processes
 
 # Logger
 logger = setup_logger("BenchmarkModels", level="INFO")
 
 
+def _backend_trial(
+    config: dict,
+    backend: str,
+    model_name: str,
+    audio_files: List[str],
+    cpu_cores: List[int],
+    repetitions: int,
+    result_queue: Queue
+):
+    """
+    Mesure un couple (moteur, modèle) dans un processus dédié, pour que la
+    RAM crête (ru_maxrss) ne concerne que ce moteur.
+    
+    Args:
+        config: Configuration
+        backend: Nom du moteur
+        model_name: Nom du modèle
+        audio_files: Fichiers audio à transcrire
+        cpu_cores: Cœurs CPU à utiliser
+        repetitions: Nombre de répétitions par fichier
+        result_queue: File de retour (temps par fichier, RAM crête en Go)
+    """
+    temp_config = dict(config)
+    temp_config['whisper'] = dict(
+        config.get('whisper', {}),
+        model=model_name,
+        backend=backend,
+        # Modèle gardé entre les répétitions: on mesure l'inférence, pas le chargement
+        model_cache_gb=ModelManager.MODEL_SPECS.get(model_name, {}).get('ram_gb', 10)
+    )
+    transcriber = WhisperTranscriber(temp_config)
+    
+    times = {}
+    for audio_file in audio_files:
+        times[audio_file] = []
+        for _ in range(repetitions):
+            start_time = time.time()
+            result = transcriber.transcribe_on_specific_cores(audio_file, cpu_cores, model_name)
+            if result is not None:
+                times[audio_file].append(time.time() - start_time)
+    
+    # ru_maxrss est en Ko sous Linux
+    peak_ram_gb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024**2)
+    result_queue.put((transcriber.backend.name, times, peak_ram_gb))
+
+
 class BenchmarkRunner:
     """Classe pour exécuter les benchmarks de modèles Whisper."""
     
@@ -41,9 +92,17 @@ class BenchmarkRunner:
         """
         self.config = config
         self.results = []
+        self.batch_results = []
+        self.backend_results = []
+        self.quantization_results = []
+        self.speculative_results = []
+        # Cache de log-mel par (fichier, modèle): hits, misses, temps économisé
+        self.feature_cache_stats: Dict[Tuple[str, str], Dict] = {}
         # Récupérer num_threads depuis la config (par défaut: None = auto)
         self.num_threads = config.get('benchmark', {}).get('num_threads', None)
-        
+        # Durée max d'une mesure de moteur dans son processus (0 = sans limite)
+        self.trial_timeout_s = config.get('benchmark', {}).get('trial_timeout_s', 0)
+    
     def run_single_test(
         self,
         audio_file: str,
@@ -90,13 +149,21 @@ class BenchmarkRunner:
             
             processing_time = time.time() - start_time
             
+            if transcriber.mel_cache is not None:
+                cache_stats = self.feature_cache_stats.setdefault(
+                    (Path(audio_file).name, model_name),
+                    {'hits': 0, 'misses': 0, 'saved_time_s': 0.0}
+                )
+                for key in cache_stats:
+                    cache_stats[key] += transcriber.mel_cache.stats[key]
+            
             if not success:
                 logger.error(f"    ❌ Échec de la transcription")
                 return 0.0, False
             
             logger.info(f"    ✓ Complété en {processing_time:.2f}s")
             return processing_time, True
-            
+        
         except Exception as e:
             logger.error(f"    ❌ Erreur: {str(e)}")
             return 0.0, False
@@ -200,6 +267,16 @@ class BenchmarkRunner:
                     logger.info(f"   RT moyen       : {avg_rt:.3f}× temps réel")
                     logger.info(f"   RT médian      : {median_rt:.3f}× temps réel")
                     
+                    cache_stats = self.feature_cache_stats.get(
+                        (audio_path.name, model_name), {'hits': 0, 'misses': 0, 'saved_time_s': 0.0}
+                    )
+                    lookups = cache_stats['hits'] + cache_stats['misses']
+                    if lookups:
+                        logger.info(
+                            f"   Cache log-mel  : {cache_stats['hits']}/{lookups} hits, "
+                            f"{cache_stats['saved_time_s']:.2f}s économisées"
+                        )
+                    
                     # Enregistrer les résultats
                     self.results.append({
                         'file': audio_path.name,
@@ -214,7 +291,9 @@ class BenchmarkRunner:
                         'avg_rt': avg_rt,
                         'median_rt': median_rt,
                         'all_times': times,
-                        'all_rt_factors': rt_factors
+                        'all_rt_factors': rt_factors,
+                        'mel_cache_hit_rate': cache_stats['hits'] / lookups if lookups else None,
+                        'mel_time_saved_s': cache_stats['saved_time_s']
                     })
                 else:
                     logger.warning(f"⚠️ Aucun test réussi pour {model_name}")
@@ -224,6 +303,435 @@ class BenchmarkRunner:
         logger.info("BENCHMARK TERMINÉ")
         logger.info("=" * 80)
     
+    @staticmethod
+    def _export_rows(rows: List[Dict], output_file: str, formats: Dict[str, str], label: str):
+        """
+        Exporte des résultats de comparaison dans un fichier CSV.
+        
+        Args:
+            rows: Résultats (une ligne par dictionnaire)
+            output_file: Chemin du fichier de sortie
+            formats: Colonnes dans l'ordre -> format des valeurs ("" = valeur brute, None = cellule vide)
+            label: Nom de la comparaison pour les logs
+        """
+        if not rows:
+            logger.warning(f"Aucun résultat à exporter ({label})")
+            return
+        
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(formats))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    key: format(row[key], fmt) if row[key] is not None else ''
+                    for key, fmt in formats.items()
+                })
+        
+        logger.info(f"✓ Résultats exportés vers {output_file} ({label})")
+    
+    def _compare_variants(
+        self,
+        audio_files: List[str],
+        model_name: str,
+        variants: List[Tuple[str, Dict]],
+        cpu_cores: List[int],
+        repetitions: int,
+        prepare=None
+    ) -> List[Dict]:
+        """
+        Transcrit chaque fichier avec chaque variante de configuration whisper,
+        la première servant de référence: temps médian, RT, gain de vitesse et
+        WER relatifs à la transcription de référence.
+        
+        Args:
+            audio_files: Fichiers audio existants
+            model_name: Modèle à tester
+            variants: Liste de (nom, surcharges de la section whisper)
+            cpu_cores: Cœurs CPU à utiliser
+            repetitions: Nombre de répétitions par fichier et variante
+            prepare: Fonction (transcripteur, nom) appelée hors mesure (optionnel)
+        
+        Returns:
+            Liste de dictionnaires (variant, audio_file, audio_s, median_time_s,
+            rt_factor, speedup, wer, result) par fichier réussi
+        """
+        from utils.file_handler import FichierAudio
+        
+        calculator = MetricsCalculator()
+        references = {}
+        reference_times = {}
+        rows = []
+        for index, (variant, overrides) in enumerate(variants):
+            temp_config = dict(self.config)
+            temp_config['whisper'] = dict(self.config.get('whisper', {}), model=model_name, **overrides)
+            if self.num_threads is not None:
+                temp_config['num_threads'] = self.num_threads
+            
+            transcriber = WhisperTranscriber(temp_config)
+            if prepare is not None:
+                prepare(transcriber, variant)
+            
+            for audio_file in audio_files:
+                times = []
+                result = None
+                for _ in range(repetitions):
+                    start_time = time.time()
+                    output = transcriber.transcribe_on_specific_cores(audio_file, cpu_cores, model_name)
+                    if output is not None:
+                        times.append(time.time() - start_time)
+                        result = output
+                
+                if not times:
+                    logger.warning(f"⚠️ Échec pour {model_name} ({variant}) sur {Path(audio_file).name}")
+                    continue
+                
+                duration = FichierAudio(audio_file).longueur
+                median_time = statistics.median(times)
+                text = result.get('text', '')
+                if index == 0:
+                    references[audio_file] = text
+                    reference_times[audio_file] = median_time
+                    wer = 0.0
+                elif audio_file in references:
+                    wer = calculator.calculate_wer(references[audio_file], text)
+                else:
+                    wer = None
+                speedup = (
+                    reference_times[audio_file] / median_time
+                    if audio_file in reference_times and median_time > 0 else None
+                )
+                
+                logger.info(
+                    f"📊 {model_name} | {variant} | {Path(audio_file).name}: "
+                    f"{median_time:.2f}s, gain {speedup or 0:.2f}×, "
+                    f"WER vs {variants[0][0]} {wer * 100 if wer is not None else float('nan'):.2f}%"
+                )
+                rows.append({
+                    'variant': variant,
+                    'audio_file': Path(audio_file).name,
+                    'audio_s': duration,
+                    'median_time_s': median_time,
+                    'rt_factor': duration / median_time if median_time > 0 else 0,
+                    'speedup': speedup,
+                    'wer': wer,
+                    'result': result
+                })
+            
+            transcriber.backend.unload_all()
+        return rows
+    
+    def run_batch_size_sweep(
+        self,
+        audio_files: List[str],
+        models: List[str],
+        batch_sizes: List[int],
+        cpu_cores: List[int]
+    ):
+        """
+        Mesure le débit du moteur par lots (BatchedEngine) selon la taille de lot.
+        Tous les fichiers sont transcrits ensemble pour chaque taille de lot.
+        
+        Args:
+            audio_files: Liste des fichiers audio à tester
+            models: Liste des modèles à tester
+            batch_sizes: Tailles de lot à comparer
+            cpu_cores: Cœurs CPU à utiliser
+        """
+        from utils.file_handler import FichierAudio
+        
+        existing = [f for f in audio_files if Path(f).exists()]
+        if not existing:
+            logger.warning("⚠️ Aucun fichier audio disponible pour le balayage des tailles de lot")
+            return
+        audio_total = sum(FichierAudio(f).longueur for f in existing)
+        batch_sizes = sorted(set(batch_sizes))
+        
+        logger.info("=" * 80)
+        logger.info("BALAYAGE DES TAILLES DE LOT")
+        logger.info(f"{len(existing)} fichiers ({audio_total:.0f}s), tailles: {batch_sizes}")
+        logger.info("=" * 80)
+        
+        for model_name in models:
+            temp_config = self.config.copy()
+            temp_config['whisper'] = dict(self.config.get('whisper', {}), model=model_name)
+            # Garder le modèle chargé entre les tailles de lot: on ne mesure que l'inférence
+            temp_config['whisper']['model_cache_gb'] = ModelManager.MODEL_SPECS.get(model_name, {}).get('ram_gb', 10)
+            if self.num_threads is not None:
+                temp_config['num_threads'] = self.num_threads
+            
+            transcriber = WhisperTranscriber(temp_config)
+            transcriber.model_manager.load_model(model_name)
+            baseline = None
+            
+            for batch_size in batch_sizes:
+                logger.info(f"📊 {model_name} | batch_size={batch_size}")
+                start_time = time.time()
+                outputs = transcriber.transcribe_batch(existing, cpu_cores, batch_size=batch_size, model_name=model_name)
+                elapsed = time.time() - start_time
+                
+                if outputs is None or elapsed <= 0:
+                    logger.warning(f"⚠️ Échec pour {model_name} avec batch_size={batch_size}")
+                    continue
+                
+                throughput = audio_total / elapsed
+                baseline = baseline or throughput
+                gain = throughput / baseline
+                logger.info(f"   {elapsed:.2f}s, {throughput:.2f}× temps réel, gain {gain:.2f}× vs batch_size={batch_sizes[0]}")
+                
+                self.batch_results.append({
+                    'model': model_name,
+                    'batch_size': batch_size,
+                    'files': len(existing),
+                    'audio_s': audio_total,
+                    'time_s': elapsed,
+                    'throughput': throughput,
+                    'gain': gain
+                })
+            
+            transcriber.backend.unload_all()
+    
+    def export_batch_results(self, output_file: str):
+        """
+        Exporte les résultats du balayage des tailles de lot dans un fichier CSV.
+        
+        Args:
+            output_file: Chemin du fichier de sortie
+        """
+        self._export_rows(self.batch_results, output_file, {
+            'model': '', 'batch_size': '', 'files': '', 'audio_s': '.2f',
+            'time_s': '.2f', 'throughput': '.3f', 'gain': '.3f'
+        }, "balayage des tailles de lot")
+    
+    def run_backend_comparison(
+        self,
+        audio_files: List[str],
+        models: List[str],
+        backends: List[str],
+        cpu_cores: List[int],
+        repetitions: int
+    ):
+        """
+        Compare les moteurs d'inférence (RT médian et RAM crête).
+        Chaque couple (moteur, modèle) est mesuré dans un processus séparé.
+        
+        Args:
+            audio_files: Liste des fichiers audio à tester
+            models: Liste des modèles à tester
+            backends: Moteurs à comparer (pytorch, ctranslate2, onnx)
+            cpu_cores: Cœurs CPU à utiliser
+            repetitions: Nombre de répétitions par fichier
+        """
+        from utils.file_handler import FichierAudio
+        
+        existing = [f for f in audio_files if Path(f).exists()]
+        if not existing:
+            logger.warning("⚠️ Aucun fichier audio disponible pour la comparaison des moteurs")
+            return
+        durations = {f: FichierAudio(f).longueur for f in existing}
+        config = dict(self.config)
+        if self.num_threads is not None:
+            config['num_threads'] = self.num_threads
+        
+        logger.info("=" * 80)
+        logger.info("COMPARAISON DES MOTEURS D'INFÉRENCE")
+        logger.info(f"Moteurs: {backends} | Modèles: {models} | {len(existing)} fichiers × {repetitions}")
+        logger.info("=" * 80)
+        
+        for model_name in models:
+            for backend in backends:
+                result_queue = Queue()
+                p = Process(
+                    target=_backend_trial,
+                    args=(config, backend, model_name, existing, cpu_cores, repetitions, result_queue)
+                )
+                p.start()
+                deadline = time.time() + self.trial_timeout_s if self.trial_timeout_s > 0 else 0.0
+                messages = gather_results(result_queue, 1, [p], deadline)
+                if messages is None:
+                    # Exception, OOM ou délai dépassé: mesure ignorée, processus arrêté
+                    stop_processes([p])
+                    logger.error(f"❌ Mesure {model_name}/{backend} échouée (code de sortie {p.exitcode})")
+                    continue
+                p.join()
+                effective_backend, times, peak_ram_gb = messages[0]
+                
+                if effective_backend != backend:
+                    logger.warning(f"⚠️ Moteur {backend} indisponible, mesure ignorée")
+                    continue
+                
+                for audio_file, file_times in times.items():
+                    if not file_times or durations[audio_file] <= 0:
+                        logger.warning(f"⚠️ Échec pour {model_name}/{backend} sur {Path(audio_file).name}")
+                        continue
+                    median_time = statistics.median(file_times)
+                    rt_factor = durations[audio_file] / median_time if median_time > 0 else 0
+                    logger.info(
+                        f"📊 {model_name} | {backend} | {Path(audio_file).name}: "
+                        f"RT {rt_factor:.3f}× temps réel, RAM crête {peak_ram_gb:.2f} Go"
+                    )
+                    self.backend_results.append({
+                        'model': model_name,
+                        'backend': backend,
+                        'audio_file': Path(audio_file).name,
+                        'audio_s': durations[audio_file],
+                        'median_time_s': median_time,
+                        'rt_factor': rt_factor,
+                        'peak_ram_gb': peak_ram_gb
+                    })
+    
+    def export_backend_results(self, output_file: str):
+        """
+        Exporte la comparaison des moteurs dans un fichier CSV.
+        
+        Args:
+            output_file: Chemin du fichier de sortie
+        """
+        self._export_rows(self.backend_results, output_file, {
+            'model': '', 'backend': '', 'audio_file': '', 'audio_s': '.2f',
+            'median_time_s': '.2f', 'rt_factor': '.4f', 'peak_ram_gb': '.3f'
+        }, "comparaison des moteurs")
+    
+    def run_quantization_comparison(
+        self,
+        audio_files: List[str],
+        models: List[str],
+        cpu_cores: List[int],
+        repetitions: int
+    ):
+        """
+        Compare le chargement FP32 et int8 (quantification dynamique):
+        RT médian, gain de vitesse et WER de la transcription int8
+        relatif à la transcription FP32 (référence).
+        
+        Args:
+            audio_files: Liste des fichiers audio à tester
+            models: Liste des modèles à tester
+            cpu_cores: Cœurs CPU à utiliser
+            repetitions: Nombre de répétitions par fichier et précision
+        """
+        existing = [f for f in audio_files if Path(f).exists()]
+        if not existing:
+            logger.warning("⚠️ Aucun fichier audio disponible pour la comparaison FP32 / int8")
+            return
+        
+        logger.info("=" * 80)
+        logger.info("COMPARAISON FP32 / INT8 (WER vs VITESSE)")
+        logger.info("=" * 80)
+        
+        def prepare(transcriber, precision):
+            if precision == 'int8':
+                # Conversion hors mesure (réalisée une seule fois, puis lue depuis le disque)
+                transcriber.model_manager.prepare_quantized_model(transcriber.model_name)
+        
+        for model_name in models:
+            # Modèle gardé entre les répétitions: on mesure l'inférence, pas le chargement
+            cache_gb = ModelManager.MODEL_SPECS.get(model_name, {}).get('ram_gb', 10)
+            variants = [
+                ('fp32', {'quantization': 'none', 'model_cache_gb': cache_gb}),
+                ('int8', {'quantization': 'int8', 'model_cache_gb': cache_gb})
+            ]
+            for row in self._compare_variants(existing, model_name, variants, cpu_cores, repetitions, prepare):
+                self.quantization_results.append({
+                    'model': model_name,
+                    'precision': row['variant'],
+                    'audio_file': row['audio_file'],
+                    'audio_s': row['audio_s'],
+                    'median_time_s': row['median_time_s'],
+                    'rt_factor': row['rt_factor'],
+                    'speedup_vs_fp32': row['speedup'],
+                    'wer_vs_fp32': row['wer']
+                })
+    
+    def export_quantization_results(self, output_file: str):
+        """
+        Exporte la comparaison FP32 / int8 dans un fichier CSV.
+        
+        Args:
+            output_file: Chemin du fichier de sortie
+        """
+        self._export_rows(self.quantization_results, output_file, {
+            'model': '', 'precision': '', 'audio_file': '', 'audio_s': '.2f', 'median_time_s': '.2f',
+            'rt_factor': '.3f', 'speedup_vs_fp32': '.3f', 'wer_vs_fp32': '.4f'
+        }, "comparaison FP32 / int8")
+    
+    def run_speculative_comparison(
+        self,
+        audio_files: List[str],
+        models: List[str],
+        draft_model: str,
+        cpu_cores: List[int],
+        repetitions: int
+    ):
+        """
+        Compare le décodage standard et le décodage spéculatif (brouillon draft_model):
+        RT médian, gain de vitesse, taux d'acceptation des tokens proposés et
+        WER de la transcription spéculative relatif au décodage standard.
+        
+        Args:
+            audio_files: Liste des fichiers audio à tester
+            models: Liste des modèles à tester (medium, large...)
+            draft_model: Modèle brouillon (tiny, base)
+            cpu_cores: Cœurs CPU à utiliser
+            repetitions: Nombre de répétitions par fichier et moteur
+        """
+        existing = [f for f in audio_files if Path(f).exists()]
+        if not existing:
+            logger.warning("⚠️ Aucun fichier audio disponible pour la comparaison du décodage spéculatif")
+            return
+        
+        logger.info("=" * 80)
+        logger.info(f"DÉCODAGE STANDARD / SPÉCULATIF (brouillon {draft_model})")
+        logger.info("=" * 80)
+        
+        for model_name in models:
+            overrides = {
+                'draft_model': draft_model,
+                # Pas d'horodatage par mot: on compare le seul décodage
+                'word_timestamps': False,
+                # Modèles gardés entre les répétitions: on mesure l'inférence, pas le chargement
+                'model_cache_gb': (
+                    ModelManager.MODEL_SPECS.get(model_name, {}).get('ram_gb', 10)
+                    + ModelManager.MODEL_SPECS.get(draft_model, {}).get('ram_gb', 1)
+                )
+            }
+            variants = [
+                (engine, dict(overrides, decoding_engine=engine)) for engine in ('standard', 'speculative')
+            ]
+            for row in self._compare_variants(existing, model_name, variants, cpu_cores, repetitions):
+                speculative = row['result'].get('speculative') or {}
+                if speculative:
+                    logger.info(
+                        f"   {row['audio_file']}: acceptation {speculative.get('acceptance_rate', 0) * 100:.1f}%, "
+                        f"{speculative.get('tokens_per_pass', 0):.2f} tokens par passe"
+                    )
+                self.speculative_results.append({
+                    'model': model_name,
+                    'engine': row['variant'],
+                    'draft_model': draft_model if row['variant'] == 'speculative' else '',
+                    'audio_file': row['audio_file'],
+                    'audio_s': row['audio_s'],
+                    'median_time_s': row['median_time_s'],
+                    'rt_factor': row['rt_factor'],
+                    'speedup_vs_standard': row['speedup'],
+                    'acceptance_rate': speculative.get('acceptance_rate'),
+                    'tokens_per_pass': speculative.get('tokens_per_pass'),
+                    'wer_vs_standard': row['wer']
+                })
+    
+    def export_speculative_results(self, output_file: str):
+        """
+        Exporte la comparaison du décodage spéculatif dans un fichier CSV.
+        
+        Args:
+            output_file: Chemin du fichier de sortie
+        """
+        self._export_rows(self.speculative_results, output_file, {
+            'model': '', 'engine': '', 'draft_model': '', 'audio_file': '', 'audio_s': '.2f',
+            'median_time_s': '.2f', 'rt_factor': '.3f', 'speedup_vs_standard': '.3f',
+            'acceptance_rate': '.4f', 'tokens_per_pass': '.2f', 'wer_vs_standard': '.4f'
+        }, "décodage spéculatif")
+    
     def export_results(self, output_file: str):
         """
         Exporte les résultats dans un fichier CSV.
@@ -249,7 +757,8 @@ class BenchmarkRunner:
                 'run_1', 'run_2', 'run_3', 'run_4', 'run_5',
                 'run_6', 'run_7', 'run_8', 'run_9', 'run_10',
                 'rt_1', 'rt_2', 'rt_3', 'rt_4', 'rt_5',
-                'rt_6', 'rt_7', 'rt_8', 'rt_9', 'rt_10'
+                'rt_6', 'rt_7', 'rt_8', 'rt_9', 'rt_10',
+                'mel_cache_hit_rate', 'mel_time_saved_s'
             ]
             
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -268,7 +777,12 @@ class BenchmarkRunner:
                     'max_time_s': f"{result['max_time']:.2f}",
                     'std_dev_s': f"{result['std_dev']:.2f}",
                     'avg_rt': f"{result['avg_rt']:.3f}",
-                    'median_rt': f"{result['median_rt']:.3f}"
+                    'median_rt': f"{result['median_rt']:.3f}",
+                    'mel_cache_hit_rate': (
+                        f"{result['mel_cache_hit_rate']:.3f}"
+                        if result.get('mel_cache_hit_rate') is not None else ''
+                    ),
+                    'mel_time_saved_s': f"{result.get('mel_time_saved_s', 0.0):.2f}"
                 }
                 
                 # Ajouter les temps individuels (jusqu'à 10 runs)
@@ -417,6 +931,32 @@ def main():
         default=None,
         help="Nombre de répétitions par test (défaut: depuis config)"
     )
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=None,
+        help="Mesurer le débit du moteur par lots pour ces tailles (ex: 1 2 4 8)"
+    )
+    parser.add_argument(
+        '--backends',
+        nargs='+',
+        default=None,
+        help="Comparer ces moteurs d'inférence (ex: pytorch ctranslate2 onnx)"
+    )
+    parser.add_argument(
+        '--quantization',
+        action='store_true',
+        help="Comparer FP32 et int8 (WER relatif vs gain de vitesse)"
+    )
+    parser.add_argument(
+        '--speculative',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='DRAFT',
+        help="Comparer le décodage standard et spéculatif (brouillon: tiny par défaut)"
+    )
     parser.add_argument(
         '--output', '-o',
         default=None,
@@ -453,6 +993,37 @@ def main():
     # Créer le runner
     runner = BenchmarkRunner(config)
     
+    # Tailles de lot à comparer (moteur par lots)
+    batch_sizes = args.batch_sizes or benchmark_config.get('batch_sizes')
+    if batch_sizes:
+        output_path = Path(output_file)
+        runner.run_batch_size_sweep(audio_files, models, batch_sizes, cpu_cores)
+        runner.export_batch_results(str(output_path.parent / f"{output_path.stem}_batch_sizes.csv"))
+        return
+    
+    # Moteurs à comparer
+    backends = args.backends or benchmark_config.get('backends')
+    if backends:
+        output_path = Path(output_file)
+        runner.run_backend_comparison(audio_files, models, backends, cpu_cores, repetitions)
+        runner.export_backend_results(str(output_path.parent / f"{output_path.stem}_backends.csv"))
+        return
+    
+    # Comparaison FP32 / int8
+    if args.quantization or benchmark_config.get('compare_quantization', False):
+        output_path = Path(output_file)
+        runner.run_quantization_comparison(audio_files, models, cpu_cores, repetitions)
+        runner.export_quantization_results(str(output_path.parent / f"{output_path.stem}_quantization.csv"))
+        return
+    
+    # Décodage standard / spéculatif
+    if args.speculative is not None or benchmark_config.get('compare_speculative', False):
+        output_path = Path(output_file)
+        draft_model = args.speculative or benchmark_config.get('draft_model', 'tiny')
+        runner.run_speculative_comparison(audio_files, models, draft_model, cpu_cores, repetitions)
+        runner.export_speculative_results(str(output_path.parent / f"{output_path.stem}_speculative.csv"))
+        return
+    
     try:
         # Exécuter le benchmark
         runner.run_benchmark(
@@ -470,7 +1041,7 @@ def main():
         logger.info("✅ BENCHMARK TERMINÉ AVEC SUCCÈS")
         logger.info("=" * 80)
         logger.info(f"📁 Résultats disponibles dans: {output_file}")
-        
+    
     except KeyboardInterrupt:
         logger.warning("\n⚠️ Interruption par l'utilisateur")
         # Sauvegarder les résultats partiels
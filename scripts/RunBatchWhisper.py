@@ -12,17 +12,28 @@ import gc
 import argparse
 import yaml
 import time
+import queue
+import psutil
 from pathlib import Path
-from multiprocessing import Process
-from typing import List
+from multiprocessing import Process, Queue
+from typing import List, Optional
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.transcription import WhisperTranscriber
+from core.admission import MemoryAdmission
+from core.models import ModelManager
 from core.affinity import CPUAffinityManager, Audio
+from core.alignment import WordAligner
+from core.autotune import apply_profile
+from core.decoding import DECODING_PROFILES, queue_config
+from core.priority import JobInbox, PriorityClassifier
+from core.scheduling import group_by_model, model_config, pack_models, predict, schedule, schedule_mixed
+from core.worker_pool import WorkerPool
 from qos.monitor import SystemMonitor
 from qos.metrics import MetricsCalculator
+from qos.history import EtaEstimator, ProcessingHistory, ProcessingTimePredictor
 from qos.power_monitor import PowerMonitor
 from qos.power_monitor import PowerMonitor
 from utils.logger import setup_logger
@@ -49,7 +60,9 @@ def process_audio_files_on_core(
     config: dict,
     cpu_cores: List[int],
     core_index: int,
-    metrics_calculator: MetricsCalculator
+    metrics_calculator: MetricsCalculator,
+    chunk_core_sets: Optional[List[List[int]]] = None,
+    chargements: Optional[Queue] = None
 ):
     """
     Lance séquentiellement la transcription sur chaque fichier Audio de la liste.
@@ -61,6 +74,8 @@ def process_audio_files_on_core(
         cpu_cores: Liste des cœurs CPU à utiliser
         core_index: Index du processus
         metrics_calculator: Calculateur de métriques
+        chunk_core_sets: Jeux de cœurs pour le mode découpé (ce processus + cœurs libres)
+        chargements: File de signalement du modèle chargé (admission mémoire, optionnel)
     """
     duree_totale = sum(audio.duree for audio in audio_list)
     logger.info(
@@ -80,6 +95,67 @@ def process_audio_files_on_core(
     # Créer le transcripteur
     transcriber = WhisperTranscriber(config)
     
+    # Admission mémoire: modèle chargé avant le premier fichier (gardé pour celui-ci)
+    # et USS signalée au lanceur
+    if chargements is not None:
+        CPUAffinityManager.set_cpu_affinity(cpu_cores)
+        transcriber.preload_model(config.get('num_threads', len(cpu_cores)))
+        chargements.put((core_index, SystemMonitor.get_process_memory()["uss_gb"]))
+    
+    # Pic mémoire du worker (mesuré après chaque fichier, modèle encore chargé)
+    peak_memory = None
+    
+    # Clips courts: transcription par lots (whisper.batch_size > 1), le reste fichier par fichier
+    if transcriber.batch_size > 1:
+        short_clip_max_s = config.get('batch', {}).get('short_clip_max_s', 600)
+        clips = [audio for audio in audio_list if audio.duree <= short_clip_max_s]
+        audio_list = [audio for audio in audio_list if audio.duree > short_clip_max_s]
+        
+        for j in range(0, len(clips), transcriber.batch_size):
+            groupe = clips[j:j + transcriber.batch_size]
+            try:
+                logger.info("=" * 80)
+                logger.info(f"PROCESSUS {core_index} | Lot de {len(groupe)} clips courts")
+                logger.info("=" * 80)
+                
+                start_time = time.time()
+                statuses = transcriber.process_batch_and_write(
+                    [(audio.path, audio.duree) for audio in groupe],
+                    cpu_cores,
+                    str(tracker_path),
+                    priorities={audio.path: (audio.classe, audio.deadline) for audio in groupe}
+                )
+                processing_time = time.time() - start_time
+                duree_lot = sum(audio.duree for audio in groupe)
+                
+                if metrics_calculator:
+                    for audio in groupe:
+                        part = audio.duree / duree_lot if duree_lot > 0 else 1 / len(groupe)
+                        metrics_calculator.add_transcription(
+                            audio_duration=audio.duree,
+                            processing_time=processing_time * part,
+                            file_path=audio.path,
+                            model=config.get('whisper', {}).get('model', 'unknown'),
+                            success=statuses.get(audio.path, False),
+                            fields={"classe": audio.classe, "échéance": audio.deadline}
+                        )
+                
+                logger.info(
+                    f"[LOT] Processus {core_index} | {sum(statuses.values())}/{len(groupe)} réussis, "
+                    f"{processing_time:.2f}s, {duree_lot / processing_time if processing_time > 0 else 0:.2f}x temps réel"
+                )
+                gc.collect()
+            
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement du lot de clips: {str(e)}")
+    
+    # Temps restant: prédictions de l'historique recalées sur les fichiers déjà traités
+    predicteur = ProcessingTimePredictor.from_config(config)
+    cout_predit = predicteur.cost(
+        transcriber.model_name, config.get('num_threads', len(cpu_cores))
+    )
+    eta = EtaEstimator([cout_predit(audio) for audio in audio_list])
+    
     # Traiter chaque fichier
     for i, audio in enumerate(audio_list, 1):
         try:
@@ -104,11 +180,15 @@ def process_audio_files_on_core(
                 cpu_cores,
                 core_index,
                 str(tracker_path),
-                audio_duration=audio.duree
+                audio_duration=audio.duree,
+                chunk_core_sets=chunk_core_sets,
+                priority_class=audio.classe,
+                deadline=audio.deadline
             )
             
             processing_time = time.time() - start_time
             throughput = audio.duree / processing_time if processing_time > 0 else 0
+            restant_s = eta.update(processing_time)
             
             # Ajouter aux métriques
             if metrics_calculator:
@@ -117,7 +197,8 @@ def process_audio_files_on_core(
                     processing_time=processing_time,
                     file_path=audio.path,
                     model=config.get('whisper', {}).get('model', 'unknown'),
-                    success=success
+                    success=success,
+                    fields={"classe": audio.classe, "échéance": audio.deadline}
                 )
             
             # Log de fin de traitement
@@ -127,6 +208,9 @@ def process_audio_files_on_core(
                 logger.info(f"   Temps traitement : {processing_time:.2f}s")
                 logger.info(f"   Throughput       : {throughput:.2f}x temps réel")
                 logger.info(f"   Restant          : {len(audio_list) - i} fichiers")
+                if restant_s > 0:
+                    fin = time.strftime("%H:%M", time.localtime(time.time() + restant_s))
+                    logger.info(f"   ETA              : {fin} (reste ~{restant_s / 3600:.2f}h)")
                 logger.info("=" * 80)
             else:
                 logger.error("-" * 80)
@@ -136,12 +220,99 @@ def process_audio_files_on_core(
             # Forcer le nettoyage mémoire entre les fichiers
             # Whisper accumule des tenseurs non libérés entre transcriptions
             gc.collect()
-                
+            
+            memory = SystemMonitor.get_process_memory()
+            if peak_memory is None or memory["rss_gb"] > peak_memory["rss_gb"]:
+                peak_memory = memory
+        
         except Exception as e:
             logger.error(f"Erreur lors du traitement de {audio.path}: {str(e)}")
+    
+    # Bilan du cache de modèles du processus
+    cache_stats = transcriber.model_manager.get_cache_stats()
+    logger.info(
+        f"Processus {core_index} | Cache modèles: {cache_stats['loads']} chargements, "
+        f"{cache_stats['hits']} réutilisations, {cache_stats['evictions']} évictions, "
+        f"temps de chargement {cache_stats['load_time_s']:.1f}s, "
+        f"temps économisé ~{cache_stats['saved_time_s']:.1f}s"
+    )
+    
+    # Mémoire du worker: RSS unique (privée) vs partagée (poids mappés, bibliothèques)
+    if peak_memory is not None:
+        logger.info(
+            f"Processus {core_index} | Mémoire: RSS {peak_memory['rss_gb']:.2f} Go, "
+            f"unique {peak_memory['uss_gb']:.2f} Go, partagée {peak_memory['shared_gb']:.2f} Go"
+        )
+        with open(tracker_path, 'a', encoding='utf-8') as f:
+            f.write(
+                f"memoire: rss={peak_memory['rss_gb']:.3f} uss={peak_memory['uss_gb']:.3f} "
+                f"shared={peak_memory['shared_gb']:.3f} (Go)\n"
+            )
+    transcriber.backend.unload_all()
+
+
+def attribuer_coeurs_libres(
+    listes_audio: List[List[Audio]],
+    cpu_affinity: List[List[int]],
+    nb_processus: int
+) -> List[List[List[int]]]:
+    """
+    Attribue les jeux de cœurs sans liste de fichiers aux listes les plus longues,
+    pour la transcription découpée des fichiers longs.
+    
+    Args:
+        listes_audio: Listes de fichiers par processus
+        cpu_affinity: Jeux de cœurs par processus
+        nb_processus: Nombre maximal de jeux de cœurs utilisés
+    
+    Returns:
+        Pour chaque liste, ses jeux de cœurs (le sien en premier)
+    """
+    groupes = [[cpu_affinity[i]] for i in range(len(listes_audio))]
+    libres = [
+        cpu_affinity[i] for i in range(min(nb_processus, len(cpu_affinity)))
+        if i >= len(listes_audio) or not listes_audio[i]
+    ]
+    actives = sorted(
+        (i for i, liste in enumerate(listes_audio) if liste),
+        key=lambda i: sum(a.duree for a in listes_audio[i]),
+        reverse=True
+    )
+    
+    for j, cores in enumerate(libres):
+        if not actives:
+            break
+        groupes[actives[j % len(actives)]].append(cores)
+    
+    if libres and actives:
+        logger.info(f"{len(libres)} jeux de cœurs libres attribués au mode découpé")
+    
+    return groupes
 
 
-def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator):
+def attendre_chargement(chargements: Queue, process: Process, admission: MemoryAdmission):
+    """
+    Attend qu'un worker signale son modèle chargé et enregistre son USS.
+    
+    Args:
+        chargements: File de signalement des workers
+        process: Worker attendu
+        admission: Contrôle d'admission mémoire
+    """
+    while process.is_alive():
+        try:
+            _, uss_gb = chargements.get(timeout=admission.poll_s)
+        except queue.Empty:
+            continue
+        admission.record(uss_gb)
+        return
+
+
+def lancer_traitement_batch(
+    config: dict,
+    metrics_calculator: MetricsCalculator,
+    predicteur: Optional[ProcessingTimePredictor] = None
+):
     """
     Lance les processus de traitement batch.
     Adapté depuis WhisperTranscriptor.py
@@ -149,6 +320,7 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
     Args:
         config: Configuration
         metrics_calculator: Calculateur de métriques
+        predicteur: Prédicteur des temps de traitement (défaut: historique de la configuration)
     """
     # Charger les fichiers audio depuis le CSV
     csv_path = config.get('paths', {}).get('csv_filename', 'fichiers_audio.csv')
@@ -170,10 +342,48 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
     liste_audios = [Audio(path, duree) for path, duree in donnees]
     logger.info(f"{len(liste_audios)} fichiers audio chargés")
     
+    # Priorités: classe (diffusion fraîche, archives) et échéance de chaque fichier
+    priorite = PriorityClassifier.from_config(config)
+    if priorite is not None:
+        for audio in liste_audios:
+            priorite.classify(audio)
+        classes = {}
+        for audio in liste_audios:
+            classes[audio.classe] = classes.get(audio.classe, 0) + 1
+        logger.info("Priorités: " + ", ".join(f"{classe} {n} fichiers" for classe, n in sorted(classes.items())))
+    
     # Nombre de processus
     nb_processus = config.get('hardware', {}).get('max_parallel_processes', 3)
     logger.info(f"Nombre de processus parallèles: {nb_processus}")
     
+    # Configuration des cœurs CPU: liste manuelle (whisper.cpu_affinity) ou plan
+    # construit sur la topologie (cœurs physiques, frères SMT, nœuds NUMA, cgroup)
+    hardware_config = config.get('hardware', {})
+    politique = hardware_config.get('affinity_policy', 'manual')
+    cpu_affinity = config.get('whisper', {}).get('cpu_affinity', [])
+    if politique != 'manual' or len(cpu_affinity) < nb_processus:
+        if politique == 'manual':
+            logger.warning(
+                f"Configuration CPU insuffisante ({len(cpu_affinity)} configs pour "
+                f"{nb_processus} processus). Plan automatique sur la topologie."
+            )
+            politique = 'physical'
+        cpu_affinity = CPUAffinityManager.plan_core_sets(
+            nb_processus, politique, hardware_config.get('threads_per_process', 0)
+        )
+    elif not CPUAffinityManager.check_core_sets(cpu_affinity[:nb_processus]):
+        cpu_affinity = None
+    if cpu_affinity is None:
+        logger.error("Plan d'affinité CPU refusé: aucun processus lancé")
+        return []
+    
+    # Temps de traitement prédit d'un fichier: appris sur l'historique,
+    # sinon durée × facteur de coût du modèle (batch.cost_factors)
+    threads_par_processus = config.get('num_threads') or len(cpu_affinity[0])
+    if predicteur is None:
+        predicteur = ProcessingTimePredictor.from_config(config)
+    cout_predit = predicteur.cost(config.get('whisper', {}).get('model', 'small'), threads_par_processus)
+    
     # Limite de fichiers par processus
     max_files_per_process = config.get('batch', {}).get('max_files_per_process', 0)
     if max_files_per_process > 0:
@@ -181,6 +391,27 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
     else:
         logger.info("Fichiers par processus: illimité")
     
+    # Modèles du lancement: whisper.model, et ceux des chaînes de batch.channel_models
+    whisper_config = config.get('whisper', {})
+    model_name = whisper_config.get('model', 'small')
+    channel_models = config.get('batch', {}).get('channel_models', {})
+    model_manager = ModelManager(
+        device=whisper_config.get('device', 'cpu'),
+        weights_dir=(
+            whisper_config.get('weights_dir', 'models/mmap')
+            if whisper_config.get('shared_weights', False) else None
+        ),
+        quantize=whisper_config.get('quantization', 'none') == 'int8',
+        quantized_dir=whisper_config.get('quantized_dir', 'models/int8')
+    )
+    
+    # Admission mémoire: coût d'un worker mesuré sur les premiers lancés (USS au modèle chargé),
+    # limite du cgroup et RAM disponible consultées avant chaque lancement
+    # (avant mesure: estimation du plus gros modèle)
+    admission = MemoryAdmission.from_config(
+        config, max(model_manager.estimate_ram_usage(m, 1) for m in {model_name, *channel_models.values()})
+    )
+    
     # Regrouper les fichiers par dossier parent (Coeur1, Coeur2, ...)
     import re
     fichiers_par_dossier = {}
@@ -189,12 +420,53 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
         if dossier_parent not in fichiers_par_dossier:
             fichiers_par_dossier[dossier_parent] = []
         fichiers_par_dossier[dossier_parent].append(audio)
+    if priorite is not None:
+        # Fichiers urgents en tête de dossier (avant la limite max_files_per_process)
+        fichiers_par_dossier = {d: priorite.sort(f) for d, f in fichiers_par_dossier.items()}
     
     # Détecter le mode "dossiers Coeur"
     noms_dossiers = list(fichiers_par_dossier.keys())
     mode_coeur = any("coeur" in d.lower() for d in noms_dossiers) and len(noms_dossiers) > 1
     
-    if mode_coeur:
+    if channel_models:
+        # Modèles mélangés: workers répartis entre modèles sous contraintes de cœurs et de RAM,
+        # chaque worker gardant un seul modèle chargé (pas d'alternance entre modèles)
+        algorithme = config.get('batch', {}).get('partitioning', 'lpt')
+        groupes = group_by_model(liste_audios, channel_models, model_name)
+        couts = {modele: predicteur.cost(modele, threads_par_processus) for modele in groupes}
+        jeux = cpu_affinity[:nb_processus]
+        if admission is not None:
+            ram_budget_gb = admission.available_gb()
+        else:
+            ram_budget_gb = (
+                psutil.virtual_memory().total / (1024**3)
+                * hardware_config.get('ram_max_usage_percent', 90) / 100.0
+            )
+        workers = pack_models(
+            {modele: sum(couts[modele](a) for a in fichiers) for modele, fichiers in groupes.items()},
+            {modele: len(fichiers) for modele, fichiers in groupes.items()},
+            {modele: model_manager.estimate_ram_usage(modele, 1) for modele in groupes},
+            # Jeux de cœurs de même taille: un jeu par worker
+            {modele: len(jeux[0]) for modele in groupes},
+            len(jeux) * len(jeux[0]),
+            ram_budget_gb
+        )
+        if workers is None:
+            return []
+        logger.info(
+            f"Mode modèles mélangés ({algorithme}, {ram_budget_gb:.1f} Go disponibles) : " + ", ".join(
+                f"{modele} sur {n} processus ({len(groupes[modele])} fichiers)" for modele, n in workers.items()
+            )
+        )
+        listes_audio, modeles_files, _ = schedule_mixed(
+            groupes, workers, couts, algorithme, max_per_list=max_files_per_process
+        )
+        noms_files = [str(i + 1) for i in range(len(listes_audio))]
+        modele_de = {id(audio): modele for modele, fichiers in groupes.items() for audio in fichiers}
+        
+        def cout_predit(audio):
+            return couts[modele_de[id(audio)]](audio)
+    elif mode_coeur:
         # Tri naturel (Coeur1, Coeur2, ..., Coeur10, ..., Coeur30)
         def natural_sort_key(s):
             return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', s)]
@@ -211,6 +483,7 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
         
         logger.info(f"Mode 'Coeurs' détecté : {len(dossiers_tries)} dossiers -> {len(dossiers_tries)} processus")
         
+        noms_files = dossiers_tries
         listes_audio = []
         for i, nom_dossier in enumerate(dossiers_tries):
             fichiers = fichiers_par_dossier[nom_dossier]
@@ -222,37 +495,106 @@ def lancer_traitement_batch(config: dict, metrics_calculator: MetricsCalculator)
             logger.info(f"  Processus {i+1} -> {nom_dossier} ({len(fichiers)} fichiers, {duree_totale:.1f}h)")
             listes_audio.append(fichiers)
     else:
-        # Répartition classique avec algorithme glouton
-        logger.info("Mode classique : équilibrage de charge par durée")
-        listes_audio = CPUAffinityManager.equilibrage_charge(liste_audios, nb_processus, max_per_list=max_files_per_process)
+        # Répartition classique sur le temps de traitement prédit (durée × facteur de coût du modèle)
+        algorithme = config.get('batch', {}).get('partitioning', 'lpt')
+        logger.info(f"Mode classique : équilibrage de charge par temps prédit ({algorithme})")
+        listes_audio, _ = schedule(
+            liste_audios, nb_processus, cout_predit, algorithme, max_per_list=max_files_per_process
+        )
+        noms_files = [str(i + 1) for i in range(len(listes_audio))]
+    if not channel_models:
+        modeles_files = [model_name] * len(listes_audio)
+    if priorite is not None:
+        # Chaque processus traite ses fichiers par priorité puis échéance
+        listes_audio = [priorite.sort(liste) for liste in listes_audio]
+    
+    # Makespan et déséquilibre prédits avant lancement
+    prediction = predict(listes_audio, cout_predit)
+    for i, charge in enumerate(prediction["loads_s"]):
+        logger.info(
+            f"  File {noms_files[i]} ({modeles_files[i]}): {len(listes_audio[i])} fichiers, "
+            f"temps prédit {charge / 3600:.2f}h"
+        )
+    logger.info(
+        f"Makespan prédit: {prediction['makespan_s'] / 3600:.2f}h "
+        f"(borne inférieure {prediction['lower_bound_s'] / 3600:.2f}h), "
+        f"déséquilibre {prediction['imbalance'] * 100:.1f}%"
+    )
     
-    # Configuration des cœurs CPU
-    cpu_affinity = config.get('whisper', {}).get('cpu_affinity', [])
+    # Convertir une seule fois les poids (magasin mappable, modèle int8) avant de lancer les workers
+    for modele in sorted(set(modeles_files)):
+        if model_manager.quantize:
+            model_manager.prepare_quantized_model(modele)
+        elif model_manager.weights_dir:
+            model_manager.prepare_weight_store(modele)
+    # Modèles mélangés: RAM déjà vérifiée par pack_models
+    if not channel_models:
+        model_manager.validate_memory_availability(
+            model_name,
+            nb_processus,
+            psutil.virtual_memory().total / (1024**3),
+            config.get('qos', {}).get('thresholds', {}).get('memory_critical', 90)
+        )
     
-    if len(cpu_affinity) < nb_processus:
-        logger.warning(
-            f"Configuration CPU insuffisante ({len(cpu_affinity)} configs pour "
-            f"{nb_processus} processus). Utilisation par défaut."
+    # Mode pool: workers persistants alimentés par une file de travail
+    batch_config = config.get('batch', {})
+    inbox_csv = batch_config.get('priority', {}).get('inbox_csv', '')
+    if priorite is not None and inbox_csv and batch_config.get('scheduler', 'static') != 'pool':
+        logger.warning("Boîte de réception ignorée: elle n'est relue qu'en mode pool (batch.scheduler: pool)")
+    if batch_config.get('scheduler', 'static') == 'pool':
+        if config.get('preprocessing', {}).get('chunking', False):
+            logger.warning("Mode découpé ignoré en mode pool: il n'utilise que les cœurs libres du lancement statique")
+        pool = WorkerPool(
+            config,
+            cpu_affinity[:nb_processus],
+            work_stealing=batch_config.get('work_stealing', False),
+            max_files_per_worker=batch_config.get('recycle_after_files', 0),
+            max_rss_gb=batch_config.get('recycle_rss_gb', 0.0),
+            admission=admission,
+            slot_models=modeles_files if channel_models else None,
+            priority=priorite,
+            inbox=JobInbox(inbox_csv) if priorite is not None and inbox_csv else None
         )
-        # Répartition automatique
-        cores_per_process = config.get('hardware', {}).get('cpu_threads', 36) // nb_processus
-        cpu_affinity = [
-            list(range(i * cores_per_process, (i + 1) * cores_per_process))
-            for i in range(nb_processus)
-        ]
-    
-    # Lancer les processus
+        logger.info("Lancement du superviseur du pool de workers")
+        p = Process(target=pool.run, args=(listes_audio,))
+        p.start()
+        return [p]
+    
+    # Mode découpé: les jeux de cœurs inutilisés aident à finir les fichiers longs
+    if config.get('preprocessing', {}).get('chunking', False):
+        groupes_coeurs = attribuer_coeurs_libres(listes_audio, cpu_affinity, nb_processus)
+    else:
+        groupes_coeurs = [None] * len(listes_audio)
+    
+    # Lancer les processus (échelonnés si l'admission mémoire est active)
+    chargements = Queue() if admission is not None else None
     processes = []
     for i, liste_audio in enumerate(listes_audio):
         if not liste_audio:
             logger.warning(f"Liste {i+1} vide, processus non lancé")
             continue
         
-        logger.info(f"Lancement du processus {i+1} sur les cœurs {cpu_affinity[i]}")
+        if admission is not None:
+            # Le worker précédent a chargé son modèle: son USS fixe le coût des suivants
+            if processes:
+                attendre_chargement(chargements, processes[-1], admission)
+            if not admission.admit(lambda: [p.pid for p in processes if p.is_alive()], f"processus {i+1}"):
+                restants = sum(len(liste) for liste in listes_audio[i:])
+                logger.error(
+                    f"Mémoire insuffisante: processus {i+1} à {len(listes_audio)} non lancés, "
+                    f"{restants} fichiers non traités"
+                )
+                break
+        
+        logger.info(f"Lancement du processus {i+1} ({modeles_files[i]}) sur les cœurs {cpu_affinity[i]}")
         
+        # Profil de décodage propre à la file (batch.queue_profiles), sinon celui de whisper
         p = Process(
             target=process_audio_files_on_core,
-            args=(liste_audio, config, cpu_affinity[i], i+1, metrics_calculator)
+            args=(
+                liste_audio, queue_config(model_config(config, modeles_files[i]), noms_files[i]), cpu_affinity[i], i+1,
+                metrics_calculator, groupes_coeurs[i], chargements
+            )
         )
         p.start()
         processes.append(p)
@@ -275,11 +617,24 @@ def main():
         action='store_true',
         help="Scanner les fichiers audio sans lancer la transcription"
     )
+    parser.add_argument(
+        '--profile', '-p',
+        choices=list(DECODING_PROFILES),
+        default=None,
+        help="Profil de décodage de toutes les files (défaut: whisper.decoding_profile)"
+    )
     
     args = parser.parse_args()
     
     # Charger la configuration
     config = load_config(args.config)
+    if args.profile:
+        config.setdefault('whisper', {})['decoding_profile'] = args.profile
+    
+    # Profil machine (scripts/AutotuneMachine.py): processus, threads et affinité mesurés
+    machine_profile = config.get('hardware', {}).get('machine_profile')
+    if machine_profile:
+        config = apply_profile(config, machine_profile)
     
     logger.info("=" * 80)
     logger.info("STATION TV - TRANSCRIPTION AUDIO HAUTE PERFORMANCE")
@@ -369,7 +724,12 @@ def main():
     
     try:
         # Lancer le traitement batch
-        processes = lancer_traitement_batch(config, metrics_calculator)
+        # Prédicteur ajusté sur l'historique antérieur au lancement (erreur suivie à la fin)
+        historique = ProcessingHistory(
+            config.get('paths', {}).get('history_file', 'test_output/history/processing_history.csv')
+        )
+        predicteur = ProcessingTimePredictor.from_config(config, historique)
+        processes = lancer_traitement_batch(config, metrics_calculator, predicteur)
         
         if not processes:
             logger.error("Aucun processus lancé")
@@ -388,6 +748,16 @@ def main():
         logger.info("TRAITEMENT TERMINÉ AVEC SUCCÈS")
         logger.info("=" * 80)
         
+        # Alignement différé: travaux laissés à l'étape scripts/RunWordAlignment.py
+        whisper_config = config.get('whisper', {})
+        if whisper_config.get('word_alignment', 'inline') == 'deferred':
+            en_attente = WordAligner.pending_jobs(whisper_config.get('alignment_dir', 'test_output/alignment'))
+            if en_attente:
+                logger.warning(
+                    f"{len(en_attente)} travaux d'alignement par mot en attente: "
+                    f"lancer scripts/RunWordAlignment.py"
+                )
+        
         # Réimporter les métriques depuis les fichiers trackers
         # (les processus enfants ont leur propre copie de metrics_calculator)
         trackers_dir = config.get('paths', {}).get('trackers_dir', 'trackers')
@@ -403,6 +773,65 @@ def main():
         logger.info(f"Durée totale: {summary['session_duration_hours']:.2f}h")
         logger.info(f"Audio traité: {summary['total_audio_duration_hours']:.2f}h")
         logger.info(f"Throughput: {summary['throughput']:.2f}× temps réel")
+        if 'worker_uss_gb_avg' in summary:
+            logger.info(
+                f"Mémoire par worker ({summary['worker_count_measured']} mesurés): "
+                f"RSS {summary['worker_rss_gb_avg']:.2f} Go, "
+                f"unique {summary['worker_uss_gb_avg']:.2f} Go (max {summary['worker_uss_gb_max']:.2f}), "
+                f"partagée {summary['worker_shared_gb_avg']:.2f} Go"
+            )
+        if 'total_audio_skipped_seconds' in summary:
+            logger.info(
+                f"Silences ignorés (VAD): {summary['total_audio_skipped_seconds'] / 3600:.2f}h "
+                f"({summary['audio_skipped_ratio']*100:.1f}% de l'audio, "
+                f"{len(summary['audio_skipped_per_file'])} fichiers)"
+            )
+        if 'loop_guard_events_per_file' in summary:
+            logger.info(
+                f"Garde anti-boucle: {summary['total_loop_guard_events']} fenêtres interrompues "
+                f"({len(summary['loop_guard_events_per_file'])} fichiers)"
+            )
+        if 'decoding_profiles' in summary:
+            for profile, stats in summary['decoding_profiles'].items():
+                logger.info(
+                    f"Profil {profile}: {stats['files']} fichiers, {stats['realtime_factor']:.2f}x temps réel, "
+                    f"{stats['fallbacks']} replis ({stats['fallback_time_s'] / 60:.1f} min)"
+                )
+        if 'music_per_channel' in summary:
+            logger.info(
+                f"Musique: {summary['total_music_seconds'] / 3600:.2f}h, "
+                f"calcul économisé estimé {summary['total_compute_saved_seconds'] / 3600:.2f}h"
+            )
+            for channel, stats in summary['music_per_channel'].items():
+                logger.info(
+                    f"   {channel}: {stats['files']} fichiers, musique {stats['music_s'] / 60:.1f} min, "
+                    f"économisé {stats['compute_saved_s'] / 60:.1f} min"
+                )
+        if 'deadline_stats' in summary:
+            for classe, stats in summary['deadline_stats'].items():
+                if stats['deadlines']:
+                    logger.info(
+                        f"Classe {classe}: {stats['missed']}/{stats['deadlines']} échéances manquées "
+                        f"({stats['miss_rate'] * 100:.1f}%), marge moyenne {stats['mean_margin_s'] / 60:.1f} min, "
+                        f"retard max {stats['max_lateness_s'] / 60:.1f} min"
+                    )
+                else:
+                    logger.info(f"Classe {classe}: {stats['files']} fichiers sans échéance")
+        
+        # Historique des temps de traitement et erreur du prédicteur
+        if config.get('batch', {}).get('prediction', {}).get('enabled', True):
+            records = historique.record(
+                metrics_calculator.transcriptions, predicteur,
+                config.get('whisper', {}).get('model', 'unknown')
+            )
+            erreur = ProcessingHistory.error_stats(records)
+            erreur_historique = ProcessingHistory.error_stats(historique.records)
+            if erreur:
+                logger.info(
+                    f"Prédiction des temps: erreur {erreur['mape'] * 100:.1f}% sur ce lancement "
+                    f"(biais {erreur['bias'] * 100:+.1f}%), {erreur_historique['mape_recent'] * 100:.1f}% "
+                    f"sur les derniers traitements, {erreur_historique['samples']} traitements suivis"
+                )
         logger.info("-" * 80)
         
         # Générer les graphiques et rapports (si activé dans la config)
@@ -463,7 +892,7 @@ def main():
             logger.info("\n" + "=" * 80)
             logger.info(f"📊 Tous les rapports sont disponibles dans: {output_dir}")
             logger.info("=" * 80)
-        
+    
     except KeyboardInterrupt:
         logger.warning("\n⚠️ Interruption par l'utilisateur")
     except Exception as e:
@@ -0,0 +1,113 @@
+"""
+Station TV - Run Stream Whisper
+Transcription en direct d'un flux TNT (ou de toute source lisible par ffmpeg),
+avec émission incrémentale des sous-titres.
+
+Usage:
+    python scripts/RunStreamWhisper.py --input udp://239.0.0.1:1234 --name TF1
+    python scripts/RunStreamWhisper.py --input capture.ts --name TF1 --realtime
+    ffmpeg -i capture.ts -f s16le -ac 1 -ar 16000 - | python scripts/RunStreamWhisper.py --input - --name TF1
+"""
+
+import sys
+import argparse
+import yaml
+from pathlib import Path
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.streaming import create_stream_transcriber, open_ffmpeg_pcm
+from utils.logger import setup_logger
+
+# Logger
+logger = setup_logger("RunStreamWhisper", level="INFO")
+
+
+def load_config(config_file: str) -> dict:
+    """Charge la configuration depuis un fichier YAML."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        logger.info(f"Configuration chargée depuis {config_file}")
+        return config
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de la configuration: {str(e)}")
+        sys.exit(1)
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(
+        description="Transcription en direct d'un flux - Station TV"
+    )
+    parser.add_argument(
+        '--input', '-i',
+        required=True,
+        help="Source: URL/fichier ffmpeg, '-' pour du PCM s16le 16 kHz sur stdin"
+    )
+    parser.add_argument(
+        '--name', '-n',
+        required=True,
+        help="Nom du flux (chaîne), utilisé dans les noms de fichiers"
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default='config/default_config.yaml',
+        help="Fichier de configuration YAML (défaut: config/default_config.yaml)"
+    )
+    parser.add_argument(
+        '--cores',
+        default=None,
+        help="Cœurs CPU à utiliser, séparés par des virgules (ex: 0,1,2,3)"
+    )
+    parser.add_argument(
+        '--realtime',
+        action='store_true',
+        help="Lire la source à la vitesse réelle (simulation d'un flux en direct)"
+    )
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help="Source PCM brute en croissance: suivre le fichier jusqu'à inactivité"
+    )
+    
+    args = parser.parse_args()
+    config = load_config(args.config)
+    cpu_cores = [int(c) for c in args.cores.split(',')] if args.cores else None
+    
+    stream = create_stream_transcriber(config, args.name, cpu_cores)
+    if stream is None:
+        logger.error("Impossible de charger le modèle")
+        sys.exit(1)
+    
+    process = None
+    if args.input == '-':
+        source = sys.stdin.buffer
+    elif args.follow:
+        source = open(args.input, 'rb')
+    else:
+        process = open_ffmpeg_pcm(args.input, realtime=args.realtime)
+        source = process.stdout
+    
+    try:
+        stats = stream.run(source, follow=args.follow)
+    except KeyboardInterrupt:
+        logger.info("Interruption: finalisation des segments en attente")
+        stream.flush()
+        stats = stream.get_stats()
+    finally:
+        if process is not None:
+            process.terminate()
+        elif args.follow:
+            source.close()
+    
+    logger.info("=" * 80)
+    logger.info(f"FLUX {args.name}")
+    logger.info("=" * 80)
+    for key, value in stats.items():
+        logger.info(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Station TV - Run Word Alignment
+Étape différée d'horodatage par mot: exécute les travaux d'alignement déposés
+par la transcription (whisper.word_alignment: "deferred"), pour tous les
+fichiers en attente ou seulement ceux demandés par le traitement MNER.
+
+Usage:
+    python scripts/RunWordAlignment.py
+    python scripts/RunWordAlignment.py --workers 4
+    python scripts/RunWordAlignment.py --requests mner_requests.txt
+    python scripts/RunWordAlignment.py --files Audios/TF1/20240101_20_00.mp3
+"""
+
+import sys
+import argparse
+import yaml
+from pathlib import Path
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.alignment import WordAligner, run_alignment_pool
+from utils.logger import setup_logger
+
+# Logger
+logger = setup_logger("RunWordAlignment", level="INFO")
+
+
+def load_config(config_file: str) -> dict:
+    """Charge la configuration depuis un fichier YAML."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        logger.info(f"Configuration chargée depuis {config_file}")
+        return config
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de la configuration: {str(e)}")
+        sys.exit(1)
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(
+        description="Alignement par mot différé - Station TV"
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default='config/default_config.yaml',
+        help="Fichier de configuration YAML (défaut: config/default_config.yaml)"
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        help="Nombre de processus d'alignement (défaut: whisper.alignment_workers)"
+    )
+    parser.add_argument(
+        '--requests', '-r',
+        default=None,
+        help="Fichier listant les fichiers audio à aligner (un chemin par ligne)"
+    )
+    parser.add_argument(
+        '--files', '-f',
+        nargs='+',
+        default=None,
+        help="Fichiers audio à aligner"
+    )
+    
+    args = parser.parse_args()
+    config = load_config(args.config)
+    whisper_config = config.get('whisper', {})
+    alignment_dir = whisper_config.get('alignment_dir', 'test_output/alignment')
+    
+    # Fichiers demandés (MNER): restriction des travaux en attente
+    audio_files = args.files
+    if args.requests:
+        with open(args.requests, 'r', encoding='utf-8') as f:
+            audio_files = (audio_files or []) + [line.strip() for line in f if line.strip()]
+    
+    jobs = WordAligner.pending_jobs(alignment_dir, audio_files)
+    if not jobs:
+        logger.info(f"Aucun travail d'alignement en attente dans {alignment_dir}")
+        return
+    
+    workers = args.workers or whisper_config.get('alignment_workers', 1)
+    core_sets = whisper_config.get('cpu_affinity', [])[:workers] or [[0]]
+    results = run_alignment_pool(config, jobs, core_sets)
+    
+    failed = [job for job, success in results.items() if not success]
+    logger.info("=" * 80)
+    logger.info(f"ALIGNEMENT PAR MOT: {len(results) - len(failed)}/{len(results)} fichiers")
+    logger.info("=" * 80)
+    for job in failed:
+        logger.error(f"  Échec: {job}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
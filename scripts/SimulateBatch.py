@@ -0,0 +1,164 @@
+"""
+Station TV - Simulate Batch
+Rejoue un manifeste fichiers_audio.csv à travers les politiques d'ordonnancement
+(dossiers Coeur, glouton, LPT/MULTIFIT/KK, pool, vol de travail) avec le modèle
+de temps de traitement appris sur l'historique, sans exécuter Whisper.
+
+Usage:
+    python scripts/SimulateBatch.py
+    python scripts/SimulateBatch.py --workers 6 12 24 30 --noise 0.2
+    python scripts/SimulateBatch.py --csv fichiers_audio.csv --policies glouton pool stealing
+    python scripts/SimulateBatch.py --output test_output/reports/simulation.csv
+"""
+
+import sys
+import csv
+import argparse
+import yaml
+from pathlib import Path
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.affinity import Audio
+from core.simulation import POLICIES, compare_policies, thread_scaling
+from qos.history import ProcessingHistory, ProcessingTimePredictor
+from utils.file_handler import FileHandler
+from utils.logger import setup_logger
+
+# Logger
+logger = setup_logger("SimulateBatch", level="INFO")
+
+
+def load_config(config_file: str) -> dict:
+    """Charge la configuration depuis un fichier YAML."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        logger.info(f"Configuration chargée depuis {config_file}")
+        return config
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de la configuration: {str(e)}")
+        sys.exit(1)
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(
+        description="Simulation des politiques d'ordonnancement du batch - Station TV"
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default='config/default_config.yaml',
+        help="Fichier de configuration YAML (défaut: config/default_config.yaml)"
+    )
+    parser.add_argument(
+        '--csv',
+        default=None,
+        help="Manifeste des fichiers audio (défaut: paths.csv_filename)"
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        nargs='+',
+        default=None,
+        help="Nombres de processus à comparer (défaut: simulation.workers)"
+    )
+    parser.add_argument(
+        '--policies', '-p',
+        nargs='+',
+        choices=list(POLICIES),
+        default=None,
+        help="Politiques à comparer (défaut: simulation.policies)"
+    )
+    parser.add_argument(
+        '--noise',
+        type=float,
+        default=None,
+        help="Écart-type log du temps simulé autour du temps prédit (défaut: simulation.noise)"
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default=None,
+        help="Fichier CSV des résultats (optionnel)"
+    )
+    
+    args = parser.parse_args()
+    config = load_config(args.config)
+    sim_config = config.get('simulation', {})
+    hardware = config.get('hardware', {})
+    
+    csv_path = args.csv or config.get('paths', {}).get('csv_filename', 'fichiers_audio.csv')
+    if not Path(csv_path).exists():
+        logger.error(f"Fichier CSV introuvable: {csv_path}")
+        sys.exit(1)
+    items = [Audio(path, duree) for path, duree in FileHandler.lire_csv(csv_path)]
+    if not items:
+        logger.error("Aucun fichier audio trouvé dans le CSV")
+        sys.exit(1)
+    
+    total_cores = hardware.get('cpu_threads', 36)
+    worker_counts = args.workers or sim_config.get('workers') or [hardware.get('max_parallel_processes', 3)]
+    policies = args.policies or sim_config.get('policies', list(POLICIES))
+    noise = args.noise if args.noise is not None else sim_config.get('noise', 0.0)
+    
+    # Modèle de temps: historique, ou facteurs de coût mesurés à reference_threads
+    history = ProcessingHistory(
+        config.get('paths', {}).get('history_file', 'test_output/history/processing_history.csv')
+    )
+    predictor = ProcessingTimePredictor.from_config(config, history)
+    model = config.get('whisper', {}).get('model', 'small')
+    reference_threads = config.get('num_threads') or max(
+        1, total_cores // hardware.get('max_parallel_processes', 3)
+    )
+    
+    def cost_for_threads(threads):
+        # Effet des threads appris seulement si l'historique en a vu plusieurs valeurs
+        if predictor.fitted and len({r["threads"] for r in history.records}) > 1:
+            return predictor.cost(model, threads)
+        return thread_scaling(
+            predictor.cost(model, reference_threads), threads, reference_threads,
+            sim_config.get('parallel_fraction', 0.85)
+        )
+    
+    logger.info(
+        f"Simulation: {len(items)} fichiers ({sum(a.duree for a in items) / 3600:.1f}h d'audio), "
+        f"{total_cores} cœurs, processus {worker_counts}, bruit {noise}"
+    )
+    results = compare_policies(
+        items, policies, worker_counts, cost_for_threads, total_cores,
+        noise=noise, seed=sim_config.get('seed', 0),
+        max_per_list=config.get('batch', {}).get('max_files_per_process', 0),
+        partitioning=config.get('batch', {}).get('partitioning', 'lpt')
+    )
+    
+    logger.info("=" * 80)
+    logger.info(
+        f"{'politique':<10} {'proc.':>5} {'threads':>7} {'makespan':>10} "
+        f"{'inactif':>12} {'traîne':>9} {'non assignés':>13}"
+    )
+    for r in results:
+        logger.info(
+            f"{r['policy']:<10} {r['workers']:>5} {r['threads']:>7} {r['makespan_s'] / 3600:>9.2f}h "
+            f"{r['idle_core_hours']:>9.1f} c·h {r['tail_s'] / 3600:>8.2f}h {r['unassigned']:>13}"
+        )
+    logger.info("=" * 80)
+    if results:
+        best = results[0]
+        logger.info(
+            f"Meilleure configuration: {best['policy']} sur {best['workers']} processus "
+            f"× {best['threads']} threads, makespan prédit {best['makespan_s'] / 3600:.2f}h"
+        )
+    
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        fields = ["policy", "workers", "threads", "makespan_s", "idle_core_hours", "tail_s", "assigned", "unassigned"]
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+        logger.info(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,12 @@ Tests unitaires pour les modules principaux
 import unittest
 import tempfile
 import shutil
+import os
+import subprocess
+import time
+import types
+import dataclasses
+import numpy as np
 from pathlib import Path
 import sys
 
@@ -13,17 +19,43 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Mock des modules non installés localement (whisper/torch) pour permettre l'import
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # Créer un mock torch qui ne casse pas scipy
 _mock_torch = MagicMock()
 _mock_torch.Tensor = type('Tensor', (), {})  # Classe réelle pour issubclass()
+# torch réel (installé) ou mock: les tests sur de vrais modules sont ignorés sans torch
+try:
+    import torch as _torch
+    TORCH_AVAILABLE = not isinstance(_torch, MagicMock)
+except ImportError:
+    TORCH_AVAILABLE = False
 for mod in ['whisper', 'torch', 'torch.cuda']:
     if mod not in sys.modules:
         sys.modules[mod] = _mock_torch if 'torch' in mod else MagicMock()
 
 from core.models import ModelManager
+from core.admission import MemoryAdmission
 from core.affinity import CPUAffinityManager, Audio
+from core.alignment import WordAligner, run_alignment_pool
+from core.autotune import (
+    apply_profile, build_profile, candidate_layouts, fit_throughput, measure_layout, recommend,
+    throughput_model, write_profile
+)
+from core.worker_pool import WorkerPool
+from core.backends import create_backend, PyTorchBackend, ONNXBackend, TranscriptionBackend, BACKENDS
+from core.batched import BatchedEngine
+from core.cascade import ModelCascade
+from core.decoding import DECODING_PROFILES, FallbackMeter, queue_config, resolve_profile
+from core.loop_guard import RepetitionGuard, _LoopFilter
+from core.priority import DEFAULT_CLASSES, JobInbox, JobQueue, PriorityClassifier
+from core.scheduling import (
+    duration_cost, group_by_model, karmarkar_karp, lpt, model_config, multifit, pack_models, predict,
+    schedule, schedule_mixed
+)
+from core.simulation import coeur_lists, compare_policies, noisy_cost, simulate, thread_scaling
+from core.speculative import speculative_greedy
+from core.streaming import RingBuffer, StreamingTranscriber, SegmentWriter, open_ffmpeg_pcm
 from qos.metrics import MetricsCalculator
 from utils.file_handler import FichierAudio
 
@@ -75,6 +107,114 @@ class TestModelManager(unittest.TestCase):
         self.assertTrue(is_valid)
 
 
+class TestModelManagerCache(unittest.TestCase):
+    """Tests pour le cache LRU de ModelManager"""
+    
+    def setUp(self):
+        self.manager = ModelManager(device="cpu", cache_budget_gb=3)
+        patcher = patch('core.models.whisper.load_model', side_effect=lambda name, device: MagicMock(name=name))
+        self.mock_load = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_cache_disabled_by_default(self):
+        """Sans budget, chaque appel recharge le modèle"""
+        manager = ModelManager(device="cpu")
+        manager.load_model("tiny")
+        manager.load_model("tiny")
+        self.assertEqual(self.mock_load.call_count, 2)
+        self.assertEqual(manager.get_cache_stats()["hits"], 0)
+    
+    def test_cache_hit(self):
+        """Un modèle déjà chargé est réutilisé"""
+        first = self.manager.load_model("small")
+        second = self.manager.load_model("small")
+        self.assertIs(first, second)
+        self.assertEqual(self.mock_load.call_count, 1)
+        stats = self.manager.get_cache_stats()
+        self.assertEqual(stats["loads"], 1)
+        self.assertEqual(stats["hits"], 1)
+    
+    def test_release_keeps_cached_model(self):
+        """release_model ne décharge pas un modèle en cache"""
+        model = self.manager.load_model("tiny")
+        self.assertFalse(self.manager.release_model(model))
+        self.assertIn("tiny", self.manager.get_cache_stats()["cached_models"])
+    
+    def test_lru_eviction_over_budget(self):
+        """Le modèle le moins récemment utilisé est évincé au-delà du budget"""
+        self.manager.load_model("tiny")    # 1 Go
+        self.manager.load_model("small")   # 2 Go -> 3 Go
+        self.manager.load_model("tiny")    # tiny redevient le plus récent
+        self.manager.load_model("base")    # 1 Go -> 4 Go > 3 Go, small évincé
+        stats = self.manager.get_cache_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["cached_models"], ["tiny", "base"])
+    
+    def test_weight_store_path(self):
+        """Le magasin de poids n'est actif que si un répertoire est configuré"""
+        self.assertIsNone(self.manager.get_weight_store_path("small"))
+        manager = ModelManager(device="cpu", weights_dir="models/mmap")
+        self.assertEqual(manager.get_weight_store_path("small"), Path("models/mmap") / "small.pt")
+    
+    def test_weight_store_whisper_internals(self):
+        """Une version de whisper sans ses attributs privés donne une erreur explicite"""
+        manager = ModelManager(device="cpu", weights_dir=tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, manager.weights_dir, True)
+        with patch('core.models.whisper', MagicMock(spec=["load_model", "__version__"], __version__="29990101")):
+            with self.assertRaisesRegex(RuntimeError, "29990101 n'expose plus whisper._download"):
+                ModelManager._whisper_internal("_download")
+            with self.assertLogs('core.models', level='ERROR') as logs:
+                self.assertIsNone(manager.prepare_weight_store("small"))
+        self.assertIn("whisper.shared_weights", "\n".join(logs.output))
+    
+    def test_oversized_model_kept_alone(self):
+        """Un modèle plus gros que le budget reste seul en cache"""
+        self.manager.load_model("tiny")
+        self.manager.load_model("medium")  # 5 Go > 3 Go
+        self.assertEqual(self.manager.get_cache_stats()["cached_models"], ["medium"])
+    
+    def test_quantized_loading_path(self):
+        """En int8, le modèle est lu depuis l'artefact quantifié, sans whisper.load_model"""
+        manager = ModelManager(device="cpu", quantize=True, quantized_dir="models/int8")
+        with patch.object(ModelManager, 'prepare_quantized_model', return_value="models/int8/tiny_int8.pt") as prepare, \
+                patch.object(ModelManager, 'is_quantized', return_value=True):
+            self.assertIsNotNone(manager.load_model("tiny"))
+        prepare.assert_called_once_with("tiny")
+        self.mock_load.assert_not_called()
+        self.assertEqual(manager.get_quantized_path("tiny"), Path("models/int8") / "tiny_int8.pt")
+    
+    def test_quantized_ram_estimates(self):
+        """Les estimations RAM utilisent l'empreinte int8 si la quantification est active"""
+        fp32 = ModelManager(device="cpu")
+        int8 = ModelManager(device="cpu", quantize=True)
+        self.assertEqual(fp32.get_model_ram_gb("medium"), 5)
+        self.assertEqual(int8.get_model_ram_gb("medium"), 2)
+        self.assertLess(int8.estimate_ram_usage("medium", 4), fp32.estimate_ram_usage("medium", 4))
+        # 4 processus medium: 24 Go en FP32, 12 Go en int8
+        self.assertFalse(fp32.validate_memory_availability("medium", 4, total_ram_gb=16))
+        self.assertTrue(int8.validate_memory_availability("medium", 4, total_ram_gb=16))
+        # Pas de quantification dynamique sur GPU
+        self.assertFalse(ModelManager(device="cuda", quantize=True).quantize)
+    
+    @unittest.skipUnless(TORCH_AVAILABLE, "torch non installé")
+    def test_quantize_linear_subclasses(self):
+        """Les sous-classes de nn.Linear (whisper.model.Linear) deviennent des couches int8 dynamiques"""
+        import torch
+        
+        class Linear(torch.nn.Linear):
+            pass
+        
+        model = torch.nn.Sequential(Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 2, bias=False))
+        x = torch.randn(3, 8)
+        expected = model(x)
+        quantized = ModelManager.quantize_model(model)
+        
+        for index in (0, 2):
+            self.assertIsInstance(quantized[index], torch.ao.nn.quantized.dynamic.Linear)
+        self.assertTrue(ModelManager.is_quantized(quantized))
+        self.assertTrue(torch.allclose(quantized(x), expected, atol=0.1))
+
+
 class TestCPUAffinityManager(unittest.TestCase):
     """Tests pour CPUAffinityManager"""
     
@@ -123,6 +263,1258 @@ class TestCPUAffinityManager(unittest.TestCase):
             self.assertEqual(len(liste), 0)
 
 
+class TestAffinityPlanner(unittest.TestCase):
+    """Tests pour les plans d'affinité construits sur la topologie (/sys simulé)"""
+    
+    def setUp(self):
+        # 8 CPU logiques: cœur = cpu % 4 (frères SMT 0/4, 1/5, ...), cœurs 0-1 sur le nœud 0, 2-3 sur le nœud 1
+        self.sys_root = Path(tempfile.mkdtemp())
+        for cpu in range(8):
+            cpu_dir = self.sys_root / "devices/system/cpu" / f"cpu{cpu}"
+            (cpu_dir / "topology").mkdir(parents=True)
+            (cpu_dir / "topology" / "physical_package_id").write_text("0\n")
+            (cpu_dir / "topology" / "core_id").write_text(f"{cpu % 4}\n")
+            (cpu_dir / f"node{0 if cpu % 4 < 2 else 1}").mkdir()
+        (self.sys_root / "fs/cgroup").mkdir(parents=True)
+        (self.sys_root / "fs/cgroup/cpuset.cpus.effective").write_text("0-7\n")
+        (self.sys_root / "fs/cgroup/cpu.max").write_text("400000 100000\n")
+        self.affinity = patch("core.affinity.os.sched_getaffinity", return_value=set(range(16)), create=True)
+        self.affinity.start()
+        self.topology = CPUAffinityManager.read_topology(str(self.sys_root))
+    
+    def tearDown(self):
+        self.affinity.stop()
+        shutil.rmtree(self.sys_root, ignore_errors=True)
+    
+    def test_read_topology_and_quota(self):
+        """Topologie lue dans /sys, restreinte au cpuset; quota cgroup v2 en CPU"""
+        self.assertEqual([e["cpu"] for e in self.topology], list(range(8)))
+        self.assertEqual(self.topology[5], {"cpu": 5, "core": (0, 1), "node": 0})
+        self.assertEqual(self.topology[6]["node"], 1)
+        self.assertEqual(CPUAffinityManager.cpu_quota(str(self.sys_root)), 4.0)
+        (self.sys_root / "fs/cgroup/cpu.max").write_text("max 100000\n")
+        self.assertIsNone(CPUAffinityManager.cpu_quota(str(self.sys_root)))
+    
+    def test_own_cgroup_cpuset_and_quota(self):
+        """Cpuset et quota lus dans le cgroup du processus (/proc/self/cgroup)"""
+        proc_root = self.sys_root / "proc"
+        (proc_root / "self").mkdir(parents=True)
+        (proc_root / "self/cgroup").write_text("0::/system.slice/stationtv.service\n")
+        service = self.sys_root / "fs/cgroup/system.slice/stationtv.service"
+        service.mkdir(parents=True)
+        (service / "cpuset.cpus.effective").write_text("2-3,6\n")
+        (service / "cpu.max").write_text("150000 100000\n")
+        
+        self.assertEqual(CPUAffinityManager.allowed_cpus(str(self.sys_root), str(proc_root)), [2, 3, 6])
+        self.assertEqual(CPUAffinityManager.cpu_quota(str(self.sys_root), str(proc_root)), 1.5)
+    
+    def test_no_sysfs_fallback(self):
+        """Sans sysfs: un cœur par CPU logique, nœud 0"""
+        empty = tempfile.mkdtemp()
+        try:
+            topology = CPUAffinityManager.read_topology(empty)
+            self.assertEqual(len(topology), 16)
+            self.assertEqual(topology[3], {"cpu": 3, "core": (0, 3), "node": 0})
+        finally:
+            shutil.rmtree(empty, ignore_errors=True)
+    
+    def test_physical_policy(self):
+        """Un CPU logique par cœur physique, dans la limite du quota"""
+        plan = CPUAffinityManager.plan_core_sets(2, "physical", topology=self.topology, quota=4.0)
+        self.assertEqual(plan, [[0, 1], [2, 3]])
+        # 3 workers × 2 cœurs pour 4 cœurs physiques: refusé
+        self.assertIsNone(CPUAffinityManager.plan_core_sets(3, "physical", 2, topology=self.topology))
+    
+    def test_siblings_and_node_policies(self):
+        """Cœurs complets avec leurs frères SMT; CPU d'un seul nœud NUMA par worker"""
+        self.assertEqual(
+            CPUAffinityManager.plan_core_sets(2, "siblings", topology=self.topology),
+            [[0, 4, 1, 5], [2, 6, 3, 7]]
+        )
+        self.assertEqual(
+            CPUAffinityManager.plan_core_sets(2, "node", 4, topology=self.topology),
+            [[0, 4, 1, 5], [2, 6, 3, 7]]
+        )
+        # 3 workers × 3 CPU: le troisième déborderait d'un nœud
+        self.assertIsNone(CPUAffinityManager.plan_core_sets(3, "node", 3, topology=self.topology))
+    
+    def test_oversubscription_refused(self):
+        """Plans refusés: quota cgroup dépassé, CPU partagé, CPU hors du cpuset"""
+        self.assertIsNone(CPUAffinityManager.plan_core_sets(4, "physical", 1, topology=self.topology, quota=2.0))
+        self.assertFalse(CPUAffinityManager.check_core_sets([[0, 1], [1, 2]], self.topology))
+        self.assertFalse(CPUAffinityManager.check_core_sets([[0], [9]], self.topology))
+        self.assertTrue(CPUAffinityManager.check_core_sets([[0, 4], [1, 5]], self.topology, quota=4.0))
+        self.assertIsNone(CPUAffinityManager.plan_core_sets(2, "unknown", topology=self.topology))
+
+
+def _crashing_worker(*args):
+    """Processus de mesure tué avant de répondre (OOM)"""
+    os._exit(9)
+
+
+class TestAutotune(unittest.TestCase):
+    """Tests pour l'ajustement de la courbe de débit et le profil machine"""
+    
+    @staticmethod
+    def _topology(cpus):
+        return [{"cpu": cpu, "core": (0, cpu % (cpus // 2)), "node": 0} for cpu in range(cpus)]
+    
+    @staticmethod
+    def _measurements(a, p, beta, layouts):
+        return [
+            {"workers": w, "threads": t, "throughput": float(throughput_model(w, t, a, p, beta))}
+            for w, t in layouts
+        ]
+    
+    def test_candidate_layouts(self):
+        """Puissances de 2 et dispositions saturantes, bornées par les CPU et la RAM"""
+        self.assertEqual(
+            candidate_layouts(8, thread_counts=[1, 2, 4]),
+            [(1, 1), (1, 2), (1, 4), (2, 1), (2, 2), (2, 4), (4, 1), (4, 2), (8, 1)]
+        )
+        self.assertEqual(candidate_layouts(6, max_workers=2, thread_counts=[1, 4]), [(1, 1), (1, 4), (2, 1)])
+    
+    def test_fit_recovers_parameters(self):
+        """Mesures synthétiques: a, p et beta retrouvés"""
+        measurements = self._measurements(0.5, 0.8, 0.02, candidate_layouts(16, thread_counts=[1, 2, 4, 8]))
+        fit = fit_throughput(measurements)
+        
+        self.assertAlmostEqual(fit["a"], 0.5, delta=0.02)
+        self.assertAlmostEqual(fit["p"], 0.8, delta=0.02)
+        self.assertAlmostEqual(fit["beta"], 0.02, delta=0.005)
+        self.assertLess(fit["rmse_log"], 0.02)
+        self.assertIsNone(fit_throughput(measurements[:2]))
+    
+    def test_recommend(self):
+        """k=1 thread par processus si le calcul parallélise mal; moins de processus à débit égal"""
+        self.assertEqual(recommend({"a": 1.0, "p": 0.8, "beta": 0.0}, 8)["workers"], 8)
+        self.assertEqual(recommend({"a": 1.0, "p": 0.8, "beta": 0.0}, 8, max_workers=2)["threads"], 4)
+        best = recommend({"a": 1.0, "p": 1.0, "beta": 0.0}, 8)
+        self.assertEqual((best["workers"], best["threads"]), (1, 8))
+    
+    def test_profile_roundtrip(self):
+        """Profil écrit puis appliqué au modèle mesuré seulement"""
+        measurements = self._measurements(0.5, 0.6, 0.01, candidate_layouts(8, thread_counts=[1, 2, 4]))
+        profile = build_profile("small", measurements, fit_throughput(measurements), self._topology(8))
+        used = profile["max_parallel_processes"] * profile["num_threads"]
+        self.assertEqual(profile["affinity_policy"], "physical" if used <= 4 else "node")
+        
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = str(Path(tmpdir) / "machine_profile.yaml")
+            self.assertTrue(write_profile(path, profile))
+            config = {"whisper": {"model": "small"}, "hardware": {"max_parallel_processes": 1, "cpu_threads": 36}}
+            applied = apply_profile(config, path)
+            self.assertEqual(applied["hardware"]["max_parallel_processes"], profile["max_parallel_processes"])
+            self.assertEqual(applied["num_threads"], profile["num_threads"])
+            self.assertEqual(applied["hardware"]["cpu_threads"], 36)
+            self.assertEqual(config["hardware"]["max_parallel_processes"], 1)
+            # Profil d'un autre modèle ou absent: configuration inchangée
+            self.assertNotIn("num_threads", apply_profile({"whisper": {"model": "medium"}}, path))
+            self.assertIs(apply_profile(config, str(Path(tmpdir) / "absent.yaml")), config)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_measure_layout_failures(self):
+        """Modèle non chargé ou processus de mesure mort: disposition ignorée sans blocage"""
+        transcriber = MagicMock()
+        transcriber.return_value.backend.load.return_value = None
+        with patch("core.transcription.WhisperTranscriber", transcriber):
+            self.assertIsNone(measure_layout({}, [("a.mp3", 16000)], [[0], [1]], 1))
+        
+        with patch("core.autotune._autotune_worker", _crashing_worker), patch("utils.processes.POLL_S", 0.1):
+            self.assertIsNone(measure_layout({}, [("a.mp3", 16000)], [[0]], 1))
+
+
+class TestScheduling(unittest.TestCase):
+    """Tests pour la répartition sur le temps prédit"""
+    
+    @staticmethod
+    def _audios(durations):
+        return [Audio(f"file{i}.mp3", d) for i, d in enumerate(durations)]
+    
+    def _assert_partition(self, listes, audios, n):
+        self.assertEqual(len(listes), n)
+        self.assertEqual(sorted(a.path for l in listes for a in l), sorted(a.path for a in audios))
+    
+    def test_lpt_matches_glouton(self):
+        """LPT par tas: même répartition que glouton_n_listes, limite par liste respectée"""
+        audios = self._audios([100, 200, 150, 300, 50, 250, 80])
+        cost = lambda a: a.duree
+        self.assertEqual(lpt(audios, 3, cost), CPUAffinityManager.glouton_n_listes(audios, 3))
+        listes = lpt(audios, 3, cost, max_per_list=2)
+        self.assertEqual([len(l) for l in listes], [2, 2, 2])
+    
+    def test_multifit_beats_lpt(self):
+        """Instance défavorable à LPT (3, 3, 2, 2, 2 sur 2 listes): MULTIFIT trouve l'optimum"""
+        audios = self._audios([3, 3, 2, 2, 2])
+        cost = lambda a: a.duree
+        self.assertEqual(predict(lpt(audios, 2, cost), cost)["makespan_s"], 7)
+        listes = multifit(audios, 2, cost)
+        self._assert_partition(listes, audios, 2)
+        self.assertEqual(predict(listes, cost)["makespan_s"], 6)
+    
+    def test_karmarkar_karp(self):
+        """Différenciation: partition complète et équilibrée"""
+        rng = np.random.default_rng(0)
+        audios = self._audios(rng.uniform(60, 3600, 500))
+        cost = lambda a: a.duree
+        listes = karmarkar_karp(audios, 7, cost)
+        self._assert_partition(listes, audios, 7)
+        self.assertLess(predict(listes, cost)["imbalance"], 0.001)
+        self.assertEqual(karmarkar_karp(self._audios([5]), 3, cost)[1:], [[], []])
+    
+    def test_schedule_best_and_prediction(self):
+        """'best' garde le plus petit makespan; prédiction sur durée × facteur du modèle"""
+        audios = self._audios([3600, 3600, 2400, 2400, 2400])
+        cost = duration_cost("medium", {"medium": 2.0})
+        listes, prediction = schedule(audios, 2, cost, "best")
+        self._assert_partition(listes, audios, 2)
+        self.assertAlmostEqual(prediction["makespan_s"], 14400.0)
+        self.assertAlmostEqual(prediction["lower_bound_s"], 14400.0)
+        self.assertAlmostEqual(prediction["imbalance"], 0.0)
+        self.assertIn(prediction["algorithm"], ("multifit", "kk"))
+        # Karmarkar-Karp ne borne pas le nombre de fichiers: repli sur multifit
+        _, prediction = schedule(audios, 2, cost, "kk", max_per_list=3)
+        self.assertEqual(prediction["algorithm"], "multifit")
+    
+    def test_pack_models(self):
+        """Workers ajoutés au modèle goulot tant que cœurs et RAM le permettent"""
+        loads = {"small": 100000.0, "medium": 60000.0}
+        ram = {"small": 3.0, "medium": 7.5}
+        cores = {"small": 4, "medium": 4}
+        workers = pack_models(loads, {"small": 50, "medium": 10}, ram, cores, 32, 30.0)
+        self.assertEqual(workers, {"small": 5, "medium": 2})
+        # Cœurs limitants: 4 workers au total
+        workers = pack_models(loads, {"small": 50, "medium": 10}, ram, cores, 16, 100.0)
+        self.assertEqual(workers, {"small": 2, "medium": 2})
+        # Pas plus de workers que de fichiers
+        self.assertEqual(pack_models(loads, {"small": 50, "medium": 1}, ram, cores, 16, 100.0)["medium"], 1)
+        # Un worker par modèle ne tient pas en RAM
+        self.assertIsNone(pack_models(loads, {"small": 50, "medium": 10}, ram, cores, 32, 8.0))
+    
+    def test_schedule_mixed(self):
+        """Fichiers regroupés par chaîne, chaque liste ne contient qu'un modèle"""
+        chaines = ["TF1", "M6", "TF1", "M6", "M6"]
+        audios = [Audio(f"/data/{chaine}/{i}.mp3", 600 * (i + 1)) for i, chaine in enumerate(chaines)]
+        groups = group_by_model(audios, {"TF1": "medium"}, "small")
+        self.assertEqual({m: len(items) for m, items in groups.items()}, {"medium": 2, "small": 3})
+        
+        costs = {"small": duration_cost("small", {"small": 0.5}), "medium": duration_cost("medium", {"medium": 1.5})}
+        listes, modeles, prediction = schedule_mixed(groups, {"medium": 1, "small": 2}, costs)
+        self.assertEqual(modeles, ["medium", "small", "small"])
+        self.assertEqual(sorted(a.path for a in listes[0]), sorted(a.path for a in groups["medium"]))
+        self.assertEqual(sorted(a.path for l in listes[1:] for a in l), sorted(a.path for a in groups["small"]))
+        # medium: (600 + 1800) × 1.5
+        self.assertAlmostEqual(prediction["loads_s"][0], 3600.0)
+        
+        config = {'whisper': {'model': 'small', 'language': 'fr'}}
+        self.assertIs(model_config(config, "small"), config)
+        self.assertEqual(model_config(config, "medium")['whisper'], {'model': 'medium', 'language': 'fr'})
+        self.assertEqual(config['whisper']['model'], 'small')
+
+
+class TestSimulation(unittest.TestCase):
+    """Tests pour la simulation des politiques d'ordonnancement"""
+    
+    @staticmethod
+    def _audios(durations, folder="bdd"):
+        return [Audio(f"{folder}/file{i}.mp3", d) for i, d in enumerate(durations)]
+    
+    def test_static_policies_makespan(self):
+        """Instance défavorable à LPT: glouton et pool à 7, best à l'optimum 6"""
+        audios = self._audios([3, 3, 2, 2, 2])
+        cost = lambda a: a.duree
+        self.assertEqual(simulate(audios, "glouton", 2, 1, cost)["makespan_s"], 7)
+        self.assertEqual(simulate(audios, "pool", 2, 1, cost)["makespan_s"], 7)
+        self.assertEqual(simulate(audios, "best", 2, 1, cost)["makespan_s"], 6)
+    
+    def test_idle_and_tail(self):
+        """Cœurs inactifs: fin anticipée d'un processus et cœurs non attribués"""
+        audios = self._audios([300, 100])
+        result = simulate(audios, "lpt", 2, 4, lambda a: a.duree, total_cores=10)
+        
+        self.assertEqual(result["busy_s"], [300, 100])
+        self.assertEqual(result["tail_s"], 200)
+        # 10 cœurs × 300 s - 4 threads × 400 s occupées
+        self.assertAlmostEqual(result["idle_core_hours"], (3000 - 1600) / 3600)
+        self.assertEqual(result["unassigned"], 0)
+    
+    def test_work_stealing_absorbs_misprediction(self):
+        """Un fichier 3× plus long que prédit: le vol de travail rattrape la répartition statique"""
+        audios = self._audios([100, 100, 100, 100])
+        predicted = lambda a: a.duree
+        actual = lambda a: a.duree * (3 if a.path.endswith("file0.mp3") else 1)
+        
+        self.assertEqual(simulate(audios, "glouton", 2, 1, predicted, actual)["makespan_s"], 400)
+        stealing = simulate(audios, "stealing", 2, 1, predicted, actual)
+        self.assertEqual(stealing["makespan_s"], 300)
+        self.assertEqual(stealing["assigned"], 4)
+    
+    def test_stealing_seeded_by_schedule(self):
+        """Le vol de travail part de la répartition de schedule, sur le temps prédit"""
+        audios = self._audios([100, 100, 100, 100])
+        predicted = lambda a: a.duree * (3 if a.path.endswith("file0.mp3") else 1)
+        
+        with patch('core.simulation.schedule', wraps=schedule) as mock_schedule:
+            simulate(audios, "stealing", 2, 1, predicted, partitioning="kk")
+        mock_schedule.assert_called_once_with(audios, 2, predicted, "kk")
+    
+    def test_coeur_lists(self):
+        """Dossiers Coeur: tri naturel, limite de processus et de fichiers"""
+        audios = (
+            self._audios([10, 20], "Coeur10") + self._audios([30], "Coeur2") + self._audios([40, 50], "Coeur1")
+        )
+        listes = coeur_lists(audios, 2, max_per_list=1)
+        self.assertEqual([[a.duree for a in l] for l in listes], [[40], [30]])
+        self.assertIsNone(coeur_lists(self._audios([10, 20]), 2))
+        self.assertIsNone(simulate(self._audios([10]), "coeur", 2, 1, lambda a: a.duree))
+        # Limite de fichiers par processus: fichiers non assignés
+        self.assertEqual(simulate(audios, "coeur", 3, 1, lambda a: a.duree, max_per_list=1)["unassigned"], 2)
+    
+    def test_cost_models(self):
+        """Loi d'Amdahl sur les threads et bruit tiré une fois par fichier"""
+        cost = lambda a: a.duree
+        self.assertAlmostEqual(thread_scaling(cost, 8, 4, 1.0)(Audio("a.mp3", 100)), 50.0)
+        self.assertAlmostEqual(thread_scaling(cost, 8, 4, 0.0)(Audio("a.mp3", 100)), 100.0)
+        
+        audios = self._audios([100] * 2000)
+        noisy = noisy_cost(audios, cost, 0.2, seed=1)
+        self.assertEqual(noisy(audios[0]), noisy(audios[0]))
+        self.assertAlmostEqual(np.mean([noisy(a) for a in audios]) / 100, 1.0, delta=0.03)
+        self.assertIs(noisy_cost(audios, cost, 0.0), cost)
+    
+    def test_compare_policies_sorted(self):
+        """Comparaison: une ligne par politique applicable et nombre de processus, triée par makespan"""
+        audios = self._audios([100, 200, 300, 400])
+        results = compare_policies(
+            audios, ["glouton", "pool", "coeur"], [1, 2], lambda threads: (lambda a: a.duree / threads), 4
+        )
+        self.assertEqual(len(results), 4)
+        self.assertEqual([r["workers"] for r in results[:2]], [1, 1])
+        makespans = [r["makespan_s"] for r in results]
+        self.assertEqual(makespans, sorted(makespans))
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Tests pour la distribution des fichiers de WorkerPool (sans lancer de processus)"""
+    
+    def setUp(self):
+        self.listes = [
+            [Audio("a.mp3", 100), Audio("b.mp3", 3600)],
+            [Audio("c.mp3", 600)],
+            []
+        ]
+        self.affinity = [[0], [1], [2]]
+    
+    def test_shared_queue_lpt_order(self):
+        """En file partagée, les fichiers sortent du plus long au plus court"""
+        pool = WorkerPool({}, self.affinity)
+        pool.load_jobs(self.listes)
+        
+        ordre = [pool.next_job(slot).duree for slot in (2, 0, 1)]
+        self.assertEqual(ordre, [3600, 600, 100])
+        self.assertIsNone(pool.next_job(0))
+    
+    def test_work_stealing(self):
+        """Un slot sans travail vole le plus court fichier du slot le plus chargé"""
+        pool = WorkerPool({}, self.affinity, work_stealing=True)
+        pool.load_jobs(self.listes)
+        
+        # Slot 1: sa propre file d'abord
+        self.assertEqual(pool.next_job(1).path, "c.mp3")
+        # Slot 2 (vide): vole par la fin de la file du slot 0
+        self.assertEqual(pool.next_job(2).path, "b.mp3")
+        self.assertEqual(pool.next_job(0).path, "a.mp3")
+        self.assertEqual(pool.remaining_jobs(), 0)
+        self.assertIsNone(pool.next_job(1))
+    
+    def test_dead_worker_reaped(self):
+        """Un worker mort libère son slot après traitement de ses derniers messages"""
+        import queue
+        pool = WorkerPool({}, self.affinity)
+        pool.load_jobs(self.listes)
+        alive = {"process": MagicMock(), "queue": MagicMock(), "files_done": 0, "current": Audio("x.mp3", 10)}
+        alive["process"].is_alive.return_value = True
+        dead = [
+            dict(alive, process=MagicMock(), current=Audio(path, 10), files_done=0)
+            for path in ("a.mp3", "b.mp3")
+        ]
+        for state in dead:
+            state["process"].is_alive.return_value = False
+        workers = {0: dead[0], 1: dead[1], 2: alive}
+        pending, idle = [], {1}
+        result_queue = MagicMock()
+        result_queue.get_nowait.side_effect = [("done", 0, "a.mp3", True, 5.0), queue.Empty]
+        
+        pool._reap_dead_workers(workers, idle, pending, result_queue, 3)
+        
+        self.assertEqual(list(workers), [2])
+        self.assertEqual((pending, idle), ([0, 1], set()))
+        self.assertEqual(
+            [(r["path"], r["success"]) for r in pool.results],
+            [("a.mp3", True), ("b.mp3", False)]
+        )
+        
+        # Tous vivants: rien n'est lu dans la file
+        result_queue.reset_mock()
+        pool._reap_dead_workers(workers, idle, pending, result_queue, 3)
+        result_queue.get_nowait.assert_not_called()
+    
+    def test_should_recycle(self):
+        """Recyclage après N fichiers ou au-delà du seuil de RSS"""
+        pool = WorkerPool({}, self.affinity, max_files_per_worker=2, max_rss_gb=4.0)
+        self.assertFalse(pool.should_recycle(1, 3.0))
+        self.assertTrue(pool.should_recycle(2, 3.0))
+        self.assertTrue(pool.should_recycle(0, 4.5))
+        self.assertFalse(WorkerPool({}, self.affinity).should_recycle(100, 100.0))
+    
+    def test_mixed_models(self):
+        """Modèles mélangés: un slot ne reçoit que les fichiers de son modèle"""
+        pool = WorkerPool({}, self.affinity, slot_models=["small", "small", "medium"])
+        pool.load_jobs([[Audio("a.mp3", 100), Audio("b.mp3", 3600)], [Audio("c.mp3", 600)], [Audio("d.mp3", 60)]])
+        self.assertEqual(pool.next_job(2).path, "d.mp3")
+        self.assertIsNone(pool.next_job(2))
+        self.assertEqual([pool.next_job(slot).path for slot in (1, 0, 1)], ["b.mp3", "c.mp3", "a.mp3"])
+        
+        # Vol de travail limité aux slots du même modèle
+        pool = WorkerPool({}, self.affinity, work_stealing=True, slot_models=["small", "medium", "small"])
+        pool.load_jobs(self.listes)
+        self.assertEqual(pool.next_job(2).path, "b.mp3")
+        self.assertEqual(pool.next_job(1).path, "c.mp3")
+        self.assertIsNone(pool.next_job(1))
+
+
+class TestMemoryAdmission(unittest.TestCase):
+    """Tests pour l'admission mémoire des workers (cgroup factice, psutil simulé)"""
+    
+    GB = 1024 ** 3
+    
+    def setUp(self):
+        self.sys_root = Path(tempfile.mkdtemp())
+        (self.sys_root / "fs/cgroup").mkdir(parents=True)
+        self.memory = MagicMock(total=64 * self.GB, available=40 * self.GB)
+        self.vm = patch("core.admission.psutil.virtual_memory", return_value=self.memory)
+        self.vm.start()
+    
+    def tearDown(self):
+        self.vm.stop()
+        shutil.rmtree(self.sys_root, ignore_errors=True)
+    
+    def admission(self, **kwargs):
+        kwargs.setdefault("poll_s", 0)
+        return MemoryAdmission(4.0, sys_root=str(self.sys_root), **kwargs)
+    
+    def test_cgroup_memory(self):
+        """Limite cgroup v2 ("max" = illimitée), puis v1 (valeur géante = illimitée)"""
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root)), (None, None))
+        (self.sys_root / "fs/cgroup/memory.max").write_text("max\n")
+        (self.sys_root / "fs/cgroup/memory.current").write_text(f"{self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root)), (None, self.GB))
+        (self.sys_root / "fs/cgroup/memory.max").write_text(f"{8 * self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root)), (8 * self.GB, self.GB))
+        
+        (self.sys_root / "fs/cgroup/memory.max").unlink()
+        (self.sys_root / "fs/cgroup/memory").mkdir()
+        (self.sys_root / "fs/cgroup/memory/memory.limit_in_bytes").write_text(f"{2 ** 63 - 4096}\n")
+        (self.sys_root / "fs/cgroup/memory/memory.usage_in_bytes").write_text(f"{2 * self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root)), (None, 2 * self.GB))
+    
+    def test_cgroup_memory_own_cgroup(self):
+        """Cgroup du processus lu dans /proc/self/cgroup, racine du montage si absent"""
+        proc_root = self.sys_root / "proc"
+        (proc_root / "self").mkdir(parents=True)
+        (proc_root / "self/cgroup").write_text("0::/system.slice/stationtv.service\n")
+        service = self.sys_root / "fs/cgroup/system.slice/stationtv.service"
+        service.mkdir(parents=True)
+        (service / "memory.max").write_text(f"{8 * self.GB}\n")
+        (service / "memory.current").write_text(f"{self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root), str(proc_root)), (8 * self.GB, self.GB))
+        
+        # cgroup v1: hiérarchie du contrôleur memory; chemin absent du montage (conteneur)
+        (proc_root / "self/cgroup").write_text("5:cpu,cpuacct:/\n4:memory:/docker/abc\n")
+        (self.sys_root / "fs/cgroup/memory").mkdir()
+        (self.sys_root / "fs/cgroup/memory/memory.limit_in_bytes").write_text(f"{4 * self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root), str(proc_root)), (4 * self.GB, None))
+        (self.sys_root / "fs/cgroup/memory/docker/abc").mkdir(parents=True)
+        (self.sys_root / "fs/cgroup/memory/docker/abc/memory.limit_in_bytes").write_text(f"{2 * self.GB}\n")
+        self.assertEqual(MemoryAdmission.cgroup_memory(str(self.sys_root), str(proc_root)), (2 * self.GB, None))
+    
+    def test_available_respects_cgroup_and_reserve(self):
+        """Disponible = min(RAM disponible, marge sous la limite du cgroup) - réserve"""
+        admission = self.admission(max_usage_percent=90, reserve_gb=2)
+        # 40 Go disponibles - 10% de 64 Go gardés libres - 2 Go de réserve
+        self.assertAlmostEqual(admission.available_gb(), 40 - 6.4 - 2)
+        (self.sys_root / "fs/cgroup/memory.max").write_text(f"{20 * self.GB}\n")
+        (self.sys_root / "fs/cgroup/memory.current").write_text(f"{10 * self.GB}\n")
+        self.assertAlmostEqual(admission.available_gb(), 18 - 10 - 2)
+    
+    def test_measured_cost_replaces_static_estimate(self):
+        """Coût statique avant mesure, puis plus grande USS mesurée × marge"""
+        admission = self.admission(max_usage_percent=100, margin=1.5)
+        self.assertEqual(admission.worker_estimate_gb(), 4.0)
+        self.assertEqual(admission.capacity(), 10)
+        admission.record(1.0)
+        admission.record(0.5)
+        self.assertEqual(admission.worker_estimate_gb(), 1.5)
+        self.assertEqual(admission.capacity(), 26)
+        
+        with patch("core.admission.SystemMonitor.get_process_memory", return_value={"uss_gb": 2.0}):
+            admission.observe([123])
+        self.assertEqual(admission.worker_estimate_gb(), 3.0)
+    
+    def test_admit_waits_then_refuses(self):
+        """Worker retardé tant que la mémoire manque, refusé après max_wait_s"""
+        self.memory.available = 2 * self.GB
+        admission = self.admission(max_usage_percent=100, max_wait_s=0)
+        self.assertFalse(admission.admit(lambda: [], "worker 2"))
+        self.assertEqual(admission.refused, 1)
+        
+        # Un worker en cours (USS 3 Go): attente, la mémoire se libère à sa fin
+        running = MagicMock(side_effect=[[123], []])
+        
+        def free(_):
+            self.memory.available = 8 * self.GB
+        
+        with patch("core.admission.time.sleep", side_effect=free), \
+                patch("core.admission.SystemMonitor.get_process_memory", return_value={"uss_gb": 3.0}):
+            self.assertTrue(admission.admit(running, "worker 3"))
+        self.assertEqual(admission.delayed, 1)
+    
+    def test_from_config(self):
+        """Admission désactivée par défaut, paramètres lus dans hardware"""
+        self.assertIsNone(MemoryAdmission.from_config({}, 4.0))
+        admission = MemoryAdmission.from_config({
+            'hardware': {
+                'ram_max_usage_percent': 80,
+                'memory_admission': {'enabled': True, 'reserve_gb': 3, 'max_wait_s': 60}
+            }
+        }, 4.0)
+        self.assertEqual((admission.max_usage_percent, admission.reserve_gb, admission.max_wait_s), (80, 3, 60))
+    
+    def test_pool_starts_workers_one_at_a_time(self):
+        """Pool: un worker démarre quand le précédent a chargé son modèle et si la mémoire l'admet"""
+        admission = self.admission(max_usage_percent=100)
+        pool = WorkerPool({}, [[0], [1], [2]], admission=admission)
+        pool.load_jobs([[Audio(f"{i}.mp3", 60) for i in range(6)]])
+        started = []
+        
+        def start(slot, _):
+            started.append(slot)
+            return {"process": MagicMock(pid=100 + slot), "loaded": False}
+        
+        workers, pending = {}, [0, 1, 2]
+        with patch.object(pool, "_start_worker", side_effect=start), \
+                patch("core.admission.SystemMonitor.get_process_memory", return_value={"uss_gb": 10.0}):
+            pool._admit_pending(pending, workers, None)
+            pool._admit_pending(pending, workers, None)
+            self.assertEqual(started, [0])
+            
+            # Modèle chargé: USS 10 Go × 1.2 = 12 Go, 40 Go disponibles
+            workers[0]["loaded"] = True
+            pool._admit_pending(pending, workers, None)
+            workers[1]["loaded"] = True
+            self.memory.available = 10 * self.GB
+            pool._admit_pending(pending, workers, None)
+        self.assertEqual(started, [0, 1])
+        self.assertEqual(pending, [2])
+
+
+class TestPriorityQueue(unittest.TestCase):
+    """Tests pour les classes de priorité, les échéances et la file à priorités"""
+    
+    NOW = 1_000_000.0
+    
+    def setUp(self):
+        self.classifier = PriorityClassifier(
+            channel_classes={"archives": "backlog"}, fresh_max_age_s=6 * 3600,
+            reserved_slots=1, reserved_max_backlog_s=600
+        )
+    
+    def classify(self, path, duree, age_s, classe=""):
+        return self.classifier.classify(Audio(path, duree), now=self.NOW, aired_at=self.NOW - age_s, classe=classe)
+    
+    def test_classify(self):
+        """Classe de la chaîne, sinon diffusion fraîche selon l'âge; échéance = diffusion + délai"""
+        fresh = self.classify("tf1/a.mp3", 1800, 600)
+        self.assertEqual((fresh.classe, fresh.deadline), ("fresh", self.NOW - 600 + 3600))
+        archive = self.classify("archives/b.mp3", 1800, 600)
+        self.assertEqual((archive.classe, archive.deadline), ("backlog", 0.0))
+        old = self.classify("tf1/c.mp3", 1800, 7 * 3600)
+        self.assertEqual(old.classe, "backlog")
+        self.assertEqual(self.classify("tf1/d.mp3", 60, 7 * 3600, classe="fresh").classe, "fresh")
+        self.assertEqual(self.classify("tf1/e.mp3", 60, 0, classe="inconnue").classe, "backlog")
+    
+    def test_from_config(self):
+        """Priorités désactivées par défaut"""
+        self.assertIsNone(PriorityClassifier.from_config({}))
+        classifier = PriorityClassifier.from_config({'batch': {'priority': {'enabled': True, 'reserved_slots': 2}}})
+        self.assertEqual((classifier.reserved_slots, classifier.classes), (2, DEFAULT_CLASSES))
+    
+    def test_job_queue_order(self):
+        """Classe, puis échéance la plus proche, puis le plus long d'abord"""
+        items = [
+            self.classify("archives/long.mp3", 7200, 0),
+            self.classify("archives/court.mp3", 300, 0),
+            self.classify("tf1/tard.mp3", 600, 0),
+            self.classify("tf1/tot.mp3", 60, 1200),
+        ]
+        q = JobQueue(self.classifier, items)
+        self.assertEqual([Path(a.path).name for a in self.classifier.sort(items)],
+                         ["tot.mp3", "tard.mp3", "long.mp3", "court.mp3"])
+        self.assertEqual(q.pop().path, "archives/court.mp3")
+        q.appendleft(self.classify("tf1/urgent.mp3", 60, 3000))
+        self.assertEqual(
+            [q.popleft().path for _ in range(len(q))],
+            ["tf1/urgent.mp3", "tf1/tot.mp3", "tf1/tard.mp3", "archives/long.mp3"]
+        )
+    
+    def test_job_queue_mixed_pops(self):
+        """Retraits par les deux bouts et par slot réservé mélangés: même ordre qu'une liste triée"""
+        items = [
+            self.classify(f"{'tf1' if i % 3 == 0 else 'archives'}/{i}.mp3", (i * 37) % 1200 + 60, i * 10)
+            for i in range(30)
+        ]
+        q = JobQueue(self.classifier, items[:20])
+        reference = self.classifier.sort(items[:20])
+        for i, audio in enumerate(items[20:]):
+            q.append(audio)
+            reference = self.classifier.sort(reference + [audio])
+            if i % 3 == 0:
+                self.assertIs(q.popleft(), reference.pop(0))
+            elif i % 3 == 1:
+                self.assertIs(q.pop(), reference.pop())
+            else:
+                expected = next(a for a in reference if self.classifier.accepts(0, a))
+                self.assertIs(q.pop_reserved(), expected)
+                reference.remove(expected)
+            self.assertEqual(len(q), len(reference))
+        self.assertEqual([q.popleft() for _ in range(len(q))], reference)
+        self.assertIsNone(q.pop_reserved())
+        self.assertRaises(IndexError, q.pop)
+    
+    def test_pool_reserved_slot(self):
+        """Le slot réservé ne prend que les fichiers à échéance ou courts, sauf si tous les workers attendent"""
+        pool = WorkerPool({}, [[0], [1]], priority=self.classifier)
+        pool.load_jobs([[self.classify("archives/long.mp3", 7200, 0), self.classify("archives/court.mp3", 300, 0)]])
+        self.assertEqual(pool.next_job(0).path, "archives/court.mp3")
+        self.assertIsNone(pool.next_job(0))
+        self.assertEqual(pool.slot_remaining_jobs(0), 1)
+        
+        # Diffusion fraîche arrivée pendant le lancement: servie avant l'archive
+        pool.enqueue(self.classify("tf1/frais.mp3", 1800, 60))
+        self.assertEqual(pool.next_job(1).path, "tf1/frais.mp3")
+        
+        # Slot 0 en attente: débloqué seulement quand plus aucun autre worker ne tourne
+        workers = {0: {"process": MagicMock(), "queue": MagicMock(), "current": None}}
+        workers[1] = dict(workers[0], queue=MagicMock())
+        idle = {0}
+        pool._dispatch_idle(idle, workers)
+        self.assertEqual(idle, {0})
+        del workers[1]
+        pool._dispatch_idle(idle, workers)
+        self.assertEqual((idle, workers[0]["current"].path), (set(), "archives/long.mp3"))
+    
+    def test_inbox(self):
+        """La boîte de réception ne rend que les nouvelles lignes valides"""
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            inbox_path = tmp / "inbox.csv"
+            inbox = JobInbox(str(inbox_path))
+            self.assertEqual(inbox.poll(), [])
+            inbox_path.write_text("chemin,duree,classe\ntf1/a.mp3,600,fresh\nfr2/b.mp3,abc\n", encoding="utf-8")
+            entries = inbox.poll()
+            self.assertEqual([(a.path, a.duree, c) for a, c in entries], [("tf1/a.mp3", 600.0, "fresh")])
+            self.assertEqual(inbox.poll(), [])
+            
+            with open(inbox_path, "a", encoding="utf-8") as f:
+                f.write("fr2/c.mp3,300\n")
+            os.utime(inbox_path, (self.NOW, self.NOW))
+            self.assertEqual([(a.path, c) for a, c in inbox.poll()], [("fr2/c.mp3", "")])
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class TestBatchedEngine(unittest.TestCase):
+    """Tests pour le découpage en segments de BatchedEngine"""
+    
+    TS = 1000  # Premier token de timestamp (fictif)
+    
+    def test_tokens_to_segments_with_timestamps(self):
+        """Les paires de timestamps délimitent les segments, décalés de l'offset"""
+        tokens = [self.TS + 0, 1, 2, self.TS + 100, self.TS + 100, 3, self.TS + 250]
+        segments = BatchedEngine.tokens_to_segments(tokens, self.TS, offset=30.0, window_end=60.0)
+        
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(segments[0], (30.0, 32.0, [1, 2]))
+        self.assertEqual(segments[1], (32.0, 35.0, [3]))
+    
+    def test_tokens_to_segments_unterminated(self):
+        """Un texte sans timestamp de fin s'étend jusqu'à la fin de la fenêtre"""
+        segments = BatchedEngine.tokens_to_segments([self.TS + 50, 7, 8], self.TS, offset=0.0, window_end=12.5)
+        self.assertEqual(segments, [(1.0, 12.5, [7, 8])])
+    
+    def test_tokens_to_segments_without_timestamps(self):
+        """Sans timestamp, toute la fenêtre forme un segment"""
+        segments = BatchedEngine.tokens_to_segments([4, 5], self.TS, offset=60.0, window_end=90.0)
+        self.assertEqual(segments, [(60.0, 90.0, [4, 5])])
+
+
+
+class TestBackends(unittest.TestCase):
+    """Tests pour la sélection des moteurs d'inférence"""
+    
+    def test_default_backend_is_pytorch(self):
+        """Sans whisper.backend, le moteur de référence est utilisé"""
+        backend = create_backend({}, ModelManager())
+        self.assertIsInstance(backend, PyTorchBackend)
+    
+    def test_unknown_or_missing_backend_falls_back(self):
+        """Un moteur inconnu ou non installé se replie sur pytorch"""
+        manager = ModelManager()
+        self.assertEqual(create_backend({'whisper': {'backend': 'inconnu'}}, manager).name, "pytorch")
+        for name, (backend_class, available) in BACKENDS.items():
+            backend = create_backend({'whisper': {'backend': name}}, manager)
+            self.assertEqual(backend.name, name if available else "pytorch")
+    
+    def test_pytorch_backend_transcribe(self):
+        """Le moteur pytorch délègue à model.transcribe avec les options du profil"""
+        backend = PyTorchBackend(ModelManager(), {'whisper': {'decoding_profile': 'greedy-fast'}})
+        model = MagicMock()
+        model.transcribe.return_value = {"text": "x", "segments": [], "language": "fr"}
+        result = backend.transcribe(model, "a.mp3", "fr", True)
+        
+        model.transcribe.assert_called_once_with(
+            "a.mp3", language="fr", word_timestamps=True, **DECODING_PROFILES["greedy-fast"]
+        )
+        self.assertEqual(result["language"], "fr")
+    
+    def test_backend_interface_is_abstract(self):
+        """L'interface des moteurs ne s'instancie pas sans load/transcribe/release"""
+        with self.assertRaises(TypeError):
+            TranscriptionBackend(ModelManager(), {})
+    
+    def test_onnx_warns_on_ignored_features(self):
+        """Profil de décodage, cascade et alignement différé sans effet sur onnx: avertissement"""
+        config = {'whisper': {'decoding_profile': 'accurate', 'cascade': True, 'word_alignment': 'deferred'}}
+        with self.assertLogs('core.backends', level='WARNING') as logs:
+            ONNXBackend(ModelManager(), config)
+        self.assertIn("accurate", logs.output[0])
+        self.assertIn("cascade", logs.output[0])
+        self.assertIn("alignement différé", logs.output[0])
+        with self.assertNoLogs('core.backends', level='WARNING'):
+            ONNXBackend(ModelManager(), {'whisper': {'decoding_profile': 'greedy-fast'}})
+    
+    def test_onnx_group_words(self):
+        """Les mots ONNX sont regroupés en segments (ponctuation, silence)"""
+        words = [
+            {"word": " Bonjour", "start": 0.0, "end": 0.5},
+            {"word": " à tous.", "start": 0.5, "end": 1.0},
+            {"word": " Suite", "start": 1.2, "end": 1.5},
+            {"word": " après", "start": 3.0, "end": 3.4},
+            {"word": " pause", "start": 3.4, "end": None},
+        ]
+        segments = ONNXBackend.group_words(words, duration=4.0)
+        
+        self.assertEqual([s["text"] for s in segments], [" Bonjour à tous.", " Suite", " après pause"])
+        self.assertEqual(segments[2]["end"], 4.0)
+        self.assertEqual(len(segments[0]["words"]), 2)
+
+
+class TestDecodingProfiles(unittest.TestCase):
+    """Tests pour les profils de décodage et la mesure des replis"""
+    
+    def test_resolve_profile(self):
+        """Profil prédéfini, surcharge par la configuration et profil inconnu"""
+        # Défaut: réglages de model.transcribe (transcriptions inchangées)
+        name, options = resolve_profile({})
+        self.assertEqual(name, "whisper-default")
+        self.assertEqual(options["temperature"], (0.0, 0.2, 0.4, 0.6, 0.8, 1.0))
+        self.assertTrue(options["condition_on_previous_text"])
+        self.assertIsNone(options["beam_size"])
+        self.assertIsNone(options["best_of"])
+        
+        config = {'whisper': {
+            'decoding_profile': 'accurate',
+            'decoding_profiles': {'accurate': {'beam_size': 3, 'temperature': [0.0, 0.5]}}
+        }}
+        name, options = resolve_profile(config)
+        self.assertEqual(options["beam_size"], 3)
+        self.assertEqual(options["temperature"], (0.0, 0.5))
+        self.assertTrue(options["condition_on_previous_text"])
+        # Les profils prédéfinis ne sont pas modifiés
+        self.assertEqual(DECODING_PROFILES["accurate"]["beam_size"], 5)
+        
+        name, _ = resolve_profile({'whisper': {'decoding_profile': 'inconnu'}})
+        self.assertEqual(name, "whisper-default")
+    
+    def test_queue_config(self):
+        """Profil propre à une file, configuration d'origine inchangée"""
+        config = {'whisper': {'model': 'small'}, 'batch': {'queue_profiles': {'Coeur2': 'greedy-fast'}}}
+        self.assertIs(queue_config(config, 'Coeur1'), config)
+        queue = queue_config(config, 'Coeur2')
+        self.assertEqual(queue['whisper'], {'model': 'small', 'decoding_profile': 'greedy-fast'})
+        self.assertNotIn('decoding_profile', config['whisper'])
+    
+    def test_summarize_fallbacks(self):
+        """Replis comptés et chronométrés à partir des passes mesurées"""
+        meter = FallbackMeter("accurate")
+        calls = [(0.0, 1, 2.0), (0.2, 1, 3.0), (0.4, 1, 3.5), (0.0, 1, 1.5)]
+        stats = meter.summarize(calls)
+        self.assertEqual(stats["profile"], "accurate")
+        self.assertEqual(stats["windows"], 2)
+        self.assertEqual(stats["fallbacks"], 2)
+        self.assertAlmostEqual(stats["decode_time_s"], 10.0)
+        self.assertAlmostEqual(stats["fallback_time_s"], 6.5)
+    
+    def test_summarize_from_segments(self):
+        """Sans passe mesurée, replis déduits de la température des segments"""
+        segments = [
+            {"seek": 0, "temperature": 0.0}, {"seek": 0, "temperature": 0.0},
+            {"seek": 3000, "temperature": 0.4}, {"seek": 6000, "temperature": 0.0}
+        ]
+        stats = FallbackMeter().summarize([], segments)
+        self.assertEqual(stats["windows"], 3)
+        self.assertEqual(stats["fallbacks"], 1)
+        self.assertEqual(stats["fallback_time_s"], 0.0)
+
+
+class TestModelCascade(unittest.TestCase):
+    """Tests pour l'escalade des segments peu confiants"""
+    
+    SEGMENTS = [
+        {"start": 0.0, "end": 4.0, "text": " sûr", "avg_logprob": -0.1, "no_speech_prob": 0.01},
+        {"start": 4.0, "end": 8.0, "text": " douteux", "avg_logprob": -1.2, "no_speech_prob": 0.1},
+        {"start": 8.5, "end": 10.0, "text": " bruit", "avg_logprob": -0.2, "no_speech_prob": 0.9},
+        {"start": 10.0, "end": 14.0, "text": " fiable", "avg_logprob": -0.05, "no_speech_prob": 0.0},
+    ]
+    
+    def test_low_confidence_spans(self):
+        """Les segments sous le seuil voisins sont regroupés"""
+        cascade = ModelCascade(MagicMock(), "medium", confidence_threshold=0.6)
+        
+        self.assertGreater(ModelCascade.segment_confidence(self.SEGMENTS[0]), 0.6)
+        self.assertEqual(ModelCascade.segment_confidence({"start": 0.0, "end": 1.0}), 1.0)
+        self.assertEqual(cascade.low_confidence_spans(self.SEGMENTS), [(4.0, 10.0)])
+    
+    def test_escalate_merges_timeline(self):
+        """Les zones retranscrites remplacent les segments du petit modèle, dans l'ordre"""
+        backend = MagicMock()
+        backend.transcribe.return_value = {"text": " corrigé", "segments": [
+            {"start": 0.5, "end": 5.5, "text": " corrigé"}
+        ]}
+        cascade = ModelCascade(backend, "medium", confidence_threshold=0.6)
+        result = {"text": "", "language": "fr", "segments": self.SEGMENTS}
+        
+        merged = cascade.escalate(result, np.zeros(16000 * 14, dtype=np.float32), 16000, "fr", 4, False)
+        
+        backend.load.assert_called_once_with("medium", 4)
+        backend.release.assert_called_once()
+        self.assertEqual([s["text"] for s in merged["segments"]], [" sûr", " corrigé", " fiable"])
+        self.assertEqual(merged["segments"][1]["start"], 4.5)
+        self.assertEqual([s["id"] for s in merged["segments"]], [0, 1, 2])
+        self.assertEqual(merged["text"], "sûr corrigé fiable")
+        self.assertEqual(merged["cascade"]["escalated_s"], 6.0)
+        self.assertEqual(merged["cascade"]["segments_escalated"], 2)
+    
+    def test_no_escalation_without_low_confidence(self):
+        """Sans segment peu confiant, le grand modèle n'est pas chargé"""
+        backend = MagicMock()
+        cascade = ModelCascade(backend, "medium", confidence_threshold=0.6)
+        result = {"text": " sûr", "segments": self.SEGMENTS[:1]}
+        
+        merged = cascade.escalate(result, np.zeros(16000 * 4, dtype=np.float32), 16000, "fr", 4, False)
+        
+        backend.load.assert_not_called()
+        self.assertEqual(merged["segments"], self.SEGMENTS[:1])
+        self.assertEqual(merged["cascade"]["escalated_s"], 0.0)
+
+
+class _FakeDecoder:
+    """Décodeur factice à cache: logits = fonction déterministe de la séquence."""
+    
+    VOCAB = 10
+    EOT = 9
+    
+    def __init__(self, next_token):
+        self.next_token = next_token
+        self.seen = []
+        self.calls = 0
+    
+    @property
+    def length(self):
+        return len(self.seen)
+    
+    def feed(self, tokens):
+        self.calls += 1
+        rows = []
+        for token in tokens:
+            self.seen.append(token)
+            row = np.zeros(self.VOCAB)
+            row[self.next_token(self.seen)] = 1.0
+            rows.append(row)
+        return rows
+    
+    def rollback(self, length):
+        del self.seen[length:]
+
+
+def _target_next(seq):
+    return _FakeDecoder.EOT if len(seq) >= 30 else (sum(seq) * 7 + len(seq)) % 9
+
+
+def _draft_next(seq):
+    # Brouillon correct sauf une position sur quatre
+    return (_target_next(seq) + 1) % 9 if len(seq) % 4 == 0 and len(seq) < 30 else _target_next(seq)
+
+
+def _greedy_select(row, tokens):
+    return int(np.argmax(row)), 0.0
+
+
+class TestSpeculativeDecoding(unittest.TestCase):
+    """Tests pour la boucle de décodage spéculatif"""
+    
+    def _reference(self, prefix, max_length):
+        """Décodage glouton de la cible seule"""
+        tokens = list(prefix)
+        while tokens[-1] != _FakeDecoder.EOT and len(tokens) < max_length:
+            tokens.append(_target_next(tokens))
+        return tokens
+    
+    def _speculate(self, max_length, n_draft, draft_next=_draft_next):
+        prefix = [1, 2, 3]
+        target = _FakeDecoder(_target_next)
+        first = int(np.argmax(target.feed(prefix)[-1]))
+        tokens, _, stats = speculative_greedy(
+            target, _FakeDecoder(draft_next), prefix + [first], _greedy_select,
+            _FakeDecoder.EOT, max_length, n_draft
+        )
+        return tokens, stats, target
+    
+    def test_matches_target_greedy(self):
+        """La sortie est identique au décodage glouton de la cible"""
+        for n_draft in (1, 3, 5, 8):
+            tokens, stats, _ = self._speculate(max_length=100, n_draft=n_draft)
+            self.assertEqual(tokens, self._reference([1, 2, 3, _target_next([1, 2, 3])], 100))
+            self.assertEqual(tokens[-1], _FakeDecoder.EOT)
+            self.assertLess(stats["accepted"], stats["drafted"])
+    
+    def test_max_length(self):
+        """La séquence ne dépasse pas la longueur maximale"""
+        tokens, _, _ = self._speculate(max_length=12, n_draft=5)
+        self.assertEqual(tokens, self._reference([1, 2, 3, _target_next([1, 2, 3])], 12))
+    
+    def test_perfect_draft_saves_target_passes(self):
+        """Un brouillon parfait est entièrement accepté: moins de passes de la cible"""
+        tokens, stats, target = self._speculate(max_length=100, n_draft=4, draft_next=_target_next)
+        
+        self.assertEqual(stats["accepted"], stats["drafted"])
+        self.assertLess(stats["target_passes"], (len(tokens) - 4) / 3)
+        self.assertEqual(target.calls, stats["target_passes"] + 1)
+
+
+def _fake_stream_transcribe(samples):
+    """Transcripteur factice: un segment toutes les 4 s du signal reçu."""
+    duration = len(samples) / 16000
+    segments = []
+    start = 0.0
+    while start + 4.0 <= duration:
+        segments.append({"start": start, "end": start + 4.0, "text": f" seg {start:.0f}"})
+        start += 4.0
+    if duration - start > 0.5:
+        segments.append({"start": start, "end": duration, "text": " fin"})
+    return {"text": "", "segments": segments}
+
+
+class TestRepetitionGuard(unittest.TestCase):
+    """Tests pour la garde anti-boucle"""
+    
+    EOT = 50
+    TIMESTAMP_BEGIN = 100
+    
+    def setUp(self):
+        self.guard = RepetitionGuard(min_repeats=3, min_loop_tokens=12)
+    
+    def test_find_loop(self):
+        """Un motif répété en fin de séquence est détecté"""
+        tokens = [1, 2, 3] + [7, 8, 9, 10] * 4
+        self.assertEqual(self.guard.find_loop(tokens), (4, 3))
+        self.assertEqual(self.guard.find_loop([5] * 12), (1, 12))
+    
+    def test_no_loop(self):
+        """Séquences courtes ou sans répétition ignorées"""
+        self.assertIsNone(self.guard.find_loop(list(range(40))))
+        # Trois répétitions, mais boucle plus courte que min_loop_tokens
+        self.assertIsNone(self.guard.find_loop([1, 2, 1, 2, 1, 2]))
+        self.assertIsNone(self.guard.find_loop([]))
+    
+    def test_compression_spike(self):
+        """Un texte très compressible déclenche la garde"""
+        guard = RepetitionGuard(min_repeats=100, min_compression_tokens=48, check_every=8)
+        tokens = list(range(48))
+        event = guard.check(tokens, lambda t: "la la la la " * len(t))
+        self.assertEqual(event["reason"], "compression")
+        self.assertGreater(event["compression_ratio"], 2.4)
+        self.assertIsNone(guard.check(tokens, lambda t: " ".join(str(x * 7919) for x in t)))
+    
+    def test_filter_forces_eot(self):
+        """Le filtre force le token de fin et enregistre un seul événement"""
+        tokenizer = MagicMock(eot=self.EOT, timestamp_begin=self.TIMESTAMP_BEGIN)
+        tokenizer.decode.side_effect = lambda t: " ".join(map(str, t))
+        loop_filter = _LoopFilter(self.guard, tokenizer, sample_begin=2, window=1)
+        
+        # Ligne 0: boucle entrecoupée d'horodatages; ligne 1: texte normal
+        looping = [0, 0] + [101, 7, 8, 9, 102] * 6
+        normal = [0, 0] + list(range(1, 31))
+        tokens = np.array([looping, normal])
+        logits = np.zeros((2, 200), dtype=np.float32)
+        loop_filter.apply(logits, tokens)
+        
+        self.assertEqual(int(np.argmax(logits[0])), self.EOT)
+        self.assertTrue(np.isneginf(logits[0, 7]))
+        self.assertFalse(np.isinf(logits[1]).any())
+        self.assertEqual(len(self.guard.events), 1)
+        self.assertEqual(self.guard.events[0]["reason"], "repetition")
+        
+        # Pas de second événement pour la même ligne
+        loop_filter.apply(np.zeros((2, 200), dtype=np.float32), tokens)
+        self.assertEqual(len(self.guard.events), 1)
+    
+    def test_guarded_window_accepted_by_fallback(self):
+        """Fenêtre close par la garde: acceptée dès la température 0, un événement par fenêtre"""
+        eot, timestamp_begin = self.EOT, self.TIMESTAMP_BEGIN
+        
+        @dataclasses.dataclass(frozen=True)
+        class DecodingResult:
+            text: str
+            avg_logprob: float
+            compression_ratio: float
+            no_speech_prob: float = 0.1
+        
+        class DecodingTask:
+            """Décodage simulé: le modèle répète « Merci. » jusqu'au token de fin"""
+            def __init__(self, model, options):
+                self.options = options
+                self.tokenizer = MagicMock(eot=eot, timestamp_begin=timestamp_begin)
+                self.tokenizer.decode.side_effect = lambda t: " Merci." * len(t)
+                self.sample_begin, self.n_group, self.logit_filters = 2, 1, []
+            
+            def run(self, mel):
+                tokens = [0, 0]
+                while tokens[-1] != eot and len(tokens) < 100:
+                    logits = np.zeros((1, 200), dtype=np.float32)
+                    logits[0, 7] = 1.0
+                    for logit_filter in self.logit_filters:
+                        logit_filter.apply(logits, np.array([tokens]))
+                    tokens.append(int(np.argmax(logits[0])))
+                text = self.tokenizer.decode([t for t in tokens[2:] if t != eot])
+                return [DecodingResult(text, -1.5, RepetitionGuard.text_compression_ratio(text))]
+        
+        decoding = types.ModuleType("whisper.decoding")
+        decoding.DecodingTask = DecodingTask
+        
+        def decode_with_fallback(mel):
+            # Boucle de repli de whisper.transcribe, seuils par défaut
+            for temperature in (0.0, 0.2, 0.4, 0.6, 0.8, 1.0):
+                result = decoding.DecodingTask(None, types.SimpleNamespace(temperature=temperature)).run(mel)[0]
+                needs_fallback = result.compression_ratio > 2.4 or result.avg_logprob < -1.0
+                if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                    needs_fallback = False
+                if not needs_fallback:
+                    break
+            return temperature, result
+        
+        # Sans garde: boucle jusqu'à 98 tokens, redécodée à toutes les températures
+        self.assertEqual(decode_with_fallback(None)[0], 1.0)
+        
+        with patch.dict(sys.modules, {"whisper.decoding": decoding}), self.guard.active() as events:
+            for _ in range(2):
+                temperature, result = decode_with_fallback(None)
+                self.assertEqual(temperature, 0.0)
+                self.assertEqual(result.text, " Merci." * 12)
+                self.assertEqual((result.compression_ratio, result.avg_logprob), (0.0, -1.0))
+            # Repli forcé de la dernière fenêtre: pas de nouvel événement
+            decoding.DecodingTask(None, types.SimpleNamespace(temperature=0.2)).run(None)
+        
+        self.assertEqual([event["window"] for event in events], [1, 2])
+        self.assertIs(decoding.DecodingTask.run, DecodingTask.run)
+
+
+class TestWordAligner(unittest.TestCase):
+    """Tests pour l'alignement par mot différé"""
+    
+    SEGMENTS = [
+        {"id": 0, "start": 0.0, "end": 10.0, "text": " a", "tokens": [1]},
+        {"id": 1, "start": 12.0, "end": 25.0, "text": " b", "tokens": [2]},
+        {"id": 2, "start": 26.0, "end": 40.0, "text": " c", "tokens": [3]},
+        {"id": 3, "start": 40.0, "end": 41.0, "text": " ", "tokens": []},
+    ]
+    
+    def test_group_segments(self):
+        """Segments regroupés en fenêtres de 30 s, segments sans tokens ignorés"""
+        groups = WordAligner.group_segments(self.SEGMENTS, 30.0)
+        self.assertEqual([[s["id"] for s in group] for group in groups], [[0, 1], [2]])
+    
+    @patch('core.alignment.whisper')
+    def test_align_remaps_words(self, mock_whisper):
+        """Mots alignés par fenêtre puis recalés sur le fichier d'origine"""
+        mock_whisper.audio.SAMPLE_RATE = 100
+        mock_whisper.audio.CHUNK_LENGTH = 30
+        mock_whisper.audio.N_SAMPLES = 3000
+        mock_whisper.audio.N_FRAMES = 3000
+        mock_whisper.log_mel_spectrogram.side_effect = lambda samples, n_mels, padding: np.zeros(
+            (80, len(samples) + padding)
+        )
+        windows = []
+        
+        def add_word_timestamps(segments, num_frames, **kwargs):
+            windows.append(([s["start"] for s in segments], num_frames))
+            for segment in segments:
+                segment["words"] = [{"word": segment["text"], "start": segment["start"], "end": segment["end"]}]
+        mock_whisper.timing.add_word_timestamps.side_effect = add_word_timestamps
+        
+        aligner = WordAligner(MagicMock())
+        segments = aligner.align(MagicMock(), self.SEGMENTS, np.zeros(4100, dtype=np.float32))
+        
+        # Fenêtres alignées depuis leur propre début (seek 0)
+        self.assertEqual(windows, [([0.0, 12.0], 2500), ([0.0], 1400)])
+        self.assertEqual(segments[1]["words"][0]["start"], 12.0)
+        self.assertEqual(segments[2]["words"][0]["start"], 26.0)
+        self.assertEqual(segments[3]["words"], [])
+        self.assertNotIn("words", self.SEGMENTS[0])
+    
+    def test_job_roundtrip(self):
+        """Travaux déposés puis retrouvés, éventuellement restreints aux fichiers demandés"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for name in ("a", "b"):
+                self.assertTrue(WordAligner.write_job(
+                    tmpdir, f"/data/TF1/{name}.mp3", {"segments": self.SEGMENTS, "language": "fr"},
+                    "small", f"/data/TF1/{name}_words.json"
+                ))
+            self.assertEqual(len(WordAligner.pending_jobs(tmpdir)), 2)
+            jobs = WordAligner.pending_jobs(tmpdir, ["/data/TF1/b.mp3", "/data/TF1/c.mp3"])
+            self.assertEqual(jobs, [WordAligner.job_path(tmpdir, "/data/TF1/b.mp3")])
+            self.assertEqual(jobs[0].name, "TF1_b.json")
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_pool_dead_worker(self):
+        """Processus d'alignement mort sans répondre: travaux en échec, sans blocage"""
+        with patch("core.alignment._align_on_cores", _crashing_worker), patch("utils.processes.POLL_S", 0.1):
+            results = run_alignment_pool({}, [Path("a.json"), Path("b.json")], [[0]])
+        self.assertEqual(results, {"a.json": False, "b.json": False})
+
+
+class TestStreaming(unittest.TestCase):
+    """Tests pour le tampon circulaire et les fenêtres glissantes"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_ring_buffer_wraparound(self):
+        """Lecture en indices absolus après plusieurs tours du tampon"""
+        ring = RingBuffer(capacity_s=1.0, sample_rate=10)
+        for i in range(3):
+            ring.write(np.arange(i * 7, i * 7 + 7, dtype=np.float32))
+        
+        self.assertEqual(ring.total, 21)
+        self.assertEqual(ring.start, 11)
+        np.testing.assert_array_equal(ring.read(15, 21), np.arange(15, 21, dtype=np.float32))
+        # Échantillons écrasés: la lecture est bornée au plus ancien disponible
+        np.testing.assert_array_equal(ring.read(0, 13), np.array([11, 12], dtype=np.float32))
+    
+    def test_segments_contiguous_without_duplicates(self):
+        """Les segments finalisés couvrent le flux sans doublon malgré le recouvrement"""
+        output_base = str(Path(self.temp_dir) / "live")
+        stream = StreamingTranscriber(
+            _fake_stream_transcribe, "TEST", writer=SegmentWriter(output_base, ["srt", "json"]),
+            window_s=10, overlap_s=3, max_lag_s=60
+        )
+        pcm = np.zeros(16000, dtype=np.int16).tobytes()
+        emitted = []
+        for _ in range(37):
+            emitted.extend(stream.feed(pcm))
+        self.assertGreater(len(emitted), 0)  # Émission avant la fin du flux
+        emitted.extend(stream.flush())
+        
+        self.assertEqual(emitted[0]["start"], 0.0)
+        self.assertAlmostEqual(emitted[-1]["end"], 37.0)
+        for previous, current in zip(emitted, emitted[1:]):
+            self.assertAlmostEqual(previous["end"], current["start"])
+        
+        stats = stream.get_stats()
+        self.assertEqual(stats["segments"], len(emitted))
+        self.assertEqual(stats["audio_dropped_s"], 0.0)
+        with open(output_base + ".jsonl", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), len(emitted))
+        with open(output_base + ".srt", encoding="utf-8") as f:
+            self.assertIn("00:00:00,000 --> 00:00:04,000", f.read())
+    
+    def test_max_lag_drops_audio(self):
+        """Au-delà du retard maximal, l'audio le plus ancien est abandonné"""
+        stream = StreamingTranscriber(_fake_stream_transcribe, "TEST", window_s=10, overlap_s=2, max_lag_s=20)
+        stream.feed(np.zeros(16000 * 50, dtype=np.int16).tobytes())
+        
+        stats = stream.get_stats()
+        self.assertAlmostEqual(stats["audio_dropped_s"], 40.0)
+        self.assertLessEqual(stats["lag_s_current"], 10.0)
+    
+    def test_run_slow_model_live_source(self):
+        """Source au rythme réel et modèle 2× plus lent: retard mesuré sur l'horloge du flux, audio abandonné"""
+        rate = 1000
+        
+        class LiveSource:
+            """2 s de PCM livrées au rythme réel (50 ms par lecture)"""
+            reads = 40
+            
+            def read(self, n):
+                if self.reads == 0:
+                    return b""
+                self.reads -= 1
+                time.sleep(0.05)
+                return np.zeros(rate // 20, dtype=np.int16).tobytes()
+        
+        def slow_transcribe(samples):
+            duration = len(samples) / rate
+            time.sleep(2 * duration)
+            return {"segments": [
+                {"start": i / 10, "end": (i + 1) / 10, "text": f" {i}"} for i in range(int(duration * 10))
+            ]}
+        
+        stream = StreamingTranscriber(
+            slow_transcribe, "TEST", window_s=0.5, overlap_s=0.1, max_lag_s=1.0, sample_rate=rate
+        )
+        stats = stream.run(LiveSource(), read_bytes=rate // 10)
+        
+        self.assertAlmostEqual(stats["audio_received_s"], 2.0)
+        self.assertGreater(stats["lag_s_max"], 1.0)
+        self.assertGreater(stats["audio_dropped_s"], 0.0)
+        self.assertGreater(stats["latency_s_avg"], 1.0)
+        self.assertAlmostEqual(stats["audio_committed_s"], 2.0)
+    
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg non disponible")
+    def test_ffmpeg_source(self):
+        """Flux PCM produit par un processus ffmpeg local"""
+        source = str(Path(self.temp_dir) / "source.wav")
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "lavfi",
+             "-i", "sine=frequency=440:duration=25", source],
+            check=True
+        )
+        process = open_ffmpeg_pcm(source)
+        stream = StreamingTranscriber(_fake_stream_transcribe, "TEST", window_s=10, overlap_s=2)
+        stats = stream.run(process.stdout)
+        process.wait()
+        
+        self.assertAlmostEqual(stats["audio_received_s"], 25.0, places=1)
+        self.assertAlmostEqual(stats["audio_committed_s"], stats["audio_received_s"])
+
+
 class TestMetricsCalculator(unittest.TestCase):
     """Tests pour MetricsCalculator"""
     
@@ -196,7 +1588,23 @@ def run_tests():
     
     # Ajouter tous les tests
     suite.addTests(loader.loadTestsFromTestCase(TestModelManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestModelManagerCache))
     suite.addTests(loader.loadTestsFromTestCase(TestCPUAffinityManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestAffinityPlanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestScheduling))
+    suite.addTests(loader.loadTestsFromTestCase(TestAutotune))
+    suite.addTests(loader.loadTestsFromTestCase(TestSimulation))
+    suite.addTests(loader.loadTestsFromTestCase(TestWorkerPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestMemoryAdmission))
+    suite.addTests(loader.loadTestsFromTestCase(TestPriorityQueue))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchedEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestBackends))
+    suite.addTests(loader.loadTestsFromTestCase(TestDecodingProfiles))
+    suite.addTests(loader.loadTestsFromTestCase(TestModelCascade))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpeculativeDecoding))
+    suite.addTests(loader.loadTestsFromTestCase(TestRepetitionGuard))
+    suite.addTests(loader.loadTestsFromTestCase(TestWordAligner))
+    suite.addTests(loader.loadTestsFromTestCase(TestStreaming))
     suite.addTests(loader.loadTestsFromTestCase(TestMetricsCalculator))
     suite.addTests(loader.loadTestsFromTestCase(TestFichierAudio))
     
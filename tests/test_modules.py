@@ -2,10 +2,12 @@
 Station TV - Tests complémentaires
 Tests unitaires pour les modules non couverts par test_core.py :
   - TranscriptionExporter (export/)
-  - AudioConverter (preprocessing/)
+  - AudioConverter, AudioSegmenter, PCMCache, MelCache, VoiceActivityDetector,
+    SpeechMusicClassifier (preprocessing/)
   - SystemMonitor (qos/)
   - PowerMonitor (qos/)
   - QoSReporter (qos/)
+  - ProcessingHistory, ProcessingTimePredictor (qos/)
   - FileHandler complet (utils/)
   - WhisperTranscriber (core/) — avec mocks
 """
@@ -20,6 +22,7 @@ import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock, PropertyMock
 import sys
+import numpy as np
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -33,9 +36,15 @@ for mod in ['whisper', 'torch', 'torch.cuda']:
 
 from export.exporter import TranscriptionExporter
 from preprocessing.audio_converter import AudioConverter
+from preprocessing.segmenter import AudioSegmenter
+from preprocessing.pcm_cache import PCMCache
+from preprocessing.mel_cache import MelCache
+from preprocessing.vad import VoiceActivityDetector
+from preprocessing.music_detector import SpeechMusicClassifier
 from qos.monitor import SystemMonitor
 from qos.power_monitor import PowerMonitor
 from qos.metrics import MetricsCalculator
+from qos.history import EtaEstimator, ProcessingHistory, ProcessingTimePredictor
 from utils.file_handler import FileHandler, FichierAudio
 from core.affinity import CPUAffinityManager, Audio
 
@@ -290,9 +299,306 @@ class TestAudioConverter(unittest.TestCase):
         self.assertEqual(results['failed'], 0)
 
 
+# ============================================================
+# AudioSegmenter
+# ============================================================
+class TestAudioSegmenter(unittest.TestCase):
+    """Tests pour AudioSegmenter"""
+    
+    SR = 100  # Fréquence réduite pour des tests rapides
+    
+    def _signal_with_silences(self, duration_s, silences):
+        """Bruit blanc avec des plages silencieuses [(début, fin)]"""
+        rng = np.random.default_rng(0)
+        audio = rng.normal(0, 0.1, int(duration_s * self.SR)).astype(np.float32)
+        for begin, end in silences:
+            audio[int(begin * self.SR):int(end * self.SR)] = 0.0
+        return audio
+    
+    def test_short_audio_single_chunk(self):
+        """Un fichier plus court que le maximum reste entier"""
+        segmenter = AudioSegmenter(min_duration_s=60, max_duration_s=120, frame_s=0.1)
+        audio = self._signal_with_silences(100, [])
+        self.assertEqual(segmenter.find_chunks(audio, self.SR), [(0.0, 100.0)])
+    
+    def test_cuts_at_silence_within_bounds(self):
+        """Les coupes tombent dans les silences et respectent les bornes"""
+        segmenter = AudioSegmenter(min_duration_s=60, max_duration_s=120, frame_s=0.1, smoothing_s=0.5)
+        audio = self._signal_with_silences(300, [(95, 97), (190, 192)])
+        
+        chunks = segmenter.find_chunks(audio, self.SR)
+        
+        self.assertEqual(chunks[0][0], 0.0)
+        self.assertAlmostEqual(chunks[-1][1], 300.0)
+        for (begin, end), (next_begin, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, next_begin)
+        for begin, end in chunks:
+            self.assertLessEqual(end - begin, 120 + 1e-6)
+        self.assertTrue(95 <= chunks[0][1] <= 97)
+        self.assertTrue(190 <= chunks[1][1] <= 192)
+    
+    def test_last_chunk_respects_minimum(self):
+        """Le dernier morceau n'est pas plus court que le minimum"""
+        segmenter = AudioSegmenter(min_duration_s=60, max_duration_s=120, frame_s=0.1)
+        audio = self._signal_with_silences(130, [(125, 127)])
+        
+        chunks = segmenter.find_chunks(audio, self.SR)
+        self.assertGreaterEqual(chunks[-1][1] - chunks[-1][0], 60 - 1e-6)
+    
+    def test_last_chunks_balanced(self):
+        """Reste trop court pour deux morceaux ≥ min: les deux derniers sont équilibrés"""
+        segmenter = AudioSegmenter(min_duration_s=60, max_duration_s=80, frame_s=0.1)
+        audio = self._signal_with_silences(100, [(52, 54)])
+        
+        chunks = segmenter.find_chunks(audio, self.SR)
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(52 <= chunks[0][1] <= 54)
+        for begin, end in chunks:
+            self.assertLessEqual(end - begin, 80 + 1e-6)
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    """Tests pour VoiceActivityDetector"""
+    
+    SR = 1000  # Fréquence réduite pour des tests rapides
+    
+    def _signal(self, duration_s, speech):
+        """Silence avec des plages de bruit [(début, fin)] simulant la parole"""
+        rng = np.random.default_rng(0)
+        audio = np.zeros(int(duration_s * self.SR), dtype=np.float32)
+        for begin, end in speech:
+            zone = slice(int(begin * self.SR), int(end * self.SR))
+            audio[zone] = rng.normal(0, 0.1, zone.stop - zone.start)
+        return audio
+    
+    def test_speech_map(self):
+        """Les zones de parole sont détectées, les clics et silences courts ignorés"""
+        vad = VoiceActivityDetector(threshold_db=-40, frame_s=0.01, padding_s=0.0)
+        # Clic de 0.05 s à 6 s, silence court (0.5 s) entre 12 et 12.5 s
+        audio = self._signal(20, [(2, 5), (6, 6.05), (10, 12), (12.5, 15)])
+        
+        regions = vad.speech_map(audio, self.SR)
+        
+        self.assertEqual(len(regions), 2)
+        self.assertAlmostEqual(regions[0][0], 2.0, places=1)
+        self.assertAlmostEqual(regions[0][1], 5.0, places=1)
+        self.assertAlmostEqual(regions[1][0], 10.0, places=1)
+        self.assertAlmostEqual(regions[1][1], 15.0, places=1)
+    
+    def test_silence_only(self):
+        """Un signal silencieux ne contient aucune zone de parole"""
+        vad = VoiceActivityDetector()
+        self.assertEqual(vad.speech_map(self._signal(5, []), self.SR), [])
+        audio, mapping = vad.extract(self._signal(5, []), self.SR, [])
+        self.assertEqual(len(audio), 0)
+        self.assertEqual(mapping, [])
+    
+    def test_extract_and_remap(self):
+        """Les horodatages du signal concaténé sont recalés sur l'original"""
+        audio = self._signal(20, [(2, 5), (10, 15)])
+        
+        concat, mapping = VoiceActivityDetector.extract(audio, self.SR, [(2.0, 5.0), (10.0, 15.0)])
+        
+        self.assertEqual(len(concat), 8 * self.SR)
+        self.assertEqual(mapping, [(0.0, 2.0), (3.0, 10.0)])
+        result = {"text": "a b", "segments": [
+            {"start": 0.5, "end": 3.0, "text": "a", "words": [{"word": "a", "start": 0.5, "end": 3.0}]},
+            {"start": 3.0, "end": 4.5, "text": "b"}
+        ]}
+        remapped = VoiceActivityDetector.remap_result(result, mapping)
+        
+        self.assertEqual(remapped["segments"][0]["start"], 2.5)
+        # Une fin à la jointure reste dans la zone précédente
+        self.assertEqual(remapped["segments"][0]["end"], 5.0)
+        self.assertEqual(remapped["segments"][0]["words"][0]["end"], 5.0)
+        self.assertEqual(remapped["segments"][1]["start"], 10.0)
+        self.assertEqual(remapped["segments"][1]["end"], 11.5)
+        # Le résultat d'origine n'est pas modifié
+        self.assertEqual(result["segments"][1]["start"], 3.0)
+
+
+class TestSpeechMusicClassifier(unittest.TestCase):
+    """Tests pour SpeechMusicClassifier"""
+    
+    SR = 16000
+    
+    def _speech(self, duration_s):
+        """Syllabes voisées / non voisées séparées de pauses"""
+        t = np.arange(int(duration_s * self.SR)) / self.SR
+        rng = np.random.default_rng(0)
+        envelope = np.sin(2 * np.pi * 3 * t) > 0.2
+        voiced = 0.1 * np.sign(np.sin(2 * np.pi * 120 * t))
+        unvoiced = rng.normal(0, 0.1, len(t))
+        return (envelope * np.where(np.sin(2 * np.pi * 1.3 * t) > 0, voiced, unvoiced)).astype(np.float32)
+    
+    def _music(self, duration_s):
+        """Accord tenu"""
+        t = np.arange(int(duration_s * self.SR)) / self.SR
+        return (0.2 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.sin(2 * np.pi * 330 * t)).astype(np.float32)
+    
+    def test_classify_speech_music(self):
+        """Les zones de parole et de musique sont distinguées"""
+        classifier = SpeechMusicClassifier()
+        audio = np.concatenate([self._speech(20), self._music(30), self._speech(20)])
+        
+        spans = classifier.classify(audio, self.SR)
+        
+        self.assertEqual([label for _, _, label in spans], ["speech", "music", "speech"])
+        self.assertAlmostEqual(spans[1][0], 20.0)
+        self.assertAlmostEqual(spans[1][1], 50.0)
+        self.assertAlmostEqual(spans[-1][1], 70.0)
+    
+    def test_short_music_is_mixed(self):
+        """Une musique plus courte que le minimum (jingle bref) n'est pas écartée"""
+        classifier = SpeechMusicClassifier(min_music_s=10)
+        audio = np.concatenate([self._speech(20), self._music(4), self._speech(20)])
+        
+        labels = [label for _, _, label in classifier.classify(audio, self.SR)]
+        
+        self.assertNotIn("music", labels)
+    
+    def test_split_regions(self):
+        """Les zones à transcrire sont découpées autour de la musique"""
+        spans = [(0.0, 10.0, "speech"), (10.0, 40.0, "music"), (40.0, 60.0, "mixed")]
+        
+        kept, removed = SpeechMusicClassifier.split_regions([(2.0, 15.0), (30.0, 50.0)], spans)
+        
+        self.assertEqual(kept, [(2.0, 10.0), (40.0, 50.0)])
+        self.assertEqual(removed, [(10.0, 15.0), (30.0, 40.0)])
+
+
 # ============================================================
 # SystemMonitor
 # ============================================================
+class TestPCMCache(unittest.TestCase):
+    """Tests pour PCMCache"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "pcm")
+        patcher = patch(
+            'preprocessing.pcm_cache.whisper.load_audio',
+            side_effect=lambda path: np.full(16000, float(os.path.getsize(path)), dtype=np.float32)
+        )
+        self.mock_decode = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _audio_file(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+    
+    def test_decoded_once_and_memory_mapped(self):
+        """Le fichier n'est décodé qu'une fois, les lectures suivantes sont mappées"""
+        cache = PCMCache(self.cache_dir, max_size_gb=1)
+        path = self._audio_file("a.mp3", b"abc")
+        
+        first = cache.load(path)
+        second = cache.load(path)
+        
+        self.assertEqual(self.mock_decode.call_count, 1)
+        self.assertIsInstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+    
+    def test_content_keyed(self):
+        """Deux fichiers au contenu identique partagent la même entrée"""
+        cache = PCMCache(self.cache_dir, max_size_gb=1)
+        a = self._audio_file("a.mp3", b"same")
+        b = self._audio_file("b.mp3", b"same")
+        self.assertEqual(cache.content_key(a), cache.content_key(b))
+        cache.load(a)
+        cache.load(b)
+        self.assertEqual(self.mock_decode.call_count, 1)
+    
+    def test_lru_eviction(self):
+        """Au-delà de la taille max, l'entrée la moins récemment lue est évincée"""
+        entry_size = 16000 * 4 + 128  # float32 + en-tête .npy
+        cache = PCMCache(self.cache_dir, max_size_gb=2.5 * entry_size / 1024**3)
+        paths = [self._audio_file(f"{i}.mp3", bytes([i]) * (i + 1)) for i in range(3)]
+        
+        cache.load(paths[0])
+        time.sleep(0.01)
+        cache.load(paths[1])
+        time.sleep(0.01)
+        cache.load(paths[0])  # paths[0] redevient la plus récente
+        time.sleep(0.01)
+        cache.load(paths[2])  # 3 entrées > 2.5: paths[1] évincée
+        
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertTrue(cache.get_entry_path(cache.content_key(paths[0])).exists())
+        self.assertFalse(cache.get_entry_path(cache.content_key(paths[1])).exists())
+
+
+class TestMelCache(unittest.TestCase):
+    """Tests pour MelCache"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.audio_path = os.path.join(self.temp_dir, "a.mp3")
+        with open(self.audio_path, 'wb') as f:
+            f.write(b"audio")
+        
+        fake_whisper = MagicMock()
+        fake_whisper.audio.N_FFT, fake_whisper.audio.HOP_LENGTH = 400, 160
+        fake_whisper.audio.SAMPLE_RATE, fake_whisper.audio.N_SAMPLES = 16000, 480000
+        fake_whisper.log_mel_spectrogram.side_effect = (
+            lambda audio, n_mels, padding: MagicMock(**{"cpu.return_value.numpy.return_value": np.ones((n_mels, 10), dtype=np.float32)})
+        )
+        patcher = patch('preprocessing.mel_cache.whisper', fake_whisper)
+        self.fake_whisper = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_mel_computed_once_per_params(self):
+        """Le log-mel est calculé une fois par (contenu, paramètres mel)"""
+        cache = MelCache(os.path.join(self.temp_dir, "mel"), max_size_gb=1)
+        loader = MagicMock(return_value=np.zeros(16000, dtype=np.float32))
+        
+        cache.load(self.audio_path, 80, loader)
+        cache.load(self.audio_path, 80, loader)   # tiny puis small: même log-mel
+        cache.load(self.audio_path, 128, loader)  # large-v3: autres paramètres
+        
+        self.assertEqual(self.fake_whisper.log_mel_spectrogram.call_count, 2)
+        self.assertEqual(loader.call_count, 2)
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+        self.assertNotEqual(MelCache.mel_params(80), MelCache.mel_params(128))
+    
+    def test_saved_time_from_other_instance(self):
+        """Le temps économisé est lu depuis l'entrée, même créée par un autre processus"""
+        cache_dir = os.path.join(self.temp_dir, "mel")
+        first = MelCache(cache_dir)
+        first.load(self.audio_path, 80, lambda path: np.zeros(16000, dtype=np.float32))
+        
+        second = MelCache(cache_dir)
+        second.load(self.audio_path, 80)
+        self.assertEqual(second.get_stats()["hits"], 1)
+        self.assertAlmostEqual(second.get_stats()["saved_time_s"], first.get_stats()["compute_time_s"])
+    
+    def test_region_variants_cached_apart(self):
+        """Le log-mel des zones retenues est une entrée distincte par jeu de zones"""
+        cache = MelCache(os.path.join(self.temp_dir, "mel"))
+        loader = MagicMock(return_value=np.zeros(16000, dtype=np.float32))
+        speech = MelCache.regions_key([(0.0, 1.0), (2.0, 3.0)])
+        
+        cache.load(self.audio_path, 80, loader)
+        cache.load(self.audio_path, 80, loader, variant=speech)
+        cache.load(self.audio_path, 80, loader, variant=speech)
+        cache.load(self.audio_path, 80, loader, variant=MelCache.regions_key([(0.0, 1.0)]))
+        
+        self.assertEqual(loader.call_count, 3)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+
 class TestSystemMonitor(unittest.TestCase):
     """Tests pour SystemMonitor"""
     
@@ -361,6 +667,16 @@ class TestSystemMonitor(unittest.TestCase):
         self.assertIsInstance(stats["cpu_percent"], float)
         self.assertGreater(stats["memory_total_gb"], 0)
     
+    def test_get_process_memory(self):
+        """Vérifie la mesure mémoire RSS unique / partagée du processus courant"""
+        memory = SystemMonitor.get_process_memory()
+        
+        for key in ("rss_gb", "uss_gb", "pss_gb", "shared_gb"):
+            self.assertIn(key, memory)
+        self.assertGreater(memory["rss_gb"], 0)
+        self.assertLessEqual(memory["uss_gb"], memory["rss_gb"])
+        self.assertAlmostEqual(memory["shared_gb"], memory["rss_gb"] - memory["uss_gb"])
+    
     def test_double_start_ignored(self):
         """Vérifie que start() appelé deux fois ne crée pas de doublons"""
         monitor = SystemMonitor(output_dir=self.tmpdir, interval=1)
@@ -681,6 +997,168 @@ class TestWhisperTranscriber(unittest.TestCase):
         
         self.assertEqual(transcriber.model_name, 'small')
         self.assertEqual(transcriber.language, 'fr')
+    
+    @patch('core.transcription.ModelManager')
+    def test_preloaded_model_reused(self, MockModelManager):
+        """Vérifie que le modèle chargé d'avance sert au premier fichier sans second chargement"""
+        from core.transcription import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.backend = MagicMock()
+        model = transcriber.backend.load.return_value
+        
+        self.assertIs(transcriber.preload_model(4), model)
+        self.assertIs(transcriber._load_model('small', 4), model)
+        transcriber.backend.load.assert_called_once_with('small', 4)
+        
+        # Repris une seule fois; rendu au moteur si le premier fichier demande un autre modèle
+        transcriber._load_model('small', 4)
+        self.assertEqual(transcriber.backend.load.call_count, 2)
+        transcriber.preload_model(4)
+        transcriber._load_model('medium', 4)
+        transcriber.backend.release.assert_called_once_with(model)
+        transcriber.backend.load.assert_called_with('medium', 4)
+    
+    @patch('core.transcription.BatchedEngine')
+    @patch('core.transcription.ModelManager')
+    def test_batch_releases_through_backend(self, MockModelManager, MockEngine):
+        """Vérifie que le mode par lots charge et rend le modèle par le moteur"""
+        from core.transcription import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.backend = MagicMock()
+        transcriber.backend.name = "pytorch"
+        MockEngine.return_value.transcribe.return_value = {"a.mp3": {"text": ""}}
+        
+        self.assertEqual(transcriber.transcribe_batch(["a.mp3"], [0], batch_size=2), {"a.mp3": {"text": ""}})
+        transcriber.backend.release.assert_called_once_with(transcriber.backend.load.return_value)
+        transcriber.model_manager.release_model.assert_not_called()
+    
+    @patch('core.transcription.ModelManager')
+    def test_chunked_dead_workers(self, MockModelManager):
+        """Vérifie qu'un processus de morceaux mort ne bloque pas le worker"""
+        import queue
+        from core.transcription import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.load_audio = MagicMock(return_value=np.zeros(16000 * 4, dtype=np.float32))
+        transcriber.segmenter.find_chunks = MagicMock(return_value=[(0.0, 2.0), (2.0, 4.0)])
+        result_queue = MagicMock()
+        result_queue.get.side_effect = [(1, {"text": ""}, 1.0), queue.Empty, queue.Empty]
+        
+        with patch('core.transcription.whisper.audio.SAMPLE_RATE', 16000), \
+                patch('core.transcription.Queue', side_effect=[MagicMock(), result_queue]), \
+                patch('core.transcription.Process') as MockProcess:
+            MockProcess.return_value.is_alive.return_value = False
+            self.assertIsNone(transcriber.transcribe_chunked("a.mp3", [[0], [1]]))
+    
+    def test_merge_chunk_results(self):
+        """Vérifie le recollage des morceaux avec horodatages globaux"""
+        from core.transcription import WhisperTranscriber
+        
+        chunk_a = {"text": " Bonjour.", "language": "fr", "segments": [
+            {"id": 0, "seek": 0, "start": 0.0, "end": 2.0, "text": " Bonjour.",
+             "words": [{"word": " Bonjour.", "start": 0.5, "end": 1.5}]}
+        ]}
+        chunk_b = {"text": " Au revoir.", "language": "fr", "segments": [
+            {"id": 0, "seek": 0, "start": 1.0, "end": 3.0, "text": " Au revoir."}
+        ]}
+        
+        merged = WhisperTranscriber.merge_chunk_results([(0.0, chunk_a), (600.0, chunk_b)])
+        
+        self.assertEqual(merged["text"], "Bonjour. Au revoir.")
+        self.assertEqual(merged["language"], "fr")
+        self.assertEqual([s["id"] for s in merged["segments"]], [0, 1])
+        self.assertEqual(merged["segments"][1]["start"], 601.0)
+        self.assertEqual(merged["segments"][1]["end"], 603.0)
+        self.assertEqual(merged["segments"][1]["seek"], 60000)
+        self.assertEqual(merged["segments"][0]["words"][0]["start"], 0.5)
+        # Les résultats d'origine ne sont pas modifiés
+        self.assertEqual(chunk_b["segments"][0]["start"], 1.0)
+    
+    @patch('core.transcription.whisper')
+    @patch('core.transcription.ModelManager')
+    def test_music_sent_to_small_model(self, MockModelManager, mock_whisper):
+        """Vérifie la politique 'tiny': musique transcrite à part puis remise en ordre"""
+        from core.transcription import WhisperTranscriber
+        
+        mock_whisper.audio.SAMPLE_RATE = 16000
+        self.config['preprocessing'] = {'music_detection': True, 'music_policy': 'tiny'}
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.music_classifier.classify = MagicMock(
+            return_value=[(0.0, 10.0, "speech"), (10.0, 40.0, "music"), (40.0, 50.0, "speech")]
+        )
+        main_model, music_model = MagicMock(), MagicMock()
+        transcriber.backend = MagicMock()
+        transcriber.backend.load.return_value = music_model
+        
+        def transcribe(model, audio, language, word_timestamps, mel=None):
+            if model is music_model:
+                return {"text": " la la", "language": "fr", "segments": [{"start": 0.0, "end": 30.0, "text": " la la"}]}
+            return {"text": " a b", "language": "fr", "segments": [
+                {"start": 0.0, "end": 10.0, "text": " a"}, {"start": 10.0, "end": 20.0, "text": " b"}
+            ]}
+        transcriber.backend.transcribe.side_effect = transcribe
+        
+        result = transcriber._transcribe_regions(
+            main_model, np.zeros(50 * 16000, dtype=np.float32), "a.mp3", 2, False
+        )
+        
+        self.assertEqual([s["start"] for s in result["segments"]], [0.0, 10.0, 40.0])
+        self.assertEqual([s["id"] for s in result["segments"]], [0, 1, 2])
+        self.assertEqual(result["text"], "a la la b")
+        self.assertEqual(result["music"]["music_s"], 30.0)
+        self.assertEqual(result["music"]["policy"], "tiny")
+        transcriber.backend.load.assert_called_once_with("tiny", 2)
+        transcriber.backend.release.assert_called_once_with(music_model)
+    
+    @patch('core.transcription.whisper')
+    @patch('core.transcription.ModelManager')
+    def test_vad_regions_use_mel_cache(self, MockModelManager, mock_whisper):
+        """Vérifie que le log-mel des zones de parole passe par le cache (fichier entier seulement)"""
+        from core.transcription import WhisperTranscriber
+        
+        mock_whisper.audio.SAMPLE_RATE = 16000
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.vad = MagicMock()
+        transcriber.vad.speech_map.return_value = [(1.0, 3.0), (5.0, 6.0)]
+        transcriber.mel_cache = MagicMock()
+        transcriber.backend = MagicMock()
+        transcriber.backend.transcribe.return_value = {"text": "", "language": "fr", "segments": []}
+        audio = np.zeros(8 * 16000, dtype=np.float32)
+        
+        transcriber._transcribe_regions(MagicMock(), audio, "a.mp3", 2, False, cache_mel=True)
+        args, kwargs = transcriber.mel_cache.load.call_args
+        self.assertEqual(kwargs["variant"], MelCache.regions_key([(1.0, 3.0), (5.0, 6.0)]))
+        self.assertEqual(len(args[2]("a.mp3")), 3 * 16000)
+        self.assertIs(transcriber.backend.transcribe.call_args.kwargs["mel"], transcriber.mel_cache.load.return_value)
+        
+        # Morceau d'un fichier: signal hors cache
+        transcriber._transcribe_regions(MagicMock(), audio, "a.mp3", 2, False)
+        transcriber.mel_cache.load.assert_called_once()
+        self.assertIsNone(transcriber.backend.transcribe.call_args.kwargs["mel"])
+    
+    @patch('core.transcription.ModelManager')
+    def test_deferred_word_alignment(self, MockModelManager):
+        """Vérifie le mode différé: segments écrits tout de suite, alignement mis en attente"""
+        from core.transcription import WhisperTranscriber
+        from core.alignment import WordAligner
+        
+        self.config['whisper']['word_alignment'] = 'deferred'
+        self.config['whisper']['alignment_dir'] = os.path.join(self.tmpdir, "alignment")
+        transcriber = WhisperTranscriber(self.config)
+        transcriber.model_manager.get_model_suffix.return_value = "ws"
+        audio_file = os.path.join(self.tmpdir, "TF1", "20240101_20_00.mp3")
+        result = {"text": " a", "language": "fr", "segments": [
+            {"id": 0, "seek": 0, "start": 0.0, "end": 2.0, "text": " a", "tokens": [1, 2]}
+        ]}
+        
+        self.assertTrue(transcriber.write_outputs(audio_file, result))
+        
+        outputs = sorted(os.listdir(os.path.join(self.tmpdir, "TF1")))
+        self.assertEqual(outputs, ["20240101_20_00_transcript_st_ws.srt", "20240101_20_00_transcript_ws.txt"])
+        jobs = WordAligner.pending_jobs(self.config['whisper']['alignment_dir'], [audio_file])
+        self.assertEqual(len(jobs), 1)
 
 
 # ============================================================
@@ -744,6 +1222,134 @@ class TestMetricsCalculatorExtended(unittest.TestCase):
         finally:
             shutil.rmtree(tmpdir, ignore_errors=True)
     
+    def test_import_worker_memory_from_trackers(self):
+        """Vérifie l'import des lignes mémoire des trackers dans le résumé"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmpdir, "Tracker1.txt"), 'w', encoding='utf-8') as f:
+                f.write("=== Processus 1 - 1 fichiers ===\n\n")
+                f.write("a.mp3: 100.00 secondes (audio: 600.00)\n")
+                f.write("memoire: rss=1.000 uss=0.200 shared=0.800 (Go)\n")
+            with open(os.path.join(tmpdir, "Tracker2.txt"), 'w', encoding='utf-8') as f:
+                f.write("memoire: rss=1.000 uss=0.400 shared=0.600 (Go)\n")
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            self.assertEqual(summary["total_files"], 1)
+            self.assertEqual(summary["worker_count_measured"], 2)
+            self.assertAlmostEqual(summary["worker_uss_gb_avg"], 0.3)
+            self.assertAlmostEqual(summary["worker_uss_gb_max"], 0.4)
+            self.assertAlmostEqual(summary["worker_shared_gb_avg"], 0.7)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_import_audio_skipped_from_trackers(self):
+        """Vérifie l'import de l'audio ignoré par la VAD et son résumé par fichier"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            from core.transcription import WhisperTranscriber
+            tracker = os.path.join(tmpdir, "Tracker1.txt")
+            WhisperTranscriber.write_tracker(tracker, "a.mp3", 100.0, 600.0, {"ignoré": 150.0})
+            WhisperTranscriber.write_tracker(tracker, "b.mp3", 50.0, 200.0)
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            self.assertEqual(summary["total_files"], 2)
+            self.assertAlmostEqual(summary["total_audio_duration_seconds"], 800.0)
+            self.assertAlmostEqual(summary["total_audio_skipped_seconds"], 150.0)
+            self.assertEqual(summary["audio_skipped_per_file"], {"a.mp3": 150.0})
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_import_music_per_channel_from_trackers(self):
+        """Vérifie l'import du calcul économisé sur la musique, agrégé par chaîne"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            from core.transcription import WhisperTranscriber
+            tracker = os.path.join(tmpdir, "Tracker1.txt")
+            music = {"musique": 120.0, "économisé": 30.0}
+            WhisperTranscriber.write_tracker(tracker, "a.mp3", 100.0, 600.0, {**music, "chaîne": "france2"})
+            WhisperTranscriber.write_tracker(tracker, "b.mp3", 100.0, 600.0, {**music, "ignoré": 10.0, "chaîne": "france2"})
+            WhisperTranscriber.write_tracker(tracker, "c.mp3", 100.0, 600.0, {**music, "chaîne": "m6"})
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            self.assertAlmostEqual(summary["total_audio_duration_seconds"], 1800.0)
+            self.assertAlmostEqual(summary["total_compute_saved_seconds"], 90.0)
+            self.assertEqual(summary["music_per_channel"]["france2"]["files"], 2)
+            self.assertAlmostEqual(summary["music_per_channel"]["france2"]["compute_saved_s"], 60.0)
+            self.assertAlmostEqual(summary["music_per_channel"]["m6"]["music_s"], 120.0)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_import_loop_guard_events_from_trackers(self):
+        """Vérifie l'import des interventions de la garde anti-boucle"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            from core.transcription import WhisperTranscriber
+            tracker = os.path.join(tmpdir, "Tracker1.txt")
+            WhisperTranscriber.write_tracker(tracker, "a.mp3", 100.0, 600.0, {"boucles": 2})
+            WhisperTranscriber.write_tracker(tracker, "b.mp3", 100.0, 600.0)
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            self.assertEqual(summary["total_files"], 2)
+            self.assertEqual(summary["total_loop_guard_events"], 2)
+            self.assertEqual(summary["loop_guard_events_per_file"], {"a.mp3": 2})
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_import_decoding_profiles_from_trackers(self):
+        """Vérifie l'import des replis en température et le coût par profil de décodage"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            from core.transcription import WhisperTranscriber
+            tracker = os.path.join(tmpdir, "Tracker1.txt")
+            accurate = {"profil": "accurate", "replis": 3, "temps replis": 40.0}
+            fast = {"profil": "greedy-fast", "replis": 0, "temps replis": 0.0}
+            WhisperTranscriber.write_tracker(tracker, "a.mp3", 200.0, 600.0, accurate)
+            WhisperTranscriber.write_tracker(tracker, "b.mp3", 50.0, 600.0, fast)
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            self.assertEqual(summary["total_fallbacks"], 3)
+            self.assertAlmostEqual(summary["total_fallback_time_seconds"], 40.0)
+            self.assertAlmostEqual(summary["fallback_time_ratio"], 40.0 / 250.0)
+            self.assertEqual(summary["fallbacks_per_file"], {"a.mp3": 3})
+            self.assertAlmostEqual(summary["decoding_profiles"]["accurate"]["realtime_factor"], 3.0)
+            self.assertEqual(summary["decoding_profiles"]["greedy-fast"]["fallbacks"], 0)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    def test_import_deadline_stats_from_trackers(self):
+        """Vérifie les échéances manquées par classe de priorité"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            import time
+            from core.transcription import WhisperTranscriber
+            tracker = os.path.join(tmpdir, "Tracker1.txt")
+            now = time.time()
+            WhisperTranscriber.write_tracker(tracker, "a.mp3", 100.0, 600.0, {"classe": "fresh", "échéance": now + 3600})
+            WhisperTranscriber.write_tracker(tracker, "b.mp3", 100.0, 600.0, {"classe": "fresh", "échéance": now - 600})
+            WhisperTranscriber.write_tracker(tracker, "c.mp3", 100.0, 600.0, {"classe": "backlog"})
+            
+            self.calc.import_from_trackers(tmpdir)
+            summary = self.calc.get_summary()
+            
+            fresh = summary["deadline_stats"]["fresh"]
+            self.assertEqual((fresh["files"], fresh["deadlines"], fresh["missed"]), (2, 2, 1))
+            self.assertAlmostEqual(fresh["miss_rate"], 0.5)
+            self.assertAlmostEqual(fresh["max_lateness_s"], 600.0, delta=5.0)
+            self.assertEqual(summary["deadline_stats"]["backlog"]["deadlines"], 0)
+            self.assertEqual([m["file_path"] for m in summary["deadline_misses"]], ["b.mp3"])
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    
     def test_wer_empty_reference(self):
         """Vérifie le WER avec référence vide"""
         wer = self.calc.calculate_wer("", "quelques mots")
@@ -802,6 +1408,132 @@ class TestCPUAffinityManagerExtended(unittest.TestCase):
         self.assertIn("3600.50", repr_str)
 
 
+# ============================================================
+# ProcessingHistory / ProcessingTimePredictor
+# ============================================================
+class TestProcessingHistory(unittest.TestCase):
+    """Tests de l'historique des temps de traitement et du prédicteur"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    @staticmethod
+    def _records(n=60):
+        """Historique synthétique: coût = 0.2 × part de parole × (8 / threads)^0.5, ×1.5 sur m6"""
+        records = []
+        for i in range(n):
+            threads = 4 if i % 2 else 8
+            channel = "m6" if i % 3 == 0 else "france2"
+            speech = 0.4 + 0.5 * ((i * 7) % 10) / 10
+            factor = 0.2 * speech * (8 / threads) ** 0.5 * (1.5 if channel == "m6" else 1.0)
+            records.append({
+                "timestamp": 1700000000.0 + i * 3600, "file": f"f{i}.mp3", "channel": channel,
+                "model": "small", "threads": threads, "audio_s": 600.0 + 10 * i,
+                "speech_ratio": speech, "processing_s": (600.0 + 10 * i) * factor, "predicted_s": 0.0
+            })
+        return records
+    
+    def test_tracker_fields_to_history(self):
+        """Vérifie que modèle, threads, chaîne et part de parole passent du tracker à l'historique"""
+        from core.transcription import WhisperTranscriber
+        tracker = os.path.join(self.tmpdir, "Tracker1.txt")
+        WhisperTranscriber.write_tracker(
+            tracker, "a.mp3", 120.0, 600.0, {"ignoré": 150.0, "chaîne": "france2", "modèle": "small", "threads": 4}
+        )
+        with open(tracker, 'a', encoding='utf-8') as f:
+            f.write("b.mp3: 60.00 secondes (audio: 300.00) (fin: 1700000000)\n")
+            f.write("c.mp3: 60.00 secondes (audio: 300.00)\n")
+        os.utime(tracker, (1710000000, 1710000000))
+        calc = MetricsCalculator()
+        calc.import_from_trackers(self.tmpdir)
+        
+        records = ProcessingHistory.from_transcriptions(calc.transcriptions)
+        
+        self.assertEqual(len(records), 3)
+        # Horodatage = fin du traitement lue dans le tracker (mtime pour les anciennes lignes)
+        self.assertAlmostEqual(records[0]["timestamp"], time.time(), delta=60)
+        self.assertEqual([r["timestamp"] for r in records[1:]], [1700000000, 1710000000])
+        self.assertEqual(records[0]["model"], "small")
+        self.assertEqual(records[0]["threads"], 4)
+        self.assertEqual(records[0]["channel"], "france2")
+        self.assertAlmostEqual(records[0]["speech_ratio"], 0.75)
+    
+    def test_fallback_to_cost_factors(self):
+        """Vérifie la prédiction par facteur de coût sans historique suffisant"""
+        predictor = ProcessingTimePredictor({"small": 0.4}, min_samples=20).fit(self._records(5))
+        
+        self.assertFalse(predictor.fitted)
+        self.assertAlmostEqual(predictor.predict(1000.0, "small", 4), 400.0)
+    
+    def test_learns_threads_channel_and_speech(self):
+        """Vérifie que la régression retrouve les effets threads, chaîne et parole"""
+        predictor = ProcessingTimePredictor(ridge=0.01).fit(self._records())
+        
+        self.assertTrue(predictor.fitted)
+        expected = 1000.0 * 0.2 * 0.8 * 2 ** 0.5 * 1.5
+        predicted = predictor.predict(1000.0, "small", 4, "m6", speech_ratio=0.8)
+        self.assertAlmostEqual(predicted / expected, 1.0, delta=0.05)
+        # Plus de threads, moins de parole: plus rapide
+        self.assertLess(
+            predictor.predict(1000.0, "small", 8, "m6", speech_ratio=0.8), predicted
+        )
+        self.assertLess(
+            predictor.predict(1000.0, "small", 4, "m6", speech_ratio=0.4), predicted
+        )
+    
+    def test_unseen_model_scaled_by_defaults(self):
+        """Vérifie qu'un modèle jamais observé suit le rapport des facteurs de coût par défaut"""
+        predictor = ProcessingTimePredictor(ridge=0.01).fit(self._records())
+        
+        small = predictor.predict(1000.0, "small", 4, "france2")
+        medium = predictor.predict(1000.0, "medium", 4, "france2")
+        self.assertAlmostEqual(medium / small, 1.5 / 0.5, delta=0.3)
+    
+    def test_cost_function_uses_parent_folder(self):
+        """Vérifie la fonction de coût (chaîne = dossier parent) pour la répartition"""
+        predictor = ProcessingTimePredictor(ridge=0.01).fit(self._records())
+        cost = predictor.cost("small", 4)
+        
+        self.assertGreater(
+            cost(Audio(os.path.join("bdd", "m6", "a.mp3"), 1000.0)),
+            cost(Audio(os.path.join("bdd", "france2", "a.mp3"), 1000.0))
+        )
+    
+    def test_history_persistence_and_error(self):
+        """Vérifie l'écriture, le rechargement et le suivi d'erreur de l'historique"""
+        path = os.path.join(self.tmpdir, "history", "processing_history.csv")
+        history = ProcessingHistory(path)
+        history.append(self._records())
+        
+        predictor = ProcessingTimePredictor().fit(history.records)
+        calc = MetricsCalculator()
+        calc.add_transcription(600.0, 100.0, "bdd/france2/x.mp3", "small", fields={"chaîne": "france2", "threads": 8})
+        records = history.record(calc.transcriptions, predictor)
+        
+        reloaded = ProcessingHistory(path)
+        self.assertEqual(len(reloaded.records), 61)
+        self.assertAlmostEqual(reloaded.records[-1]["predicted_s"], records[0]["predicted_s"], places=2)
+        
+        stats = ProcessingHistory.error_stats(reloaded.records)
+        self.assertEqual(stats["samples"], 1)
+        self.assertAlmostEqual(stats["mape"], abs(records[0]["predicted_s"] - 100.0) / 100.0, places=4)
+        self.assertEqual(len(stats["mape_per_day"]), 1)
+        self.assertEqual(ProcessingHistory.error_stats(self._records()), {})
+    
+    def test_eta_corrected_by_observed_ratio(self):
+        """Vérifie le temps restant recalé sur le rapport réel / prédit"""
+        eta = EtaEstimator([100.0, 100.0, 200.0])
+        
+        self.assertAlmostEqual(eta.remaining(), 400.0)
+        # Le premier fichier prend deux fois le temps prédit
+        self.assertAlmostEqual(eta.update(200.0), 600.0)
+        self.assertAlmostEqual(eta.update(200.0), 400.0)
+        self.assertAlmostEqual(eta.update(400.0), 0.0)
+
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -812,6 +1544,11 @@ def run_tests():
     
     suite.addTests(loader.loadTestsFromTestCase(TestTranscriptionExporter))
     suite.addTests(loader.loadTestsFromTestCase(TestAudioConverter))
+    suite.addTests(loader.loadTestsFromTestCase(TestAudioSegmenter))
+    suite.addTests(loader.loadTestsFromTestCase(TestPCMCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestMelCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestVoiceActivityDetector))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpeechMusicClassifier))
     suite.addTests(loader.loadTestsFromTestCase(TestSystemMonitor))
     suite.addTests(loader.loadTestsFromTestCase(TestPowerMonitor))
     suite.addTests(loader.loadTestsFromTestCase(TestQoSReporter))
@@ -819,6 +1556,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestWhisperTranscriber))
     suite.addTests(loader.loadTestsFromTestCase(TestMetricsCalculatorExtended))
     suite.addTests(loader.loadTestsFromTestCase(TestCPUAffinityManagerExtended))
+    suite.addTests(loader.loadTestsFromTestCase(TestProcessingHistory))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
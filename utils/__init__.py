@@ -5,5 +5,10 @@ Fonctions utilitaires pour logging, gestion fichiers, etc.
 
 from .logger import setup_logger, get_logger
 from .file_handler import FileHandler
+from .processes import gather_results, stop_processes
+from .cgroup import cgroup_dir, read_sysfs
 
-__all__ = ['setup_logger', 'get_logger', 'FileHandler']
+__all__ = [
+    'setup_logger', 'get_logger', 'FileHandler', 'gather_results', 'stop_processes',
+    'cgroup_dir', 'read_sysfs'
+]
@@ -0,0 +1,47 @@
+"""
+Station TV - Cgroup
+Lecture des fichiers de sysfs et du cgroup du processus courant, résolu depuis
+/proc/self/cgroup (et non la racine de la hiérarchie, qui ne porte pas les
+limites d'un service systemd ou d'un conteneur).
+"""
+
+from pathlib import Path
+from typing import Optional
+
+
+def read_sysfs(path: Path) -> Optional[str]:
+    """Contenu d'un fichier de /sys ou /proc, ou None s'il est absent ou illisible."""
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_dir(sys_root: str = "/sys", controller: str = "", proc_root: str = "/proc") -> Path:
+    """
+    Répertoire du cgroup du processus courant.
+    
+    Args:
+        sys_root: Racine de sysfs
+        controller: Contrôleur cgroup v1 ("memory", "cpu", "cpuset"), "" pour cgroup v2
+        proc_root: Racine de procfs
+    
+    Returns:
+        Répertoire du cgroup, ou racine du montage si le chemin est inconnu ou absent
+        de ce montage (conteneur sans espace de noms cgroup)
+    """
+    mount = Path(sys_root, "fs/cgroup", controller)
+    for line in (read_sysfs(Path(proc_root, "self/cgroup")) or "").splitlines():
+        # "id:contrôleurs:chemin", cgroup v2: "0::chemin"
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        hierarchy, controllers, path = parts
+        if controller:
+            matches = controller in controllers.split(",")
+        else:
+            matches = hierarchy == "0" and not controllers
+        if matches:
+            own = mount / path.lstrip("/")
+            return own if own.is_dir() else mount
+    return mount
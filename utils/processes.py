@@ -0,0 +1,65 @@
+"""
+Station TV - Processes
+Attente bornée des réponses de processus enfants (multiprocessing): délai
+maximal et détection des processus morts sans répondre (crash, OOM killer).
+"""
+
+import queue
+import time
+from multiprocessing import Process, Queue
+from typing import List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Intervalle de vérification des processus (secondes)
+POLL_S = 5
+
+
+def gather_results(q: Queue, count: int, processes: List[Process], deadline: float = 0.0) -> Optional[List]:
+    """
+    Attend count messages de processus enfants.
+    
+    Args:
+        q: File des messages
+        count: Nombre de messages attendus
+        processes: Processus qui répondent sur la file
+        deadline: Heure limite (0 = sans limite)
+    
+    Returns:
+        Messages reçus, ou None si un processus est mort sans répondre ou si le délai est dépassé
+    """
+    messages = []
+    while len(messages) < count:
+        try:
+            messages.append(q.get(timeout=POLL_S))
+            continue
+        except queue.Empty:
+            pass
+        # Mort anormale (OOM, crash) ou tous les processus finis sans avoir répondu
+        crashed = any(p.exitcode not in (None, 0) for p in processes)
+        if crashed or not any(p.is_alive() for p in processes):
+            try:
+                messages.append(q.get(timeout=1))
+                continue
+            except queue.Empty:
+                logger.error(f"Processus arrêtés: {count - len(messages)} réponses manquantes")
+                return None
+        if deadline and time.time() > deadline:
+            logger.error(f"Délai dépassé: {count - len(messages)} réponses manquantes")
+            return None
+    return messages
+
+
+def stop_processes(processes: List[Process]):
+    """
+    Arrête les processus encore actifs et attend leur fin.
+    
+    Args:
+        processes: Processus à arrêter
+    """
+    for p in processes:
+        if p.is_alive():
+            p.terminate()
+        p.join()